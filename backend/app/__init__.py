@@ -0,0 +1,6 @@
+"""
+Track My Academy API.
+
+The app is built by app.main.create_app(); server.py exposes the default
+instance for `uvicorn server:app`.
+"""
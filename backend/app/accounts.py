@@ -0,0 +1,69 @@
+"""
+Login accounts for academy members (Supabase users for players and coaches).
+"""
+import logging
+from typing import Optional
+
+from app.core import supabase_admin
+from utils.metrics import observe_outbound
+
+logger = logging.getLogger(__name__)
+
+def generate_default_password() -> str:
+    """Generate a default password for new players"""
+    import random
+    import string
+
+    # Generate an 8-character password with letters and numbers
+    characters = string.ascii_letters + string.digits
+    return ''.join(random.choice(characters) for _ in range(8))
+
+async def create_player_supabase_account(email: str, password: str, player_data: dict) -> Optional[str]:
+    """Create a Supabase account for a player"""
+    try:
+        # Create player account using admin privileges
+        user_metadata = {
+            'player_name': f"{player_data.get('first_name', '')} {player_data.get('last_name', '')}",
+            'academy_id': player_data.get('academy_id'),
+            'role': 'player'
+        }
+        
+        with observe_outbound("supabase", "admin.create_user"):
+            response = supabase_admin.auth.admin.create_user({
+                "email": email,
+                "password": password,
+                "email_confirm": True,  # Skip email confirmation for admin-created accounts
+                "user_metadata": user_metadata
+            })
+        
+        if response.user:
+            return response.user.id
+        return None
+    except Exception as e:
+        logger.error(f"Failed to create Supabase account for player: {e}")
+        return None
+
+async def create_coach_supabase_account(email: str, password: str, coach_data: dict) -> Optional[str]:
+    """Create a Supabase account for a coach"""
+    try:
+        # Create coach account using admin privileges
+        user_metadata = {
+            'coach_name': f"{coach_data.get('first_name', '')} {coach_data.get('last_name', '')}",
+            'academy_id': coach_data.get('academy_id'),
+            'role': 'coach'
+        }
+        
+        with observe_outbound("supabase", "admin.create_user"):
+            response = supabase_admin.auth.admin.create_user({
+                "email": email,
+                "password": password,
+                "email_confirm": True,  # Skip email confirmation for admin-created accounts
+                "user_metadata": user_metadata
+            })
+        
+        if response.user:
+            return response.user.id
+        return None
+    except Exception as e:
+        logger.error(f"Failed to create Supabase account for coach: {e}")
+        return None
@@ -0,0 +1,69 @@
+"""
+Change feed wiring: which collections are watched and what a change to
+each of them invalidates (see utils/change_feed.py).
+
+Reference caches (app/reference.py) drop the changed key in every worker
+as soon as the write is seen, whichever worker (or script) made it, and
+data_versions counts the change for the document's academy. Notifications,
+announcements and attendance marks are also published as live events.
+"""
+import os
+from typing import Optional
+
+from app import reference
+from app.core import get_state
+from app.events import FEED_FIELDS, publish_announcement, publish_attendance, publish_notification
+from utils.change_feed import ChangeEvent, ChangeFeed, data_versions
+from utils.ref_cache import ReferenceCache
+
+POLL_SECONDS = float(os.environ.get("CHANGE_FEED_POLL_SECONDS", "5"))
+
+# collection -> (cache, document field holding the cache key)
+CACHED = {
+    "academies": (reference.academies, "id"),
+    "academy_settings": (reference.academy_settings, "academy_id"),
+    "academy_fee_structure": (reference.fee_structures, "academy_id"),
+    "coaches": (reference.coaches, "id"),
+}
+# Only counted in data_versions
+VERSIONED = ("players", "player_attendance")
+# Pushed to live event streams; the route that made the write publishes first and duplicates are dropped
+LIVE = {
+    "notifications": publish_notification,
+    "announcements": publish_announcement,
+    "player_attendance": publish_attendance,
+}
+
+
+def change_feed_enabled() -> bool:
+    return os.environ.get("CHANGE_FEED", "true").lower() == "true"
+
+
+def _invalidator(cache: ReferenceCache, field: str):
+    def handle(event: ChangeEvent) -> None:
+        key: Optional[str] = (event.document or {}).get(field)
+        # Deletes only carry the _id: drop the whole entity
+        cache.invalidate_local(key)
+    return handle
+
+
+def _count(event: ChangeEvent) -> None:
+    data_versions.bump(event.collection, event.academy_id)
+
+
+def _live(publish):
+    def handle(event: ChangeEvent) -> None:
+        if event.document is not None:
+            publish(event.document)
+    return handle
+
+
+def build_change_feed(db) -> ChangeFeed:
+    feed = ChangeFeed(db, state=get_state, poll_seconds=POLL_SECONDS)
+    for collection, (cache, field) in CACHED.items():
+        feed.subscribe(collection, _invalidator(cache, field))
+    for collection in (*CACHED, *VERSIONED):
+        feed.subscribe(collection, _count)
+    for collection, publish in LIVE.items():
+        feed.subscribe(collection, _live(publish), fields=FEED_FIELDS[collection])
+    return feed
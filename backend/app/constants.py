@@ -0,0 +1,168 @@
+"""
+Static configuration tables: subscription plans, sports, positions and
+performance categories, training days and batches.
+"""
+from typing import List
+
+# Subscription Plans Configuration (Backend-defined for security) - INR Pricing
+SUBSCRIPTION_PLANS = {
+    "starter_monthly": {
+        "name": "Starter Monthly",
+        "price": 2499.00,  # ₹2,499 per month
+        "billing_cycle": "monthly",
+        "currency": "inr",
+        "player_limit": 50,
+        "coach_limit": 5,
+        "features": ["Basic player management", "Coach assignment", "Performance tracking", "Email support"]
+    },
+    "starter_annual": {
+        "name": "Starter Annual",
+        "price": 24990.00,  # ₹24,990 per year (2 months free)
+        "billing_cycle": "annual",
+        "currency": "inr",
+        "player_limit": 50,
+        "coach_limit": 5,
+        "features": ["Basic player management", "Coach assignment", "Performance tracking", "Email support"]
+    },
+    "pro_monthly": {
+        "name": "Pro Monthly", 
+        "price": 4999.00,  # ₹4,999 per month
+        "billing_cycle": "monthly",
+        "currency": "inr",
+        "player_limit": 200,
+        "coach_limit": 20,
+        "features": ["Advanced analytics", "Custom reports", "API access", "Priority support", "Mobile app access"]
+    },
+    "pro_annual": {
+        "name": "Pro Annual",
+        "price": 49990.00,  # ₹49,990 per year (2 months free)
+        "billing_cycle": "annual",
+        "currency": "inr", 
+        "player_limit": 200,
+        "coach_limit": 20,
+        "features": ["Advanced analytics", "Custom reports", "API access", "Priority support", "Mobile app access"]
+    },
+    "enterprise_monthly": {
+        "name": "Enterprise Monthly",
+        "price": 12499.00,  # ₹12,499 per month
+        "billing_cycle": "monthly",
+        "currency": "inr",
+        "player_limit": 1000,
+        "coach_limit": 100,
+        "features": ["Unlimited everything", "Custom integrations", "Dedicated support", "Training sessions", "White labeling"]
+    },
+    "enterprise_annual": {
+        "name": "Enterprise Annual", 
+        "price": 124990.00,  # ₹1,24,990 per year (2 months free)
+        "billing_cycle": "annual",
+        "currency": "inr",
+        "player_limit": 1000,
+        "coach_limit": 100,
+        "features": ["Unlimited everything", "Custom integrations", "Dedicated support", "Training sessions", "White labeling"]
+    }
+}
+
+# Sport-based Position Mapping
+SPORT_POSITIONS = {
+    "Football": ["Goalkeeper", "Center Back", "Left Back", "Right Back", "Defensive Midfielder", "Central Midfielder", "Attacking Midfielder", "Left Winger", "Right Winger", "Striker", "Center Forward"],
+    "Cricket": ["Wicket Keeper", "Batsman", "All Rounder", "Fast Bowler", "Spin Bowler", "Opening Batsman", "Middle Order", "Finisher"],
+    "Basketball": ["Point Guard", "Shooting Guard", "Small Forward", "Power Forward", "Center"],
+    "Tennis": ["Singles Player", "Doubles Player"],
+    "Badminton": ["Singles Player", "Doubles Player"],
+    "Hockey": ["Goalkeeper", "Defender", "Midfielder", "Forward"],
+    "Volleyball": ["Setter", "Outside Hitter", "Middle Blocker", "Opposite Hitter", "Libero", "Defensive Specialist"],
+    "Swimming": ["Freestyle", "Backstroke", "Breaststroke", "Butterfly", "Individual Medley"],
+    "Athletics": ["Sprinter", "Middle Distance", "Long Distance", "Jumper", "Thrower"],
+    "Other": ["Player"]
+}
+
+# Sport-specific Performance Categories (5 categories per sport)
+SPORT_PERFORMANCE_CATEGORIES = {
+    "Football": [
+        "Technical Skills",
+        "Physical Fitness", 
+        "Tactical Awareness",
+        "Mental Strength",
+        "Teamwork"
+    ],
+    "Cricket": [
+        "Technical Skills",
+        "Physical Fitness",
+        "Mental Strength", 
+        "Teamwork",
+        "Match Awareness"
+    ],
+    "Basketball": [
+        "Shooting & Scoring",
+        "Defense & Rebounding",
+        "Ball Handling",
+        "Court Vision",
+        "Physical Fitness"
+    ],
+    "Tennis": [
+        "Technical Skills",
+        "Physical Fitness",
+        "Mental Strength",
+        "Match Strategy",
+        "Consistency"
+    ],
+    "Swimming": [
+        "Technique",
+        "Speed & Endurance",
+        "Mental Focus",
+        "Training Discipline",
+        "Race Strategy"
+    ],
+    "Badminton": [
+        "Technical Skills",
+        "Physical Fitness",
+        "Mental Focus",
+        "Court Coverage",
+        "Game Strategy"
+    ],
+    "Athletics": [
+        "Technical Form",
+        "Physical Fitness",
+        "Mental Strength",
+        "Training Discipline",
+        "Competition Performance"
+    ],
+    "Hockey": [
+        "Technical Skills",
+        "Physical Fitness",
+        "Tactical Awareness",
+        "Mental Strength",
+        "Teamwork"
+    ],
+    "Volleyball": [
+        "Technical Skills",
+        "Physical Fitness",
+        "Tactical Awareness",
+        "Mental Strength",
+        "Teamwork"
+    ],
+    "Other": [
+        "Technical Skills",
+        "Physical Fitness",
+        "Mental Strength",
+        "Performance Consistency",
+        "Training Attitude"
+    ]
+}
+
+# Individual vs Team Sports Classification
+INDIVIDUAL_SPORTS = ["Tennis", "Swimming", "Badminton", "Athletics"]
+TEAM_SPORTS = ["Football", "Cricket", "Basketball", "Hockey", "Volleyball"]
+
+# Training Days and Batches
+TRAINING_DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+TRAINING_BATCHES = ["Morning", "Evening", "Both"]
+
+# Helper Functions
+def is_individual_sport(sport: str) -> bool:
+    """Check if a sport is individual or team-based"""
+    return sport in INDIVIDUAL_SPORTS
+
+def get_sport_performance_categories(sport: str) -> List[str]:
+    """Get performance categories for a specific sport"""
+    return SPORT_PERFORMANCE_CATEGORIES.get(sport, SPORT_PERFORMANCE_CATEGORIES["Other"])
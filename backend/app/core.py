@@ -0,0 +1,191 @@
+"""
+Process-wide clients (Mongo, Supabase, Zoho Mail, shared state) and paths.
+
+Routers import `db`, `analytics_db`, `supabase` and `supabase_admin` from
+here at import time. They are lazy stand-ins: the real clients are created
+in the app lifespan (or on first use, for scripts and tests that skip it),
+so importing the API opens no connections and doesn't load the Supabase SDK.
+`analytics_db` is the same database reached through a separate read pool,
+so reports can't starve writes of connections.
+"""
+import os
+from pathlib import Path
+from typing import Any, Callable
+
+from dotenv import load_dotenv
+
+from utils.db import analytics_pool_enabled, create_analytics_client, create_mongo_client, get_db_name
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+load_dotenv(ROOT_DIR / '.env')
+
+UPLOAD_DIR = ROOT_DIR / "uploads" / "logos"
+
+_mongo_client = None
+_db = None
+_analytics_client = None
+_analytics_db = None
+_supabase = None
+_supabase_admin = None
+_supabase_loaded = False
+_zoho_ready = False
+_state = None
+
+
+class LazyClient:
+    """Forwards attribute and item access to the client returned by `resolve`"""
+
+    __slots__ = ("_resolve",)
+
+    def __init__(self, resolve: Callable[[], Any]):
+        object.__setattr__(self, "_resolve", resolve)
+
+    def __getattr__(self, name):
+        return getattr(self._resolve(), name)
+
+    def __getitem__(self, name):
+        return self._resolve()[name]
+
+    def __repr__(self):
+        return f"<LazyClient {self._resolve.__name__}>"
+
+
+def _monitored(pool: str):
+    # Attributes every Mongo command to the request that issued it (see QueryMonitorMiddleware)
+    from utils.metrics import MongoPoolMetricsListener
+    from utils.query_monitor import QueryMonitorListener
+    from utils.tracing import TracingCommandListener
+    return [QueryMonitorListener(), MongoPoolMetricsListener(pool), TracingCommandListener()]
+
+
+def get_mongo_client():
+    """The shared Motor client, created on first use"""
+    global _mongo_client
+    if _mongo_client is None:
+        _mongo_client = create_mongo_client(event_listeners=_monitored("main"))
+    return _mongo_client
+
+
+def get_db():
+    global _db
+    if _db is None:
+        _db = get_mongo_client()[get_db_name()]
+    return _db
+
+
+def get_analytics_db():
+    """
+    Database handle for analytics and report reads, on its own pool with
+    secondaryPreferred reads and a per-operation time budget (see
+    utils.db.create_analytics_client). Falls back to the main database when
+    the analytics pool is disabled.
+    """
+    global _analytics_client, _analytics_db
+    if _analytics_db is None:
+        if analytics_pool_enabled():
+            _analytics_client = create_analytics_client(event_listeners=_monitored("analytics"))
+            _analytics_db = _analytics_client[get_db_name()]
+        else:
+            _analytics_db = get_db()
+    return _analytics_db
+
+
+def use_database(database, analytics=None) -> None:
+    """Point `db` (and `analytics_db`, unless given its own) at another database (load tests, scripts)"""
+    global _db, _analytics_db
+    _db = database
+    _analytics_db = analytics if analytics is not None else database
+
+
+def get_state():
+    """
+    The shared state backend (rate limits, token and result caches), chosen
+    by STATE_BACKEND; see utils/state.py
+    """
+    global _state
+    if _state is None:
+        from utils.state import state_backend_from_env
+        kind = os.environ.get("STATE_BACKEND", "mongo").lower()
+        _state = state_backend_from_env(get_db() if kind == "mongo" else None)
+    return _state
+
+
+def use_state_backend(backend) -> None:
+    """Swap the state backend (tests, scripts)"""
+    global _state
+    _state = backend
+
+
+def _load_supabase() -> None:
+    global _supabase, _supabase_admin, _supabase_loaded
+    if _supabase_loaded:
+        return
+    supabase_url = os.environ.get('SUPABASE_URL')
+    supabase_key = os.environ.get('SUPABASE_KEY')
+    supabase_service_key = os.environ.get('SUPABASE_SERVICE_KEY')
+    if supabase_url and (supabase_key or supabase_service_key):
+        # The SDK (gotrue, postgrest, realtime, storage) is a large import
+        from supabase import create_client
+        if supabase_key:
+            _supabase = create_client(supabase_url, supabase_key)
+        if supabase_service_key:
+            _supabase_admin = create_client(supabase_url, supabase_service_key)
+    _supabase_loaded = True
+
+
+def get_supabase():
+    """Anon-key Supabase client, or None when not configured"""
+    _load_supabase()
+    return _supabase
+
+
+def get_supabase_admin():
+    """Service-role Supabase client, or None when not configured"""
+    _load_supabase()
+    return _supabase_admin
+
+
+def get_mail_client():
+    """
+    The shared Zoho Mail client. zoho_mail_api is imported on first use; the
+    client keeps its access token in the state backend so all workers reuse it.
+    """
+    global _zoho_ready
+    from zoho_mail_api import get_zoho_client, setup_zoho_client
+    if not _zoho_ready:
+        setup_zoho_client(state=get_state())
+        _zoho_ready = True
+    return get_zoho_client()
+
+
+async def connect() -> None:
+    """Create the clients up front (called from the lifespan)"""
+    get_db()
+    get_analytics_db()
+    get_state()
+    _load_supabase()
+
+
+async def close() -> None:
+    global _mongo_client, _db, _analytics_client, _analytics_db, _zoho_ready, _state
+    if _zoho_ready:
+        from zoho_mail_api import close_zoho_client
+        await close_zoho_client()
+        _zoho_ready = False
+    if _state is not None:
+        await _state.close()
+        _state = None
+    if _mongo_client is not None:
+        _mongo_client.close()
+    _mongo_client = None
+    _db = None
+    if _analytics_client is not None:
+        _analytics_client.close()
+    _analytics_client = None
+    _analytics_db = None
+
+
+db = LazyClient(get_db)
+analytics_db = LazyClient(get_analytics_db)
+supabase = LazyClient(get_supabase)
+supabase_admin = LazyClient(get_supabase_admin)
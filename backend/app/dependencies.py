@@ -0,0 +1,435 @@
+"""
+Auth dependencies (Supabase token -> academy/player/coach/admin context),
+rate limiting, admission control and input validation shared by the routers.
+"""
+import functools
+import inspect
+import ipaddress
+import logging
+import os
+import secrets
+
+from fastapi import Depends, HTTPException, Request
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+
+from app.core import db, get_state, supabase
+from utils.admission import AdmissionController, Overloaded
+from utils.metrics import observe_outbound
+from utils.profiling import tag_request
+from utils.rate_limit import RateLimit, identity
+from utils.tracing import set_span_attributes
+from utils.validation import has_image_signature
+
+logger = logging.getLogger(__name__)
+
+# Security
+security = HTTPBearer(auto_error=False)
+
+def tag_tenant(academy_id: str):
+    """Record the request's academy on its profile and trace"""
+    tag_request(tenant=academy_id)
+    set_span_attributes(**{"academy.id": academy_id})
+
+def verify_supabase_token(token: str):
+    """Validate an access token with Supabase (timed as an outbound call)"""
+    with observe_outbound("supabase", "get_user"):
+        return supabase.auth.get_user(token)
+
+async def check_rate_limit(identifier: str, max_requests: int = 5, window_minutes: int = 60) -> tuple[bool, str]:
+    """
+    SECURITY FIX #6: Simple rate limiting to prevent abuse
+    Counted in the shared state backend, so the limit holds across workers.
+    Returns (is_allowed, error_message)
+    """
+    allowed, _ = await get_state().hit(f"ratelimit:{identifier}", max_requests, window_minutes * 60)
+    if not allowed:
+        return False, f"Rate limit exceeded. Maximum {max_requests} requests per {window_minutes} minutes."
+    return True, ""
+
+@functools.lru_cache(maxsize=8)
+def _trusted_proxies(setting: str):
+    """TRUSTED_PROXIES parsed: "*" (trust the direct peer) or a tuple of networks"""
+    if setting.strip() == "*":
+        return "*"
+    return tuple(ipaddress.ip_network(part.strip(), strict=False) for part in setting.split(",") if part.strip())
+
+def _is_trusted(address: str, networks) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in networks)
+
+def client_ip(request: Request) -> str:
+    """
+    Address of the caller. Requests arriving from a proxy listed in
+    TRUSTED_PROXIES (comma-separated addresses/CIDRs) are attributed to the
+    right-most X-Forwarded-For entry that isn't itself a trusted proxy; "*"
+    trusts whatever connects directly (a platform proxy such as Render's) and
+    takes the entry it appended. Untrusted peers can't spoof the header.
+    uvicorn --proxy-headers --forwarded-allow-ips does the same one level down.
+    """
+    peer = request.client.host if request.client else "unknown"
+    trusted = _trusted_proxies(os.environ.get("TRUSTED_PROXIES", ""))
+    forwarded = [hop.strip() for hop in request.headers.get("x-forwarded-for", "").split(",") if hop.strip()]
+    if not trusted or not forwarded:
+        return peer
+    if trusted == "*":
+        return forwarded[-1]
+    if not _is_trusted(peer, trusted):
+        return peer
+    for hop in reversed(forwarded):
+        if not _is_trusted(hop, trusted):
+            return hop
+    return forwarded[0]
+
+def rate_limit(policy: RateLimit, user_dependency=None):
+    """
+    Route dependency enforcing `policy`, answering 429 with Retry-After when
+    it is exceeded. IP-scoped policies key on the client address; user and
+    academy scopes take the route's auth dependency (FastAPI runs it once per
+    request, so listing it here costs nothing extra).
+    """
+    async def enforce(identifier: str):
+        allowed, retry_after = await policy.hit(get_state(), identifier)
+        if not allowed:
+            raise HTTPException(status_code=429, detail=policy.message, headers={"Retry-After": str(retry_after)})
+
+    if policy.scope == "ip":
+        async def dependency(request: Request):
+            await enforce(client_ip(request))
+    else:
+        if user_dependency is None:
+            raise ValueError(f"Rate limit {policy.name!r} is {policy.scope}-scoped and needs an auth dependency")
+
+        async def dependency(user_info = Depends(user_dependency)):
+            await enforce(identity(user_info, policy.scope))
+    return dependency
+
+def validate_password_strength(password: str) -> tuple[bool, str]:
+    """
+    SECURITY FIX #5: Validate password strength requirements
+    Returns (is_valid, error_message)
+    """
+    if len(password) < 12:
+        return False, "Password must be at least 12 characters long"
+
+    if not any(c.isupper() for c in password):
+        return False, "Password must contain at least one uppercase letter"
+
+    if not any(c.islower() for c in password):
+        return False, "Password must contain at least one lowercase letter"
+
+    if not any(c.isdigit() for c in password):
+        return False, "Password must contain at least one digit"
+
+    # Check for special characters
+    special_chars = "!@#$%^&*()_+-=[]{}|;:,.<>?"
+    if not any(c in special_chars for c in password):
+        return False, "Password must contain at least one special character"
+
+    # Check for common weak passwords
+    weak_passwords = {'password123!', 'admin123!@#', '123456789!@#', 'qwerty123!@#'}
+    if password.lower() in weak_passwords:
+        return False, "Password is too common, please choose a stronger password"
+
+    return True, ""
+
+async def validate_image_file(file_content: bytes, filename: str) -> bool:
+    """
+    SECURITY FIX: Validate image files using magic numbers (file signatures)
+    Prevents content-type spoofing attacks by checking actual file content
+    """
+    return has_image_signature(file_content)
+
+# Authentication helper functions
+async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    if credentials is None:
+        return None
+    
+    try:
+        # Verify JWT token with Supabase
+        user = verify_supabase_token(credentials.credentials)
+        return user.user if user.user else None
+    except Exception as e:
+        logger.error(f"Authentication error: {e}")
+        return None
+
+async def get_academy_user_info(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Get authenticated user info with academy details"""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    
+    try:
+        # Verify JWT token with Supabase
+        user_response = verify_supabase_token(credentials.credentials)
+        if not user_response.user:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        
+        user = user_response.user
+        
+        # Look up academy information for this user
+        academy = await db.academies.find_one({"supabase_user_id": user.id})
+        
+        if not academy:
+            # Check if this is a super admin
+            if user.email == "admin@trackmyacademy.com":
+                return {
+                    "user": user,
+                    "role": "super_admin",
+                    "academy_id": None,
+                    "academy_name": None
+                }
+            else:
+                raise HTTPException(status_code=403, detail="No academy associated with this user")
+        
+        tag_tenant(academy["id"])
+        return {
+            "user": user,
+            "role": "academy_user",
+            "academy_id": academy["id"],
+            "academy_name": academy["name"],
+            "academy": academy
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Authentication error: {e}")
+        raise HTTPException(status_code=401, detail="Authentication failed")
+
+async def require_academy_user(user_info = Depends(get_academy_user_info)):
+    """Ensure user is an academy user (not super admin)"""
+    if user_info["role"] != "academy_user":
+        raise HTTPException(status_code=403, detail="Academy user access required")
+    return user_info
+
+async def get_player_user_info(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Get authenticated player user info"""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    
+    try:
+        # Verify JWT token with Supabase
+        user_response = verify_supabase_token(credentials.credentials)
+        if not user_response.user:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        
+        user = user_response.user
+        
+        # Look up player information for this user
+        player = await db.players.find_one({"supabase_user_id": user.id})
+        
+        if not player:
+            raise HTTPException(status_code=403, detail="No player profile associated with this user")
+        
+        tag_tenant(player["academy_id"])
+        return {
+            "user": user,
+            "role": "player",
+            "player_id": player["id"],
+            "academy_id": player["academy_id"],
+            "player": player
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Player authentication error: {e}")
+        raise HTTPException(status_code=401, detail="Authentication failed")
+
+async def require_player_user(user_info = Depends(get_player_user_info)):
+    """Ensure user is a player"""
+    if user_info["role"] != "player":
+        raise HTTPException(status_code=403, detail="Player access required")
+    return user_info
+
+async def get_coach_user_info(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Get authenticated coach user info"""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    
+    try:
+        # Verify JWT token with Supabase
+        user_response = verify_supabase_token(credentials.credentials)
+        if not user_response.user:
+            raise HTTPException(status_code=401, detail="Invalid token")
+        
+        user = user_response.user
+        
+        # Look up coach information for this user
+        coach = await db.coaches.find_one({"supabase_user_id": user.id})
+        
+        if not coach:
+            raise HTTPException(status_code=403, detail="No coach profile associated with this user")
+        
+        tag_tenant(coach["academy_id"])
+        return {
+            "user": user,
+            "role": "coach",
+            "coach_id": coach["id"],
+            "academy_id": coach["academy_id"],
+            "coach": coach
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Authentication error: {e}")
+        raise HTTPException(status_code=401, detail="Authentication failed")
+
+async def require_coach_user(user_info = Depends(get_coach_user_info)):
+    """Ensure user is a coach"""
+    if user_info["role"] != "coach":
+        raise HTTPException(status_code=403, detail="Coach access required")
+    return user_info
+
+async def get_event_user_info(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Academy user, coach or player asking for a live event stream ticket"""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    try:
+        # Verify JWT token with Supabase
+        user_response = verify_supabase_token(credentials.credentials)
+        if not user_response.user:
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+        user = user_response.user
+
+        academy = await db.academies.find_one({"supabase_user_id": user.id})
+        if academy:
+            user_info = {"user": user, "role": "academy_user", "academy_id": academy["id"]}
+        elif coach := await db.coaches.find_one({"supabase_user_id": user.id}):
+            user_info = {"user": user, "role": "coach", "coach_id": coach["id"], "academy_id": coach["academy_id"]}
+        elif player := await db.players.find_one({"supabase_user_id": user.id}):
+            user_info = {"user": user, "role": "player", "player_id": player["id"],
+                         "academy_id": player["academy_id"]}
+        else:
+            raise HTTPException(status_code=403, detail="No academy, coach or player profile associated with this user")
+
+        tag_tenant(user_info["academy_id"])
+        return user_info
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Event stream authentication error: {e}")
+        raise HTTPException(status_code=401, detail="Authentication failed")
+
+STREAM_TICKET_SECONDS = 60
+STREAM_TICKET_FIELDS = ("role", "academy_id", "coach_id", "player_id")
+
+async def issue_stream_ticket(user_info: dict) -> str:
+    """
+    One-time ticket for opening an event stream. Browsers' EventSource can't
+    send headers, and a bearer token in the URL would end up in access logs
+    and traces, so the stream URL carries this instead.
+    """
+    ticket = secrets.token_urlsafe(32)
+    fields = {field: user_info[field] for field in STREAM_TICKET_FIELDS if user_info.get(field)}
+    await get_state().set(f"stream_ticket:{ticket}", fields, STREAM_TICKET_SECONDS)
+    return ticket
+
+async def get_event_stream_user(request: Request):
+    """Auth context of a stream ticket (?ticket=); each ticket opens one connection"""
+    ticket = request.query_params.get("ticket")
+    if not ticket:
+        raise HTTPException(status_code=401, detail="Authentication required")
+    # take() reads and deletes in one step, so two workers can't both redeem a ticket
+    user_info = await get_state().take(f"stream_ticket:{ticket}")
+    if not user_info:
+        raise HTTPException(status_code=401, detail="Invalid or expired stream ticket")
+    tag_tenant(user_info["academy_id"])
+    return user_info
+
+async def require_super_admin(credentials: HTTPAuthorizationCredentials = Depends(security)):
+    """Ensure user is a super admin - CRITICAL SECURITY FUNCTION"""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Authentication required")
+
+    try:
+        # Verify JWT token with Supabase
+        user_response = verify_supabase_token(credentials.credentials)
+        if not user_response.user:
+            raise HTTPException(status_code=401, detail="Invalid token")
+
+        user = user_response.user
+        user_email = user.email.lower() if user.email else ""
+
+        # Check if user is super admin (hardcoded check for security)
+        # In production, this should be checked against a database role table
+        if user_email != 'admin@trackmyacademy.com':
+            raise HTTPException(status_code=403, detail="Super admin access required")
+
+        return {
+            "user": user,
+            "role": "super_admin",
+            "academy_id": None,
+            "academy_name": None,
+            "permissions": ['manage_all_academies', 'view_all_data', 'create_academies', 'manage_billing']
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Super admin authentication error: {e}")
+        raise HTTPException(status_code=401, detail="Authentication failed")
+
+# Cost class for analytics routes that fan out into many Mongo queries. The
+# default leaves half the Mongo pool to cheap routes whatever heavy pages do.
+HEAVY_ROUTES = AdmissionController(
+    "heavy",
+    max_concurrent=int(os.environ.get("HEAVY_MAX_CONCURRENT") or int(os.environ.get("MONGO_MAX_POOL", "10")) // 2),
+    per_tenant=int(os.environ.get("HEAVY_PER_TENANT", "2")),
+    queue_timeout=float(os.environ.get("HEAVY_QUEUE_TIMEOUT_SECONDS", "5"))
+)
+
+def _busy(e: Overloaded) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": str(e.retry_after)}
+    )
+
+def admission(controller: AdmissionController, user_dependency=require_academy_user):
+    """
+    Route dependency holding a slot of `controller` for the academy making
+    the request until the handler returns. Shed requests get 503 with
+    Retry-After rather than queueing until the client times out.
+    """
+    async def dependency(user_info = Depends(user_dependency)):
+        tenant = user_info.get("academy_id") or "none"
+        try:
+            await controller.acquire(tenant)
+        except Overloaded as e:
+            raise _busy(e)
+        try:
+            yield
+        finally:
+            controller.release(tenant)
+    return dependency
+
+def admitted(controller: AdmissionController):
+    """
+    Decorator form of `admission` for handlers taking `user_info`. The slot
+    is held around the call itself, so with @coalesce on top only the
+    request that computes takes one; duplicates awaiting it don't queue.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            user_info = signature.bind(*args, **kwargs).arguments["user_info"]
+            tenant = user_info.get("academy_id") or "none"
+            try:
+                await controller.acquire(tenant)
+            except Overloaded as e:
+                raise _busy(e)
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                controller.release(tenant)
+        return wrapper
+    return decorator
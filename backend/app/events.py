@@ -0,0 +1,87 @@
+"""
+Live events for the SSE stream (app/routers/events.py): who receives
+notifications, announcements and attendance marks, and the publishers the
+write paths and the change feed call.
+
+Publish after the write has succeeded, with the document as written.
+Events carry a few display fields; clients refetch over REST for more.
+"""
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from utils.events import EventBus
+
+bus = EventBus(
+    "live",
+    max_connections=int(os.environ.get("EVENT_STREAM_MAX_CONNECTIONS", "500")),
+    buffer_size=int(os.environ.get("EVENT_STREAM_BUFFER", "1000")),
+)
+
+NOTIFICATION_FIELDS = ("id", "academy_id", "recipient_type", "recipient_id", "type", "title", "message", "data",
+                       "created_at")
+ANNOUNCEMENT_FIELDS = ("id", "academy_id", "title", "priority", "target_audience", "target_player_id", "is_active",
+                       "created_at", "updated_at")
+ATTENDANCE_FIELDS = ("id", "academy_id", "player_id", "date", "present", "sport", "marked_by_role",
+                     "created_at", "updated_at")
+# What the change feed has to fetch for each collection to publish its events
+FEED_FIELDS = {
+    "notifications": NOTIFICATION_FIELDS,
+    "announcements": ANNOUNCEMENT_FIELDS,
+    "player_attendance": ATTENDANCE_FIELDS,
+}
+
+AUDIENCE_ROLES = {"all": ("coach", "player"), "players": ("player",), "coaches": ("coach",)}
+
+
+def user_topics(user_info: Dict[str, Any]) -> List[str]:
+    """Topics a connection subscribes to, from the auth context"""
+    role, academy_id = user_info["role"], user_info["academy_id"]
+    topics = [f"academy:{academy_id}:{role}"]
+    if role == "coach":
+        topics.append(f"coach:{user_info['coach_id']}")
+    elif role == "player":
+        topics.append(f"player:{user_info['player_id']}")
+    return topics
+
+
+def _pick(doc: Dict[str, Any], fields: Iterable[str]) -> Dict[str, Any]:
+    return {field: doc[field] for field in fields if doc.get(field) is not None}
+
+
+def _key(collection: str, doc: Dict[str, Any]) -> str:
+    """Identifies one write of a document, the same from a route and from the change feed"""
+    version: Optional[datetime] = doc.get("updated_at") or doc.get("created_at")
+    if isinstance(version, datetime):
+        # Mongo keeps milliseconds; match what the change feed reads back
+        version = version.replace(microsecond=version.microsecond // 1000 * 1000).isoformat()
+    return f"{collection}:{doc.get('id')}:{version}"
+
+
+def publish_notification(notification: Dict[str, Any]) -> None:
+    recipient_type, recipient_id = notification.get("recipient_type"), notification.get("recipient_id")
+    if recipient_type == "academy":
+        topics = [f"academy:{recipient_id}:academy_user"]
+    else:
+        topics = [f"{recipient_type}:{recipient_id}"]
+    bus.publish("notification", _pick(notification, NOTIFICATION_FIELDS), topics,
+                key=_key("notifications", notification))
+
+
+def publish_announcement(announcement: Dict[str, Any]) -> None:
+    academy_id = announcement.get("academy_id")
+    audience = announcement.get("target_audience", "all")
+    topics = [f"academy:{academy_id}:academy_user"]
+    if audience == "specific_player":
+        if announcement.get("target_player_id"):
+            topics.append(f"player:{announcement['target_player_id']}")
+    else:
+        topics += [f"academy:{academy_id}:{role}" for role in AUDIENCE_ROLES.get(audience, ())]
+    bus.publish("announcement", _pick(announcement, ANNOUNCEMENT_FIELDS), topics,
+                key=_key("announcements", announcement))
+
+
+def publish_attendance(record: Dict[str, Any]) -> None:
+    """An attendance record was marked; shown live to the academy's admins"""
+    bus.publish("attendance_marked", _pick(record, ATTENDANCE_FIELDS),
+                [f"academy:{record.get('academy_id')}:academy_user"], key=_key("player_attendance", record))
@@ -0,0 +1,8 @@
+"""
+`fields=` whitelists used by more than one router (see utils/fieldsets.py).
+"""
+from app.models import PlayerResponse
+from utils.fieldsets import sparse_fields
+
+# Player lists, academy and coach side (e.g. fields=first_name,last_name for roster pickers)
+player_fieldset = sparse_fields(PlayerResponse.model_fields)
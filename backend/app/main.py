@@ -0,0 +1,148 @@
+"""
+App factory: routers, middleware and the client lifecycle.
+"""
+import importlib
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Optional, Sequence
+
+from fastapi import FastAPI
+from fastapi.staticfiles import StaticFiles
+from starlette.middleware.cors import CORSMiddleware
+
+from app import core
+from app.change_feed import build_change_feed, change_feed_enabled
+from app.notifications import notification_store
+from app.routers import ROUTERS
+from utils.http_cache import ETagMiddleware, add_compression_middleware
+from utils.indexes import ensure_indexes
+from utils.metrics import EventLoopLagMonitor, MetricsMiddleware
+from utils.profiling import ProfilingMiddleware
+from utils.query_monitor import QueryMonitorMiddleware
+from utils.serialization import FastJSONResponse
+from utils.tracing import configure_tracing, instrument_app, shutdown_tracing
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+CORS_ORIGINS = [
+    "https://track-my-academy.vercel.app",
+    "https://dev.trackmyacademy.com",
+    "https://www.trackmyacademy.com",
+    "https://trackmyacademy.com",
+    "https://track-my-academy-backend.onrender.com",
+    "https://login-fix-97.preview.emergentagent.com",
+    "http://localhost:5173",
+    "http://localhost:3000",
+    "http://localhost:3001",
+    "http://127.0.0.1:3000",
+    "http://127.0.0.1:3001",
+    "http://127.0.0.1:8000",
+]
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await core.connect()
+    db = core.get_db()
+    if "blog_api" in app.state.router_modules:
+        from blog_api import setup_blog_dependencies
+        setup_blog_dependencies(db, core.get_supabase(), core.get_supabase_admin())
+    # Indexes backing keyset pagination
+    await ensure_indexes(db)
+    # Notifications written before the unified schema; a no-op once migrated
+    await migrate_notifications()
+    # Background jobs can run inside the API; leases keep them single-run across workers
+    scheduler = None
+    if os.environ.get("RUN_JOB_SCHEDULER", "false").lower() == "true":
+        from fee_reminder_scheduler import build_scheduler
+        scheduler = build_scheduler(db)
+        scheduler.start()
+    # Invalidates this worker's caches on writes made by any worker
+    change_feed = None
+    if change_feed_enabled():
+        change_feed = build_change_feed(db)
+        change_feed.start()
+    # Reported as event_loop_lag_seconds on /metrics
+    loop_lag_monitor = EventLoopLagMonitor()
+    loop_lag_monitor.start()
+    print("Application startup complete.")
+    yield
+    print("Application shutdown initiated.")
+    await loop_lag_monitor.stop()
+    shutdown_tracing()
+    if scheduler is not None:
+        await scheduler.stop()
+    if change_feed is not None:
+        await change_feed.stop()
+    await core.close()
+    print("MongoDB client connection closed.")
+
+
+async def migrate_notifications() -> None:
+    state = core.get_state()
+    # One worker migrates; the others start without waiting for it
+    owner = await state.acquire_lock("notifications:migrate", ttl_seconds=600)
+    if not owner:
+        return
+    try:
+        await notification_store.migrate_legacy()
+    except Exception as e:
+        logger.warning(f"Could not migrate legacy notifications: {e}")
+    finally:
+        await state.release_lock("notifications:migrate", owner)
+
+
+def _load_router(spec: str):
+    module_name, _, attribute = spec.partition(":")
+    return module_name, getattr(importlib.import_module(module_name), attribute)
+
+
+def create_app(routers: Optional[Sequence[str]] = None) -> FastAPI:
+    """
+    Build the API. Router modules are imported here rather than at package
+    import; pass `routers` (entries like those in app.routers.ROUTERS) to
+    build an app with only some of them.
+    """
+    app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
+    app.state.router_modules = set()
+
+    # Request spans (no-op unless tracing is configured, see utils/tracing.py)
+    configure_tracing()
+    instrument_app(app)
+
+    for spec in ROUTERS if routers is None else routers:
+        module_name, router = _load_router(spec)
+        app.include_router(router)
+        app.state.router_modules.add(module_name)
+
+    # Uploaded logos and photos, served under the /api prefix
+    core.UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
+    app.mount("/api/uploads", StaticFiles(directory=str(core.ROOT_DIR / "uploads")), name="uploads")
+
+    # Innermost, so profiles cover the route rather than the middleware around it
+    app.add_middleware(ProfilingMiddleware)
+    # ETags are computed on the uncompressed body, so compression wraps them
+    app.add_middleware(ETagMiddleware)
+    add_compression_middleware(app)
+    # Query counts per request: budget/N+1 warnings and a Server-Timing header
+    app.add_middleware(QueryMonitorMiddleware)
+    # Per-route latency, status codes and in-flight requests for /metrics
+    app.add_middleware(MetricsMiddleware)
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_credentials=True,
+        allow_origins=CORS_ORIGINS,
+        allow_origin_regex=r"https://.*\.vercel\.app$",
+        # SECURITY FIX MEDIUM #3: Restrict to specific methods and headers instead of wildcard
+        allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS", "PATCH"],
+        allow_headers=["Content-Type", "Authorization", "Accept", "Origin", "X-Requested-With", "If-None-Match", "X-Profile-Signature"],
+        expose_headers=["Content-Length", "X-Requested-With", "ETag", "Server-Timing"],
+        max_age=600,
+    )
+    return app
@@ -0,0 +1,803 @@
+"""
+Pydantic request/response models shared by the routers.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel, Field, validator
+
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+
+# Define Models
+class StatusCheck(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    client_name: str
+    timestamp: datetime = Field(default_factory=datetime.utcnow)
+
+class StatusCheckCreate(BaseModel):
+    client_name: str
+
+# Authentication Models
+class SignUpRequest(BaseModel):
+    email: str
+    password: str
+    academy_name: Optional[str] = None
+    owner_name: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    sports_type: Optional[str] = None
+
+class SignInRequest(BaseModel):
+    email: str
+    password: str
+
+class AuthResponse(BaseModel):
+    user: dict
+    session: dict
+    message: str
+
+class UserResponse(BaseModel):
+    user: Optional[dict] = None
+    role: Optional[str] = None    # <-- add this line
+    message: str
+
+class SupabaseHealthResponse(BaseModel):
+    status: str
+    supabase_url: str
+    connection: str
+
+# Academy Models
+class Academy(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str
+    owner_name: str
+    email: str
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    sports_type: Optional[str] = None
+    logo_url: Optional[str] = None
+    player_limit: int = 50  # Default limit for player accounts
+    coach_limit: int = 10   # Default limit for coach accounts
+    status: str = "pending"  # pending, approved, rejected, suspended
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    supabase_user_id: Optional[str] = None
+
+class AcademyCreate(BaseModel):
+    name: str
+    owner_name: str
+    email: str
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    sports_type: Optional[str] = None
+    player_limit: Optional[int] = 50
+    coach_limit: Optional[int] = 10
+
+class AcademyUpdate(BaseModel):
+    name: Optional[str] = None
+    owner_name: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    sports_type: Optional[str] = None
+    player_limit: Optional[int] = None
+    coach_limit: Optional[int] = None
+    status: Optional[str] = None
+
+# Demo Request Models
+class DemoRequest(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    full_name: str
+    email: str
+    phone: Optional[str] = None
+    academy_name: str
+    location: str
+    sports_type: str
+    current_students: Optional[str] = None
+    message: Optional[str] = None
+    status: str = "pending"  # pending, contacted, closed
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class DemoRequestCreate(BaseModel):
+    full_name: str
+    email: str
+    phone: Optional[str] = None
+    academy_name: str
+    location: str
+    sports_type: str
+    current_students: Optional[str] = None
+    message: Optional[str] = None
+
+class DemoRequestUpdate(BaseModel):
+    status: str  # pending, contacted, closed
+
+# Subscription and Billing Models
+class SubscriptionPlan(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    name: str  # e.g., "Basic", "Pro", "Enterprise", "Custom"
+    price_monthly: Optional[float] = None  # USD monthly price
+    price_annual: Optional[float] = None   # USD annual price (with discount)
+    features: List[str] = []               # List of features included
+    player_limit: int = 50                 # Maximum players allowed
+    coach_limit: int = 10                  # Maximum coaches allowed
+    is_custom: bool = False                # True for custom pricing plans
+    is_active: bool = True                 # Plan availability
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class AcademySubscription(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    academy_id: str
+    plan_id: str
+    billing_cycle: str = "monthly"  # monthly, annual
+    amount: float                   # Custom amount for this academy
+    currency: str = "inr"           # Changed to INR for Indian market
+    status: str = "active"          # active, cancelled, suspended, pending, trial
+    current_period_start: datetime
+    current_period_end: datetime
+    auto_renew: bool = True
+    notes: Optional[str] = None     # Admin notes about subscription
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class PaymentTransaction(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    academy_id: str
+    subscription_id: Optional[str] = None
+    amount: float
+    currency: str = "inr"           # Changed to INR
+    payment_method: str             # GPay, Cash, Bank Transfer, UPI, etc.
+    payment_status: str = "pending" # pending, paid, failed, cancelled
+    payment_date: Optional[datetime] = None  # Actual payment date
+    billing_cycle: Optional[str] = None
+    description: Optional[str] = None
+    admin_notes: Optional[str] = None # Admin notes about the payment
+    receipt_url: Optional[str] = None # URL to receipt/proof if uploaded
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class SubscriptionCreateRequest(BaseModel):
+    academy_id: str
+    billing_cycle: str  # monthly, annual
+    custom_amount: Optional[float] = None  # For custom pricing
+
+# Manual Billing Models
+class ManualPaymentCreate(BaseModel):
+    academy_id: str
+    amount: float
+    payment_method: str  # GPay, Cash, Bank Transfer, UPI, etc.
+    payment_date: datetime
+    billing_cycle: Optional[str] = None
+    description: Optional[str] = None
+    admin_notes: Optional[str] = None
+    receipt_url: Optional[str] = None
+
+class ManualPaymentUpdate(BaseModel):
+    amount: Optional[float] = None
+    payment_method: Optional[str] = None
+    payment_date: Optional[datetime] = None
+    payment_status: Optional[str] = None  # pending, paid, failed, cancelled
+    billing_cycle: Optional[str] = None
+    description: Optional[str] = None
+    admin_notes: Optional[str] = None
+    receipt_url: Optional[str] = None
+
+class SubscriptionManualCreate(BaseModel):
+    academy_id: str
+    plan_id: str  # Reference to SUBSCRIPTION_PLANS key
+    billing_cycle: str  # monthly, annual
+    custom_amount: Optional[float] = None  # Override plan price if needed
+    current_period_start: datetime
+    current_period_end: datetime
+    status: str = "active"  # active, cancelled, suspended, pending, trial
+    auto_renew: bool = True
+    notes: Optional[str] = None
+
+class SubscriptionManualUpdate(BaseModel):
+    plan_id: Optional[str] = None
+    billing_cycle: Optional[str] = None
+    amount: Optional[float] = None
+    status: Optional[str] = None
+    current_period_start: Optional[datetime] = None
+    current_period_end: Optional[datetime] = None
+    auto_renew: Optional[bool] = None
+    notes: Optional[str] = None
+
+class PaymentSessionRequest(BaseModel):
+    academy_id: str
+    billing_cycle: str  # monthly, annual
+    origin_url: str     # Frontend origin for success/cancel URLs
+
+# Enhanced Player and Coach Management Models
+class Player(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    academy_id: str  # Links player to academy
+    coach_id: Optional[str] = None  # Links player to assigned coach
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    date_of_birth: Optional[str] = None  # Store as string for simplicity
+    age: Optional[int] = None  # Auto-calculated from date_of_birth
+    gender: Optional[str] = None     
+    sport: Optional[str] = None  
+    position: Optional[str] = None  # Position based on sport (not needed for individual sports)
+    registration_number: str = None  
+    height: Optional[str] = None  # e.g., "5'10"
+    weight: Optional[str] = None  # e.g., "70 kg"
+    photo_url: Optional[str] = None  # Player photo URL
+    training_days: List[str] = []  # Days when player trains
+    training_batch: Optional[str] = None  # Morning, Evening, Both
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    medical_notes: Optional[str] = None
+    status: str = "active"  # active, inactive, suspended
+    # Player Authentication Fields
+    has_login: bool = False  # Whether player has login credential
+    default_password: Optional[str] = None  # Auto-generated default password
+    password_changed: bool = False  # Whether player has changed default password
+    supabase_user_id: Optional[str] = None  # Links to Supabase auth user
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class PlayerCreate(BaseModel):
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    age: Optional[int] = None  # Will be auto-calculated if date_of_birth provided
+    gender: str  # Required: Male, Female, Other
+    sport: str  # Required: Sport type
+    position: Optional[str] = None  # Optional for individual sports
+    registration_number: str = None 
+    height: Optional[str] = None
+    weight: Optional[str] = None
+    photo_url: Optional[str] = None
+    training_days: List[str] = []
+    training_batch: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    medical_notes: Optional[str] = None
+    coach_id: Optional[str] = None  # Assign player to coach
+
+class PlayerUpdate(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    age: Optional[int] = None  # Will be auto-calculated if date_of_birth provided
+    gender: Optional[str] = None
+    sport: Optional[str] = None
+    position: Optional[str] = None
+    registration_number: Optional[str] = None  
+    height: Optional[str] = None
+    weight: Optional[str] = None
+    photo_url: Optional[str] = None
+    training_days: Optional[List[str]] = None
+    training_batch: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    medical_notes: Optional[str] = None
+    status: Optional[str] = None
+    coach_id: Optional[str] = None  # Assign/reassign player to coach
+
+class BulkPlayerUpdate(BaseModel):
+    player_ids: List[str]
+    coach_id: Optional[str] = None  # None for unassigning
+
+class PlayerResponse(BaseModel):
+    """
+    Response model for Player with authentication fields for Academy dashboard
+    Includes password fields (only visible until player changes password)
+    """
+    id: str
+    academy_id: str
+    coach_id: Optional[str] = None
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    date_of_birth: Optional[str] = None
+    age: Optional[int] = None
+    gender: Optional[str] = None
+    sport: Optional[str] = None
+    position: Optional[str] = None
+    registration_number: Optional[str] = None
+    height: Optional[str] = None
+    weight: Optional[str] = None
+    photo_url: Optional[str] = None
+    training_days: List[str] = []
+    training_batch: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    medical_notes: Optional[str] = None
+    status: str = "active"
+    # Authentication fields (for academy dashboard)
+    has_login: bool = False
+    default_password: Optional[str] = None
+    password_changed: bool = False
+    # Excluded: supabase_user_id (always keep this private)
+    created_at: datetime
+    updated_at: datetime
+
+class Coach(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    academy_id: str  # Links coach to academy
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    sports: List[str] = []  # List of sports the coach handles
+    specialization: Optional[str] = None  # Fitness, Technical, Goalkeeping, etc.
+    experience_years: Optional[int] = None
+    qualifications: Optional[str] = None  # Certifications, degrees, etc.
+    salary: Optional[float] = None
+    hire_date: Optional[str] = None
+    contract_end_date: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    bio: Optional[str] = None
+    profile_picture_url: Optional[str] = None
+    description: Optional[str] = None
+    status: str = "active"  # active, inactive, suspended
+    # Coach Authentication Fields
+    has_login: bool = False
+    default_password: Optional[str] = None
+    password_changed: bool = False
+    supabase_user_id: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class CoachCreate(BaseModel):
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    sports: List[str] = []  # Sports the coach handles
+    specialization: Optional[str] = None
+    experience_years: Optional[int] = None
+    qualifications: Optional[str] = None
+    salary: Optional[float] = None
+    hire_date: Optional[str] = None
+    contract_end_date: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    bio: Optional[str] = None
+
+class CoachUpdate(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    sports: Optional[List[str]] = None
+    specialization: Optional[str] = None
+    experience_years: Optional[int] = None
+    qualifications: Optional[str] = None
+    salary: Optional[float] = None
+    hire_date: Optional[str] = None
+    contract_end_date: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    bio: Optional[str] = None
+    status: Optional[str] = None
+
+class CoachResponse(BaseModel):
+    """
+    Response model for Coach with authentication fields for Academy dashboard
+    Includes password fields (only visible until coach changes password)
+    """
+    id: str
+    academy_id: str
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    sports: List[str] = []
+    specialization: Optional[str] = None
+    experience_years: Optional[int] = None
+    qualifications: Optional[str] = None
+    salary: Optional[float] = None
+    hire_date: Optional[str] = None
+    contract_end_date: Optional[str] = None
+    emergency_contact_name: Optional[str] = None
+    emergency_contact_phone: Optional[str] = None
+    bio: Optional[str] = None
+    profile_picture_url: Optional[str] = None
+    description: Optional[str] = None
+    status: str = "active"
+    # Authentication fields (for academy dashboard)
+    has_login: bool = False
+    temporary_password: Optional[str] = None  # Alias for default_password
+    has_reset_password: bool = False  # Alias for password_changed
+    # Excluded: supabase_user_id (always keep this private)
+    created_at: datetime
+    updated_at: datetime
+
+# Notification Model (stored shape, written by utils/notifications.py)
+class Notification(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    academy_id: str
+    recipient_type: str  # coach, player, academy
+    recipient_id: str
+    type: str = "general"
+    title: Optional[str] = None
+    message: str
+    data: Dict[str, Any] = Field(default_factory=dict)
+    is_read: bool = False
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: Optional[datetime] = None
+
+# Enhanced Attendance and Performance Tracking Models
+class PlayerAttendance(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    player_id: str
+    academy_id: str
+    date: str  # YYYY-MM-DD format
+    present: bool
+    # sport: str  # Sport type for performance categories
+    # Sport-specific performance ratings (1-10 scale for each category)
+    performance_ratings: Dict[str, Optional[int]] = {}  # e.g., {"Technical Skills": 8, "Physical Fitness": 7, ...}
+    notes: Optional[str] = None
+    marked_by: str  # User ID who marked attendance
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+class PlayerAttendanceCreate(BaseModel):
+    player_id: str
+    date: str
+    present: bool
+    sport: str  # Required for performance categories
+    performance_ratings: Dict[str, Optional[int]] = {}  # Sport-specific ratings
+    notes: Optional[str] = None
+
+class PlayerAttendanceUpdate(BaseModel):
+    present: Optional[bool] = None
+    performance_ratings: Optional[Dict[str, Optional[int]]] = None
+    notes: Optional[str] = None
+
+# Simplified PlayerPerformanceAnalytics Model
+class PlayerPerformanceAnalytics(BaseModel):
+    player_id: str
+    player_name: str
+    sport: str
+    total_sessions: int
+    attended_sessions: int
+    attendance_percentage: float
+    average_rating: Optional[float] = None
+    performance_trend: List[Dict[str, Any]] = []
+    monthly_stats: Dict[str, Dict[str, Any]] = {}
+
+class AttendanceMarkingRequest(BaseModel):
+    date: str
+    attendance_records: List[PlayerAttendanceCreate]
+
+# New Performance Metrics Model
+class PerformanceMetricsCreate(BaseModel):
+    player_id: str
+    date: str
+    speed: int = Field(..., ge=1, le=10)
+    agility: int = Field(..., ge=1, le=10)
+    movement: int = Field(..., ge=1, le=10)
+    pace: int = Field(..., ge=1, le=10)
+    stamina: int = Field(..., ge=1, le=10)
+    overall_rating: int = Field(..., ge=1, le=10)
+    notes: Optional[str] = None
+
+# Player -> Coach rating submission model
+class CoachRatingCreate(BaseModel):
+    rating: int = Field(..., ge=1, le=10)
+    notes: Optional[str] = None
+
+# Sport Positions API Response Model (Legacy - for backward compatibility)
+class SportPositionsResponse(BaseModel):
+    sports: Dict[str, List[str]]
+    training_days: List[str]
+    training_batches: List[str]
+
+# Enhanced Sport Configuration API Response Model
+class SportConfigResponse(BaseModel):
+    sports: Dict[str, List[str]]  # sport -> positions
+    performance_categories: Dict[str, List[str]]  # sport -> categories
+    individual_sports: List[str]
+    team_sports: List[str]
+    training_days: List[str]
+    training_batches: List[str]
+
+# Theme Preference Models
+class ThemePreference(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    theme: str = "light"  # light, dark
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+# Announcement Models
+class Announcement(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    academy_id: str
+    title: str
+    content: str
+    priority: str = "medium"  # low, medium, high, urgent
+    target_audience: str = "all"  # all, players, coaches, specific_player
+    target_player_id: Optional[str] = None  # For player-specific announcements
+    is_active: bool = True
+    created_by: str  # User ID who created the announcement
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class AnnouncementCreate(BaseModel):
+    title: str
+    content: str
+    priority: str = "medium"
+    target_audience: str = "all"
+    target_player_id: Optional[str] = None
+
+class AnnouncementUpdate(BaseModel):
+    title: Optional[str] = None
+    content: Optional[str] = None
+    priority: Optional[str] = None
+    target_audience: Optional[str] = None
+    target_player_id: Optional[str] = None
+    is_active: Optional[bool] = None
+
+# Player Authentication Models
+class PlayerSignInRequest(BaseModel):
+    email: str
+    password: str
+
+class PlayerAuthResponse(BaseModel):
+    player: dict
+    session: dict
+    message: str
+
+class PlayerPasswordChangeRequest(BaseModel):
+    current_password: str
+    new_password: str
+
+class CoachPasswordChangeRequest(BaseModel):
+    new_password: str
+
+# Student Fee Models
+class StudentFeeCreate(BaseModel):
+    amount: float
+    frequency: str
+    due_date: str
+    status: Optional[str] = "due"
+    notes: Optional[str] = None
+
+# Training Plan Models
+class TrainingPlanDrill(BaseModel):
+    name: str
+    description: Optional[str] = None
+    duration: str
+    focus_area: Optional[str] = None
+
+class TrainingPlanGoal(BaseModel):
+    description: str
+    target_date: Optional[str] = None
+
+class TrainingPlanCreate(BaseModel):
+    title: str
+    description: Optional[str] = None
+    sport: str
+    batch_id: Optional[str] = None
+    start_date: str
+    end_date: str
+    schedule: Optional[Dict[str, Any]] = {}
+    drills: List[TrainingPlanDrill] = []
+    goals: List[TrainingPlanGoal] = []
+
+# System Overview Models
+class SystemStats(BaseModel):
+    total_academies: int
+    active_academies: int
+    pending_academies: int
+    total_demo_requests: int
+    pending_demo_requests: int
+    recent_activity_count: int
+
+class RecentActivity(BaseModel):
+    id: str
+    type: str  # academy_created, demo_request, academy_approved, etc.
+    description: str
+    timestamp: datetime
+    status: str  # success, pending, info
+
+class RecentAcademy(BaseModel):
+    id: str
+    name: str
+    owner_name: str
+    location: str
+    sports_type: str
+    status: str
+    created_at: datetime
+
+class SystemOverview(BaseModel):
+    stats: SystemStats
+    recent_activities: List[RecentActivity]
+    recent_academies: List[RecentAcademy]
+    server_status: str
+
+# ========== ACADEMY SETTINGS MODELS ==========
+
+class AcademySettings(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    academy_id: str
+    
+    # Branding Settings (Academy can edit)
+    logo_url: Optional[str] = None
+    description: Optional[str] = None
+    website: Optional[str] = None
+    social_media: Optional[Dict[str, str]] = None  # {"facebook": "url", "twitter": "url", etc.}
+    theme_color: Optional[str] = "#0ea5e9"  # Default sky-500
+    
+    # Operational Settings (Academy can edit)
+    season_start_date: Optional[str] = None
+    season_end_date: Optional[str] = None
+    training_days: Optional[List[str]] = None  # ["Monday", "Wednesday", "Friday"]
+    training_time: Optional[str] = None  # "6:00 PM - 8:00 PM"
+    facility_address: Optional[str] = None
+    facility_amenities: Optional[List[str]] = None  # ["Gym", "Pool", "Field"]
+    
+    # Notification Settings (Academy can edit)
+    email_notifications: Optional[bool] = True
+    sms_notifications: Optional[bool] = False
+    parent_notifications: Optional[bool] = True
+    coach_notifications: Optional[bool] = True
+    
+    # Privacy Settings (Academy can edit)
+    public_profile: Optional[bool] = False
+    show_player_stats: Optional[bool] = True
+    show_coach_info: Optional[bool] = True
+    data_sharing_consent: Optional[bool] = False
+    
+    # System Settings (Read-only for academy, set by admin)
+    max_file_upload_size: Optional[int] = 5  # MB
+    allowed_file_types: Optional[List[str]] = ["jpg", "jpeg", "png", "pdf"]
+    auto_backup: Optional[bool] = True
+    maintenance_mode: Optional[bool] = False
+    api_access: Optional[bool] = True
+    fee_reminder_type: Optional[str] = "manual"  # "manual" or "automatic"
+
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+
+class AcademySettingsCreate(BaseModel):
+    # Branding Settings
+    description: Optional[str] = None
+    website: Optional[str] = None
+    social_media: Optional[Dict[str, str]] = None
+    theme_color: Optional[str] = "#0ea5e9"
+    
+    # Operational Settings
+    season_start_date: Optional[str] = None
+    season_end_date: Optional[str] = None
+    training_days: Optional[List[str]] = None
+    training_time: Optional[str] = None
+    facility_address: Optional[str] = None
+    facility_amenities: Optional[List[str]] = None
+    
+    # Notification Settings
+    email_notifications: Optional[bool] = True
+    sms_notifications: Optional[bool] = False
+    parent_notifications: Optional[bool] = True
+    coach_notifications: Optional[bool] = True
+    
+    # Privacy Settings
+    public_profile: Optional[bool] = False
+    show_player_stats: Optional[bool] = True
+    show_coach_info: Optional[bool] = True
+    data_sharing_consent: Optional[bool] = False
+
+class AcademySettingsUpdate(BaseModel):
+    # Branding Settings
+    logo_url: Optional[str] = None
+    description: Optional[str] = None
+    website: Optional[str] = None
+    social_media: Optional[Dict[str, str]] = None
+    
+    # Operational Settings
+    season_start_date: Optional[str] = None
+    season_end_date: Optional[str] = None
+    training_days: Optional[List[str]] = None
+    training_time: Optional[str] = None
+    facility_address: Optional[str] = None
+    facility_amenities: Optional[List[str]] = None
+    
+    # Notification Settings
+    email_notifications: Optional[bool] = None
+    sms_notifications: Optional[bool] = None
+    parent_notifications: Optional[bool] = None
+    coach_notifications: Optional[bool] = None
+    
+    # Privacy Settings
+    public_profile: Optional[bool] = None
+    show_player_stats: Optional[bool] = None
+    show_coach_info: Optional[bool] = None
+    data_sharing_consent: Optional[bool] = None
+
+    # System Settings
+    auto_backup: Optional[bool] = None
+    maintenance_mode: Optional[bool] = None
+    api_access: Optional[bool] = None
+    fee_reminder_type: Optional[str] = None  # "manual" or "automatic"
+
+# ========== ACADEMY ANALYTICS MODELS ==========
+
+class PlayerAnalytics(BaseModel):
+    total_players: int
+    active_players: int
+    inactive_players: int
+    age_distribution: Dict[str, int]  # {"under_18": 15, "18_25": 20, "over_25": 5}
+    position_distribution: Dict[str, int]  # {"forward": 10, "midfielder": 8, etc.}
+    status_distribution: Dict[str, int]  # {"active": 35, "inactive": 5}
+    recent_additions: int  # players added in last 30 days
+
+class CoachAnalytics(BaseModel):
+    total_coaches: int
+    active_coaches: int
+    inactive_coaches: int
+    specialization_distribution: Dict[str, int]  # {"fitness": 2, "technical": 3}
+    experience_distribution: Dict[str, int]  # {"0_2_years": 1, "3_5_years": 2}
+    average_experience: float
+    recent_additions: int  # coaches added in last 30 days
+
+class GrowthMetrics(BaseModel):
+    monthly_player_growth: List[Dict[str, Any]]  # [{"month": "Jan", "count": 5}]
+    monthly_coach_growth: List[Dict[str, Any]]
+    yearly_summary: Dict[str, int]  # {"players_added": 25, "coaches_added": 3}
+
+class OperationalMetrics(BaseModel):
+    capacity_utilization: Dict[str, float]  # {"players": 70.0, "coaches": 80.0}
+    academy_age: int  # days since academy creation
+    settings_completion: float  # percentage of settings filled out
+    recent_activity: Dict[str, int]  # {"players_updated": 5, "coaches_updated": 2}
+
+class AcademyAnalytics(BaseModel):
+    academy_id: str
+    academy_name: str
+    generated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    # Core Analytics
+    player_analytics: PlayerAnalytics
+    coach_analytics: CoachAnalytics
+    growth_metrics: GrowthMetrics
+    operational_metrics: OperationalMetrics
+    
+    # Quick Stats
+    total_members: int  # players + coaches
+    monthly_growth_rate: float
+    capacity_usage: float
+
+# Send Manual Fee Reminder Email
+class ManualEmailRequest(BaseModel):
+    player_id: str
+    subject: str
+    content: str
+
+    # Input validation
+    @validator('subject')
+    def validate_subject(cls, v):
+        if not v or not v.strip():
+            raise ValueError('Subject is required')
+        if len(v) > 200:
+            raise ValueError('Subject must be less than 200 characters')
+        return v.strip()
+
+    @validator('content')
+    def validate_content(cls, v):
+        if not v or not v.strip():
+            raise ValueError('Email content is required')
+        if len(v) > 10000:
+            raise ValueError('Content must be less than 10000 characters')
+        return v.strip()
+
+# ========== PROFILING ENDPOINTS ==========
+
+class ProfileSignatureRequest(BaseModel):
+    path: str
+    method: str = "GET"
+    ttl_seconds: int = Field(600, ge=60, le=86400)
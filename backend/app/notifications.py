@@ -0,0 +1,15 @@
+"""
+The API's notification store (see utils/notifications.py). Routes create
+notifications through it so every one gets the same shape, counts as
+unread for its recipient and is pushed to live event streams.
+"""
+from app.core import db
+from app.events import publish_notification
+from app.models import Notification
+from utils.fieldsets import sparse_fields
+from utils.notifications import NotificationStore
+
+notification_store = NotificationStore(db, publish=publish_notification)
+
+# `fields=` whitelist for notification lists (coach and player)
+notification_fieldset = sparse_fields(Notification.model_fields)
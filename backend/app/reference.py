@@ -0,0 +1,46 @@
+"""
+Cached reference documents: academies, academy settings, fee structures
+and coaches (see utils/ref_cache.py).
+
+Read with the helpers below instead of find_one on hot paths, and call the
+matching cache's `invalidate` after any write to these collections.
+Documents are shared between requests; copy before changing them.
+"""
+import os
+from typing import Any, Dict, Optional
+
+from app.core import db, get_state
+from utils.ref_cache import ReferenceCache
+
+TTL_SECONDS = float(os.environ.get("REFERENCE_CACHE_TTL_SECONDS", "300"))
+
+Document = Dict[str, Any]
+
+academies: ReferenceCache[Document] = ReferenceCache(
+    "academy", lambda academy_id: db.academies.find_one({"id": academy_id}), TTL_SECONDS, state=get_state
+)
+academy_settings: ReferenceCache[Document] = ReferenceCache(
+    "academy_settings", lambda academy_id: db.academy_settings.find_one({"academy_id": academy_id}),
+    TTL_SECONDS, state=get_state
+)
+fee_structures: ReferenceCache[Document] = ReferenceCache(
+    "academy_fee_structure", lambda academy_id: db.academy_fee_structure.find_one({"academy_id": academy_id}),
+    TTL_SECONDS, state=get_state
+)
+coaches: ReferenceCache[Document] = ReferenceCache(
+    "coach", lambda coach_id: db.coaches.find_one({"id": coach_id}), TTL_SECONDS, state=get_state
+)
+
+CACHES = (academies, academy_settings, fee_structures, coaches)
+
+
+async def get_academy(academy_id: Optional[str]) -> Optional[Document]:
+    return await academies.get(academy_id) if academy_id else None
+
+
+async def get_coach(coach_id: Optional[str], academy_id: Optional[str] = None) -> Optional[Document]:
+    """Coach by id, or None if unknown (or not in academy_id, when given)"""
+    coach = await coaches.get(coach_id) if coach_id else None
+    if coach is None or (academy_id is not None and coach.get("academy_id") != academy_id):
+        return None
+    return coach
@@ -0,0 +1,24 @@
+"""
+Domain routers, in registration order.
+
+Each entry is "module:attribute"; create_app imports them when it builds
+the app, so a process can serve a subset (create_app(routers=[...])).
+Order matters where paths overlap: earlier routers match first.
+"""
+ROUTERS = (
+    "app.routers.system:router",
+    "app.routers.admin:router",
+    "app.routers.auth:router",
+    "app.routers.billing:router",
+    "app.routers.players:router",
+    "app.routers.attendance:router",
+    "app.routers.coaches:router",
+    "app.routers.academy:router",
+    "app.routers.analytics:router",
+    "app.routers.player_portal:router",
+    "app.routers.training:router",
+    "app.routers.fees:router",
+    "app.routers.events:router",
+    "app.routers.ops:router",
+    "blog_api:blog_router",
+)
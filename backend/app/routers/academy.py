@@ -0,0 +1,299 @@
+"""
+Academy stats, settings, logo and announcements.
+"""
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+
+import aiofiles
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+
+from app.core import UPLOAD_DIR, db
+from app.dependencies import require_academy_user, validate_image_file
+from app.events import publish_announcement
+from app.models import AcademySettings, AcademySettingsUpdate, Announcement, AnnouncementCreate, AnnouncementUpdate
+from app.reference import academies, academy_settings
+from utils.pagination import PageParams, fetch_page
+from utils.raw_bson import raw_fastpath_enabled, raw_find_page, raw_json_response
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# ========== ACADEMY STATS ENDPOINT ==========
+
+# Get academy stats (Academy User)
+@router.get("/academy/stats")
+async def get_academy_stats(user_info = Depends(require_academy_user)):
+    """Get academy statistics"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Count players and coaches
+        total_players = await db.players.count_documents({"academy_id": academy_id})
+        active_players = await db.players.count_documents({"academy_id": academy_id, "status": "active"})
+        total_coaches = await db.coaches.count_documents({"academy_id": academy_id})
+        active_coaches = await db.coaches.count_documents({"academy_id": academy_id, "status": "active"})
+        
+        return {
+            "total_players": total_players,
+            "active_players": active_players,
+            "total_coaches": total_coaches,
+            "active_coaches": active_coaches,
+            "player_limit": user_info["academy"].get("player_limit", 50),
+            "coach_limit": user_info["academy"].get("coach_limit", 10)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching academy stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch academy stats")
+
+# ========== ACADEMY SETTINGS ENDPOINTS ==========
+
+# Get academy settings (Academy User)
+@router.get("/academy/settings", response_model=AcademySettings)
+async def get_academy_settings(user_info = Depends(require_academy_user)):
+    """Get academy settings for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Check if settings exist
+        settings = await academy_settings.get(academy_id)
+        
+        if not settings:
+            # Create default settings if none exist
+            default_settings = AcademySettings(academy_id=academy_id)
+            settings_dict = default_settings.dict()
+            await db.academy_settings.insert_one(settings_dict)
+            await academy_settings.invalidate(academy_id)
+            return default_settings
+        
+        return AcademySettings(**settings)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching academy settings: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch academy settings")
+
+# Update academy settings (Academy User)
+@router.put("/academy/settings", response_model=AcademySettings)
+async def update_academy_settings(
+    settings_data: AcademySettingsUpdate, 
+    user_info = Depends(require_academy_user)
+):
+    """Update academy settings for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Prepare update data
+        update_data = {k: v for k, v in settings_data.dict().items() if v is not None}
+        update_data.pop("theme_color", None)
+        update_data["updated_at"] = datetime.utcnow()
+        
+        # Update settings using upsert
+        result = await db.academy_settings.update_one(
+            {"academy_id": academy_id},
+            {"$set": update_data},
+            upsert=True
+        )
+
+        # SYNC: If logo_url or branding.logo_url is being updated, sync it to the main academies collection
+        if "logo_url" in update_data or "branding" in update_data:
+            logo_url = None
+            if "branding" in update_data and update_data["branding"].get("logo_url"):
+                logo_url = update_data["branding"]["logo_url"]
+            elif "logo_url" in update_data:
+                logo_url = update_data["logo_url"]
+
+            if logo_url:
+                await db.academies.update_one(
+                    {"id": academy_id},
+                    {"$set": {"logo_url": logo_url, "updated_at": datetime.utcnow()}}
+                )
+                await academies.invalidate(academy_id)
+        await academy_settings.invalidate(academy_id)
+
+        # Get updated settings
+        updated_settings = await db.academy_settings.find_one({"academy_id": academy_id})
+        return AcademySettings(**updated_settings)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating academy settings: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update academy settings")
+
+# Upload academy logo (Academy User)
+@router.post("/academy/logo")
+async def upload_academy_logo(
+    file: UploadFile = File(...),
+    user_info = Depends(require_academy_user)
+):
+    """Upload academy logo"""
+    try:
+        academy_id = user_info["academy_id"]
+
+        # Read file content for validation
+        content = await file.read()
+
+        # SECURITY FIX #2: Validate actual file content using magic numbers
+        if not await validate_image_file(content, file.filename):
+            raise HTTPException(status_code=400, detail="Invalid image file")
+
+        # SECURITY FIX #4: Use pathlib for safe file extension extraction
+        file_extension = Path(file.filename).suffix.lower().lstrip('.')
+
+        # Whitelist allowed extensions
+        allowed_extensions = {'jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'}
+        if file_extension not in allowed_extensions:
+            raise HTTPException(status_code=400, detail="File type not allowed")
+
+        # Generate unique filename
+        filename = f"{academy_id}_{uuid.uuid4()}.{file_extension}"
+        file_path = UPLOAD_DIR / filename
+
+        # Save file
+        async with aiofiles.open(file_path, 'wb') as f:
+            await f.write(content)
+        
+        # Generate URL
+        logo_url = f"/api/uploads/logos/{filename}"
+        
+        # Update academy settings with new logo URL
+        await db.academy_settings.update_one(
+            {"academy_id": academy_id},
+            {
+                "$set": {
+                    "logo_url": logo_url,
+                    "updated_at": datetime.utcnow()
+                }
+            },
+            upsert=True
+        )
+        await academy_settings.invalidate(academy_id)
+        
+        return {"logo_url": logo_url, "message": "Logo uploaded successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading academy logo: {e}")
+        raise HTTPException(status_code=500, detail="Failed to upload logo")
+
+# ========== ANNOUNCEMENT MANAGEMENT ENDPOINTS ==========
+
+# Get Academy Announcements (Academy User)
+@router.get("/academy/announcements")
+async def get_academy_announcements(page: PageParams = Depends(), user_info = Depends(require_academy_user)):
+    """Get all announcements for the academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        limit = page.page_limit(100)
+        # Raw fast path skips decoding each announcement into a dict
+        find_page = raw_find_page if raw_fastpath_enabled() else fetch_page
+        announcements, next_cursor = await find_page(
+            db.announcements, {"academy_id": academy_id}, projection={"_id": 0},
+            sort_field="created_at", direction=-1, limit=limit, position=page.position
+        )
+        
+        content = {"announcements": announcements, "limit": limit, "next_cursor": next_cursor}
+        return raw_json_response(content) if raw_fastpath_enabled() else content
+        
+    except Exception as e:
+        logger.error(f"Error fetching academy announcements: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch announcements")
+
+# Create Academy Announcement (Academy User)
+@router.post("/academy/announcements", response_model=Announcement)
+async def create_academy_announcement(announcement_data: AnnouncementCreate, user_info = Depends(require_academy_user)):
+    """Create a new announcement for the academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        user_id = user_info["user"].id
+        
+        announcement = Announcement(
+            academy_id=academy_id,
+            created_by=user_id,
+            **announcement_data.dict()
+        )
+        
+        await db.announcements.insert_one(announcement.dict())
+        publish_announcement(announcement.dict())
+        
+        return announcement
+        
+    except Exception as e:
+        logger.error(f"Error creating announcement: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create announcement")
+
+# Update Academy Announcement (Academy User)
+@router.put("/academy/announcements/{announcement_id}", response_model=Announcement)
+async def update_academy_announcement(announcement_id: str, announcement_data: AnnouncementUpdate, user_info = Depends(require_academy_user)):
+    """Update an academy announcement"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Check if announcement exists
+        existing_announcement = await db.announcements.find_one({
+            "id": announcement_id,
+            "academy_id": academy_id
+        })
+        if not existing_announcement:
+            raise HTTPException(status_code=404, detail="Announcement not found")
+        
+        # Update announcement
+        update_data = announcement_data.dict(exclude_unset=True)
+        if update_data:
+            update_data["updated_at"] = datetime.utcnow()
+            await db.announcements.update_one(
+                {"id": announcement_id, "academy_id": academy_id},
+                {"$set": update_data}
+            )
+        
+        # Get updated announcement
+        updated_announcement = await db.announcements.find_one({
+            "id": announcement_id,
+            "academy_id": academy_id
+        })
+        if update_data:
+            publish_announcement(updated_announcement)
+        return Announcement(**updated_announcement)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating announcement: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update announcement")
+
+# Delete Academy Announcement (Academy User)
+@router.delete("/academy/announcements/{announcement_id}")
+async def delete_academy_announcement(announcement_id: str, user_info = Depends(require_academy_user)):
+    """Delete an academy announcement"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Check if announcement exists
+        existing_announcement = await db.announcements.find_one({
+            "id": announcement_id,
+            "academy_id": academy_id
+        })
+        if not existing_announcement:
+            raise HTTPException(status_code=404, detail="Announcement not found")
+        
+        # Delete announcement
+        await db.announcements.delete_one({
+            "id": announcement_id,
+            "academy_id": academy_id
+        })
+        
+        return {"message": "Announcement deleted successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting announcement: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete announcement")
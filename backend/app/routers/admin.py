@@ -0,0 +1,385 @@
+"""
+Super-admin endpoints: academies, system overview and demo requests.
+"""
+import logging
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Union
+
+import aiofiles
+from fastapi import APIRouter, Depends, File, Form, HTTPException, Request, UploadFile
+
+from app.core import UPLOAD_DIR, db, supabase_admin
+from app.dependencies import (check_rate_limit, rate_limit, require_super_admin, validate_image_file,
+                              validate_password_strength)
+from app.models import (Academy, AcademyUpdate, AuthResponse, DemoRequest, DemoRequestCreate, DemoRequestUpdate,
+                        RecentAcademy, RecentActivity, SystemOverview, SystemStats)
+from app.reference import academies as academy_cache
+from utils.metrics import observe_outbound
+from utils.pagination import Page, PageParams, fetch_page
+from utils.rate_limit import RateLimit
+from utils.serialization import FastJSONResponse, rows_from_db
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# Authentication Endpoints
+
+# DISABLED: Public signup endpoint - SaaS model requires admin-controlled user creation
+# @router.post("/auth/signup", response_model=AuthResponse)
+# async def signup(request: SignUpRequest):
+#     # This endpoint is disabled for SaaS model
+#     # Only admin can create academy accounts through admin dashboard
+#     raise HTTPException(status_code=403, detail="Public signup disabled. Contact administrator for academy registration.")
+
+# Admin-Only Academy Creation Endpoint (Enhanced with new fields)
+@router.post("/admin/create-academy", response_model=AuthResponse)
+async def admin_create_academy(
+    email: str = Form(...),
+    password: str = Form(...),
+    name: str = Form(...),
+    owner_name: str = Form(...),
+    phone: Optional[str] = Form(None),
+    location: Optional[str] = Form(None),
+    sports_type: Optional[str] = Form(None),
+    player_limit: int = Form(50),
+    coach_limit: int = Form(10),
+    logo: Optional[UploadFile] = File(None),
+    admin_user = Depends(require_super_admin)
+):
+    """Admin-only endpoint to create new academy accounts with Supabase authentication"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # SECURITY FIX #5: Validate password strength
+        is_valid, error_msg = validate_password_strength(password)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail=error_msg)
+
+        # Handle logo upload if provided
+        logo_url = None
+        if logo:
+            # Read file content for validation
+            content = await logo.read()
+
+            # SECURITY FIX #2: Validate actual file content using magic numbers
+            if not await validate_image_file(content, logo.filename):
+                raise HTTPException(status_code=400, detail="Invalid image file")
+
+            # SECURITY FIX #4: Use pathlib for safe file extension extraction
+            file_extension = Path(logo.filename).suffix.lower().lstrip('.') if logo.filename else "png"
+
+            # Whitelist allowed extensions
+            allowed_extensions = {'jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'}
+            if file_extension not in allowed_extensions:
+                raise HTTPException(status_code=400, detail="File type not allowed")
+
+            # Generate unique filename
+            unique_filename = f"{str(uuid.uuid4())}.{file_extension}"
+            file_path = UPLOAD_DIR / unique_filename
+
+            # Save file
+            async with aiofiles.open(file_path, 'wb') as f:
+                await f.write(content)
+
+            logo_url = f"/api/uploads/logos/{unique_filename}"
+        
+        # Prepare user metadata
+        user_metadata = {
+            'academy_name': name,
+            'owner_name': owner_name,
+            'phone': phone,
+            'location': location,
+            'sports_type': sports_type,
+            'player_limit': player_limit,
+            'coach_limit': coach_limit
+        }
+        
+        # Create academy account using admin privileges
+        with observe_outbound("supabase", "admin.create_user"):
+            response = supabase_admin.auth.admin.create_user({
+                "email": email,
+                "password": password,
+                "email_confirm": True,  # Skip email confirmation for admin-created accounts
+                "user_metadata": user_metadata
+            })
+        
+        if response.user:
+            # Store academy data in MongoDB
+            academy_data = Academy(
+                name=name,
+                owner_name=owner_name,
+                email=email,
+                phone=phone,
+                location=location,
+                sports_type=sports_type,
+                logo_url=logo_url,
+                player_limit=player_limit,
+                coach_limit=coach_limit,
+                status="approved",  # Admin-created academies are auto-approved
+                supabase_user_id=response.user.id
+            )
+            
+            await db.academies.insert_one(academy_data.dict())
+            await academy_cache.invalidate(academy_data.id)
+            
+            return AuthResponse(
+                user=response.user.model_dump() if hasattr(response.user, 'model_dump') else dict(response.user),
+                session={},  # No session for admin-created users
+                message="Academy account created successfully by admin"
+            )
+        else:
+            raise HTTPException(status_code=400, detail="Failed to create academy account")
+            
+    except Exception as e:
+        logger.error(f"Admin academy creation error: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+# Academy Management Endpoints
+@router.get("/admin/academies", response_model=Union[List[Academy], Page[Academy]])
+async def get_academies(page: PageParams = Depends(), admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to list all academies"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+        academies, next_cursor = await fetch_page(
+            db.academies, {}, sort_field="created_at", direction=1,
+            limit=page.page_limit(1000), position=page.position
+        )
+        return FastJSONResponse(page.respond(rows_from_db(academies, Academy), next_cursor))
+    except Exception as e:
+        logger.error(f"Error fetching academies: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch academies")
+
+@router.put("/admin/academies/{academy_id}", response_model=Academy)
+async def update_academy(academy_id: str, academy_update: AcademyUpdate, admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to update academy information"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Find the academy
+        academy = await db.academies.find_one({"id": academy_id})
+        if not academy:
+            raise HTTPException(status_code=404, detail="Academy not found")
+        
+        # Update fields
+        update_data = academy_update.dict(exclude_unset=True)
+        if update_data:
+            update_data["updated_at"] = datetime.utcnow()
+            await db.academies.update_one(
+                {"id": academy_id},
+                {"$set": update_data}
+            )
+            await academy_cache.invalidate(academy_id)
+        
+        # Return updated academy
+        updated_academy = await db.academies.find_one({"id": academy_id})
+        return Academy(**updated_academy)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating academy: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update academy")
+
+@router.delete("/admin/academies/{academy_id}")
+async def delete_academy(academy_id: str, admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to delete an academy"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Find the academy
+        academy = await db.academies.find_one({"id": academy_id})
+        if not academy:
+            raise HTTPException(status_code=404, detail="Academy not found")
+        
+        # Delete from MongoDB
+        await db.academies.delete_one({"id": academy_id})
+        await academy_cache.invalidate(academy_id)
+        
+        # TODO: Also delete the Supabase user if needed
+        # if academy.get('supabase_user_id'):
+        #     try:
+        #         supabase_admin.auth.admin.delete_user(academy['supabase_user_id'])
+        #     except Exception as e:
+        #         logger.warning(f"Failed to delete Supabase user: {e}")
+        
+        return {"message": "Academy deleted successfully"}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting academy: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete academy")
+
+# System Overview Endpoint
+@router.get("/admin/system-overview", response_model=SystemOverview)
+async def get_system_overview(admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to get system-wide statistics"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Get academy stats
+        academies = await db.academies.find().to_list(1000)
+        total_academies = len(academies)
+        active_academies = len([a for a in academies if a.get('status') == 'approved'])
+        pending_academies = len([a for a in academies if a.get('status') == 'pending'])
+        
+        # Get demo request stats
+        demo_requests = await db.demo_requests.find().to_list(1000)
+        total_demo_requests = len(demo_requests)
+        pending_demo_requests = len([d for d in demo_requests if d.get('status') == 'pending'])
+        
+        # Create stats
+        stats = SystemStats(
+            total_academies=total_academies,
+            active_academies=active_academies,
+            pending_academies=pending_academies,
+            total_demo_requests=total_demo_requests,
+            pending_demo_requests=pending_demo_requests,
+            recent_activity_count=len(academies) + len(demo_requests)
+        )
+        
+        # Get recent activities (last 10)
+        recent_activities = []
+        
+        # Recent academy activities
+        recent_academy_activities = await db.academies.find().sort("created_at", -1).limit(5).to_list(5)
+        for academy in recent_academy_activities:
+            activity = RecentActivity(
+                id=str(uuid.uuid4()),
+                type="academy_created",
+                description=f"New academy registration: {academy.get('name', 'Unknown')}",
+                timestamp=academy.get('created_at', datetime.utcnow()),
+                status="success" if academy.get('status') == 'approved' else "pending"
+            )
+            recent_activities.append(activity)
+        
+        # Recent demo request activities
+        recent_demo_activities = await db.demo_requests.find().sort("created_at", -1).limit(5).to_list(5)
+        for demo in recent_demo_activities:
+            activity = RecentActivity(
+                id=str(uuid.uuid4()),
+                type="demo_request",
+                description=f"Demo request from: {demo.get('academy_name', 'Unknown Academy')}",
+                timestamp=demo.get('created_at', datetime.utcnow()),
+                status=demo.get('status', 'pending')
+            )
+            recent_activities.append(activity)
+        
+        # Sort by timestamp (newest first) and limit to 10
+        recent_activities.sort(key=lambda x: x.timestamp, reverse=True)
+        recent_activities = recent_activities[:10]
+        
+        # Get recently added academies (last 5)
+        recent_academies_data = await db.academies.find().sort("created_at", -1).limit(5).to_list(5)
+        recent_academies = []
+        for academy in recent_academies_data:
+            academy_obj = RecentAcademy(
+                id=academy.get('id', str(uuid.uuid4())),
+                name=academy.get('name', 'Unknown'),
+                owner_name=academy.get('owner_name', 'Unknown'),
+                location=academy.get('location', 'Unknown'),
+                sports_type=academy.get('sports_type', 'Unknown'),
+                status=academy.get('status', 'pending'),
+                created_at=academy.get('created_at', datetime.utcnow())
+            )
+            recent_academies.append(academy_obj)
+        
+        # Server status (always healthy for now)
+        server_status = "healthy"
+        
+        overview = SystemOverview(
+            stats=stats,
+            recent_activities=recent_activities,
+            recent_academies=recent_academies,
+            server_status=server_status
+        )
+        
+        return overview
+        
+    except Exception as e:
+        logger.error(f"Error fetching system overview: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch system overview")
+
+# Demo Request Endpoints
+
+# Per-address cap on top of the per-email one, so rotating emails doesn't bypass it
+DEMO_REQUEST_IP_LIMIT = RateLimit("demo_request_ip", 10, 3600)
+
+# Public endpoint for demo requests (no authentication required)
+@router.post("/demo-requests", response_model=DemoRequest,
+             dependencies=[Depends(rate_limit(DEMO_REQUEST_IP_LIMIT))])
+async def create_demo_request(request: DemoRequestCreate, http_request: Request):
+    """Public endpoint to submit demo requests - rate limited to prevent spam"""
+    try:
+        # SECURITY FIX #6: Rate limiting to prevent abuse
+        # Use email as identifier for rate limiting
+        identifier = f"demo_request:{request.email.lower()}"
+        is_allowed, error_msg = await check_rate_limit(identifier, max_requests=3, window_minutes=1440)  # 3 requests per 24 hours
+
+        if not is_allowed:
+            raise HTTPException(status_code=429, detail=error_msg)
+
+        demo_request_data = DemoRequest(**request.dict())
+        await db.demo_requests.insert_one(demo_request_data.dict())
+
+        logger.info(f"Demo request created: {demo_request_data.full_name} - {demo_request_data.academy_name}")
+        return demo_request_data
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating demo request: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create demo request")
+
+# Admin endpoints for managing demo requests
+@router.get("/admin/demo-requests", response_model=Union[List[DemoRequest], Page[DemoRequest]])
+async def get_demo_requests(
+    skip: int = 0,
+    page: PageParams = Depends(),
+    admin_user = Depends(require_super_admin)
+):
+    """Admin-only endpoint to list demo requests with pagination"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # SECURITY FIX MEDIUM #4: Add pagination to prevent large data transfers
+        # Limit maximum page size to prevent resource exhaustion
+        limit = min(page.page_limit(50), 100)  # Cap at 100 records per request
+
+        # `skip` is kept for older clients; cursor pages don't get slower as they go deeper
+        demo_requests, next_cursor = await fetch_page(
+            db.demo_requests, {}, sort_field="created_at", direction=-1,
+            limit=limit, position=page.position, skip=0 if page.requested else skip
+        )
+        return FastJSONResponse(page.respond(rows_from_db(demo_requests, DemoRequest), next_cursor))
+    except Exception as e:
+        logger.error(f"Error fetching demo requests: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch demo requests")
+
+@router.put("/admin/demo-requests/{request_id}", response_model=DemoRequest)
+async def update_demo_request(request_id: str, request_update: DemoRequestUpdate, admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to update demo request status"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Find the request
+        demo_request = await db.demo_requests.find_one({"id": request_id})
+        if not demo_request:
+            raise HTTPException(status_code=404, detail="Demo request not found")
+        
+        # Update fields
+        update_data = request_update.dict(exclude_unset=True)
+        if update_data:
+            update_data["updated_at"] = datetime.utcnow()
+            await db.demo_requests.update_one(
+                {"id": request_id},
+                {"$set": update_data}
+            )
+        
+        # Return updated request
+        updated_request = await db.demo_requests.find_one({"id": request_id})
+        return DemoRequest(**updated_request)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating demo request: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update demo request")
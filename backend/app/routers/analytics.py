@@ -0,0 +1,774 @@
+"""
+Academy analytics: dashboards, radar charts, leaderboard, predictions
+and coach comparison.
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.constants import get_sport_performance_categories
+from app.core import analytics_db
+from app.dependencies import HEAVY_ROUTES, admission, admitted, require_academy_user
+from app.models import AcademyAnalytics, CoachAnalytics, GrowthMetrics, OperationalMetrics, PlayerAnalytics
+from utils.analytics import (aggregate_academy_ratings, aggregate_sport_ratings, linear_trend, slope_of_series,
+                             trend_confidence)
+from utils.single_flight import SingleFlight, coalesce, flight_key
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# Dashboards, radars, the leaderboard and comparisons scan whole academies.
+# They read through analytics_db: its own pool, secondaryPreferred, maxTimeMS.
+heavy_route = admission(HEAVY_ROUTES)
+
+# Staff opening the same page together send identical requests; per academy
+# and parameters only one is computed (in a heavy slot) and the rest share it
+ANALYTICS_FLIGHTS = SingleFlight("analytics")
+coalesced = coalesce(
+    ANALYTICS_FLIGHTS, lambda args: flight_key(args["user_info"]["academy_id"], args, exclude=("user_info",))
+)
+
+# Core calculation helpers for radar analytics
+async def _get_active_player_ids(academy_id: str) -> List[str]:
+    players = await analytics_db.players.find({"academy_id": academy_id, "status": "active"}).to_list(length=None)
+    return [p.get("id") for p in players if p.get("id")]
+
+def _aggregate_academy_ratings(records: List[Dict[str, Any]], default_categories: List[str]) -> Dict[str, Any]:
+    return aggregate_academy_ratings(records, default_categories)
+
+def _aggregate_sport_ratings(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return aggregate_sport_ratings(records, get_sport_performance_categories)
+
+# ========== ACADEMY ANALYTICS ENDPOINTS ==========
+
+# Get comprehensive academy analytics (Academy User)
+@router.get("/academy/analytics", response_model=AcademyAnalytics, dependencies=[Depends(heavy_route)])
+async def get_academy_analytics(user_info = Depends(require_academy_user)):
+    """Get comprehensive analytics for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        academy_name = user_info["academy"]["name"]
+        
+        # Get players and coaches
+        players = await analytics_db.players.find({"academy_id": academy_id}).to_list(1000)
+        coaches = await analytics_db.coaches.find({"academy_id": academy_id}).to_list(100)
+        academy_data = await analytics_db.academies.find_one({"id": academy_id})
+        
+        # Calculate player analytics
+        total_players = len(players)
+        active_players = len([p for p in players if p.get("status") == "active"])
+        inactive_players = total_players - active_players
+        
+        # Age distribution
+        age_distribution = {"under_18": 0, "18_25": 0, "over_25": 0}
+        position_distribution = {}
+        status_distribution = {"active": 0, "inactive": 0}
+        
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        recent_player_additions = 0
+        
+        for player in players:
+            # Age distribution
+            age = player.get("age")
+            if age is None:
+                age = 0
+            if age < 18:
+                age_distribution["under_18"] += 1
+            elif age <= 25:
+                age_distribution["18_25"] += 1
+            else:
+                age_distribution["over_25"] += 1
+            
+            position = player.get("position")  # Get position, which can be None
+            if position is None:
+                position = "Unknown"  # Explicitly set to a string
+            position_distribution[position] = position_distribution.get(position, 0) + 1
+            
+            # Status distribution
+            status = player.get("status")
+            if status is None:
+                status = "inactive" # <--- FIXED: Assign a default string if the value is None
+            status_distribution[status] = status_distribution.get(status, 0) + 1
+            
+            # Recent additions
+            created_at = player.get("created_at")
+            if created_at and isinstance(created_at, datetime) and created_at >= thirty_days_ago:
+                recent_player_additions += 1
+        
+        player_analytics = PlayerAnalytics(
+            total_players=total_players,
+            active_players=active_players,
+            inactive_players=inactive_players,
+            age_distribution=age_distribution,
+            position_distribution=position_distribution,
+            status_distribution=status_distribution,
+            recent_additions=recent_player_additions
+        )
+        
+        # Calculate coach analytics
+        total_coaches = len(coaches)
+        active_coaches = len([c for c in coaches if c.get("status") == "active"])
+        inactive_coaches = total_coaches - active_coaches
+        
+        specialization_distribution = {}
+        experience_distribution = {"0_2_years": 0, "3_5_years": 0, "6_10_years": 0, "over_10_years": 0}
+        total_experience = 0
+        recent_coach_additions = 0
+        
+        for coach in coaches:
+            # Specialization distribution
+            specialization = coach.get("specialization")
+            if specialization is None:                    # Check if it is None
+                specialization = "General"
+            specialization_distribution[specialization] = specialization_distribution.get(specialization, 0) + 1
+            
+            # Experience distribution
+            experience_years = coach.get("experience_years")  # Get the value
+            if experience_years is None:                      # Check if it is None
+                experience_years = 0 
+            total_experience += experience_years
+            
+            if experience_years <= 2:
+                experience_distribution["0_2_years"] += 1
+            elif experience_years <= 5:
+                experience_distribution["3_5_years"] += 1
+            elif experience_years <= 10:
+                experience_distribution["6_10_years"] += 1
+            else:
+                experience_distribution["over_10_years"] += 1
+            
+            # Recent additions
+            created_at = coach.get("created_at")
+            if created_at and isinstance(created_at, datetime) and created_at >= thirty_days_ago:
+                recent_coach_additions += 1
+        
+        average_experience = total_experience / total_coaches if total_coaches > 0 else 0
+        
+        coach_analytics = CoachAnalytics(
+            total_coaches=total_coaches,
+            active_coaches=active_coaches,
+            inactive_coaches=inactive_coaches,
+            specialization_distribution=specialization_distribution,
+            experience_distribution=experience_distribution,
+            average_experience=round(average_experience, 1),
+            recent_additions=recent_coach_additions
+        )
+        
+        # Calculate growth metrics (simplified for now)
+        monthly_player_growth = [{"month": "Current", "count": recent_player_additions}]
+        monthly_coach_growth = [{"month": "Current", "count": recent_coach_additions}]
+        yearly_summary = {"players_added": total_players, "coaches_added": total_coaches}
+        
+        growth_metrics = GrowthMetrics(
+            monthly_player_growth=monthly_player_growth,
+            monthly_coach_growth=monthly_coach_growth,
+            yearly_summary=yearly_summary
+        )
+        
+        # Calculate operational metrics
+        player_limit = academy_data.get("player_limit", 50)
+        coach_limit = academy_data.get("coach_limit", 10)
+        
+        player_capacity = (total_players / player_limit * 100) if player_limit > 0 else 0
+        coach_capacity = (total_coaches / coach_limit * 100) if coach_limit > 0 else 0
+        
+        academy_created = academy_data.get("created_at", datetime.utcnow())
+        academy_age = (datetime.utcnow() - academy_created).days if isinstance(academy_created, datetime) else 0
+        
+        # Check settings completion (simplified)
+        settings = await analytics_db.academy_settings.find_one({"academy_id": academy_id})
+        settings_filled = 0
+        total_settings = 10  # approximate number of key settings
+        
+        if settings:
+            key_fields = ["description", "website", "facility_address", "training_days", "training_time"]
+            settings_filled = sum(1 for field in key_fields if settings.get(field))
+        
+        settings_completion = (settings_filled / total_settings * 100)
+        
+        operational_metrics = OperationalMetrics(
+            capacity_utilization={"players": round(player_capacity, 1), "coaches": round(coach_capacity, 1)},
+            academy_age=academy_age,
+            settings_completion=round(settings_completion, 1),
+            recent_activity={"players_updated": recent_player_additions, "coaches_updated": recent_coach_additions}
+        )
+        
+        # Calculate summary metrics
+        total_members = total_players + total_coaches
+        monthly_growth_rate = 0  # Initialize with a default value
+        if total_members > 0:
+            monthly_growth_rate = ((recent_player_additions + recent_coach_additions) / total_members) * 100
+        capacity_usage = (player_capacity + coach_capacity) / 2
+        
+        return AcademyAnalytics(
+            academy_id=academy_id,
+            academy_name=academy_name,
+            player_analytics=player_analytics,
+            coach_analytics=coach_analytics,
+            growth_metrics=growth_metrics,
+            operational_metrics=operational_metrics,
+            total_members=total_members,
+            monthly_growth_rate=round(monthly_growth_rate, 1),
+            capacity_usage=round(capacity_usage, 1)
+)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching academy analytics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch academy analytics")
+
+# Get player-specific analytics (Academy User)
+@router.get("/academy/analytics/players", response_model=PlayerAnalytics)
+async def get_player_analytics(user_info = Depends(require_academy_user)):
+    """Get detailed player analytics for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Get comprehensive analytics and return just player analytics
+        analytics = await get_academy_analytics(user_info)
+        return analytics.player_analytics
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching player analytics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch player analytics")
+
+# Get coach-specific analytics (Academy User)
+@router.get("/academy/analytics/coaches", response_model=CoachAnalytics)
+async def get_coach_analytics(user_info = Depends(require_academy_user)):
+    """Get detailed coach analytics for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Get comprehensive analytics and return just coach analytics
+        analytics = await get_academy_analytics(user_info)
+        return analytics.coach_analytics
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching coach analytics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch coach analytics")
+
+# Get Leaderboard
+@router.get("/academy/leaderboard")
+@coalesced
+@admitted(HEAVY_ROUTES)
+async def get_leaderboard(
+    sport: str = None,
+    batch_id: str = None,
+    metric: str = "overall",  # "overall", "attendance", "performance"
+    limit: int = 10,
+    user_info = Depends(require_academy_user)
+):
+    """Get leaderboard for players"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Build query
+        query = {"academy_id": academy_id, "status": "active"}
+        if sport:
+            query["sport"] = sport
+        if batch_id:
+            query["batch_id"] = batch_id
+        
+        players = await analytics_db.players.find(query).to_list(1000)
+        
+        # Calculate scores for each player
+        leaderboard = []
+        for player in players:
+            player_id = player["id"]
+            
+            # Get attendance percentage
+            total_attendance = await analytics_db.player_attendance.count_documents({"player_id": player_id})
+            present_count = await analytics_db.player_attendance.count_documents(
+                {"player_id": player_id, "present": True}
+            )
+            attendance_pct = (present_count / total_attendance * 100) if total_attendance > 0 else 0
+            
+            # Get average performance
+            recent_attendance = await analytics_db.player_attendance.find({
+                "player_id": player_id
+            }).sort("date", -1).limit(30).to_list(30)
+            
+            performance_scores = []
+            for record in recent_attendance:
+                if record.get("performance_ratings"):
+                    scores = [v for v in record["performance_ratings"].values() if v is not None]
+                    if scores:
+                        performance_scores.extend(scores)
+            
+            avg_performance = (sum(performance_scores) / len(performance_scores)) if performance_scores else 0
+            performance_pct = (avg_performance / 10) * 100
+            
+            # Calculate overall score
+            if metric == "attendance":
+                score = attendance_pct
+            elif metric == "performance":
+                score = performance_pct
+            else:  # overall
+                score = (attendance_pct * 0.4) + (performance_pct * 0.6)
+            
+            # Get achievement count
+            achievement_count = await analytics_db.achievements.count_documents({
+                "player_id": player_id,
+                "academy_id": academy_id
+            })
+            
+            leaderboard.append({
+                "player_id": player_id,
+                "player_name": f"{player.get('first_name')} {player.get('last_name')}",
+                "sport": player.get("sport"),
+                "batch_id": player.get("batch_id"),
+                "score": round(score, 2),
+                "attendance_percentage": round(attendance_pct, 2),
+                "performance_score": round(performance_pct, 2),
+                "achievement_count": achievement_count,
+                "photo_url": player.get("photo_url")
+            })
+        
+        # Sort by score
+        leaderboard.sort(key=lambda x: x["score"], reverse=True)
+        
+        # Add rank
+        for i, entry in enumerate(leaderboard[:limit]):
+            entry["rank"] = i + 1
+        
+        return {"leaderboard": leaderboard[:limit]}
+        
+    except Exception as e:
+        logger.error(f"Error generating leaderboard: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate leaderboard")
+
+# ========== ADVANCED ANALYTICS ENDPOINTS ==========
+
+# Get Predictive Performance
+@router.get("/academy/analytics/predictive-performance/{player_id}", dependencies=[Depends(heavy_route)])
+async def get_predictive_performance(player_id: str, user_info = Depends(require_academy_user)):
+    """Get predictive performance analysis for a player"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Get historical performance data (last 90 days)
+        ninety_days_ago = datetime.utcnow() - timedelta(days=90)
+        attendance_records = await analytics_db.player_attendance.find({
+            "player_id": player_id,
+            "date": {"$gte": ninety_days_ago}
+        }).sort("date", 1).to_list(100)
+        
+        if len(attendance_records) < 5:
+            return {
+                "message": "Insufficient data for prediction",
+                "prediction": None,
+                "confidence": 0
+            }
+        
+        # Extract performance trends
+        performance_trend = []
+        for record in attendance_records:
+            if record.get("performance_ratings"):
+                scores = [v for v in record["performance_ratings"].values() if v is not None]
+                if scores:
+                    avg_score = sum(scores) / len(scores)
+                    performance_trend.append({
+                        "date": record["date"].isoformat(),
+                        "score": avg_score
+                    })
+        
+        # Simple linear regression for trend
+        if len(performance_trend) >= 3:
+            x_values = list(range(len(performance_trend)))
+            y_values = [p["score"] for p in performance_trend]
+            slope, intercept = linear_trend(y_values)
+            
+            # Predict next 30 days
+            future_predictions = []
+            for i in range(30):
+                future_x = len(x_values) + i
+                predicted_score = slope * future_x + intercept
+                predicted_score = max(0, min(10, predicted_score))  # Clamp between 0-10
+                
+                future_date = datetime.utcnow() + timedelta(days=i)
+                future_predictions.append({
+                    "date": future_date.isoformat(),
+                    "predicted_score": round(predicted_score, 2)
+                })
+            
+            # Calculate trend direction
+            trend_direction = "improving" if slope > 0.05 else "declining" if slope < -0.05 else "stable"
+            
+            # Calculate confidence based on data consistency
+            confidence = trend_confidence(y_values)
+            
+            return {
+                "player_id": player_id,
+                "historical_performance": performance_trend,
+                "predicted_performance": future_predictions,
+                "trend_direction": trend_direction,
+                "trend_slope": round(slope, 4),
+                "confidence": round(confidence, 2),
+                "recommendation": get_performance_recommendation(trend_direction, y_values[-1] if y_values else 5)
+            }
+        
+        return {
+            "message": "Insufficient data for prediction",
+            "historical_performance": performance_trend,
+            "prediction": None
+        }
+        
+    except Exception as e:
+        logger.error(f"Error calculating predictive performance: {e}")
+        raise HTTPException(status_code=500, detail="Failed to calculate predictive performance")
+
+def get_performance_recommendation(trend, current_score):
+    """Generate performance recommendation based on trend and score"""
+    if trend == "improving" and current_score >= 7:
+        return "Excellent progress! Continue with current training regimen."
+    elif trend == "improving" and current_score < 7:
+        return "Showing improvement. Focus on consistency to reach peak performance."
+    elif trend == "declining" and current_score >= 7:
+        return "Performance declining from high level. Review training intensity and recovery."
+    elif trend == "declining":
+        return "Performance declining. Immediate attention needed. Consider one-on-one coaching."
+    elif trend == "stable" and current_score >= 7:
+        return "Maintaining good performance. Challenge with advanced drills."
+    else:
+        return "Performance stable but below potential. Increase training focus."
+
+# Get Academy Analytics Dashboard
+@router.get("/academy/analytics/dashboard")
+@coalesced
+@admitted(HEAVY_ROUTES)
+async def get_analytics_dashboard(user_info = Depends(require_academy_user)):
+    """Get comprehensive analytics for academy dashboard"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Get total counts
+        total_players = await analytics_db.players.count_documents({"academy_id": academy_id, "status": "active"})
+        total_coaches = await analytics_db.coaches.count_documents({"academy_id": academy_id, "status": "active"})
+        total_batches = await analytics_db.batches.count_documents({"academy_id": academy_id, "status": "active"})
+        
+        # Get retention rate (players active > 3 months)
+        three_months_ago = datetime.utcnow() - timedelta(days=90)
+        retained_players = await analytics_db.players.count_documents({
+            "academy_id": academy_id,
+            "status": "active",
+            "created_at": {"$lte": three_months_ago}
+        })
+        retention_rate = (retained_players / total_players * 100) if total_players > 0 else 0
+        
+        # Get average attendance
+        all_attendance = await analytics_db.player_attendance.count_documents({"academy_id": academy_id})
+        present_attendance = await analytics_db.player_attendance.count_documents(
+            {"academy_id": academy_id, "present": True}
+        )
+        avg_attendance = (present_attendance / all_attendance * 100) if all_attendance > 0 else 0
+        
+        # Get revenue (from payment transactions)
+        thirty_days_ago = datetime.utcnow() - timedelta(days=30)
+        revenue_pipeline = [
+            {"$match": {"academy_id": academy_id, "payment_status": "paid", "payment_date": {"$gte": thirty_days_ago}}},
+            {"$group": {"_id": None, "total": {"$sum": "$amount"}}}
+        ]
+        revenue_result = await analytics_db.payment_transactions.aggregate(
+            revenue_pipeline, allowDiskUse=True
+        ).to_list(1)
+        monthly_revenue = revenue_result[0]["total"] if revenue_result else 0
+        
+        # Get growth trend (last 6 months)
+        growth_trend = []
+        for i in range(6):
+            month_start = datetime.utcnow() - timedelta(days=30 * (i + 1))
+            month_end = datetime.utcnow() - timedelta(days=30 * i)
+            
+            player_count = await analytics_db.players.count_documents({
+                "academy_id": academy_id,
+                "created_at": {"$gte": month_start, "$lt": month_end}
+            })
+            
+            growth_trend.insert(0, {
+                "month": month_start.strftime("%b %Y"),
+                "new_players": player_count
+            })
+        
+        return {
+            "total_players": total_players,
+            "total_coaches": total_coaches,
+            "total_batches": total_batches,
+            "retention_rate": round(retention_rate, 2),
+            "average_attendance": round(avg_attendance, 2),
+            "monthly_revenue": monthly_revenue,
+            "growth_trend": growth_trend
+        }
+        
+    except Exception as e:
+        logger.error(f"Error generating analytics dashboard: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate analytics")
+
+# Academy-wide Skill Radar (aggregate performance ratings across attendance)
+@router.get("/academy/analytics/skill-radar")
+@coalesced
+@admitted(HEAVY_ROUTES)
+async def get_academy_skill_radar(
+    target: float = 8.0,
+    user_info = Depends(require_academy_user)
+):
+    """Aggregate player_attendance.performance_ratings across the academy and
+    compute average per category for radar visualization.
+
+    Returns categories with average scores (0–10), a target benchmark, and
+    basic insights about strengths and weaknesses.
+    """
+    try:
+        academy_id = user_info["academy_id"]
+        active_player_ids = await _get_active_player_ids(academy_id)
+        time_limit = datetime.utcnow() - timedelta(days=180)
+        cursor = analytics_db.player_attendance.find({
+            "academy_id": academy_id,
+            "player_id": {"$in": active_player_ids},
+            "present": True,
+            "created_at": {"$gte": time_limit}
+        })
+        records = await cursor.to_list(length=None)
+
+        # Default categories to ensure consistent radar shape
+        default_categories = [
+            "Technical Skills",
+            "Physical Fitness",
+            "Tactical Awareness",
+            "Mental Strength",
+            "Teamwork"
+        ]
+        agg = _aggregate_academy_ratings(records, default_categories)
+        categories = agg["categories"]
+        rated_count = agg["rated_count"]
+
+        weaknesses = [c["name"] for c in categories if c["average"] < max(0.0, target - 1.0)]
+        strengths = [c["name"] for c in categories if c["average"] >= target]
+
+        return {
+            "categories": categories,
+            "target": target,
+            "strengths": strengths,
+            "weaknesses": weaknesses,
+            "rated_count": rated_count
+        }
+    except Exception as e:
+        logger.error(f"Error generating academy skill radar: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate academy skill radar")
+
+@router.get("/academy/analytics/sport-skill-radar")
+@coalesced
+@admitted(HEAVY_ROUTES)
+async def get_sport_skill_radar(
+    target: float = 8.0,
+    user_info = Depends(require_academy_user)
+):
+    try:
+        academy_id = user_info["academy_id"]
+        active_player_ids = await _get_active_player_ids(academy_id)
+        time_limit = datetime.utcnow() - timedelta(days=180)
+        cursor = analytics_db.player_attendance.find({
+            "academy_id": academy_id,
+            "player_id": {"$in": active_player_ids},
+            "present": True,
+            "created_at": {"$gte": time_limit}
+        })
+        records = await cursor.to_list(length=None)
+
+        result_sports = _aggregate_sport_ratings(records)
+        # Enrich with strengths/weaknesses using target
+        for s in result_sports:
+            weaknesses = [c["name"] for c in s["categories"] if c["average"] < max(0.0, target - 1.0)]
+            strengths = [c["name"] for c in s["categories"] if c["average"] >= target]
+            s["weaknesses"] = weaknesses
+            s["strengths"] = strengths
+
+        return {"target": target, "sports": result_sports}
+    except Exception as e:
+        logger.error(f"Error generating sport-wise skill radar: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate sport-wise skill radar")
+
+# Backward-compatible aliases for environments using older routes
+# (admission and coalescing happen in the handlers they delegate to)
+@router.get("/analytics/skill-radar")
+async def get_academy_skill_radar_alias(target: float = 8.0, user_info = Depends(require_academy_user)):
+    return await get_academy_skill_radar(target=target, user_info=user_info)
+
+@router.get("/analytics/sport-skill-radar")
+async def get_sport_skill_radar_alias(target: float = 8.0, user_info = Depends(require_academy_user)):
+    return await get_sport_skill_radar(target=target, user_info=user_info)
+
+@router.get("/academy/analytics/sport-radar")
+async def get_sport_radar_alias(target: float = 8.0, user_info = Depends(require_academy_user)):
+    return await get_sport_skill_radar(target=target, user_info=user_info)
+
+@router.get("/academy/sport-skill-radar")
+async def get_sport_skill_radar_alias2(target: float = 8.0, user_info = Depends(require_academy_user)):
+    return await get_sport_skill_radar(target=target, user_info=user_info)
+
+@router.get("/academy/skill-radar")
+async def get_skill_radar_alias2(target: float = 8.0, user_info = Depends(require_academy_user)):
+    return await get_academy_skill_radar(target=target, user_info=user_info)
+
+@router.get("/academy/analytics/coach-comparison")
+@coalesced
+@admitted(HEAVY_ROUTES)
+async def get_coach_comparison(
+    coach_a: Optional[str] = None,
+    coach_b: Optional[str] = None,
+    months: int = 6,
+    user_info = Depends(require_academy_user)
+):
+    try:
+        academy_id = user_info["academy_id"]
+
+        def month_key(dt: datetime) -> str:
+            return dt.strftime("%Y-%m")
+
+        end_date = datetime.utcnow()
+        start_date = (end_date.replace(day=1) - timedelta(days=1))  # last month end
+        # compute start_date months back by going to first day of end month and subtract months
+        # simple approx: subtract 30*months days
+        start_date = end_date - timedelta(days=months * 30)
+        start_str = start_date.strftime("%Y-%m-%d")
+
+        coaches_cursor = analytics_db.coaches.find({"academy_id": academy_id, "status": "active"})
+        coaches_list = await coaches_cursor.to_list(length=None)
+        coach_index = {c["id"]: c for c in coaches_list}
+
+        # Helper to compute per-coach aggregates
+        async def compute_for_coach(cid: str):
+            players_cursor = analytics_db.players.find({"academy_id": academy_id, "coach_id": cid})
+            players = await players_cursor.to_list(length=None)
+            player_ids = [p["id"] for p in players]
+
+            perf_cursor = analytics_db.performance_metrics.find({
+                "academy_id": academy_id,
+                "player_id": {"$in": player_ids},
+                "date": {"$gte": start_str}
+            })
+            perf_records = await perf_cursor.to_list(length=None)
+
+            # group by player
+            by_player: Dict[str, List[Dict[str, Any]]] = {}
+            for rec in perf_records:
+                pid = rec["player_id"]
+                by_player.setdefault(pid, []).append(rec)
+
+            player_avgs: List[float] = []
+            player_slopes: List[float] = []
+            player_deltas: List[float] = []
+
+            for pid, recs in by_player.items():
+                # sort by date
+                recs_sorted = sorted(recs, key=lambda r: r["date"])  # ISO strings sort correctly
+                ratings = [r.get("overall_rating") for r in recs_sorted if r.get("overall_rating") is not None]
+                if not ratings:
+                    continue
+                player_avgs.append(sum(ratings) / len(ratings))
+                player_slopes.append(slope_of_series(ratings))
+                player_deltas.append(ratings[-1] - ratings[0])
+
+            avg_rating_6m = round(sum(player_avgs) / len(player_avgs), 2) if player_avgs else None
+            improvement_rate = round(sum(player_slopes) / len(player_slopes), 3) if player_slopes else 0.0
+            avg_delta_6m = round(sum(player_deltas) / len(player_deltas), 2) if player_deltas else 0.0
+
+            # Monthly series (average of all players per month)
+            months_map: Dict[str, List[float]] = {}
+            for rec in perf_records:
+                r = rec.get("overall_rating")
+                if r is None:
+                    continue
+                # parse date string YYYY-MM-DD
+                try:
+                    dt = datetime.strptime(rec["date"], "%Y-%m-%d")
+                except Exception:
+                    # if not parseable, bucket by first 7 chars
+                    mk = rec["date"][:7]
+                else:
+                    mk = month_key(dt)
+                months_map.setdefault(mk, []).append(float(r))
+            monthly_series = [
+                {"month": m, "average_rating": round(sum(vals) / len(vals), 2)}
+                for m, vals in sorted(months_map.items())
+            ]
+
+            # Average coach rating from player submissions in last 6 months
+            rating_time_limit = datetime.utcnow() - timedelta(days=180)
+            coach_ratings_cursor = analytics_db.coach_ratings.find({
+                "academy_id": academy_id,
+                "coach_id": cid,
+                "created_at": {"$gte": rating_time_limit}
+            })
+            coach_ratings = await coach_ratings_cursor.to_list(length=None)
+            rating_values = [r.get("rating") for r in coach_ratings if isinstance(r.get("rating"), (int, float))]
+            avg_coach_rating_6m = round(sum(rating_values) / len(rating_values), 2) if rating_values else None
+
+            # Build monthly series for coach ratings
+            coach_months_map: Dict[str, List[float]] = {}
+            for r in coach_ratings:
+                val = r.get("rating")
+                if not isinstance(val, (int, float)):
+                    continue
+                ts = r.get("created_at")
+                mk = None
+                if isinstance(ts, datetime):
+                    mk = month_key(ts)
+                elif isinstance(ts, str):
+                    try:
+                        dt = datetime.strptime(ts[:10], "%Y-%m-%d")
+                        mk = month_key(dt)
+                    except Exception:
+                        mk = ts[:7]
+                else:
+                    mk = end_date.strftime("%Y-%m")
+                coach_months_map.setdefault(mk, []).append(float(val))
+            coach_rating_series = [
+                {"month": m, "avg_coach_rating": round(sum(vals) / len(vals), 2)}
+                for m, vals in sorted(coach_months_map.items())
+            ]
+
+            coach = coach_index.get(cid)
+            return {
+                "coach_id": cid,
+                "coach_name": f"{coach.get('first_name','')} {coach.get('last_name','')}" if coach else cid,
+                "player_count": len(player_ids),
+                "avg_rating_6m": avg_rating_6m,
+                "improvement_rate": improvement_rate,
+                "avg_delta_6m": avg_delta_6m,
+                "monthly_series": monthly_series,
+                "avg_coach_rating_6m": avg_coach_rating_6m,
+                "coach_rating_series": coach_rating_series
+            }
+
+        # If no coach ids provided, select first two active coaches
+        ids = [c["id"] for c in coaches_list]
+        if not coach_a and ids:
+            coach_a = ids[0]
+        if not coach_b and len(ids) > 1:
+            coach_b = ids[1]
+
+        result_a = await compute_for_coach(coach_a) if coach_a else None
+        result_b = await compute_for_coach(coach_b) if coach_b else None
+
+        # Leaderboard for all coaches by avg_delta_6m
+        leaderboard: List[Dict[str, Any]] = []
+        for cid in ids:
+            leaderboard.append(await compute_for_coach(cid))
+        leaderboard.sort(key=lambda x: x.get("avg_delta_6m", 0.0), reverse=True)
+
+        return {
+            "months": months,
+            "coach_a": result_a,
+            "coach_b": result_b,
+            "leaderboard": leaderboard
+        }
+    except Exception as e:
+        logger.error(f"Error generating coach comparison: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate coach comparison")
@@ -0,0 +1,385 @@
+"""
+Attendance marking and performance tracking by the academy.
+"""
+import logging
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.core import analytics_db, db
+from app.dependencies import require_academy_user
+from app.events import publish_attendance
+from app.models import AttendanceMarkingRequest, PerformanceMetricsCreate, PlayerAttendance, PlayerPerformanceAnalytics
+from utils.fieldsets import FieldSelection, sparse_fields
+from utils.pagination import PageParams, fetch_page
+from utils.serialization import FastJSONResponse
+from utils.streaming import projection_for, stream_cursor
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# ========== ATTENDANCE AND PERFORMANCE TRACKING ENDPOINTS ==========
+
+# Mark attendance for players (Academy User)
+@router.post("/academy/attendance")
+async def mark_attendance(attendance_request: AttendanceMarkingRequest, user_info = Depends(require_academy_user)):
+    """Mark attendance for multiple players with performance ratings"""
+    try:
+        academy_id = user_info["academy_id"]
+        marked_by = user_info["user"].id
+        
+        results = []
+        for record in attendance_request.attendance_records:
+            # Validate player belongs to academy
+            player = await db.players.find_one({"id": record.player_id, "academy_id": academy_id})
+            if not player:
+                continue  # Skip invalid players
+            
+            # Check if attendance already exists for this date
+            existing_attendance = await db.player_attendance.find_one({
+                "player_id": record.player_id,
+                "academy_id": academy_id,
+                "date": record.date
+            })
+            
+            # Get player's sport for performance categories
+            player_sport = player.get("sport", "Other")
+            
+            attendance_data = {
+                "player_id": record.player_id,
+                "academy_id": academy_id,
+                "date": record.date,
+                "present": record.present,
+                "sport": record.sport or player_sport,  # Use provided sport or player's sport
+                "performance_ratings": record.performance_ratings or {},
+                "notes": record.notes,
+                "marked_by": marked_by,
+                "created_at": datetime.utcnow(),
+                "id": str(uuid.uuid4())
+            }
+            
+            if existing_attendance:
+                # Update existing attendance
+                changes = {
+                    "present": record.present,
+                    "sport": record.sport or player_sport,
+                    "performance_ratings": record.performance_ratings or {},
+                    "notes": record.notes,
+                    "marked_by": marked_by,
+                    "updated_at": datetime.utcnow()
+                }
+                await db.player_attendance.update_one({"id": existing_attendance["id"]}, {"$set": changes})
+                publish_attendance({**existing_attendance, **changes})
+                results.append({"player_id": record.player_id, "status": "updated"})
+            else:
+                # Create new attendance record
+                await db.player_attendance.insert_one(attendance_data)
+                publish_attendance(attendance_data)
+                results.append({"player_id": record.player_id, "status": "created"})
+        
+        return {"message": "Attendance marked successfully", "results": results}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error marking attendance: {e}")
+        raise HTTPException(status_code=500, detail="Failed to mark attendance")
+
+# Get attendance for a specific date (Academy User)
+@router.post("/academy/attendance/{date}")
+async def get_attendance_by_date(date: str, user_info = Depends(require_academy_user)):
+    """Get attendance records for a specific date"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Get attendance records for the date
+        attendance_cursor = db.player_attendance.find({
+            "academy_id": academy_id,
+            "date": date
+        })
+        attendance_records = await attendance_cursor.to_list(length=None)
+        
+        # Get player details for each attendance record
+        results = []
+        for record in attendance_records:
+            # SECURITY FIX: Added academy_id check to prevent cross-academy data access
+            player = await db.players.find_one({"id": record["player_id"], "academy_id": academy_id})
+            if player:
+                results.append({
+                    "attendance_id": record["id"],
+                    "player_id": record["player_id"],
+                    "player_name": f"{player['first_name']} {player['last_name']}",
+                    "present": record["present"],
+                    "performance_ratings": record.get("performance_ratings", {}),
+                    "notes": record.get("notes"),
+                    "marked_at": record["created_at"]
+                })
+        
+        return {"date": date, "attendance_records": results}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching attendance: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch attendance")
+
+# Get player performance analytics (Academy User) - SIMPLIFIED
+@router.get("/academy/players/{player_id}/performance", response_model=PlayerPerformanceAnalytics)
+async def get_player_performance(player_id: str, user_info = Depends(require_academy_user)):
+    """Get simplified performance analytics for a specific player"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+        
+        all_sessions_cursor = db.player_attendance.find({"player_id": player_id, "academy_id": academy_id})
+        all_sessions = await all_sessions_cursor.to_list(length=None)
+
+        total_sessions = len(all_sessions)
+        attended_sessions_records = [s for s in all_sessions if s.get("present")]
+        attended_sessions = len(attended_sessions_records)
+        attendance_percentage = (attended_sessions / total_sessions * 100) if total_sessions > 0 else 0
+
+        perf_cursor = db.performance_metrics.find({"player_id": player_id, "academy_id": academy_id})
+        perf_records = await perf_cursor.to_list(length=None)
+
+        all_ratings = [rec.get("overall_rating") for rec in perf_records if rec.get("overall_rating") is not None]
+        average_rating = round(sum(all_ratings) / len(all_ratings), 2) if all_ratings else None
+
+        performance_trend = sorted([
+            {
+                "date": rec["date"],
+                "rating": rec.get("overall_rating"),
+                "speed": rec.get("speed"),
+                "agility": rec.get("agility"),
+                "movement": rec.get("movement"),
+                "pace": rec.get("pace"),
+                "stamina": rec.get("stamina"),
+                "notes": rec.get("notes", "")
+            }
+            for rec in perf_records
+            if rec.get("overall_rating") is not None
+        ], key=lambda x: x["date"])
+
+        monthly_stats = {}
+        perf_map = {rec["date"]: rec.get("overall_rating") for rec in perf_records if rec.get("overall_rating") is not None}
+        for record in all_sessions:
+            month_key = record["date"][:7]
+            if month_key not in monthly_stats:
+                monthly_stats[month_key] = {"total_sessions": 0, "attended_sessions": 0, "ratings": []}
+            monthly_stats[month_key]["total_sessions"] += 1
+            if record.get("present"):
+                monthly_stats[month_key]["attended_sessions"] += 1
+                r = perf_map.get(record["date"]) 
+                if r is not None:
+                    monthly_stats[month_key]["ratings"].append(r)
+        for month, stats in monthly_stats.items():
+            stats["attendance_percentage"] = (stats["attended_sessions"] / stats["total_sessions"] * 100) if stats["total_sessions"] > 0 else 0
+            stats["average_rating"] = round(sum(stats["ratings"]) / len(stats["ratings"]), 2) if stats["ratings"] else None
+            del stats["ratings"]
+
+        return PlayerPerformanceAnalytics(
+            player_id=player_id,
+            player_name=f"{player['first_name']} {player['last_name']}",
+            sport=player.get("sport", "Other"),
+            total_sessions=total_sessions,
+            attended_sessions=attended_sessions,
+            attendance_percentage=round(attendance_percentage, 2),
+            average_rating=average_rating,
+            performance_trend=performance_trend,
+            monthly_stats=monthly_stats
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching player performance: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch player performance")
+
+
+# `fields=` whitelist for attendance record lists
+attendance_fieldset = sparse_fields(PlayerAttendance.model_fields)
+
+# Get attendance records in a date range (Academy User)
+@router.get("/academy/attendance/records")
+async def get_attendance_records(
+    request: Request,
+    start_date: str = None,
+    end_date: str = None,
+    stream: bool = False,
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(attendance_fieldset),
+    user_info = Depends(require_academy_user)
+):
+    """Get raw attendance records for the academy, optionally within a date range"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Build date filter
+        date_filter = {"academy_id": academy_id}
+        if start_date and end_date:
+            date_filter["date"] = {"$gte": start_date, "$lte": end_date}
+        elif start_date:
+            date_filter["date"] = {"$gte": start_date}
+        elif end_date:
+            date_filter["date"] = {"$lte": end_date}
+        
+        if stream:
+            attendance_cursor = db.player_attendance.find(
+                date_filter, fieldset.projection(projection_for(PlayerAttendance))
+            ).sort([("date", 1), ("id", 1)])
+            return stream_cursor(attendance_cursor, request)
+        
+        limit = page.page_limit()
+        records, next_cursor = await fetch_page(
+            db.player_attendance, date_filter, sort_field="date", direction=1,
+            limit=limit, position=page.position,
+            projection=fieldset.projection(projection_for(PlayerAttendance), extra=("date",))
+        )
+        
+        return FastJSONResponse({
+            "attendance_records": fieldset.trim_rows(records),
+            "limit": limit,
+            "next_cursor": next_cursor
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching attendance records: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch attendance records")
+
+# Get attendance summary for academy (Academy User)
+@router.get("/academy/attendance/summary")
+async def get_attendance_summary(start_date: str = None, end_date: str = None, user_info = Depends(require_academy_user)):
+    """Get attendance summary for academy within date range"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Build date filter
+        date_filter = {"academy_id": academy_id}
+        if start_date and end_date:
+            date_filter["date"] = {"$gte": start_date, "$lte": end_date}
+        elif start_date:
+            date_filter["date"] = {"$gte": start_date}
+        elif end_date:
+            date_filter["date"] = {"$lte": end_date}
+        
+        # Get attendance records
+        attendance_cursor = analytics_db.player_attendance.find(date_filter)
+        attendance_records = await attendance_cursor.to_list(length=None)
+        
+        # Calculate summary statistics
+        total_records = len(attendance_records)
+        present_records = sum(1 for record in attendance_records if record["present"])
+        overall_attendance_rate = (present_records / total_records * 100) if total_records > 0 else 0
+        
+        perf_filter = {"academy_id": academy_id}
+        if start_date and end_date:
+            perf_filter["date"] = {"$gte": start_date, "$lte": end_date}
+        elif start_date:
+            perf_filter["date"] = {"$gte": start_date}
+        elif end_date:
+            perf_filter["date"] = {"$lte": end_date}
+
+        perf_cursor = analytics_db.performance_metrics.find(perf_filter)
+        perf_records = await perf_cursor.to_list(length=None)
+        performance_ratings = [rec.get("overall_rating") for rec in perf_records if rec.get("overall_rating") is not None]
+        average_performance = sum(performance_ratings) / len(performance_ratings) if performance_ratings else None
+        
+        return {
+            "date_range": {"start": start_date, "end": end_date},
+            "total_records": total_records,
+            "present_records": present_records,
+            "overall_attendance_rate": round(overall_attendance_rate, 2),
+            "average_performance_rating": round(average_performance, 2) if average_performance else None,
+            "total_performance_ratings": len(performance_ratings)
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching attendance summary: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch attendance summary")
+
+# ========== COACH MANAGEMENT ENDPOINTS ==========
+
+# Add detailed performance metrics (Academy User - Coaches)
+@router.post("/academy/performance")
+async def save_performance_metrics(performance: PerformanceMetricsCreate, user_info = Depends(require_academy_user)):
+    """Save detailed performance metrics for a player on a specific date"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Verify player belongs to this academy
+        player = await db.players.find_one({"id": performance.player_id, "academy_id": academy_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found or does not belong to your academy")
+        
+        # Check if attendance record exists and player was present
+        attendance_record = await db.player_attendance.find_one({
+            "player_id": performance.player_id,
+            "academy_id": academy_id,
+            "date": performance.date
+        })
+        
+        if not attendance_record:
+            raise HTTPException(status_code=400, detail="Attendance must be marked before adding performance metrics")
+        
+        if not attendance_record.get("present"):
+            raise HTTPException(status_code=400, detail="Performance can only be added for players who were present")
+        
+        # Create or check performance_metrics collection document
+        performance_id = str(uuid.uuid4())
+        performance_doc = {
+            "id": performance_id,
+            "player_id": performance.player_id,
+            "academy_id": academy_id,
+            "date": performance.date,
+            "speed": performance.speed,
+            "agility": performance.agility,
+            "movement": performance.movement,
+            "pace": performance.pace,
+            "stamina": performance.stamina,
+            "overall_rating": performance.overall_rating,
+            "notes": performance.notes,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        
+        # Check if performance already exists for this player and date
+        existing = await db.performance_metrics.find_one({
+            "player_id": performance.player_id,
+            "academy_id": academy_id,
+            "date": performance.date
+        })
+        
+        if existing:
+            # Update existing performance
+            await db.performance_metrics.update_one(
+                {"id": existing["id"]},
+                {"$set": {
+                    "speed": performance.speed,
+                    "agility": performance.agility,
+                    "movement": performance.movement,
+                    "pace": performance.pace,
+                    "stamina": performance.stamina,
+                    "overall_rating": performance.overall_rating,
+                    "notes": performance.notes,
+                    "updated_at": datetime.utcnow()
+                }}
+            )
+            return {"message": "Performance metrics updated successfully", "performance_id": existing["id"]}
+        else:
+            # Insert new performance
+            await db.performance_metrics.insert_one(performance_doc)
+            return {"message": "Performance metrics saved successfully", "performance_id": performance_id}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error saving performance metrics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to save performance metrics")
@@ -0,0 +1,262 @@
+"""
+Sign-in, session refresh and password changes for all roles.
+"""
+import logging
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core import db, supabase, supabase_admin
+from app.dependencies import get_current_user, require_coach_user, require_player_user
+from app.models import (AuthResponse, CoachPasswordChangeRequest, PlayerAuthResponse, PlayerPasswordChangeRequest,
+                        PlayerSignInRequest, RefreshRequest, SignInRequest, UserResponse)
+from app.reference import coaches as coach_cache
+from utils.metrics import observe_outbound
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+@router.post("/auth/login", response_model=AuthResponse)
+async def login(request: SignInRequest):
+    try:
+        with observe_outbound("supabase", "sign_in"):
+            response = supabase.auth.sign_in_with_password({
+                "email": request.email,
+                "password": request.password
+            })
+        
+        if response.user:
+            return AuthResponse(
+                user=response.user.model_dump() if hasattr(response.user, 'model_dump') else dict(response.user),
+                session=response.session.model_dump() if response.session and hasattr(response.session, 'model_dump') else dict(response.session) if response.session else {},
+                message="Login successful"
+            )
+        else:
+            raise HTTPException(status_code=401, detail="Invalid credentials")
+            
+    except Exception as e:
+        logger.error(f"Login error: {e}")
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+@router.post("/auth/logout")
+async def logout(current_user = Depends(get_current_user)):
+    try:
+        supabase.auth.sign_out()
+        return {"message": "Logout successful"}
+    except Exception as e:
+        logger.error(f"Logout error: {e}")
+        raise HTTPException(status_code=500, detail="Logout failed")
+
+@router.get("/auth/user", response_model=UserResponse)
+async def get_user(current_user = Depends(get_current_user)):
+    if current_user:
+        # Convert user object to dictionary
+        user_dict = current_user.model_dump() if hasattr(current_user, 'model_dump') else dict(current_user)
+        
+        # Determine user role and academy information
+        user_email = user_dict.get('email', '')
+        user_id = user_dict.get('id', '')
+
+        user_email_lower = user_email.lower()
+        # SECURITY FIX: Removed environment-dependent check
+        # Super admin status should be consistent across all environments
+        is_super_admin = (user_email_lower == 'admin@trackmyacademy.com')
+        
+        # Initialize role info
+        role_info = {
+            'role': 'super_admin' if is_super_admin else 'academy_user',
+            'academy_id': None,
+            'academy_name': None,
+            'permissions': []
+        }
+        
+        if is_super_admin:
+            role_info['permissions'] = ['manage_all_academies', 'view_all_data', 'create_academies', 'manage_billing']
+        else:
+            # Check if user is a coach
+            coach = await db.coaches.find_one({"supabase_user_id": user_id})
+            if coach:
+                role_info['role'] = 'coach'
+                role_info['coach_id'] = coach['id']
+                role_info['academy_id'] = coach['academy_id']
+                role_info['permissions'] = ['view_assigned_players', 'mark_attendance', 'add_performance']
+            else:
+                # Check if user is a player
+                player = await db.players.find_one({"supabase_user_id": user_id})
+                if player:
+                    role_info['role'] = 'player'
+                    role_info['player_id'] = player['id']
+                    role_info['academy_id'] = player['academy_id']
+                    role_info['permissions'] = ['view_own_data', 'view_attendance', 'view_performance']
+                else:
+                    # Find academy for this user
+                    academy = await db.academies.find_one({"supabase_user_id": user_id})
+                    if academy:
+                        role_info['academy_id'] = academy['id']
+                        role_info['academy_name'] = academy['name']
+                        role_info['permissions'] = ['manage_own_academy', 'create_coaches', 'view_own_data']
+
+        # Add role info to user data
+        user_dict['role_info'] = role_info
+
+        # Extract role directly for top-level field
+        role = role_info.get("role")
+
+        return UserResponse(
+            user=user_dict,
+            role=role,
+            message="User retrieved successfully"
+        )
+    else:
+        return UserResponse(
+            user=None,
+            message="No authenticated user"
+        )
+
+@router.post("/auth/refresh", response_model=AuthResponse)
+async def refresh_token(input: RefreshRequest):
+    try:
+        with observe_outbound("supabase", "refresh_session"):
+            refreshed = supabase.auth.refresh_session(input.refresh_token)
+        if refreshed.session:
+            return {
+                "user": dict(refreshed.user) if hasattr(refreshed.user, "__iter__") else refreshed.user,
+                "session": {
+                    "access_token": refreshed.session.access_token,
+                    "refresh_token": refreshed.session.refresh_token,
+                    "expires_at": refreshed.session.expires_at,
+                },
+                "message": "Token refreshed successfully",
+            }
+        raise HTTPException(status_code=401, detail="Failed to refresh token")
+    except Exception as e:
+        logger.error(f"Refresh error: {e}")
+        raise HTTPException(status_code=401, detail="Failed to refresh token")
+
+# Change password endpoint (for coaches)
+@router.post("/auth/change-password")
+async def change_password(
+    request: CoachPasswordChangeRequest,
+    user_info = Depends(require_coach_user)
+):
+    """Change password for the authenticated coach"""
+    try:
+        coach_id = user_info["coach_id"]
+        supabase_user_id = user_info["coach"].get("supabase_user_id")
+        
+        if not supabase_user_id:
+            raise HTTPException(
+                status_code=400,
+                detail="No authentication account linked to this coach"
+            )
+        
+        # Validate password
+        if len(request.new_password) < 6:
+            raise HTTPException(
+                status_code=400,
+                detail="Password must be at least 6 characters long"
+            )
+        
+        # Update password in Supabase using admin client
+        try:
+            supabase_admin.auth.admin.update_user_by_id(
+                supabase_user_id,
+                {"password": request.new_password}
+            )
+            logger.info(f"Successfully updated password in Supabase for coach {coach_id}")
+        except Exception as e:
+            logger.error(f"Failed to update password in Supabase: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail="Failed to update password in authentication system"
+            )
+        
+        # Update password_changed flag in database
+        await db.coaches.update_one(
+            {"id": coach_id},
+            {"$set": {
+                "password_changed": True,
+                "updated_at": datetime.utcnow()
+            }}
+        )
+        await coach_cache.invalidate(coach_id)
+        
+        logger.info(f"Password changed successfully for coach {coach_id}")
+        
+        return {
+            "message": "Password changed successfully. Please use your new password to log in.",
+            "has_reset_password": True
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error changing password: {e}")
+        raise HTTPException(status_code=500, detail="Failed to change password")
+
+# ========== PLAYER AUTHENTICATION ENDPOINTS ==========
+
+# Player Login
+@router.post("/player/auth/login", response_model=PlayerAuthResponse)
+async def player_login(request: PlayerSignInRequest):
+    """Player login endpoint"""
+    try:
+        response = supabase.auth.sign_in_with_password({
+            "email": request.email,
+            "password": request.password
+        })
+        
+        if response.user:
+            # Verify this is a player account
+            player = await db.players.find_one({"supabase_user_id": response.user.id})
+            if not player:
+                raise HTTPException(status_code=403, detail="Account is not associated with a player profile")
+            
+            return PlayerAuthResponse(
+                player=response.user.model_dump() if hasattr(response.user, 'model_dump') else dict(response.user),
+                session=response.session.model_dump() if hasattr(response.session, 'model_dump') else dict(response.session),
+                message="Player login successful"
+            )
+        else:
+            raise HTTPException(status_code=401, detail="Invalid email or password")
+            
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Player login error: {e}")
+        raise HTTPException(status_code=400, detail="Login failed")
+
+# Update Player Password
+@router.put("/player/change-password")
+async def change_player_password(request: PlayerPasswordChangeRequest, user_info = Depends(require_player_user)):
+    """Change player password"""
+    try:
+        # Verify current password by attempting to sign in
+        try:
+            supabase.auth.sign_in_with_password({
+                "email": user_info["user"].email,
+                "password": request.current_password
+            })
+        except Exception as e:
+            # SECURITY FIX: Catch specific exception instead of bare except
+            logger.error(f"Password verification error: {e}")
+            raise HTTPException(status_code=400, detail="Current password is incorrect")
+        
+        # Update password in Supabase
+        supabase.auth.update_user({
+            "password": request.new_password
+        })
+        
+        # Mark password as changed in database
+        await db.players.update_one(
+            {"id": user_info["player_id"]},
+            {"$set": {"password_changed": True, "updated_at": datetime.utcnow()}}
+        )
+        
+        return {"message": "Password changed successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error changing player password: {e}")
+        raise HTTPException(status_code=500, detail="Failed to change password")
@@ -0,0 +1,584 @@
+"""
+Subscription plans, academy subscriptions and manual billing.
+"""
+import logging
+from datetime import datetime
+from typing import List, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.constants import SUBSCRIPTION_PLANS
+from app.core import db
+from app.dependencies import get_current_user, require_super_admin
+from app.models import (AcademySubscription, ManualPaymentCreate, ManualPaymentUpdate, PaymentTransaction,
+                        SubscriptionManualCreate, SubscriptionManualUpdate)
+from utils.http_cache import StaticPayload
+from utils.pagination import Page, PageParams, fetch_page
+from utils.serialization import FastJSONResponse, rows_from_db
+from utils.streaming import projection_for, stream_cursor
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# Stripe configuration - REMOVED for manual billing
+# stripe_api_key = os.environ.get('STRIPE_API_KEY')
+# if not stripe_api_key:
+#     raise ValueError("Missing STRIPE_API_KEY environment variable")
+stripe_api_key = None  # Disabled for manual billing
+
+# ========== BILLING AND SUBSCRIPTION ENDPOINTS ==========
+
+# Get Available Subscription Plans
+SUBSCRIPTION_PLANS_PAYLOAD = StaticPayload({"plans": SUBSCRIPTION_PLANS})
+
+@router.get("/billing/plans")
+async def get_subscription_plans(request: Request):
+    """Get all available subscription plans with pricing"""
+    try:
+        return SUBSCRIPTION_PLANS_PAYLOAD.response(request)
+    except Exception as e:
+        logger.error(f"Error fetching subscription plans: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch subscription plans")
+
+# Get Academy Subscription Status
+@router.get("/billing/academy/{academy_id}/subscription")
+async def get_academy_subscription(academy_id: str, current_user = Depends(get_current_user)):
+    """Get current subscription status for an academy"""
+    try:
+        # TODO: Add proper authorization (admin or academy owner)
+        
+        subscription = await db.academy_subscriptions.find_one({"academy_id": academy_id})
+        if not subscription:
+            return {"subscription": None, "status": "no_subscription"}
+        
+        return {"subscription": AcademySubscription(**subscription)}
+    except Exception as e:
+        logger.error(f"Error fetching academy subscription: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch subscription")
+
+# DISABLED: Stripe payment session creation - removed for manual billing
+# @router.post("/billing/create-payment-session")
+# async def create_payment_session(request: PaymentSessionRequest, http_request: Request, current_user = Depends(get_current_user)):
+#     """Create Stripe payment session for academy subscription"""
+#     try:
+#         # Check if Stripe is enabled
+#         if not stripe_api_key:
+#             raise HTTPException(status_code=503, detail="Payment processing is currently disabled. Please contact support for manual billing.")
+#         
+#         # Validate academy exists
+#         academy = await db.academies.find_one({"id": request.academy_id})
+#         if not academy:
+#             raise HTTPException(status_code=404, detail="Academy not found")
+#         
+#         # Get plan pricing - support custom amounts
+#         plan_key = f"starter_{request.billing_cycle}"  # Default plan
+#         if plan_key not in SUBSCRIPTION_PLANS:
+#             raise HTTPException(status_code=400, detail="Invalid billing cycle")
+#         
+#         # For now, use default pricing - in future, support custom amounts per academy
+#         amount = SUBSCRIPTION_PLANS[plan_key]["price"]
+#         
+#         # Initialize Stripe
+#         host_url = str(http_request.base_url).rstrip('/')
+#         webhook_url = f"{host_url}/api/webhook/stripe"
+#         stripe_checkout = StripeCheckout(api_key=stripe_api_key, webhook_url=webhook_url)
+#         
+#         # Build dynamic URLs from frontend origin
+#         success_url = f"{request.origin_url}/billing/success?session_id={{CHECKOUT_SESSION_ID}}"
+#         cancel_url = f"{request.origin_url}/billing/cancel"
+#         
+#         # Create checkout session
+#         checkout_request = CheckoutSessionRequest(
+#             amount=amount,
+#             currency="usd",
+#             success_url=success_url,
+#             cancel_url=cancel_url,
+#             metadata={
+#                 "academy_id": request.academy_id,
+#                 "billing_cycle": request.billing_cycle,
+#                 "source": "academy_subscription",
+#                 "plan": plan_key
+#             }
+#         )
+#         
+#         session: CheckoutSessionResponse = await stripe_checkout.create_checkout_session(checkout_request)
+#         
+#         # Create payment transaction record
+#         payment_transaction = PaymentTransaction(
+#             academy_id=request.academy_id,
+#             session_id=session.session_id,
+#             amount=amount,
+#             currency="usd",
+#             payment_status="pending",
+#             stripe_status="pending",
+#             billing_cycle=request.billing_cycle,
+#             description=f"Subscription - {SUBSCRIPTION_PLANS[plan_key]['name']}",
+#             metadata=checkout_request.metadata
+#         )
+#         
+#         await db.payment_transactions.insert_one(payment_transaction.dict())
+#         
+#         logger.info(f"Payment session created for academy {request.academy_id}: {session.session_id}")
+#         return {"checkout_url": session.url, "session_id": session.session_id}
+#         
+#     except HTTPException:
+#         raise
+#     except Exception as e:
+#         logger.error(f"Error creating payment session: {e}")
+#         raise HTTPException(status_code=500, detail="Failed to create payment session")
+
+# DISABLED: Stripe payment status check - removed for manual billing
+# @router.get("/billing/payment-status/{session_id}")
+# async def check_payment_status(session_id: str, http_request: Request):
+#     """Check the status of a payment session and update subscription if paid"""
+#     try:
+#         # Check if Stripe is enabled
+#         if not stripe_api_key:
+#             raise HTTPException(status_code=503, detail="Payment processing is currently disabled. Please contact support for manual billing.")
+#         
+#         # Initialize Stripe
+#         host_url = str(http_request.base_url).rstrip('/')
+#         webhook_url = f"{host_url}/api/webhook/stripe"
+#         stripe_checkout = StripeCheckout(api_key=stripe_api_key, webhook_url=webhook_url)
+#         
+#         # Get payment status from Stripe
+#         checkout_status: CheckoutStatusResponse = await stripe_checkout.get_checkout_status(session_id)
+#         
+#         # Find payment transaction
+#         payment_transaction = await db.payment_transactions.find_one({"session_id": session_id})
+#         if not payment_transaction:
+#             raise HTTPException(status_code=404, detail="Payment transaction not found")
+#         
+#         # Update payment transaction status
+#         update_data = {
+#             "payment_status": checkout_status.payment_status,
+#             "stripe_status": checkout_status.status,
+#             "updated_at": datetime.utcnow()
+#         }
+#         
+#         await db.payment_transactions.update_one(
+#             {"session_id": session_id},
+#             {"$set": update_data}
+#         )
+#         
+#         # If payment is successful and not already processed
+#         if checkout_status.payment_status == "paid" and payment_transaction.get("payment_status") != "paid":
+#             await process_successful_payment(payment_transaction, checkout_status)
+#         
+#         return {
+#             "payment_status": checkout_status.payment_status,
+#             "status": checkout_status.status,
+#             "amount_total": checkout_status.amount_total,
+#             "currency": checkout_status.currency
+#         }
+#         
+#     except HTTPException:
+#         raise
+#     except Exception as e:
+#         logger.error(f"Error checking payment status: {e}")
+#         raise HTTPException(status_code=500, detail="Failed to check payment status")
+
+# DISABLED: Stripe payment processing function - removed for manual billing
+# async def process_successful_payment(payment_transaction: dict, checkout_status: CheckoutStatusResponse):
+#     """Process successful payment and create/update subscription"""
+#     try:
+#         academy_id = payment_transaction["academy_id"]
+#         billing_cycle = payment_transaction["billing_cycle"]
+#         
+#         # Calculate subscription period
+#         start_date = datetime.utcnow()
+#         if billing_cycle == "monthly":
+#             end_date = start_date + timedelta(days=30)
+#         elif billing_cycle == "annual":
+#             end_date = start_date + timedelta(days=365)
+#         else:
+#             raise ValueError(f"Invalid billing cycle: {billing_cycle}")
+#         
+#         # Check if academy already has a subscription
+#         existing_subscription = await db.academy_subscriptions.find_one({"academy_id": academy_id})
+#         
+#         if existing_subscription:
+#             # Update existing subscription
+#             update_data = {
+#                 "billing_cycle": billing_cycle,
+#                 "amount": payment_transaction["amount"],
+#                 "status": "active",
+#                 "current_period_start": start_date,
+#                 "current_period_end": end_date,
+#                 "updated_at": start_date
+#             }
+#             
+#             await db.academy_subscriptions.update_one(
+#                 {"academy_id": academy_id},
+#                 {"$set": update_data}
+#             )
+#             
+#             logger.info(f"Updated subscription for academy {academy_id}")
+#         else:
+#             # Create new subscription
+#             subscription = AcademySubscription(
+#                 academy_id=academy_id,
+#                 plan_id="starter",  # Default plan for now
+#                 billing_cycle=billing_cycle,
+#                 amount=payment_transaction["amount"],
+#                 current_period_start=start_date,
+#                 current_period_end=end_date,
+#                 status="active"
+#             )
+#             
+#             await db.academy_subscriptions.insert_one(subscription.dict())
+#             logger.info(f"Created new subscription for academy {academy_id}")
+#         
+#     except Exception as e:
+#         logger.error(f"Error processing successful payment: {e}")
+#         raise
+
+# DISABLED: Stripe webhook handler - removed for manual billing
+# @router.post("/webhook/stripe")
+# async def stripe_webhook(request: Request):
+#     """Handle Stripe webhooks for payment events"""
+#     try:
+#         # Check if Stripe is enabled
+#         if not stripe_api_key:
+#             raise HTTPException(status_code=503, detail="Payment processing is currently disabled.")
+#         
+#         # Get request body as bytes
+#         body = await request.body()
+#         stripe_signature = request.headers.get("stripe-signature", "")
+#         
+#         # Initialize Stripe
+#         host_url = str(request.base_url).rstrip('/')
+#         webhook_url = f"{host_url}/api/webhook/stripe"
+#         stripe_checkout = StripeCheckout(api_key=stripe_api_key, webhook_url=webhook_url)
+#         
+#         # Handle webhook
+#         webhook_response = await stripe_checkout.handle_webhook(body, stripe_signature)
+#         
+#         # Process webhook event based on type
+#         if webhook_response.event_type in ["checkout.session.completed", "payment_intent.succeeded"]:
+#             # Find and update payment transaction
+#             payment_transaction = await db.payment_transactions.find_one({"session_id": webhook_response.session_id})
+#             if payment_transaction and payment_transaction.get("payment_status") != "paid":
+#                 
+#                 # Update payment status
+#                 await db.payment_transactions.update_one(
+#                     {"session_id": webhook_response.session_id},
+#                     {"$set": {
+#                         "payment_status": "paid",
+#                         "stripe_status": "completed",
+#                         "updated_at": datetime.utcnow()
+#                     }}
+#                 )
+#                 
+#                 # Process successful payment
+#                 checkout_status = CheckoutStatusResponse(
+#                     status="complete",
+#                     payment_status="paid",
+#                     amount_total=int(payment_transaction["amount"] * 100),  # Convert to cents
+#                     currency=payment_transaction["currency"],
+#                     metadata=webhook_response.metadata or {}
+#                 )
+#                 
+#                 await process_successful_payment(payment_transaction, checkout_status)
+#                 logger.info(f"Webhook processed: payment completed for session {webhook_response.session_id}")
+#         
+#         return {"status": "success"}
+#         
+#     except Exception as e:
+#         logger.error(f"Error processing webhook: {e}")
+#         raise HTTPException(status_code=500, detail="Webhook processing failed")
+
+# Admin: Get All Subscriptions
+@router.get("/admin/billing/subscriptions", response_model=Union[List[AcademySubscription], Page[AcademySubscription]])
+async def get_all_subscriptions(page: PageParams = Depends(), admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to get all academy subscriptions"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        subscriptions, next_cursor = await fetch_page(
+            db.academy_subscriptions, {}, sort_field="created_at", direction=1,
+            limit=page.page_limit(1000), position=page.position
+        )
+        return FastJSONResponse(page.respond(rows_from_db(subscriptions, AcademySubscription), next_cursor))
+    except Exception as e:
+        logger.error(f"Error fetching subscriptions: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch subscriptions")
+
+# Admin: Get All Payment Transactions
+@router.get("/admin/billing/transactions", response_model=Union[List[PaymentTransaction], Page[PaymentTransaction]])
+async def get_payment_transactions(
+    request: Request,
+    stream: bool = False,
+    page: PageParams = Depends(),
+    admin_user = Depends(require_super_admin)
+):
+    """Admin-only endpoint to get all payment transactions (?stream=1 for a full export)"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        if stream:
+            transactions_cursor = db.payment_transactions.find(
+                {}, projection_for(PaymentTransaction)
+            ).sort([("created_at", -1), ("id", -1)])
+            return stream_cursor(transactions_cursor, request)
+
+        transactions, next_cursor = await fetch_page(
+            db.payment_transactions, {}, sort_field="created_at", direction=-1,
+            limit=page.page_limit(1000), position=page.position
+        )
+        return FastJSONResponse(page.respond(rows_from_db(transactions, PaymentTransaction), next_cursor))
+    except Exception as e:
+        logger.error(f"Error fetching payment transactions: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch payment transactions")
+
+# Admin: Update Academy Subscription
+@router.put("/admin/billing/academy/{academy_id}/subscription")
+async def update_academy_subscription(
+    academy_id: str,
+    subscription_data: dict,
+    admin_user = Depends(require_super_admin)
+):
+    """Admin-only endpoint to manually update academy subscription"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Check if academy exists
+        academy = await db.academies.find_one({"id": academy_id})
+        if not academy:
+            raise HTTPException(status_code=404, detail="Academy not found")
+        
+        # Update subscription
+        subscription_data["updated_at"] = datetime.utcnow()
+        
+        result = await db.academy_subscriptions.update_one(
+            {"academy_id": academy_id},
+            {"$set": subscription_data},
+            upsert=True
+        )
+        
+        # Get updated subscription
+        updated_subscription = await db.academy_subscriptions.find_one({"academy_id": academy_id})
+        
+        return {"message": "Subscription updated successfully", "subscription": updated_subscription}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating academy subscription: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update subscription")
+
+# ========== MANUAL BILLING ENDPOINTS ==========
+
+# Admin: Create Manual Payment Record
+@router.post("/admin/billing/payments/manual", response_model=PaymentTransaction)
+async def create_manual_payment(payment_data: ManualPaymentCreate, admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to create manual payment records"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Verify academy exists
+        academy = await db.academies.find_one({"id": payment_data.academy_id})
+        if not academy:
+            raise HTTPException(status_code=404, detail="Academy not found")
+        
+        # Create payment transaction
+        payment_transaction = PaymentTransaction(
+            academy_id=payment_data.academy_id,
+            amount=payment_data.amount,
+            currency="inr",
+            payment_method=payment_data.payment_method,
+            payment_date=payment_data.payment_date,
+            payment_status="paid",  # Manual payments are typically already paid
+            billing_cycle=payment_data.billing_cycle,
+            description=payment_data.description,
+            admin_notes=payment_data.admin_notes,
+            receipt_url=payment_data.receipt_url
+        )
+        
+        # Save to database
+        await db.payment_transactions.insert_one(payment_transaction.dict())
+        
+        return payment_transaction
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating manual payment: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create manual payment")
+
+# Admin: Update Manual Payment Record
+@router.put("/admin/billing/payments/{payment_id}", response_model=PaymentTransaction)
+async def update_manual_payment(
+    payment_id: str,
+    payment_data: ManualPaymentUpdate,
+    admin_user = Depends(require_super_admin)
+):
+    """Admin-only endpoint to update manual payment records"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Check if payment exists
+        existing_payment = await db.payment_transactions.find_one({"id": payment_id})
+        if not existing_payment:
+            raise HTTPException(status_code=404, detail="Payment transaction not found")
+        
+        # Prepare update data (only include non-None fields)
+        update_data = {k: v for k, v in payment_data.dict().items() if v is not None}
+        update_data["updated_at"] = datetime.utcnow()
+        
+        # Update payment transaction
+        await db.payment_transactions.update_one(
+            {"id": payment_id},
+            {"$set": update_data}
+        )
+        
+        # Get updated payment
+        updated_payment = await db.payment_transactions.find_one({"id": payment_id})
+        
+        return PaymentTransaction(**updated_payment)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating manual payment: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update manual payment")
+
+# Admin: Get Payment History for Academy
+@router.get("/admin/billing/academy/{academy_id}/payments", response_model=List[PaymentTransaction])
+async def get_academy_payment_history(academy_id: str, admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to get payment history for specific academy"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Verify academy exists
+        academy = await db.academies.find_one({"id": academy_id})
+        if not academy:
+            raise HTTPException(status_code=404, detail="Academy not found")
+        
+        # Get payment history
+        payments = await db.payment_transactions.find(
+            {"academy_id": academy_id}
+        ).sort("created_at", -1).to_list(1000)
+        
+        return [PaymentTransaction(**payment) for payment in payments]
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching academy payment history: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch payment history")
+
+# Admin: Create Manual Subscription
+@router.post("/admin/billing/subscriptions/manual", response_model=AcademySubscription)
+async def create_manual_subscription(subscription_data: SubscriptionManualCreate, admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to create manual subscriptions"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Verify academy exists
+        academy = await db.academies.find_one({"id": subscription_data.academy_id})
+        if not academy:
+            raise HTTPException(status_code=404, detail="Academy not found")
+        
+        # Verify plan exists
+        if subscription_data.plan_id not in SUBSCRIPTION_PLANS:
+            raise HTTPException(status_code=404, detail="Subscription plan not found")
+        
+        # Get plan details
+        plan = SUBSCRIPTION_PLANS[subscription_data.plan_id]
+        
+        # Determine amount (use custom amount or plan price)
+        amount = subscription_data.custom_amount if subscription_data.custom_amount else plan["price"]
+        
+        # Create subscription
+        subscription = AcademySubscription(
+            academy_id=subscription_data.academy_id,
+            plan_id=subscription_data.plan_id,
+            billing_cycle=subscription_data.billing_cycle,
+            amount=amount,
+            currency="inr",
+            status=subscription_data.status,
+            current_period_start=subscription_data.current_period_start,
+            current_period_end=subscription_data.current_period_end,
+            auto_renew=subscription_data.auto_renew,
+            notes=subscription_data.notes
+        )
+        
+        # Save to database (upsert to replace existing subscription)
+        await db.academy_subscriptions.update_one(
+            {"academy_id": subscription_data.academy_id},
+            {"$set": subscription.dict()},
+            upsert=True
+        )
+        
+        return subscription
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating manual subscription: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create manual subscription")
+
+# Admin: Update Manual Subscription
+@router.put("/admin/billing/subscriptions/{subscription_id}", response_model=AcademySubscription)
+async def update_manual_subscription(
+    subscription_id: str,
+    subscription_data: SubscriptionManualUpdate,
+    admin_user = Depends(require_super_admin)
+):
+    """Admin-only endpoint to update manual subscriptions"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Check if subscription exists
+        existing_subscription = await db.academy_subscriptions.find_one({"id": subscription_id})
+        if not existing_subscription:
+            raise HTTPException(status_code=404, detail="Subscription not found")
+        
+        # Prepare update data (only include non-None fields)
+        update_data = {k: v for k, v in subscription_data.dict().items() if v is not None}
+        update_data["updated_at"] = datetime.utcnow()
+        
+        # If plan_id is being updated, validate it exists and update amount if no custom amount
+        if "plan_id" in update_data and update_data["plan_id"] not in SUBSCRIPTION_PLANS:
+            raise HTTPException(status_code=404, detail="Subscription plan not found")
+        
+        # Update subscription
+        await db.academy_subscriptions.update_one(
+            {"id": subscription_id},
+            {"$set": update_data}
+        )
+        
+        # Get updated subscription
+        updated_subscription = await db.academy_subscriptions.find_one({"id": subscription_id})
+        
+        return AcademySubscription(**updated_subscription)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating manual subscription: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update manual subscription")
+
+# Admin: Delete Payment Transaction
+@router.delete("/admin/billing/payments/{payment_id}")
+async def delete_payment_transaction(payment_id: str, admin_user = Depends(require_super_admin)):
+    """Admin-only endpoint to delete payment transactions"""
+    try:
+        # SECURITY FIX: Now using require_super_admin dependency
+
+        # Check if payment exists
+        existing_payment = await db.payment_transactions.find_one({"id": payment_id})
+        if not existing_payment:
+            raise HTTPException(status_code=404, detail="Payment transaction not found")
+        
+        # Delete payment transaction
+        await db.payment_transactions.delete_one({"id": payment_id})
+        
+        return {"message": "Payment transaction deleted successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting payment transaction: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete payment transaction")
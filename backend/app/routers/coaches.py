@@ -0,0 +1,854 @@
+"""
+Coach management and the coach portal (dashboard, attendance,
+performance, notifications).
+"""
+import logging
+import uuid
+from datetime import datetime
+from typing import List, Optional, Union
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.accounts import create_coach_supabase_account, generate_default_password
+from app.core import db, supabase_admin
+from app.dependencies import require_academy_user, require_coach_user
+from app.events import publish_attendance
+from app.fieldsets import player_fieldset
+from app.notifications import notification_fieldset, notification_store
+from app.models import (AttendanceMarkingRequest, Coach, CoachCreate, CoachResponse, CoachUpdate, Notification,
+                        PerformanceMetricsCreate, PlayerPerformanceAnalytics, PlayerResponse)
+from app.reference import coaches as coach_cache
+from app.reference import get_academy
+from utils.fieldsets import FieldSelection, sparse_fields
+from utils.pagination import Page, PageParams, fetch_page
+from utils.raw_bson import raw_fastpath_enabled, raw_find_page, raw_page_response
+from utils.serialization import FastJSONResponse, row_from_db, rows_from_db
+from utils.streaming import projection_for
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# ============================================
+# COACH-SPECIFIC ENDPOINTS
+# ============================================
+
+# Get coaches by sport (Public/Academy endpoint for dropdown)
+@router.get("/coaches/by-sport")
+async def get_coaches_by_sport(sport: str, user_info = Depends(require_academy_user)):
+    """Get all coaches who handle a specific sport"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Find coaches who have this sport in their sports array
+        coaches_cursor = db.coaches.find({
+            "academy_id": academy_id,
+            "sports": sport,
+            "status": "active"
+        })
+        
+        coaches = await coaches_cursor.to_list(length=None)
+        
+        # Return simplified coach info for dropdown
+        coach_list = [
+            {
+                "id": coach["id"],
+                "name": f"{coach['first_name']} {coach['last_name']}",
+                "specialization": coach.get("specialization")
+            }
+            for coach in coaches
+        ]
+        
+        return coach_list
+        
+    except Exception as e:
+        logger.error(f"Error fetching coaches by sport: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch coaches")
+
+# Get coach dashboard data
+@router.get("/coach/dashboard")
+async def get_coach_dashboard(user_info = Depends(require_coach_user)):
+    """Get dashboard data for the authenticated coach"""
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+        coach = user_info["coach"]
+        
+        # Get assigned players
+        players_cursor = db.players.find({
+            "coach_id": coach_id,
+            "academy_id": academy_id,
+            "status": "active"
+        })
+        players = await players_cursor.to_list(length=None)
+        
+        # Group players by sport
+        players_by_sport = {}
+        for player in players:
+            sport = player.get("sport", "Other")
+            if sport not in players_by_sport:
+                players_by_sport[sport] = []
+            players_by_sport[sport].append({
+                "id": player["id"],
+                "name": f"{player['first_name']} {player['last_name']}",
+                "registration_number": player.get("registration_number"),
+                "position": player.get("position")
+            })
+        
+        # Calculate statistics
+        total_players = len(players)
+        stats_by_sport = {
+            sport: len(player_list) 
+            for sport, player_list in players_by_sport.items()
+        }
+        
+        # Get recent attendance summary
+        today = datetime.utcnow().date().isoformat()
+        attendance_records = await db.player_attendance.count_documents({
+            "academy_id": academy_id,
+            "player_id": {"$in": [p["id"] for p in players]},
+            "date": today,
+            "present": True
+        })
+        academy = await get_academy(academy_id)
+        academy_summary = {key: academy.get(key) for key in ("id", "name", "logo_url")} if academy else None
+        
+        return {
+            "coach": {
+                "id": coach["id"],
+                "name": f"{coach['first_name']} {coach['last_name']}",
+                "email": coach.get("email"),
+                "sports": coach.get("sports", []),
+                "specialization": coach.get("specialization"),
+                "profile_picture_url": coach.get("profile_picture_url"),
+                "description": coach.get("description")
+            },
+            "academy": academy_summary,
+            "summary": {
+                "total_players": total_players,
+                "stats_by_sport": stats_by_sport,
+                "today_attendance": attendance_records
+            },
+            "players_by_sport": players_by_sport
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching coach dashboard: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch dashboard data")
+
+# Get all players assigned to coach
+@router.get("/coach/players", response_model=Union[List[PlayerResponse], Page[PlayerResponse]])
+async def get_coach_players(
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(player_fieldset),
+    user_info = Depends(require_coach_user)
+):
+    """Get all players assigned to the authenticated coach"""
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+        
+        # Get all players assigned to this coach
+        players_filter = {
+            "coach_id": coach_id,
+            "academy_id": academy_id,
+            "status": "active"
+        }
+        
+        if raw_fastpath_enabled() and not fieldset.selected:
+            raw_players, next_cursor = await raw_find_page(
+                db.players, players_filter, projection_for(PlayerResponse),
+                sort_field="created_at", direction=1, limit=page.page_limit(None), position=page.position
+            )
+            return raw_page_response(page, raw_players, next_cursor)
+        
+        players, next_cursor = await fetch_page(
+            db.players, players_filter, sort_field="created_at", direction=1,
+            limit=page.page_limit(None), position=page.position,
+            projection=fieldset.projection(extra=("created_at",))
+        )
+        
+        # Trusted DB rows: shape them like PlayerResponse without validating each one twice
+        player_list = fieldset.trim_rows(rows_from_db(players, PlayerResponse))
+        
+        return FastJSONResponse(page.respond(player_list, next_cursor))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching coach players: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch players")
+
+# Update coach profile
+@router.put("/coach/profile")
+async def update_coach_profile(
+    profile_picture_url: Optional[str] = None,
+    description: Optional[str] = None,
+    user_info = Depends(require_coach_user)
+):
+    """Update coach's profile picture and description"""
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+        
+        # Prepare update data
+        update_data = {
+            "updated_at": datetime.utcnow()
+        }
+        
+        if profile_picture_url is not None:
+            update_data["profile_picture_url"] = profile_picture_url
+        
+        if description is not None:
+            update_data["description"] = description
+        
+        # Update coach
+        await db.coaches.update_one(
+            {"id": coach_id, "academy_id": academy_id},
+            {"$set": update_data}
+        )
+        await coach_cache.invalidate(coach_id)
+        
+        # Get updated coach
+        updated_coach = await db.coaches.find_one({"id": coach_id})
+        
+        return Coach(**updated_coach)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating coach profile: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update profile")
+
+# Coach: Mark attendance for their players
+@router.post("/coach/attendance")
+async def coach_mark_attendance(attendance_data: AttendanceMarkingRequest, user_info = Depends(require_coach_user)):
+    """Coach marks attendance for their assigned players"""
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+        
+        # Verify all players belong to this coach
+        player_ids = [record.player_id for record in attendance_data.attendance_records]
+        coach_players = await db.players.count_documents({
+            "id": {"$in": player_ids},
+            "coach_id": coach_id,
+            "academy_id": academy_id
+        })
+        
+        if coach_players != len(player_ids):
+            raise HTTPException(
+                status_code=403,
+                detail="You can only mark attendance for players assigned to you"
+            )
+        
+        # Process attendance records (same logic as academy endpoint)
+        results = []
+        for record in attendance_data.attendance_records:
+            attendance_id = str(uuid.uuid4())
+            attendance_doc = {
+                "id": attendance_id,
+                "player_id": record.player_id,
+                "academy_id": academy_id,
+                "date": attendance_data.date,
+                "present": record.present,
+                "sport": record.sport,
+                "performance_ratings": record.performance_ratings or {},
+                "notes": record.notes,
+                "marked_by": coach_id,
+                "marked_by_role": "coach",
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow()
+            }
+            
+            # Check if record exists
+            existing = await db.player_attendance.find_one({
+                "player_id": record.player_id,
+                "academy_id": academy_id,
+                "date": attendance_data.date
+            })
+            
+            if existing:
+                changes = {
+                    "present": record.present,
+                    "sport": record.sport,
+                    "performance_ratings": record.performance_ratings or {},
+                    "notes": record.notes,
+                    "updated_at": datetime.utcnow()
+                }
+                await db.player_attendance.update_one({"id": existing["id"]}, {"$set": changes})
+                publish_attendance({**existing, **changes})
+                results.append({"player_id": record.player_id, "status": "updated"})
+            else:
+                await db.player_attendance.insert_one(attendance_doc)
+                publish_attendance(attendance_doc)
+                results.append({"player_id": record.player_id, "status": "created"})
+        
+        return {
+            "message": "Attendance marked successfully",
+            "date": attendance_data.date,
+            "results": results
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error marking attendance: {e}")
+        raise HTTPException(status_code=500, detail="Failed to mark attendance")
+
+# Coach: Get attendance for a specific date (players assigned to coach)
+@router.post("/coach/attendance/{date}")
+async def coach_get_attendance_by_date(date: str, user_info = Depends(require_coach_user)):
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+
+        attendance_cursor = db.player_attendance.find({
+            "academy_id": academy_id,
+            "date": date
+        })
+        attendance_records = await attendance_cursor.to_list(length=None)
+
+        results = []
+        for record in attendance_records:
+            player = await db.players.find_one({"id": record["player_id"], "academy_id": academy_id})
+            # Only include players assigned to this coach
+            if not player or player.get("coach_id") != coach_id:
+                continue
+            results.append({
+                "attendance_id": record["id"],
+                "player_id": record["player_id"],
+                "player_name": f"{player['first_name']} {player['last_name']}",
+                "present": record.get("present", False),
+                "performance_ratings": record.get("performance_ratings", {}),
+                "notes": record.get("notes"),
+                "marked_at": record.get("created_at")
+            })
+
+        return {"date": date, "attendance_records": results}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching coach attendance for {date}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch attendance")
+
+# Coach: Add performance metrics for their players
+@router.post("/coach/performance")
+async def coach_add_performance(performance: PerformanceMetricsCreate, user_info = Depends(require_coach_user)):
+    """Coach adds performance metrics for their assigned players"""
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+        
+        # Verify player belongs to this coach
+        player = await db.players.find_one({
+            "id": performance.player_id,
+            "coach_id": coach_id,
+            "academy_id": academy_id
+        })
+        
+        if not player:
+            raise HTTPException(
+                status_code=403,
+                detail="You can only add performance metrics for players assigned to you"
+            )
+        
+        # Check if attendance record exists and player was present
+        attendance_record = await db.player_attendance.find_one({
+            "player_id": performance.player_id,
+            "academy_id": academy_id,
+            "date": performance.date
+        })
+        
+        if not attendance_record:
+            raise HTTPException(status_code=400, detail="Attendance must be marked before adding performance metrics")
+        
+        if not attendance_record.get("present"):
+            raise HTTPException(status_code=400, detail="Performance can only be added for players who were present")
+        
+        # Create performance document
+        performance_id = str(uuid.uuid4())
+        performance_doc = {
+            "id": performance_id,
+            "player_id": performance.player_id,
+            "academy_id": academy_id,
+            "coach_id": coach_id,
+            "date": performance.date,
+            "speed": performance.speed,
+            "agility": performance.agility,
+            "movement": performance.movement,
+            "pace": performance.pace,
+            "stamina": performance.stamina,
+            "overall_rating": performance.overall_rating,
+            "notes": performance.notes,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        
+        # Check if performance already exists for this player and date
+        existing = await db.performance_metrics.find_one({
+            "player_id": performance.player_id,
+            "academy_id": academy_id,
+            "date": performance.date
+        })
+        
+        if existing:
+            # Update existing performance
+            await db.performance_metrics.update_one(
+                {"id": existing["id"]},
+                {"$set": {
+                    "speed": performance.speed,
+                    "agility": performance.agility,
+                    "movement": performance.movement,
+                    "pace": performance.pace,
+                    "stamina": performance.stamina,
+                    "overall_rating": performance.overall_rating,
+                    "notes": performance.notes,
+                    "updated_at": datetime.utcnow()
+                }}
+            )
+            return {"message": "Performance metrics updated successfully", "performance_id": existing["id"]}
+        else:
+            # Insert new performance
+            await db.performance_metrics.insert_one(performance_doc)
+            return {"message": "Performance metrics saved successfully", "performance_id": performance_id}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error saving performance metrics: {e}")
+        raise HTTPException(status_code=500, detail="Failed to save performance metrics")
+
+@router.get("/coach/players/{player_id}/performance", response_model=PlayerPerformanceAnalytics)
+async def coach_get_player_performance(player_id: str, user_info = Depends(require_coach_user)):
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+
+        player = await db.players.find_one({"id": player_id, "academy_id": academy_id, "coach_id": coach_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found or not assigned to coach")
+
+        all_sessions_cursor = db.player_attendance.find({"player_id": player_id, "academy_id": academy_id})
+        all_sessions = await all_sessions_cursor.to_list(length=None)
+
+        total_sessions = len(all_sessions)
+        attended_sessions_records = [s for s in all_sessions if s.get("present")]
+        attended_sessions = len(attended_sessions_records)
+        attendance_percentage = (attended_sessions / total_sessions * 100) if total_sessions > 0 else 0
+
+        perf_cursor = db.performance_metrics.find({"player_id": player_id, "academy_id": academy_id})
+        perf_records = await perf_cursor.to_list(length=None)
+
+        all_ratings = [rec.get("overall_rating") for rec in perf_records if rec.get("overall_rating") is not None]
+        average_rating = round(sum(all_ratings) / len(all_ratings), 2) if all_ratings else None
+
+        performance_trend = sorted([
+            {
+                "date": rec["date"],
+                "rating": rec.get("overall_rating"),
+                "speed": rec.get("speed"),
+                "agility": rec.get("agility"),
+                "movement": rec.get("movement"),
+                "pace": rec.get("pace"),
+                "stamina": rec.get("stamina"),
+                "notes": rec.get("notes", "")
+            }
+            for rec in perf_records
+            if rec.get("overall_rating") is not None
+        ], key=lambda x: x["date"])
+
+        monthly_stats = {}
+        perf_map = {rec["date"]: rec.get("overall_rating") for rec in perf_records if rec.get("overall_rating") is not None}
+        for record in all_sessions:
+            month_key = record["date"][:7]
+            if month_key not in monthly_stats:
+                monthly_stats[month_key] = {"total_sessions": 0, "attended_sessions": 0, "ratings": []}
+            monthly_stats[month_key]["total_sessions"] += 1
+            if record.get("present"):
+                monthly_stats[month_key]["attended_sessions"] += 1
+                r = perf_map.get(record["date"]) 
+                if r is not None:
+                    monthly_stats[month_key]["ratings"].append(r)
+        for month, stats in monthly_stats.items():
+            stats["attendance_percentage"] = (stats["attended_sessions"] / stats["total_sessions"] * 100) if stats["total_sessions"] > 0 else 0
+            stats["average_rating"] = round(sum(stats["ratings"]) / len(stats["ratings"]), 2) if stats["ratings"] else None
+            del stats["ratings"]
+
+        return PlayerPerformanceAnalytics(
+            player_id=player_id,
+            player_name=f"{player['first_name']} {player['last_name']}",
+            sport=player.get("sport", "Other"),
+            total_sessions=total_sessions,
+            attended_sessions=attended_sessions,
+            attendance_percentage=round(attendance_percentage, 2),
+            average_rating=average_rating,
+            performance_trend=performance_trend,
+            monthly_stats=monthly_stats
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching coach player performance: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch player performance")
+
+@router.get("/coach/attendance/summary")
+async def coach_get_attendance_summary(start_date: str = None, end_date: str = None, user_info = Depends(require_coach_user)):
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+
+        players_cursor = db.players.find({"coach_id": coach_id, "academy_id": academy_id, "status": "active"})
+        players = await players_cursor.to_list(length=None)
+        player_ids = [p["id"] for p in players]
+
+        date_filter = {"academy_id": academy_id, "player_id": {"$in": player_ids}}
+        if start_date and end_date:
+            date_filter["date"] = {"$gte": start_date, "$lte": end_date}
+        elif start_date:
+            date_filter["date"] = {"$gte": start_date}
+        elif end_date:
+            date_filter["date"] = {"$lte": end_date}
+
+        attendance_cursor = db.player_attendance.find(date_filter)
+        attendance_records = await attendance_cursor.to_list(length=None)
+
+        total_records = len(attendance_records)
+        present_records = sum(1 for record in attendance_records if record.get("present"))
+        overall_attendance_rate = (present_records / total_records * 100) if total_records > 0 else 0
+
+        perf_filter = {"academy_id": academy_id, "player_id": {"$in": player_ids}}
+        if start_date and end_date:
+            perf_filter["date"] = {"$gte": start_date, "$lte": end_date}
+        elif start_date:
+            perf_filter["date"] = {"$gte": start_date}
+        elif end_date:
+            perf_filter["date"] = {"$lte": end_date}
+
+        perf_cursor = db.performance_metrics.find(perf_filter)
+        perf_records = await perf_cursor.to_list(length=None)
+        performance_ratings = [rec.get("overall_rating") for rec in perf_records if rec.get("overall_rating") is not None]
+        average_performance = sum(performance_ratings) / len(performance_ratings) if performance_ratings else None
+
+        return {
+            "date_range": {"start": start_date, "end": end_date},
+            "total_records": total_records,
+            "present_records": present_records,
+            "overall_attendance_rate": round(overall_attendance_rate, 2),
+            "average_performance_rating": round(average_performance, 2) if average_performance else None,
+            "total_performance_ratings": len(performance_ratings)
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching coach attendance summary: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch attendance summary")
+
+# Get coach notifications
+@router.get("/coach/notifications")
+async def get_coach_notifications(
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(notification_fieldset),
+    user_info = Depends(require_coach_user)
+):
+    """Get all notifications for the authenticated coach"""
+    try:
+        coach_id = user_info["coach_id"]
+        
+        # Get notifications sorted by newest first
+        limit = page.page_limit(100)
+        notifications, next_cursor = await notification_store.page(
+            "coach", coach_id, limit=limit, position=page.position,
+            projection=fieldset.projection(extra=("created_at",))
+        )
+        
+        # Shape like Notification (trusted DB rows, no per-row validation)
+        notification_list = fieldset.trim_rows(rows_from_db(notifications, Notification))
+        
+        # Kept per coach, not counted per request
+        unread_count = await notification_store.unread_count("coach", coach_id)
+        
+        return FastJSONResponse({
+            "notifications": notification_list,
+            "unread_count": unread_count,
+            "limit": limit,
+            "next_cursor": next_cursor
+        })
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching notifications: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch notifications")
+
+# Mark notification as read
+@router.put("/coach/notifications/{notification_id}/read")
+async def mark_notification_read(notification_id: str, user_info = Depends(require_coach_user)):
+    """Mark a notification as read"""
+    try:
+        coach_id = user_info["coach_id"]
+        
+        # Only this coach's notifications match
+        if not await notification_store.mark_read("coach", coach_id, notification_id):
+            raise HTTPException(status_code=404, detail="Notification not found")
+        
+        return {"message": "Notification marked as read"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating notification: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update notification")
+
+# Mark all notifications as read
+@router.put("/coach/notifications/read-all")
+async def mark_all_notifications_read(user_info = Depends(require_coach_user)):
+    """Mark all notifications as read for the authenticated coach"""
+    try:
+        coach_id = user_info["coach_id"]
+        
+        # Mark all as read
+        updated_count = await notification_store.mark_all_read("coach", coach_id)
+        
+        return {
+            "message": "All notifications marked as read",
+            "updated_count": updated_count
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating notifications: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update notifications")
+
+
+# Get all coaches for an academy (Academy User)
+# `fields=` whitelist for coach lists (e.g. fields=first_name,last_name for the coach dropdown)
+coach_fieldset = sparse_fields(CoachResponse.model_fields)
+
+@router.get("/academy/coaches", response_model=Union[List[CoachResponse], Page[CoachResponse]])
+async def get_academy_coaches(
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(coach_fieldset),
+    user_info = Depends(require_academy_user)
+):
+    """Get all coaches for the authenticated academy (sensitive fields excluded)"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        if raw_fastpath_enabled() and not fieldset.selected:
+            # Same derived fields as below, computed by the server in the projection
+            projection = projection_for(CoachResponse)
+            projection["has_reset_password"] = {"$ifNull": ["$password_changed", False]}
+            projection["temporary_password"] = {
+                "$cond": [{"$eq": [{"$ifNull": ["$password_changed", False]}, False]}, "$default_password", None]
+            }
+            raw_coaches, next_cursor = await raw_find_page(
+                db.coaches, {"academy_id": academy_id}, projection,
+                sort_field="created_at", direction=1, limit=page.page_limit(None), position=page.position
+            )
+            return raw_page_response(page, raw_coaches, next_cursor)
+        
+        # Get coaches for this academy
+        coaches, next_cursor = await fetch_page(
+            db.coaches, {"academy_id": academy_id}, sort_field="created_at", direction=1,
+            limit=page.page_limit(None), position=page.position,
+            projection=fieldset.projection(extra=("created_at", "password_changed", "default_password"))
+        )
+        
+        # Add has_reset_password field to response
+        coaches_with_status = []
+        for coach in coaches:
+            coach_data = dict(coach)
+            # Use password_changed as has_reset_password
+            coach_data["has_reset_password"] = coach.get("password_changed", False)
+            # Include temporary password if not reset
+            if not coach.get("password_changed", False):
+                coach_data["temporary_password"] = coach.get("default_password")
+            # Keep only CoachResponse fields (drops _id and supabase_user_id)
+            coaches_with_status.append(fieldset.trim(row_from_db(coach_data, CoachResponse)))
+        
+        return FastJSONResponse(page.respond(coaches_with_status, next_cursor))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching academy coaches: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch coaches")
+
+# Create a new coach (Academy User)
+@router.post("/academy/coaches")
+async def create_coach(coach_data: CoachCreate, user_info = Depends(require_academy_user)):
+    """Create a new coach for the authenticated academy with auto-generated login"""
+    try:
+        academy_id = user_info["academy_id"]
+        academy = user_info["academy"]
+        
+        # Check if academy has reached coach limit
+        current_coaches = await db.coaches.count_documents({"academy_id": academy_id, "status": "active"})
+        if current_coaches >= academy.get("coach_limit", 10):
+            raise HTTPException(
+                status_code=400,
+                detail=f"Academy has reached maximum coach limit of {academy.get('coach_limit', 10)}"
+            )
+        
+        # Validate email is provided for creating login
+        if not coach_data.email:
+            raise HTTPException(status_code=400, detail="Email is required to create coach login")
+        
+        # Check if email already exists in Supabase
+        try:
+            # Try to get user by email from Supabase
+            existing_user = supabase_admin.auth.admin.list_users()
+            for user in existing_user:
+                if user.email == coach_data.email:
+                    raise HTTPException(
+                        status_code=409, 
+                        detail="A user with this email already exists"
+                    )
+        except HTTPException:
+            raise
+        except Exception as e:
+            logger.warning(f"Could not verify email uniqueness in Supabase: {e}")
+        
+        # Check if email already exists in local database
+        existing_coach = await db.coaches.find_one({"email": coach_data.email, "academy_id": academy_id})
+        if existing_coach:
+            raise HTTPException(
+                status_code=409, 
+                detail="A coach with this email already exists in this academy"
+            )
+        
+        # Generate secure temporary password
+        default_password = generate_default_password()
+        supabase_user_id = None
+        
+        if coach_data.email:
+            coach_dict = coach_data.dict()
+            coach_dict["academy_id"] = academy_id
+            supabase_user_id = await create_coach_supabase_account(
+                coach_data.email, 
+                default_password, 
+                coach_dict
+            )
+            
+            if not supabase_user_id:
+                raise HTTPException(
+                    status_code=500,
+                    detail="Failed to create coach authentication account"
+                )
+        
+        # Create new coach with has_reset_password flag
+        coach = Coach(
+            academy_id=academy_id,
+            **coach_data.dict(),
+            has_login=bool(supabase_user_id),
+            default_password=default_password,
+            password_changed=False,  # This will be our has_reset_password flag
+            supabase_user_id=supabase_user_id
+        )
+        
+        # Save to database
+        await db.coaches.insert_one(coach.dict())
+        await coach_cache.invalidate(coach.id)
+        
+        # Return coach with temporary password (only shown once)
+        response_data = coach.dict()
+        response_data["temporary_password"] = default_password if supabase_user_id else None
+        response_data["has_reset_password"] = False
+        
+        return response_data
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating coach: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create coach")
+
+# Get specific coach (Academy User)
+@router.get("/academy/coaches/{coach_id}", response_model=CoachResponse)
+async def get_coach(coach_id: str, user_info = Depends(require_academy_user)):
+    """Get specific coach for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Find coach
+        coach = await db.coaches.find_one({"id": coach_id, "academy_id": academy_id})
+        if not coach:
+            raise HTTPException(status_code=404, detail="Coach not found")
+        
+        # Remove MongoDB _id field
+        coach.pop("_id", None)
+        return Coach(**coach)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching coach: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch coach")
+
+# Update coach (Academy User)
+@router.put("/academy/coaches/{coach_id}", response_model=CoachResponse)
+async def update_coach(coach_id: str, coach_data: CoachUpdate, user_info = Depends(require_academy_user)):
+    """Update specific coach for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Check if coach exists
+        existing_coach = await db.coaches.find_one({"id": coach_id, "academy_id": academy_id})
+        if not existing_coach:
+            raise HTTPException(status_code=404, detail="Coach not found")
+        
+        # Update coach data
+        update_data = {k: v for k, v in coach_data.dict().items() if v is not None}
+
+        # SECURITY FIX MEDIUM #1: Explicitly exclude sensitive authentication fields
+        # These fields should never be modified via API updates
+        sensitive_fields = {'has_login', 'default_password', 'password_changed', 'supabase_user_id', 'id', 'academy_id', 'created_at'}
+        for field in sensitive_fields:
+            update_data.pop(field, None)
+
+        update_data["updated_at"] = datetime.utcnow()
+        
+        await db.coaches.update_one(
+            {"id": coach_id, "academy_id": academy_id},
+            {"$set": update_data}
+        )
+        await coach_cache.invalidate(coach_id)
+        
+        # Get updated coach
+        updated_coach = await db.coaches.find_one({"id": coach_id, "academy_id": academy_id})
+        # Remove MongoDB _id field
+        updated_coach.pop("_id", None)
+        return Coach(**updated_coach)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating coach: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update coach")
+
+# Delete coach (Academy User)
+@router.delete("/academy/coaches/{coach_id}")
+async def delete_coach(coach_id: str, user_info = Depends(require_academy_user)):
+    """Delete specific coach for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Check if coach exists
+        existing_coach = await db.coaches.find_one({"id": coach_id, "academy_id": academy_id})
+        if not existing_coach:
+            raise HTTPException(status_code=404, detail="Coach not found")
+        
+        # Delete coach
+        await db.coaches.delete_one({"id": coach_id, "academy_id": academy_id})
+        await coach_cache.invalidate(coach_id)
+        
+        return {"message": "Coach deleted successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting coach: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete coach")
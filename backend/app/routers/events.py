@@ -0,0 +1,74 @@
+"""
+Live events over server-sent events: notifications, announcements and
+attendance marks as they happen, instead of polling the list endpoints.
+"""
+import logging
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+
+from app.dependencies import STREAM_TICKET_SECONDS, get_event_stream_user, get_event_user_info, issue_stream_ticket
+from app.events import bus, user_topics
+from utils.admission import Overloaded
+from utils.events import HEARTBEAT_FRAME, RESET_FRAME, Subscription, format_sse
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+HEARTBEAT_SECONDS = float(os.environ.get("EVENT_STREAM_HEARTBEAT_SECONDS", "15"))
+RECONNECT_MS = 3000
+
+STREAM_HEADERS = {
+    # no-store keeps the ETag middleware out; identity keeps gzip from buffering frames
+    "Cache-Control": "no-store",
+    "Content-Encoding": "identity",
+    # Tell nginx-style proxies not to buffer either
+    "X-Accel-Buffering": "no",
+}
+
+
+async def _frames(subscription: Subscription):
+    try:
+        yield f"retry: {RECONNECT_MS}\n\n".encode()
+        while True:
+            if subscription.reset:
+                subscription.reset = False
+                yield RESET_FRAME
+            event = await subscription.next(HEARTBEAT_SECONDS)
+            # Heartbeats keep proxies from closing an idle connection
+            yield HEARTBEAT_FRAME if event is None else format_sse(event)
+    finally:
+        subscription.close()
+
+
+@router.post("/events/ticket")
+async def create_stream_ticket(user_info = Depends(get_event_user_info)):
+    """
+    Ticket for one connection to /api/events/stream?ticket=..., valid for
+    STREAM_TICKET_SECONDS. Get a fresh one for every (re)connection.
+    """
+    return {"ticket": await issue_stream_ticket(user_info), "expires_in": STREAM_TICKET_SECONDS}
+
+
+@router.get("/events/stream")
+async def stream_events(request: Request, user_info = Depends(get_event_stream_user)):
+    """
+    Event stream for the academy user, coach or player the ticket was
+    issued to.
+
+    Events: `notification`, `announcement`, `attendance_marked` (academy
+    users), and `reset` when some were missed and lists should be refetched.
+    Reconnecting (with a new ticket) and Last-Event-ID or ?last_event_id=
+    replays what was missed on this worker.
+    """
+    last_event_id = request.headers.get("last-event-id") or request.query_params.get("last_event_id")
+    try:
+        subscription = bus.subscribe(user_topics(user_info), last_event_id)
+    except Overloaded as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Too many live connections, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+    return StreamingResponse(_frames(subscription), media_type="text/event-stream", headers=STREAM_HEADERS)
@@ -0,0 +1,562 @@
+"""
+Fee structure, student fees, reminders and fee notifications.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core import db, get_mail_client
+from app.dependencies import rate_limit, require_academy_user, require_player_user
+from app.notifications import notification_store
+from app.models import ManualEmailRequest, StudentFeeCreate
+from app.reference import academy_settings, fee_structures, get_academy
+from utils.fieldsets import FieldSelection, sparse_fields
+from utils.rate_limit import RateLimit
+from utils.serialization import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+MANUAL_REMINDER_LIMIT = RateLimit(
+    "manual_reminder", 10, 300, scope="user",
+    message="Rate limit exceeded. Please wait before sending more reminders."
+)
+
+FEE_NOTIFICATION_TYPES = ("fee_due", "fee_paid", "fee_reminder")
+
+# ========== FEE MANAGEMENT ENDPOINTS ==========
+
+# Get Academy Fee Structure
+@router.get("/academy/fee-structure")
+async def get_academy_fee_structure(user_info = Depends(require_academy_user)):
+    """Get fee structure for the academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Get fee structure from database
+        fee_structure = await fee_structures.get(academy_id)
+        
+        if not fee_structure:
+            # Return default structure if none exists
+            return {
+                "academy_id": academy_id,
+                "sport_fees": {},
+                "default_frequency": "monthly",
+                "currency": "INR"
+            }
+        
+        # Clean MongoDB ObjectId (on a copy: the cached document is shared)
+        return {key: value for key, value in fee_structure.items() if key != "_id"}
+        
+    except Exception as e:
+        logger.error(f"Error fetching fee structure: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch fee structure")
+
+# Update Academy Fee Structure
+@router.put("/academy/fee-structure")
+async def update_academy_fee_structure(
+    sport_fees: dict,
+    default_frequency: str = "monthly",
+    currency: str = "INR",
+    user_info = Depends(require_academy_user)
+):
+    """Update fee structure for the academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Validate frequency
+        valid_frequencies = ["monthly", "quarterly", "half_yearly", "annual"]
+        if default_frequency not in valid_frequencies:
+            raise HTTPException(status_code=400, detail="Invalid frequency")
+        
+        # Update or create fee structure
+        await db.academy_fee_structure.update_one(
+            {"academy_id": academy_id},
+            {
+                "$set": {
+                    "sport_fees": sport_fees,
+                    "default_frequency": default_frequency,
+                    "currency": currency,
+                    "updated_at": datetime.utcnow()
+                }
+            },
+            upsert=True
+        )
+        await fee_structures.invalidate(academy_id)
+        
+        return {"message": "Fee structure updated successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating fee structure: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update fee structure")
+
+# Get All Student Fees
+# `fields=` whitelist for the student fee list (fee record fields plus the joined player info)
+STUDENT_FEE_FIELDS = [
+    "id", "player_id", "academy_id", "amount", "frequency", "status", "due_date", "paid_date",
+    "notes", "created_at", "updated_at", "last_reminder_sent",
+    "player_name", "player_email", "sport", "age", "registration_number"
+]
+student_fee_fieldset = sparse_fields(STUDENT_FEE_FIELDS, always=("player_id",))
+
+@router.get("/academy/student-fees")
+async def get_all_student_fees(
+    fieldset: FieldSelection = Depends(student_fee_fieldset),
+    user_info = Depends(require_academy_user)
+):
+    """Get fee records for all students in the academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Get all players (only the fields joined into the fee rows)
+        players = await db.players.find(
+            {"academy_id": academy_id, "status": "active"},
+            {"_id": 0, "id": 1, "first_name": 1, "last_name": 1, "email": 1, "sport": 1, "age": 1, "registration_number": 1}
+        ).to_list(1000)
+        
+        # Get fee records
+        fee_records = []
+        for player in players:
+            # Get latest fee record for player
+            fee_record = await db.student_fees.find_one(
+                {"player_id": player["id"], "academy_id": academy_id},
+                sort=[("created_at", -1)]
+            )
+            
+            if not fee_record:
+                # Create default fee record
+                fee_record = {
+                    "player_id": player["id"],
+                    "academy_id": academy_id,
+                    "amount": 0,
+                    "frequency": "monthly",
+                    "status": "pending",
+                    "due_date": None,
+                    "paid_date": None
+                }
+            
+            # Add player info
+            fee_record["player_name"] = f"{player.get('first_name', '')} {player.get('last_name', '')}".strip()
+            fee_record["player_email"] = player.get("email")
+            fee_record["sport"] = player.get("sport")
+            fee_record["age"] = player.get("age")
+            fee_record["registration_number"] = player.get("registration_number")
+            
+            # Clean MongoDB ObjectId
+            fee_record.pop("_id", None)
+            
+            # Convert dates to ISO format
+            if fee_record.get("due_date"):
+                fee_record["due_date"] = fee_record["due_date"].isoformat() if hasattr(fee_record["due_date"], "isoformat") else fee_record["due_date"]
+            if fee_record.get("paid_date"):
+                fee_record["paid_date"] = fee_record["paid_date"].isoformat() if hasattr(fee_record["paid_date"], "isoformat") else fee_record["paid_date"]
+            if fee_record.get("created_at"):
+                fee_record["created_at"] = fee_record["created_at"].isoformat() if hasattr(fee_record["created_at"], "isoformat") else fee_record["created_at"]
+            
+            fee_records.append(fieldset.trim(fee_record))
+        
+        return {"fee_records": fee_records}
+        
+    except Exception as e:
+        logger.error(f"Error fetching student fees: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch student fees")
+
+# Create/Update Student Fee Record
+@router.post("/academy/student-fees/{player_id}")
+async def create_or_update_student_fee(
+    player_id: str,
+    fee_data: StudentFeeCreate,
+    user_info = Depends(require_academy_user)
+):
+    """Create or update fee record for a student"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Verify player belongs to academy
+        player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+        
+        # Parse due date
+        due_date_obj = datetime.fromisoformat(fee_data.due_date.replace('Z', '+00:00'))
+
+        # Set paid_date based on status
+        paid_date = datetime.utcnow() if fee_data.status == "paid" else None
+
+        # Check if fee record already exists
+        existing_fee = await db.student_fees.find_one({"player_id": player_id, "academy_id": academy_id})
+
+        if existing_fee:
+            # Update existing record
+            update_data = {
+                "amount": fee_data.amount,
+                "frequency": fee_data.frequency,
+                "due_date": due_date_obj,
+                "status": fee_data.status,
+                "paid_date": paid_date,
+                "notes": fee_data.notes,
+                "updated_at": datetime.utcnow()
+            }
+            await db.student_fees.update_one(
+                {"player_id": player_id, "academy_id": academy_id},
+                {"$set": update_data}
+            )
+            fee_record_id = existing_fee["id"]
+        else:
+            # Create new fee record
+            fee_record_id = str(uuid.uuid4())
+            fee_record = {
+                "id": fee_record_id,
+                "player_id": player_id,
+                "academy_id": academy_id,
+                "amount": fee_data.amount,
+                "frequency": fee_data.frequency,
+                "due_date": due_date_obj,
+                "status": fee_data.status,
+                "paid_date": paid_date,
+                "notes": fee_data.notes,
+                "created_at": datetime.utcnow(),
+                "updated_at": datetime.utcnow()
+            }
+            await db.student_fees.insert_one(fee_record)
+        
+        # Create in-app notification for student
+        await notification_store.notify(
+            academy_id, "player", player_id,
+            f"Your {fee_data.frequency} fee of ₹{fee_data.amount} is due on {due_date_obj.strftime('%d %b %Y')}",
+            type="fee_due",
+            title="Fee Payment Due"
+        )
+        
+        return {"message": "Fee record created successfully", "fee_record_id": fee_record_id}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating student fee: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create fee record")
+
+# Mark Fee as Paid
+@router.put("/academy/student-fees/{fee_record_id}/mark-paid")
+async def mark_fee_as_paid(
+    fee_record_id: str,
+    payment_method: str = "cash",
+    transaction_id: str = None,
+    user_info = Depends(require_academy_user)
+):
+    """Mark a fee record as paid"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Find fee record
+        fee_record = await db.student_fees.find_one({"id": fee_record_id, "academy_id": academy_id})
+        if not fee_record:
+            raise HTTPException(status_code=404, detail="Fee record not found")
+        
+        # Update fee record
+        await db.student_fees.update_one(
+            {"id": fee_record_id},
+            {
+                "$set": {
+                    "status": "paid",
+                    "paid_date": datetime.utcnow(),
+                    "payment_method": payment_method,
+                    "transaction_id": transaction_id,
+                    "updated_at": datetime.utcnow()
+                }
+            }
+        )
+        
+        # Create payment transaction record
+        transaction = {
+            "id": str(uuid.uuid4()),
+            "academy_id": academy_id,
+            "player_id": fee_record["player_id"],
+            "amount": fee_record["amount"],
+            "currency": "INR",
+            "payment_method": payment_method,
+            "transaction_id": transaction_id,
+            "payment_status": "paid",
+            "payment_date": datetime.utcnow(),
+            "description": f"{fee_record.get('frequency', 'monthly')} fee payment",
+            "billing_cycle": fee_record.get('frequency', 'monthly')
+        }
+        await db.payment_transactions.insert_one(transaction)
+        
+        # Create notification for student
+        await notification_store.notify(
+            academy_id, "player", fee_record["player_id"],
+            f"Your payment of ₹{fee_record['amount']} has been received. Thank you!",
+            type="fee_paid",
+            title="Payment Received"
+        )
+        
+        return {"message": "Fee marked as paid successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error marking fee as paid: {e}")
+        raise HTTPException(status_code=500, detail="Failed to mark fee as paid")
+
+# Send Fee Reminder Email
+@router.post("/academy/student-fees/{player_id}/send-reminder")
+async def send_fee_reminder_email(
+    player_id: str,
+    user_info = Depends(require_academy_user)
+):
+    """Send fee reminder email to student"""
+    try:
+        academy_id = user_info["academy_id"]
+
+        # Get player
+        player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+
+        if not player.get("email"):
+            raise HTTPException(status_code=400, detail="Player does not have an email")
+
+        # Get academy info
+        academy = await get_academy(academy_id)
+
+        # Get latest unpaid fee (due or pending status)
+        fee_record = await db.student_fees.find_one(
+            {
+                "player_id": player_id,
+                "academy_id": academy_id,
+                "status": {"$in": ["due", "pending"]}
+            },
+            sort=[("due_date", 1)]
+        )
+
+        if not fee_record:
+            raise HTTPException(status_code=404, detail="No unpaid fee found")
+
+        # Send email using Zoho Mail API (OAuth-based, NOT SMTP)
+        # This is for AUTOMATIC reminders triggered by button click
+        player_name = f"{player.get('first_name', '')} {player.get('last_name', '')}".strip() or player.get('name', 'Student')
+        academy_name = academy.get("name", "Your Academy")
+
+        try:
+            # Use Zoho Mail API for automatic reminders
+            logger.info(f"Sending automatic fee reminder via Zoho Mail API to {player['email']}")
+            email_sent = await get_mail_client().send_fee_reminder(
+                to_email=player["email"],
+                player_name=player_name,
+                academy_name=academy_name,
+                fee_amount=fee_record["amount"],
+                due_date=fee_record["due_date"],
+                frequency=fee_record.get("frequency", "monthly")
+            )
+            logger.info(f"✅ Automatic reminder sent successfully to {player['email']}")
+        except Exception as email_error:
+            logger.error(f"Failed to send email via Zoho Mail API: {email_error}")
+            # Fall back to False but continue with notification
+            email_sent = False
+
+        if not email_sent:
+            logger.warning(f"Email sending failed for player {player_id}, but creating in-app notification")
+
+        # Create in-app notification
+        await notification_store.notify(
+            academy_id, "player", player_id,
+            f"Reminder: Your {fee_record.get('frequency', 'monthly')} fee of ₹{fee_record['amount']} is due on {fee_record['due_date'].strftime('%d %b %Y')}. Please make the payment at the earliest.",
+            type="fee_reminder",
+            title="Fee Payment Reminder"
+        )
+
+        # Update last_reminder_sent timestamp
+        await db.student_fees.update_one(
+            {"player_id": player_id, "academy_id": academy_id},
+            {"$set": {"last_reminder_sent": datetime.utcnow()}}
+        )
+
+        return {
+            "message": "Fee reminder sent successfully",
+            "email_sent": email_sent,
+            "notification_created": True
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error sending fee reminder: {e}")
+        raise HTTPException(status_code=500, detail="Failed to send reminder")
+
+@router.post("/academy/student-fees/send-manual-reminder",
+             dependencies=[Depends(rate_limit(MANUAL_REMINDER_LIMIT, require_academy_user))])
+async def send_manual_fee_reminder(
+    email_request: ManualEmailRequest,
+    user_info = Depends(require_academy_user)
+):
+    """
+    Send manual custom fee reminder email to student
+
+    Security:
+    - Only academy admins can send
+    - Subject and content are validated and sanitized
+    - Rate limited (10 sends per 5 minutes per admin, shared across workers)
+    - All sends are logged
+    """
+    try:
+        academy_id = user_info["academy_id"]
+        admin_id = user_info.get("user_id", "unknown")
+
+        # Get player - SERVER SIDE VALIDATION (ignore any from/to from frontend)
+        player = await db.players.find_one({
+            "id": email_request.player_id,
+            "academy_id": academy_id
+        })
+
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found in your academy")
+
+        player_email = player.get("email")
+        if not player_email or not player_email.strip():
+            raise HTTPException(
+                status_code=400,
+                detail=f"Player {player.get('name', 'Unknown')} does not have an email address"
+            )
+
+        player_name = player.get("name", "Student")
+
+        # Sanitize content (basic HTML sanitization)
+        import html
+        sanitized_subject = html.escape(email_request.subject)
+        # For content, we allow HTML but escape dangerous scripts
+        sanitized_content = email_request.content.replace('<script', '&lt;script').replace('</script>', '&lt;/script&gt;')
+
+        # Send email using Zoho SMTP
+        logger.info(f"Attempting to send manual email to {player_email} from admin {admin_id}")
+
+        # The SMTP pool module is only needed here; load it on first use
+        from email_utils import send_manual_email
+        try:
+            # SMTP is blocking; run it off the event loop
+            email_sent = await asyncio.to_thread(
+                send_manual_email,
+                to_email=player_email,
+                subject=sanitized_subject,
+                content=sanitized_content
+            )
+        except Exception as email_error:
+            logger.error(f"SMTP Error: {str(email_error)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"Email service error: {str(email_error)}"
+            )
+
+        if not email_sent:
+            raise HTTPException(
+                status_code=500,
+                detail="Email failed to send. Please check SMTP configuration."
+            )
+
+        # Log the manual reminder send
+        reminder_log = {
+            "id": str(uuid.uuid4()),
+            "fee_id": email_request.player_id,  # Using player_id as fee_id for now
+            "player_id": email_request.player_id,
+            "player_email": player_email,
+            "player_name": player_name,
+            "academy_id": academy_id,
+            "subject": sanitized_subject,
+            "type": "MANUAL",
+            "sent_at": datetime.utcnow(),
+            "sent_by": admin_id,
+            "status": "sent"
+        }
+        await db.reminder_logs.insert_one(reminder_log)
+
+        # Update last_reminder_sent timestamp on fee record
+        await db.student_fees.update_one(
+            {"player_id": email_request.player_id, "academy_id": academy_id},
+            {"$set": {"last_reminder_sent": datetime.utcnow()}},
+            upsert=False
+        )
+
+        # Create in-app notification for player
+        await notification_store.notify(
+            academy_id, "player", email_request.player_id, sanitized_content[:200],
+            type="fee_reminder",
+            title=sanitized_subject
+        )
+
+        logger.info(f"Manual email sent successfully to {player_email} by admin {admin_id}")
+
+        return {
+            "success": True,
+            "message": "Email sent successfully",
+            "recipient": player_email,
+            "player_name": player_name,
+            "sent_at": datetime.utcnow().isoformat()
+        }
+
+    except HTTPException:
+        raise
+    except ValueError as ve:
+        logger.error(f"Validation error: {ve}")
+        raise HTTPException(status_code=400, detail=str(ve))
+    except Exception as e:
+        logger.error(f"Unexpected error sending manual email: {str(e)}", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Server error: {str(e)}"
+        )
+
+# Get Fee Reminder Settings
+@router.get("/academy/fee-reminder-settings")
+async def get_fee_reminder_settings(user_info = Depends(require_academy_user)):
+    """Get academy's fee reminder type setting"""
+    try:
+        academy_id = user_info["academy_id"]
+
+        # Get academy settings
+        settings = await academy_settings.get(academy_id)
+
+        if not settings:
+            return {"fee_reminder_type": "manual"}  # Default
+
+        return {
+            "fee_reminder_type": settings.get("fee_reminder_type", "manual")
+        }
+
+    except Exception as e:
+        logger.error(f"Error fetching fee reminder settings: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch settings")
+
+# Get Player Fee Notifications (for player dashboard)
+@router.get("/player/fee-notifications")
+async def get_player_fee_notifications(user_info = Depends(require_player_user)):
+    """Get fee notifications for player"""
+    try:
+        player_id = user_info["player_id"]
+        academy_id = user_info["academy_id"]
+        
+        # Get pending fees
+        fee_list = await db.student_fees.find({
+            "player_id": player_id,
+            "academy_id": academy_id,
+            "status": "pending"
+        }, {"_id": 0}).sort("due_date", 1).to_list(10)
+        
+        # Get fee notifications
+        notification_list, _ = await notification_store.page(
+            "player", player_id, types=FEE_NOTIFICATION_TYPES, limit=20, projection={"_id": 0}
+        )
+        
+        # Dates are encoded by FastJSONResponse
+        return FastJSONResponse({
+            "pending_fees": fee_list,
+            "notifications": notification_list
+        })
+        
+    except Exception as e:
+        logger.error(f"Error fetching fee notifications: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch fee notifications")
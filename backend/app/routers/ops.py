@@ -0,0 +1,60 @@
+"""
+Operational endpoints: health, Prometheus metrics and request profiles.
+"""
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
+
+from app.dependencies import require_super_admin
+from app.models import ProfileSignatureRequest
+from utils.metrics import render_metrics
+from utils.profiling import PROFILE_HEADER, profile_store, render_profile, sign_profile_request
+
+router = APIRouter()
+
+@router.get("/", include_in_schema=False)
+async def root():
+    return {"status": "ok"}
+
+# Prometheus scrape endpoint; set METRICS_TOKEN to require "Authorization: Bearer <token>"
+@router.get("/metrics", include_in_schema=False)
+async def metrics(request: Request):
+    metrics_token = os.environ.get("METRICS_TOKEN")
+    if metrics_token and request.headers.get("authorization") != f"Bearer {metrics_token}":
+        raise HTTPException(status_code=401, detail="Unauthorized")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type, headers={"Cache-Control": "no-store"})
+
+@router.get("/api/admin/profiles")
+async def list_profiles(admin_user = Depends(require_super_admin)):
+    """List captured request profiles held by this worker, newest first"""
+    return {"profiles": profile_store.list()}
+
+@router.get("/api/admin/profiles/{profile_id}")
+async def download_profile(profile_id: str, format: str = "html", admin_user = Depends(require_super_admin)):
+    """Download one profile (HTML or text for pyinstrument, text for cProfile)"""
+    if format not in ("html", "text"):
+        raise HTTPException(status_code=400, detail="format must be 'html' or 'text'")
+    entry = profile_store.get(profile_id)
+    if not entry:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    content, media_type = render_profile(entry, format)
+    extension = "html" if media_type == "text/html" else "txt"
+    return Response(
+        content=content,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="profile-{profile_id}.{extension}"'}
+    )
+
+@router.post("/api/admin/profiles/signature")
+async def create_profile_signature(request: ProfileSignatureRequest, admin_user = Depends(require_super_admin)):
+    """Mint an X-Profile-Signature header value that profiles one method + path"""
+    secret = os.environ.get("PROFILE_SECRET")
+    if not secret:
+        raise HTTPException(status_code=400, detail="Request profiling is not configured (PROFILE_SECRET)")
+    return {
+        "header": PROFILE_HEADER,
+        "value": sign_profile_request(secret, request.method, request.path, request.ttl_seconds),
+        "expires_in": request.ttl_seconds
+    }
@@ -0,0 +1,680 @@
+"""
+The player portal: profile, attendance, performance, payments and coach.
+"""
+import logging
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+
+from app.constants import get_sport_performance_categories
+from app.core import db
+from app.dependencies import require_player_user
+from app.models import CoachRatingCreate, Notification
+from app.notifications import notification_fieldset, notification_store
+from app.reference import get_academy, get_coach
+from utils.fieldsets import FieldSelection
+from utils.pagination import PageParams
+from utils.raw_bson import raw_decode, raw_fastpath_enabled, raw_find_page, raw_json_response
+from utils.serialization import FastJSONResponse, rows_from_db
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# Get Player Profile
+@router.get("/player/profile")
+async def get_player_profile(user_info = Depends(require_player_user)):
+    """Get player profile information"""
+    try:
+        player = user_info["player"]
+        
+        # Get academy information
+        academy = await get_academy(player["academy_id"])
+        
+        # Get coach information
+        coach_name = None
+        if player.get("coach_id"):
+            coach = await get_coach(player["coach_id"])
+            if coach:
+                coach_name = f"{coach.get('first_name', '')} {coach.get('last_name', '')}".strip()
+        
+        # Create clean player data without MongoDB ObjectId
+        player_data = {
+            "id": player.get("id"),
+            "first_name": player.get("first_name"),
+            "last_name": player.get("last_name"),
+            "email": player.get("email"),
+            "phone": player.get("phone"),
+            "date_of_birth": player.get("date_of_birth"),
+            "age": player.get("age"),
+            "gender": player.get("gender"),
+            "sport": player.get("sport"),
+            "position": player.get("position"),
+            "registration_number": player.get("registration_number"),
+            "height": player.get("height"),
+            "weight": player.get("weight"),
+            "photo_url": player.get("photo_url"),
+            "training_days": player.get("training_days", []),
+            "training_batch": player.get("training_batch"),
+            "emergency_contact_name": player.get("emergency_contact_name"),
+            "emergency_contact_phone": player.get("emergency_contact_phone"),
+            "medical_notes": player.get("medical_notes"),
+            "status": player.get("status"),
+            "academy_id": player.get("academy_id"),
+            "coach_name": coach_name,
+            "created_at": player.get("created_at").isoformat() if player.get("created_at") else None,
+            "updated_at": player.get("updated_at").isoformat() if player.get("updated_at") else None
+        }
+        
+        # Create clean academy data
+        academy_data = None
+        if academy:
+            academy_data = {
+                "id": academy.get("id"),
+                "name": academy.get("name"),
+                "logo_url": academy.get("logo_url"),
+                "location": academy.get("location"),
+                "sports_type": academy.get("sports_type")
+            }
+        
+        return {
+            "player": player_data,
+            "academy": academy_data
+        }
+    except Exception as e:
+        logger.error(f"Error fetching player profile: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch player profile")
+
+# ========== PLAYER DASHBOARD ENDPOINTS ==========
+
+# Get Player Attendance History
+@router.get("/player/attendance")
+async def get_player_attendance_history(user_info = Depends(require_player_user)):
+    """Get player's attendance history"""
+    try:
+        player_id = user_info["player_id"]
+        academy_id = user_info["academy_id"]
+
+        # SECURITY FIX MEDIUM #2: Add academy_id filter for proper data isolation
+        if raw_fastpath_enabled():
+            # Shape the records in the projection so they go straight to JSON;
+            # the statistics come from the same single decode
+            match = {"player_id": player_id, "academy_id": academy_id}
+            fields = ["id", "player_id", "academy_id", "date", "present", "sport", "notes", "marked_by", "created_at"]
+            projection = {field: {"$ifNull": [f"${field}", None]} for field in fields}
+            projection["performance_ratings"] = {"$ifNull": ["$performance_ratings", {}]}
+            projection["_id"] = 0
+            raw_records, _ = await raw_find_page(
+                db.player_attendance, match, projection, sort_field="date", direction=-1, limit=100
+            )
+            records = raw_decode(raw_records)
+            total_sessions = len(records)
+            attended_sessions = sum(1 for record in records if record["present"])
+            attendance_percentage = (attended_sessions / total_sessions * 100) if total_sessions > 0 else 0
+            return raw_json_response({
+                "attendance_records": records,
+                "statistics": {
+                    "total_sessions": total_sessions,
+                    "attended_sessions": attended_sessions,
+                    "missed_sessions": total_sessions - attended_sessions,
+                    "attendance_percentage": round(attendance_percentage, 2)
+                }
+            })
+        
+        # Get attendance records for this player
+        attendance_records_raw = await db.player_attendance.find(
+            {"player_id": player_id, "academy_id": academy_id},
+            {"_id": 0}
+        ).sort("date", -1).limit(100).to_list(100)
+        
+        # Pick the public fields; FastJSONResponse encodes created_at
+        attendance_records = [
+            {
+                "id": record.get("id"),
+                "player_id": record.get("player_id"),
+                "academy_id": record.get("academy_id"),
+                "date": record.get("date"),
+                "present": record.get("present"),
+                "sport": record.get("sport"),
+                "performance_ratings": record.get("performance_ratings", {}),
+                "notes": record.get("notes"),
+                "marked_by": record.get("marked_by"),
+                "created_at": record.get("created_at")
+            }
+            for record in attendance_records_raw
+        ]
+        
+        # Calculate attendance statistics
+        total_sessions = len(attendance_records)
+        attended_sessions = len([r for r in attendance_records if r.get("present", False)])
+        attendance_percentage = (attended_sessions / total_sessions * 100) if total_sessions > 0 else 0
+        
+        return FastJSONResponse({
+            "attendance_records": attendance_records,
+            "statistics": {
+                "total_sessions": total_sessions,
+                "attended_sessions": attended_sessions,
+                "missed_sessions": total_sessions - attended_sessions,
+                "attendance_percentage": round(attendance_percentage, 2)
+            }
+        })
+        
+    except Exception as e:
+        logger.error(f"Error fetching player attendance: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch attendance history")
+
+# Get Player Performance Stats
+@router.get("/player/performance")
+async def get_player_performance_stats(user_info = Depends(require_player_user)):
+    """Get player's performance statistics"""
+    try:
+        player_id = user_info["player_id"]
+        player = user_info["player"]
+        
+        # Get performance data from attendance records
+        attendance_records = await db.player_attendance.find(
+            {"player_id": player_id, "present": True}
+        ).sort("date", -1).to_list(100)
+        
+        # Calculate performance averages
+        category_averages = {}
+        performance_trend = []
+
+        if attendance_records:
+        # Get performance categories for this player's sport
+            sport_categories = get_sport_performance_categories(player.get("sport", "Other"))
+
+            # Calculate averages for each category
+            for category in sport_categories:
+                ratings = []
+                for record in attendance_records:
+                    # FIXED: Check if performance_ratings is not None before calling .get()
+                    ratings_dict = record.get("performance_ratings")
+                    if ratings_dict:
+                        rating = ratings_dict.get(category)
+                        if rating is not None:
+                            ratings.append(rating)
+
+                if ratings:
+                    category_averages[category] = round(sum(ratings) / len(ratings), 2)
+                else:
+                    category_averages[category] = 0
+
+            # Build performance trend (last 30 days)
+            recent_records = attendance_records[:30]
+            for record in recent_records:
+                # FIXED: Handle None for performance_ratings
+                ratings_dict = record.get("performance_ratings")
+                if ratings_dict:
+                    overall_rating = sum(ratings_dict.values()) / len(ratings_dict) if ratings_dict else 0
+                else:
+                    overall_rating = 0
+
+                performance_trend.append({
+                    "date": record.get("date"),
+                    "overall_rating": overall_rating,
+                    "ratings": ratings_dict or {}  # Ensure an empty dict is used as a default
+                })
+    
+        overall_average = sum(category_averages.values()) / len(category_averages) if category_averages else 0
+        
+        return {
+            "player_id": player_id,
+            "player_name": f"{player.get('first_name', '')} {player.get('last_name', '')}",
+            "sport": player.get("sport"),
+            "position": player.get("position"),
+            "total_sessions": len(attendance_records),
+            "category_averages": category_averages,
+            "overall_average_rating": round(overall_average, 2),
+            "performance_trend": performance_trend[:10]  # Last 10 sessions
+        }
+        
+    except Exception as e:
+        logger.error(f"Error fetching player performance: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch performance statistics")
+
+# Get Player Announcements
+@router.get("/player/announcements")
+async def get_player_announcements(user_info = Depends(require_player_user)):
+    """Get announcements for the player"""
+    try:
+        player_id = user_info["player_id"]
+        academy_id = user_info["academy_id"]
+        
+        # Get announcements targeted to this player or all players
+        announcements_raw = await db.announcements.find({
+            "academy_id": academy_id,
+            "is_active": True,
+            "$or": [
+                {"target_audience": "all"},
+                {"target_audience": "players"},
+                {"target_audience": "specific_player", "target_player_id": player_id}
+            ]
+        }).sort("created_at", -1).to_list(50)
+        
+        # Clean announcements for JSON serialization
+        announcements = []
+        for announcement in announcements_raw:
+            clean_announcement = {
+                "id": announcement.get("id"),
+                "academy_id": announcement.get("academy_id"),
+                "title": announcement.get("title"),
+                "content": announcement.get("content"),
+                "priority": announcement.get("priority"),
+                "target_audience": announcement.get("target_audience"),
+                "target_player_id": announcement.get("target_player_id"),
+                "is_active": announcement.get("is_active"),
+                "created_by": announcement.get("created_by"),
+                "created_at": announcement.get("created_at").isoformat() if announcement.get("created_at") else None,
+                "updated_at": announcement.get("updated_at").isoformat() if announcement.get("updated_at") else None
+            }
+            announcements.append(clean_announcement)
+        
+        return {"announcements": announcements}
+        
+    except Exception as e:
+        logger.error(f"Error fetching player announcements: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch announcements")
+
+# Player Stats and Analytics
+@router.get("/player/stats")
+async def get_player_stats(user_info = Depends(require_player_user)):
+    """Get comprehensive player statistics"""
+    try:
+        player_id = user_info["player_id"]
+        academy_id = user_info["academy_id"]
+        player = user_info["player"]
+        
+        # Get total attendance records
+        total_attendance = await db.player_attendance.count_documents({"player_id": player_id})
+        present_count = await db.player_attendance.count_documents({"player_id": player_id, "present": True})
+        
+        # Calculate attendance percentage
+        attendance_percentage = (present_count / total_attendance * 100) if total_attendance > 0 else 0
+        
+        # Get recent attendance with performance ratings
+        recent_attendance = await db.player_attendance.find({
+            "player_id": player_id
+        }).sort("date", -1).limit(30).to_list(30)
+        
+        # Calculate average performance ratings
+        performance_averages = {}
+        performance_count = {}
+        
+        for record in recent_attendance:
+            if record.get("performance_ratings"):
+                for category, rating in record["performance_ratings"].items():
+                    if rating is not None:
+                        if category not in performance_averages:
+                            performance_averages[category] = 0
+                            performance_count[category] = 0
+                        performance_averages[category] += rating
+                        performance_count[category] += 1
+        
+        # Calculate final averages
+        for category in performance_averages:
+            if performance_count[category] > 0:
+                performance_averages[category] = performance_averages[category] / performance_count[category]
+        
+        # Overall performance score (average of all categories)
+        overall_performance = sum(performance_averages.values()) / len(performance_averages) if performance_averages else 0
+        overall_performance_scaled = (overall_performance / 10) * 100  # Scale to 0-100
+        
+        # Get coach information
+        coach_name = None
+        if player.get("coach_id"):
+            coach = await get_coach(player["coach_id"])
+            if coach:
+                coach_name = f"{coach.get('first_name', '')} {coach.get('last_name', '')}".strip()
+        
+        # Get academy info
+        academy = await get_academy(academy_id)
+        academy_name = academy.get("name") if academy else "Unknown Academy"
+        
+        return {
+            "player_id": player_id,
+            "total_sessions": total_attendance,
+            "attended_sessions": present_count,
+            "attendance_percentage": round(attendance_percentage, 2),
+            "overall_performance": round(overall_performance_scaled, 2),
+            "performance_by_category": {k: round(v, 2) for k, v in performance_averages.items()},
+            "coach_name": coach_name,
+            "academy_name": academy_name,
+            "sport": player.get("sport"),
+            "recent_attendance_count": len(recent_attendance)
+        }
+        
+    except Exception as e:
+        logger.error(f"Error fetching player stats: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch player stats")
+
+# Player Photo Upload (Self-upload)
+@router.post("/player/upload-photo")
+async def player_upload_photo(file: UploadFile = File(...), user_info = Depends(require_player_user)):
+    """Allow player to upload their own photo"""
+    try:
+        player_id = user_info["player_id"]
+        
+        # Validate file type
+        if not file.content_type.startswith("image/"):
+            raise HTTPException(status_code=400, detail="File must be an image")
+        
+        # Validate file size (500KB)
+        content = await file.read()
+        if len(content) > 500 * 1024:
+            raise HTTPException(status_code=400, detail="Photo size must be less than 500KB")
+        
+        # Convert to base64
+        import base64
+        base64_photo = f"data:{file.content_type};base64,{base64.b64encode(content).decode()}"
+        
+        # Update player photo
+        await db.players.update_one(
+            {"id": player_id},
+            {"$set": {"photo_url": base64_photo, "updated_at": datetime.utcnow()}}
+        )
+        
+        return {"message": "Photo uploaded successfully", "photo_url": base64_photo}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error uploading player photo: {e}")
+        raise HTTPException(status_code=500, detail="Failed to upload photo")
+
+@router.delete("/player/photo")
+async def delete_player_photo(user_info = Depends(require_player_user)):
+    """Allow player to remove their photo"""
+    try:
+        player_id = user_info["player_id"]
+
+        # Update player to remove photo
+        await db.players.update_one(
+            {"id": player_id},
+            {"$set": {"photo_url": None, "updated_at": datetime.utcnow()}}
+        )
+
+        return {"message": "Photo removed successfully"}
+
+    except Exception as e:
+        logger.error(f"Error removing player photo: {e}")
+        raise HTTPException(status_code=500, detail="Failed to remove photo")
+
+# Get Player Notification Preferences
+@router.get("/player/notification-preferences")
+async def get_player_notification_preferences(user_info = Depends(require_player_user)):
+    """Get player notification preferences"""
+    try:
+        player_id = user_info["player_id"]
+        
+        # Check if preferences exist
+        preferences = await db.player_preferences.find_one({"player_id": player_id})
+        
+        if not preferences:
+            # Return defaults
+            return {
+                "email_notifications": True,
+                "notification_priority": "all",  # all, important, none
+                "push_notifications": True
+            }
+        
+        return {
+            "email_notifications": preferences.get("email_notifications", True),
+            "notification_priority": preferences.get("notification_priority", "all"),
+            "push_notifications": preferences.get("push_notifications", True)
+        }
+        
+    except Exception as e:
+        logger.error(f"Error fetching notification preferences: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch preferences")
+
+# Update Player Notification Preferences
+@router.put("/player/notification-preferences")
+async def update_player_notification_preferences(
+    email_notifications: bool = True,
+    notification_priority: str = "all",
+    push_notifications: bool = True,
+    user_info = Depends(require_player_user)
+):
+    """Update player notification preferences"""
+    try:
+        player_id = user_info["player_id"]
+        
+        # Validate notification_priority
+        if notification_priority not in ["all", "important", "none"]:
+            raise HTTPException(status_code=400, detail="Invalid notification priority")
+        
+        # Update or create preferences
+        await db.player_preferences.update_one(
+            {"player_id": player_id},
+            {
+                "$set": {
+                    "email_notifications": email_notifications,
+                    "notification_priority": notification_priority,
+                    "push_notifications": push_notifications,
+                    "updated_at": datetime.utcnow()
+                }
+            },
+            upsert=True
+        )
+        
+        return {"message": "Preferences updated successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating notification preferences: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update preferences")
+
+# Get player notifications
+@router.get("/player/notifications")
+async def get_player_notifications(
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(notification_fieldset),
+    user_info = Depends(require_player_user)
+):
+    """Get all notifications for the authenticated player"""
+    try:
+        player_id = user_info["player_id"]
+        
+        # Get notifications sorted by newest first
+        limit = page.page_limit(100)
+        notifications, next_cursor = await notification_store.page(
+            "player", player_id, limit=limit, position=page.position,
+            projection=fieldset.projection(extra=("created_at",))
+        )
+        
+        return FastJSONResponse({
+            "notifications": fieldset.trim_rows(rows_from_db(notifications, Notification)),
+            "unread_count": await notification_store.unread_count("player", player_id),
+            "limit": limit,
+            "next_cursor": next_cursor
+        })
+        
+    except Exception as e:
+        logger.error(f"Error fetching notifications: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch notifications")
+
+# Mark notification as read
+@router.put("/player/notifications/{notification_id}/read")
+async def mark_player_notification_read(notification_id: str, user_info = Depends(require_player_user)):
+    """Mark a notification as read"""
+    try:
+        if not await notification_store.mark_read("player", user_info["player_id"], notification_id):
+            raise HTTPException(status_code=404, detail="Notification not found")
+        
+        return {"message": "Notification marked as read"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating notification: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update notification")
+
+# Mark all notifications as read
+@router.put("/player/notifications/read-all")
+async def mark_all_player_notifications_read(user_info = Depends(require_player_user)):
+    """Mark all notifications as read for the authenticated player"""
+    try:
+        updated_count = await notification_store.mark_all_read("player", user_info["player_id"])
+        
+        return {
+            "message": "All notifications marked as read",
+            "updated_count": updated_count
+        }
+        
+    except Exception as e:
+        logger.error(f"Error updating notifications: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update notifications")
+
+# Get Player Payment History
+@router.get("/player/payment-history")
+async def get_player_payment_history(user_info = Depends(require_player_user)):
+    """Get payment history for player's academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Get academy subscription info
+        subscription = await db.academy_subscriptions.find_one({"academy_id": academy_id})
+        
+        # Get payment transactions
+        payments = await db.payment_transactions.find({
+            "academy_id": academy_id,
+            "payment_status": "paid"
+        }).sort("payment_date", -1).limit(12).to_list(12)
+        
+        # Clean payment data
+        payment_history = []
+        for payment in payments:
+            payment_history.append({
+                "id": payment.get("id"),
+                "amount": payment.get("amount"),
+                "currency": payment.get("currency"),
+                "payment_date": payment.get("payment_date").isoformat() if payment.get("payment_date") else None,
+                "payment_method": payment.get("payment_method"),
+                "description": payment.get("description"),
+                "billing_cycle": payment.get("billing_cycle")
+            })
+        
+        # Calculate next payment info
+        next_payment = None
+        if subscription:
+            next_payment = {
+                "amount": subscription.get("amount"),
+                "currency": subscription.get("currency"),
+                "due_date": subscription.get("current_period_end").isoformat() if subscription.get("current_period_end") else None,
+                "billing_cycle": subscription.get("billing_cycle"),
+                "status": subscription.get("status")
+            }
+        
+        return {
+            "payment_history": payment_history,
+            "next_payment": next_payment,
+            "total_paid": sum([p.get("amount", 0) for p in payments])
+        }
+        
+    except Exception as e:
+        logger.error(f"Error fetching payment history: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch payment history")
+
+# Coach info for a player (assigned coach details)
+@router.get("/player/coach-info")
+async def get_player_coach_info(user_info = Depends(require_player_user), date: Optional[str] = None):
+    try:
+        player = user_info["player"]
+        academy_id = user_info["academy_id"]
+        coach_id = player.get("coach_id")
+        if not coach_id:
+            return {"coach": None}
+
+        coach = await get_coach(coach_id, academy_id)
+        if not coach:
+            return {"coach": None}
+
+        # Compute average coach rating over last 180 days
+        time_limit = datetime.utcnow() - timedelta(days=180)
+        ratings_cursor = db.coach_ratings.find({
+            "academy_id": academy_id,
+            "coach_id": coach_id,
+            "created_at": {"$gte": time_limit}
+        })
+        ratings = await ratings_cursor.to_list(length=None)
+        values = [r.get("rating") for r in ratings if isinstance(r.get("rating"), (int, float))]
+        avg_rating_6m = round(sum(values) / len(values), 2) if values else None
+
+        # Eligibility: allow coach rating only if player has a recent attendance
+        # marked present AND performance ratings recorded (last 7 days)
+        target_date = date or datetime.utcnow().strftime('%Y-%m-%d')
+        eligible = await db.player_attendance.find_one({
+            "academy_id": academy_id,
+            "player_id": user_info["player_id"],
+            "date": target_date,
+            "present": True
+        })
+        can_rate = bool(eligible)
+
+        coach_clean = {
+            "id": coach.get("id"),
+            "first_name": coach.get("first_name"),
+            "last_name": coach.get("last_name"),
+            "email": coach.get("email"),
+            "phone": coach.get("phone"),
+            "sports": coach.get("sports", []),
+            "specialization": coach.get("specialization"),
+            "experience_years": coach.get("experience_years"),
+            "profile_picture_url": coach.get("profile_picture_url"),
+            "description": coach.get("description")
+        }
+
+        return {"coach": coach_clean, "avg_coach_rating_6m": avg_rating_6m, "can_rate_coach": can_rate, "session_date": target_date}
+    except Exception as e:
+        logger.error(f"Error fetching player coach info: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch coach info")
+
+# Player submits rating for assigned coach
+@router.post("/player/coach-rating")
+async def submit_coach_rating(payload: CoachRatingCreate, user_info = Depends(require_player_user), date: Optional[str] = None):
+    try:
+        player = user_info["player"]
+        player_id = user_info["player_id"]
+        academy_id = user_info["academy_id"]
+        coach_id = player.get("coach_id")
+        if not coach_id:
+            raise HTTPException(status_code=400, detail="No coach assigned to player")
+
+        coach = await get_coach(coach_id, academy_id)
+        if not coach:
+            raise HTTPException(status_code=404, detail="Assigned coach not found")
+
+        # Eligibility check: must have recent present attendance with performance ratings
+        target_date = date or datetime.utcnow().strftime('%Y-%m-%d')
+        eligible = await db.player_attendance.find_one({
+            "academy_id": academy_id,
+            "player_id": player_id,
+            "date": target_date,
+            "present": True
+        })
+        if not eligible:
+            raise HTTPException(status_code=400, detail="Coach rating allowed only when attendance is marked present for the selected date")
+
+        rating_doc = {
+            "id": str(uuid.uuid4()),
+            "academy_id": academy_id,
+            "coach_id": coach_id,
+            "player_id": player_id,
+            "rating": int(payload.rating),
+            "notes": payload.notes,
+            "session_date": target_date,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+
+        await db.coach_ratings.insert_one(rating_doc)
+
+        return {"message": "Coach rating submitted", "rating": rating_doc["rating"]}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting coach rating: {e}")
+        raise HTTPException(status_code=500, detail="Failed to submit coach rating")
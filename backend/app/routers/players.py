@@ -0,0 +1,406 @@
+"""
+Academy-side player management.
+"""
+import logging
+from datetime import datetime
+from typing import List, Union
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+
+from app.accounts import create_player_supabase_account, generate_default_password
+from app.constants import SPORT_POSITIONS, is_individual_sport
+from app.core import db, supabase_admin
+from app.dependencies import require_academy_user
+from app.fieldsets import player_fieldset
+from app.notifications import notification_store
+from app.models import BulkPlayerUpdate, Player, PlayerCreate, PlayerResponse, PlayerUpdate
+from utils.fieldsets import FieldSelection
+from utils.pagination import Page, PageParams, fetch_page
+from utils.player_update_ops import build_player_update_ops
+from utils.raw_bson import raw_fastpath_enabled, raw_find_page, raw_page_response
+from utils.serialization import FastJSONResponse, rows_from_db
+from utils.streaming import projection_for, stream_cursor
+from utils.validation import calculate_age_from_dob
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# ========== PLAYER MANAGEMENT ENDPOINTS ==========
+
+# Get all players for an academy (Academy User)
+@router.get("/academy/players", response_model=Union[List[PlayerResponse], Page[PlayerResponse]])
+async def get_academy_players(
+    request: Request,
+    stream: bool = False,
+    page: PageParams = Depends(),
+    fieldset: FieldSelection = Depends(player_fieldset),
+    user_info = Depends(require_academy_user)
+):
+    """Get all players for the authenticated academy (?stream=1 for large exports)"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        if stream:
+            players_cursor = db.players.find(
+                {"academy_id": academy_id}, fieldset.projection(projection_for(PlayerResponse))
+            ).sort([("created_at", 1), ("id", 1)])
+            return stream_cursor(players_cursor, request)
+        
+        if raw_fastpath_enabled() and not fieldset.selected:
+            raw_players, next_cursor = await raw_find_page(
+                db.players, {"academy_id": academy_id}, projection_for(PlayerResponse),
+                sort_field="created_at", direction=1, limit=page.page_limit(None), position=page.position
+            )
+            return raw_page_response(page, raw_players, next_cursor)
+        
+        # Get players for this academy (all of them unless a page is requested)
+        players, next_cursor = await fetch_page(
+            db.players, {"academy_id": academy_id}, sort_field="created_at", direction=1,
+            limit=page.page_limit(None), position=page.position,
+            projection=fieldset.projection(extra=("created_at",))
+        )
+        
+        # Trusted DB rows: shape them like PlayerResponse without validating each one twice
+        player_list = fieldset.trim_rows(rows_from_db(players, PlayerResponse))
+        return FastJSONResponse(page.respond(player_list, next_cursor))
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching academy players: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch players")
+
+# Create a new player (Academy User)
+@router.post("/academy/players", response_model=Player)
+async def create_player(player_data: PlayerCreate, user_info = Depends(require_academy_user)):
+    """Create a new player for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        academy = user_info["academy"]
+        
+        # Check if academy has reached player limit
+        current_players = await db.players.count_documents({"academy_id": academy_id, "status": "active"})
+        if current_players >= academy.get("player_limit", 50):
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Academy has reached maximum player limit of {academy.get('player_limit', 50)}"
+            )
+        
+        # Check for duplicate registration number within academy (if provided)
+        if player_data.registration_number:
+            existing_registration = await db.players.find_one({
+                "academy_id": academy_id,
+                "registration_number": player_data.registration_number,
+                "status": "active"
+            })
+            if existing_registration:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Registration number {player_data.registration_number} is already taken"
+                )
+        
+        # Prepare player data with enhancements
+        player_dict = player_data.dict()
+        
+        # Auto-calculate age from date of birth if provided
+        if player_data.date_of_birth and not player_data.age:
+            calculated_age = calculate_age_from_dob(player_data.date_of_birth)
+            if calculated_age:
+                player_dict["age"] = calculated_age
+        
+        # Validate sport-specific requirements
+        if player_data.sport:
+            # For individual sports, position is optional
+            if is_individual_sport(player_data.sport) and not player_data.position:
+                player_dict["position"] = None
+            
+            # Validate position against sport if provided
+            if player_data.position and player_data.sport in SPORT_POSITIONS:
+                valid_positions = SPORT_POSITIONS[player_data.sport]
+                if player_data.position not in valid_positions:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Invalid position '{player_data.position}' for sport '{player_data.sport}'"
+                    )
+        
+        # Auto-generate login credentials if email is provided
+        supabase_user_id = None
+        default_password = None
+        has_login = False
+        
+        if player_data.email:
+            # Generate default password
+            default_password = generate_default_password()
+            
+            # Create Supabase account for player
+            supabase_user_id = await create_player_supabase_account(
+                player_data.email, 
+                default_password, 
+                {
+                    "first_name": player_data.first_name,
+                    "last_name": player_data.last_name,
+                    "academy_id": academy_id
+                }
+            )
+            
+            if supabase_user_id:
+                has_login = True
+        
+        # Create new player with authentication fields
+        player = Player(
+            academy_id=academy_id,
+            has_login=has_login,
+            default_password=default_password,
+            password_changed=False,
+            supabase_user_id=supabase_user_id,
+            **player_dict
+        )
+        
+        # Save to database
+        await db.players.insert_one(player.dict())
+        
+        # Create notification if coach is assigned
+        if player_data.coach_id:
+            # Verify coach exists
+            coach = await db.coaches.find_one({"id": player_data.coach_id, "academy_id": academy_id})
+            if coach:
+                await notification_store.notify(
+                    academy_id, "coach", player_data.coach_id,
+                    f"A new player, {player_data.first_name} {player_data.last_name}, has been assigned to you.",
+                    type="player_assigned",
+                    title="New Player Assigned"
+                )
+        
+        return player
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating player: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create player")
+
+@router.post("/academy/players/bulk-assign")
+@router.post("/academy/players/bulk-assign/")
+@router.put("/academy/players/bulk-assign")
+@router.put("/academy/players/bulk-assign/")
+async def bulk_assign_players(payload: BulkPlayerUpdate, user_info = Depends(require_academy_user)):
+    """
+    Assign or Unassign multiple players in a single database operation.
+    Pass coach_id=None to unassign.
+    """
+    try:
+        academy_id = user_info["academy_id"]
+
+        if not payload.player_ids:
+            return {"message": "No players provided", "modified_count": 0, "matched_count": 0}
+
+        # Pre-check: find which players exist
+        existing_cursor = db.players.find({"academy_id": academy_id, "id": {"$in": payload.player_ids}}, {"id": 1})
+        existing = await existing_cursor.to_list(length=None)
+        found_ids = {p.get("id") for p in existing}
+        missing_ids = [pid for pid in payload.player_ids if pid not in found_ids]
+
+        filter_query = {"id": {"$in": list(found_ids)}, "academy_id": academy_id}
+
+        if payload.coach_id is None:
+            update_query = {"$unset": {"coach_id": ""}, "$set": {"updated_at": datetime.utcnow()}}
+        else:
+            update_query = {"$set": {"coach_id": payload.coach_id, "updated_at": datetime.utcnow()}}
+
+        result = await db.players.update_many(filter_query, update_query)
+
+        action = "assigned" if payload.coach_id else "unassigned"
+        response = {
+            "message": f"Successfully {action} {result.modified_count} players.",
+            "modified_count": result.modified_count,
+            "matched_count": result.matched_count,
+            "missing_ids": missing_ids,
+        }
+        if missing_ids:
+            logger.warning(f"Bulk assign: {len(missing_ids)} player IDs not found for academy {academy_id}: {missing_ids[:10]}{'...' if len(missing_ids) > 10 else ''}")
+        return response
+    except Exception as e:
+        logger.error(f"Bulk assign error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update players")
+
+# Get specific player (Academy User)
+@router.get("/academy/players/{player_id}", response_model=PlayerResponse)
+async def get_player(player_id: str, user_info = Depends(require_academy_user)):
+    """Get specific player for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Find player
+        player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+
+        # Remove MongoDB _id field
+        player.pop("_id", None)
+        return PlayerResponse(**player)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching player: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch player")
+
+# Update player (Academy User)
+@router.put("/academy/players/{player_id}", response_model=PlayerResponse)
+async def update_player(player_id: str, player_data: PlayerUpdate, user_info = Depends(require_academy_user)):
+    """Update specific player for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Check if player exists
+        existing_player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not existing_player:
+            raise HTTPException(status_code=404, detail="Player not found")
+
+        # Check for duplicate registration number ONLY if actually changing it and it's not empty
+        if player_data.registration_number is not None and player_data.registration_number.strip() != "":
+            # Only check if different from current registration number
+            current_reg = existing_player.get("registration_number", "")
+            if player_data.registration_number != current_reg:
+                existing_registration = await db.players.find_one({
+                    "academy_id": academy_id,
+                    "registration_number": player_data.registration_number,
+                    "status": "active",
+                    "id": {"$ne": player_id}  # Exclude current player
+                })
+                if existing_registration:
+                    raise HTTPException(
+                        status_code=400,
+                        detail=f"Registration number {player_data.registration_number} is already taken"
+                    )
+
+        # Build update data and remove None values
+        update_data = {k: v for k, v in player_data.dict().items() if v is not None}
+
+        # SECURITY FIX MEDIUM #1: Explicitly exclude sensitive authentication fields
+        # These fields should never be modified via API updates
+        sensitive_fields = {'has_login', 'default_password', 'password_changed', 'supabase_user_id', 'id', 'academy_id', 'created_at'}
+        for field in sensitive_fields:
+            update_data.pop(field, None)
+
+        # Validate position against sport if provided
+        if player_data.sport:
+            if update_data.get("position") and player_data.sport in SPORT_POSITIONS:
+                valid_positions = SPORT_POSITIONS[player_data.sport]
+                if update_data["position"] not in valid_positions:
+                    raise HTTPException(status_code=400, detail=f"Invalid position '{update_data['position']}' for sport '{player_data.sport}'")
+
+        # Check if coach is being assigned/changed
+        old_coach_id = existing_player.get("coach_id")
+        new_coach_id = player_data.coach_id
+
+        # Build update operations with cleaned data
+        update_ops = build_player_update_ops(existing_player, player_data, cleaned_update_data=update_data)
+        
+        await db.players.update_one(
+            {"id": player_id, "academy_id": academy_id},
+            update_ops
+        )
+        
+        # Create notification if coach is assigned or changed
+        if new_coach_id and new_coach_id != old_coach_id:
+            # Verify coach exists
+            coach = await db.coaches.find_one({"id": new_coach_id, "academy_id": academy_id})
+            if coach:
+                await notification_store.notify(
+                    academy_id, "coach", new_coach_id,
+                    f"A new player, {existing_player['first_name']} {existing_player['last_name']}, has been assigned to you.",
+                    type="player_assigned",
+                    title="New Player Assigned"
+                )
+        
+        # Get updated player
+        updated_player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        # Remove MongoDB _id field
+        updated_player.pop("_id", None)
+        return PlayerResponse(**updated_player)
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating player {player_id}: {type(e).__name__}: {str(e)}")
+        import traceback
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        raise HTTPException(status_code=500, detail=f"Failed to update player: {str(e)}")
+
+
+
+# Delete player (Academy User)
+@router.delete("/academy/players/{player_id}")
+async def delete_player(player_id: str, user_info = Depends(require_academy_user)):
+    """Delete specific player for the authenticated academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Check if player exists
+        existing_player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not existing_player:
+            raise HTTPException(status_code=404, detail="Player not found")
+        
+        # Delete player
+        await db.players.delete_one({"id": player_id, "academy_id": academy_id})
+        
+        return {"message": "Player deleted successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting player: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete player")
+
+# Regenerate Player Password (Admin Only)
+@router.post("/academy/players/{player_id}/regenerate-password")
+async def regenerate_player_password(player_id: str, user_info = Depends(require_academy_user)):
+    """Regenerate password for a player (Admin only)"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Find player
+        player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+        
+        if not player.get("email") or not player.get("supabase_user_id"):
+            raise HTTPException(status_code=400, detail="Player does not have login credentials")
+        
+        # Generate new password
+        new_password = generate_default_password()
+        
+        # Update password in Supabase
+        try:
+            supabase_admin.auth.admin.update_user_by_id(
+                player["supabase_user_id"],
+                {"password": new_password}
+            )
+        except Exception as e:
+            logger.error(f"Failed to update Supabase password: {e}")
+            raise HTTPException(status_code=500, detail="Failed to update password in authentication system")
+        
+        # Update player in database
+        await db.players.update_one(
+            {"id": player_id},
+            {
+                "$set": {
+                    "default_password": new_password,
+                    "password_changed": False,
+                    "updated_at": datetime.utcnow()
+                }
+            }
+        )
+        
+        return {
+            "message": "Password regenerated successfully",
+            "new_password": new_password,
+            "player_email": player["email"]
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error regenerating player password: {e}")
+        raise HTTPException(status_code=500, detail="Failed to regenerate password")
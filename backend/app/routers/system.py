@@ -0,0 +1,201 @@
+"""
+Health checks, status checks, sport configuration, uploads and theme.
+"""
+import logging
+import os
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import aiofiles
+from fastapi import APIRouter, Depends, File, HTTPException, Request, UploadFile
+
+from app.constants import (INDIVIDUAL_SPORTS, SPORT_PERFORMANCE_CATEGORIES, SPORT_POSITIONS, TEAM_SPORTS,
+                           TRAINING_BATCHES, TRAINING_DAYS)
+from app.core import UPLOAD_DIR, db, supabase
+from app.dependencies import require_academy_user, validate_image_file
+from app.models import (SportConfigResponse, SportPositionsResponse, StatusCheck, StatusCheckCreate,
+                        SupabaseHealthResponse, ThemePreference)
+from utils.http_cache import StaticPayload
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+@router.get("/")
+async def root():
+    return {"message": "Hello World"}
+
+# Supabase Health Check
+@router.get("/supabase/health", response_model=SupabaseHealthResponse)
+async def supabase_health_check():
+    try:
+        # Test connection by getting user (will return None for anon key)
+        test_response = supabase.auth.get_user()
+        return SupabaseHealthResponse(
+            status="healthy",
+            supabase_url=os.environ.get("SUPABASE_URL"),
+            connection="active"
+        )
+    except Exception as e:
+        logger.error(f"Supabase health check failed: {e}")
+        # SECURITY FIX: Generic error message to prevent information disclosure
+        raise HTTPException(status_code=500, detail="Service connection failed")
+
+# File Upload Endpoints
+@router.post("/upload/logo")
+async def upload_academy_logo(file: UploadFile = File(...)):
+    try:
+        # Read file content first for validation
+        content = await file.read()
+
+        # SECURITY FIX #2: Validate actual file content using magic numbers
+        if not await validate_image_file(content, file.filename):
+            raise HTTPException(status_code=400, detail="Invalid image file")
+
+        # SECURITY FIX #4: Use pathlib for safe file extension extraction
+        file_extension = Path(file.filename).suffix.lower().lstrip('.')
+
+        # Whitelist allowed extensions
+        allowed_extensions = {'jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'}
+        if file_extension not in allowed_extensions:
+            raise HTTPException(status_code=400, detail="File type not allowed")
+
+        # Generate unique filename
+        unique_filename = f"{str(uuid.uuid4())}.{file_extension}"
+        file_path = UPLOAD_DIR / unique_filename
+
+        # Save file
+        async with aiofiles.open(file_path, 'wb') as f:
+            await f.write(content)
+        
+        # Return the URL path with /api prefix
+        logo_url = f"/api/uploads/logos/{unique_filename}"
+        return {"logo_url": logo_url, "message": "Logo uploaded successfully"}
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions (like validation errors)
+        raise
+    except Exception as e:
+        logger.error(f"File upload error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to upload logo")
+
+@router.post("/upload/player-photo")
+async def upload_player_photo(file: UploadFile = File(...), user_info = Depends(require_academy_user)):
+    try:
+        # Read file content first for validation
+        content = await file.read()
+
+        # SECURITY FIX #2: Validate actual file content using magic numbers
+        if not await validate_image_file(content, file.filename):
+            raise HTTPException(status_code=400, detail="Invalid image file")
+
+        # SECURITY FIX #4: Use pathlib for safe file extension extraction
+        file_extension = Path(file.filename).suffix.lower().lstrip('.')
+
+        # Whitelist allowed extensions
+        allowed_extensions = {'jpg', 'jpeg', 'png', 'gif', 'webp', 'bmp'}
+        if file_extension not in allowed_extensions:
+            raise HTTPException(status_code=400, detail="File type not allowed")
+
+        # Generate unique filename with academy prefix
+        academy_id = user_info["academy_id"]
+        unique_filename = f"player_{academy_id}_{str(uuid.uuid4())}.{file_extension}"
+        file_path = UPLOAD_DIR / unique_filename
+
+        # Save file
+        async with aiofiles.open(file_path, 'wb') as f:
+            await f.write(content)
+        
+        # Return the URL path with /api prefix
+        photo_url = f"/api/uploads/logos/{unique_filename}"
+        return {"photo_url": photo_url, "message": "Player photo uploaded successfully"}
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions (like validation errors)
+        raise
+    except Exception as e:
+        logger.error(f"File upload error: {e}")
+        raise HTTPException(status_code=500, detail="Failed to upload player photo")
+
+# Sport and Position Configuration Endpoints
+# These payloads never change at runtime, so they are validated and serialized once
+SPORT_POSITIONS_PAYLOAD = StaticPayload(SportPositionsResponse(
+    sports=SPORT_POSITIONS,
+    training_days=TRAINING_DAYS,
+    training_batches=TRAINING_BATCHES
+).model_dump())
+
+SPORT_CONFIG_PAYLOAD = StaticPayload(SportConfigResponse(
+    sports=SPORT_POSITIONS,
+    performance_categories=SPORT_PERFORMANCE_CATEGORIES,
+    individual_sports=INDIVIDUAL_SPORTS,
+    team_sports=TEAM_SPORTS,
+    training_days=TRAINING_DAYS,
+    training_batches=TRAINING_BATCHES
+).model_dump())
+
+@router.get("/sports/positions", response_model=SportPositionsResponse)
+async def get_sport_positions(request: Request):
+    """Get available sports, positions, training days, and batches (Legacy endpoint)"""
+    return SPORT_POSITIONS_PAYLOAD.response(request)
+
+@router.get("/sports/config", response_model=SportConfigResponse)
+async def get_sport_config(request: Request):
+    """Get enhanced sports configuration including performance categories and sport types"""
+    return SPORT_CONFIG_PAYLOAD.response(request)
+
+@router.post("/status", response_model=StatusCheck)
+async def create_status_check(input: StatusCheckCreate):
+    status_dict = input.dict()
+    status_obj = StatusCheck(**status_dict)
+    _ = await db.status_checks.insert_one(status_obj.dict())
+    return status_obj
+
+@router.get("/status", response_model=List[StatusCheck])
+async def get_status_checks():
+    status_checks = await db.status_checks.find().to_list(1000)
+    return [StatusCheck(**status_check) for status_check in status_checks]
+
+# ========== THEME PREFERENCE ENDPOINTS ==========
+
+# Get Theme Preference
+@router.get("/theme")
+async def get_theme_preference():
+    """Get global theme preference"""
+    try:
+        theme_pref = await db.theme_preferences.find_one({})
+        if not theme_pref:
+            # Create default theme preference
+            default_theme = ThemePreference()
+            await db.theme_preferences.insert_one(default_theme.dict())
+            return {"theme": "light"}
+        
+        return {"theme": theme_pref.get("theme", "light")}
+        
+    except Exception as e:
+        logger.error(f"Error fetching theme preference: {e}")
+        return {"theme": "light"}  # Default fallback
+
+# Update Theme Preference
+@router.put("/theme")
+async def update_theme_preference(theme: str):
+    """Update global theme preference"""
+    try:
+        if theme not in ["light", "dark"]:
+            raise HTTPException(status_code=400, detail="Theme must be 'light' or 'dark'")
+        
+        # Update or create theme preference
+        await db.theme_preferences.update_one(
+            {},
+            {"$set": {"theme": theme, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+        
+        return {"message": "Theme updated successfully", "theme": theme}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating theme preference: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update theme preference")
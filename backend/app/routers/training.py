@@ -0,0 +1,475 @@
+"""
+Batches, training plans, achievements and certificates.
+"""
+import logging
+import uuid
+from datetime import datetime
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from app.core import db
+from app.dependencies import require_academy_user, require_coach_user
+from app.notifications import notification_store
+from app.models import TrainingPlanCreate
+from app.reference import get_academy
+from utils.pagination import PageParams, fetch_page
+from utils.serialization import FastJSONResponse
+
+logger = logging.getLogger(__name__)
+router = APIRouter(prefix="/api")
+
+# ========== BATCH/GROUP MANAGEMENT ENDPOINTS ==========
+
+# Get All Batches
+@router.get("/academy/batches")
+async def get_academy_batches(user_info = Depends(require_academy_user)):
+    """Get all batches for the academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        batches_raw = await db.batches.find({"academy_id": academy_id}).to_list(100)
+        
+        # Clean batches and get player counts
+        batches = []
+        for batch in batches_raw:
+            batch.pop("_id", None)
+            
+            # Count players in batch
+            player_count = await db.players.count_documents({
+                "academy_id": academy_id,
+                "batch_id": batch.get("id"),
+                "status": "active"
+            })
+            batch["player_count"] = player_count
+            
+            # Clean dates
+            if batch.get("created_at"):
+                batch["created_at"] = batch["created_at"].isoformat()
+            if batch.get("updated_at"):
+                batch["updated_at"] = batch["updated_at"].isoformat()
+            
+            batches.append(batch)
+        
+        return {"batches": batches}
+        
+    except Exception as e:
+        logger.error(f"Error fetching batches: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch batches")
+
+# Create Batch
+@router.post("/academy/batches")
+async def create_batch(
+    name: str,
+    sport: str,
+    skill_level: str,
+    age_group: str = None,
+    schedule_days: list = [],
+    schedule_time: str = None,
+    coach_id: str = None,
+    max_players: int = 20,
+    fee_amount: float = 0,
+    user_info = Depends(require_academy_user)
+):
+    """Create a new batch"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Validate skill level
+        valid_skill_levels = ["beginner", "intermediate", "advanced", "elite"]
+        if skill_level not in valid_skill_levels:
+            raise HTTPException(status_code=400, detail="Invalid skill level")
+        
+        # Create batch
+        batch_id = str(uuid.uuid4())
+        batch = {
+            "id": batch_id,
+            "academy_id": academy_id,
+            "name": name,
+            "sport": sport,
+            "skill_level": skill_level,
+            "age_group": age_group,
+            "schedule_days": schedule_days,
+            "schedule_time": schedule_time,
+            "coach_id": coach_id,
+            "max_players": max_players,
+            "fee_amount": fee_amount,
+            "status": "active",
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        
+        await db.batches.insert_one(batch)
+        
+        return {"message": "Batch created successfully", "batch_id": batch_id}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating batch: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create batch")
+
+# Update Batch
+@router.put("/academy/batches/{batch_id}")
+async def update_batch(
+    batch_id: str,
+    name: str = None,
+    sport: str = None,
+    skill_level: str = None,
+    age_group: str = None,
+    schedule_days: list = None,
+    schedule_time: str = None,
+    coach_id: str = None,
+    max_players: int = None,
+    fee_amount: float = None,
+    status: str = None,
+    user_info = Depends(require_academy_user)
+):
+    """Update batch details"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Find batch
+        batch = await db.batches.find_one({"id": batch_id, "academy_id": academy_id})
+        if not batch:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        
+        # Build update data
+        update_data = {"updated_at": datetime.utcnow()}
+        if name: update_data["name"] = name
+        if sport: update_data["sport"] = sport
+        if skill_level: update_data["skill_level"] = skill_level
+        if age_group: update_data["age_group"] = age_group
+        if schedule_days is not None: update_data["schedule_days"] = schedule_days
+        if schedule_time: update_data["schedule_time"] = schedule_time
+        if coach_id: update_data["coach_id"] = coach_id
+        if max_players: update_data["max_players"] = max_players
+        if fee_amount is not None: update_data["fee_amount"] = fee_amount
+        if status: update_data["status"] = status
+        
+        await db.batches.update_one({"id": batch_id}, {"$set": update_data})
+        
+        return {"message": "Batch updated successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error updating batch: {e}")
+        raise HTTPException(status_code=500, detail="Failed to update batch")
+
+# Delete Batch
+@router.delete("/academy/batches/{batch_id}")
+async def delete_batch(batch_id: str, user_info = Depends(require_academy_user)):
+    """Delete a batch"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Check if batch has players
+        player_count = await db.players.count_documents({
+            "academy_id": academy_id,
+            "batch_id": batch_id,
+            "status": "active"
+        })
+        
+        if player_count > 0:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Cannot delete batch with {player_count} active players. Please reassign them first."
+            )
+        
+        result = await db.batches.delete_one({"id": batch_id, "academy_id": academy_id})
+        
+        if result.deleted_count == 0:
+            raise HTTPException(status_code=404, detail="Batch not found")
+        
+        return {"message": "Batch deleted successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error deleting batch: {e}")
+        raise HTTPException(status_code=500, detail="Failed to delete batch")
+
+# ========== TRAINING PLANS & SCHEDULES ENDPOINTS ==========
+
+# Get All Training Plans
+@router.get("/academy/training-plans")
+async def get_training_plans(page: PageParams = Depends(), user_info = Depends(require_academy_user)):
+    """Get all training plans for academy"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        limit = page.page_limit(100)
+        plans, next_cursor = await fetch_page(
+            db.training_plans, {"academy_id": academy_id}, sort_field="created_at", direction=-1,
+            limit=limit, position=page.position, projection={"_id": 0}
+        )
+        
+        for plan in plans:
+            # Get review status from coaches
+            plan["reviews"] = await db.training_reviews.find(
+                {"plan_id": plan.get("id")}, {"_id": 0}
+            ).to_list(100)
+        
+        # Dates are encoded by FastJSONResponse, no per-field isoformat pass needed
+        return FastJSONResponse({"training_plans": plans, "limit": limit, "next_cursor": next_cursor})
+        
+    except Exception as e:
+        logger.error(f"Error fetching training plans: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch training plans")
+
+# Create Training Plan (Admin only)
+@router.post("/academy/training-plans")
+async def create_training_plan(
+    plan_data: TrainingPlanCreate,
+    user_info = Depends(require_academy_user)
+):
+    """Create a new training plan (Admin creates, coaches review)"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Parse dates
+        start_date_obj = datetime.fromisoformat(plan_data.start_date.replace('Z', '+00:00')) if plan_data.start_date else None
+        end_date_obj = datetime.fromisoformat(plan_data.end_date.replace('Z', '+00:00')) if plan_data.end_date else None
+        
+        # Create plan
+        plan_id = str(uuid.uuid4())
+        plan = {
+            "id": plan_id,
+            "academy_id": academy_id,
+            "title": plan_data.title,
+            "description": plan_data.description,
+            "sport": plan_data.sport,
+            "batch_id": plan_data.batch_id,
+            "start_date": start_date_obj,
+            "end_date": end_date_obj,
+            "schedule": plan_data.schedule,  # {day: {time, drills, notes}}
+            "drills": [drill.dict() for drill in plan_data.drills],  # [{ name, description, duration, focus_area }]
+            "goals": [goal.dict() for goal in plan_data.goals],  # [{ description, target_date }]
+            "status": "pending_review",
+            "created_by": user_info["user"].id,
+            "created_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow()
+        }
+        
+        await db.training_plans.insert_one(plan)
+        
+        # Notify coaches assigned to the batch
+        if plan_data.batch_id:
+            batch = await db.batches.find_one({"id": plan_data.batch_id})
+            if batch and batch.get("coach_id"):
+                await notification_store.notify(
+                    academy_id, "coach", batch["coach_id"],
+                    f"A new training plan '{plan_data.title}' has been created and requires your review.",
+                    type="training_plan_review",
+                    title="New Training Plan for Review",
+                    data={"plan_id": plan_id}
+                )
+        
+        return {"message": "Training plan created successfully", "plan_id": plan_id}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error creating training plan: {e}")
+        raise HTTPException(status_code=500, detail="Failed to create training plan")
+
+# Coach Review Training Plan
+@router.post("/coach/training-plans/{plan_id}/review")
+async def review_training_plan(
+    plan_id: str,
+    action: str,  # "approve" or "flag"
+    comments: str = None,
+    user_info = Depends(require_coach_user)
+):
+    """Coach reviews and approves/flags training plan"""
+    try:
+        coach_id = user_info["coach_id"]
+        academy_id = user_info["academy_id"]
+        
+        # Validate action
+        if action not in ["approve", "flag"]:
+            raise HTTPException(status_code=400, detail="Invalid action. Use 'approve' or 'flag'")
+        
+        # Find plan
+        plan = await db.training_plans.find_one({"id": plan_id, "academy_id": academy_id})
+        if not plan:
+            raise HTTPException(status_code=404, detail="Training plan not found")
+        
+        # Create review record
+        review_id = str(uuid.uuid4())
+        review = {
+            "id": review_id,
+            "plan_id": plan_id,
+            "coach_id": coach_id,
+            "academy_id": academy_id,
+            "action": action,
+            "comments": comments,
+            "reviewed_at": datetime.utcnow()
+        }
+        
+        await db.training_reviews.insert_one(review)
+        
+        # Update plan status
+        new_status = "approved" if action == "approve" else "flagged"
+        await db.training_plans.update_one(
+            {"id": plan_id},
+            {"$set": {"status": new_status, "updated_at": datetime.utcnow()}}
+        )
+        
+        # Notify admin
+        await notification_store.notify(
+            academy_id, "academy", academy_id,
+            f"Coach has {action}d the training plan '{plan.get('title')}'. {comments or ''}",
+            type="training_plan_reviewed",
+            title=f"Training Plan {action.title()}d",
+            data={"plan_id": plan_id}
+        )
+        
+        return {"message": f"Training plan {action}d successfully"}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reviewing training plan: {e}")
+        raise HTTPException(status_code=500, detail="Failed to review training plan")
+
+# ========== CERTIFICATES & ACHIEVEMENTS ENDPOINTS ==========
+
+# Get Player Achievements
+@router.get("/academy/players/{player_id}/achievements")
+async def get_player_achievements(player_id: str, user_info = Depends(require_academy_user)):
+    """Get achievements for a player"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        achievements_raw = await db.achievements.find({
+            "player_id": player_id,
+            "academy_id": academy_id
+        }).to_list(100)
+        
+        achievements = []
+        for ach in achievements_raw:
+            ach.pop("_id", None)
+            if ach.get("earned_at"):
+                ach["earned_at"] = ach["earned_at"].isoformat()
+            achievements.append(ach)
+        
+        return {"achievements": achievements}
+        
+    except Exception as e:
+        logger.error(f"Error fetching achievements: {e}")
+        raise HTTPException(status_code=500, detail="Failed to fetch achievements")
+
+# Award Achievement to Player
+@router.post("/academy/players/{player_id}/achievements")
+async def award_achievement(
+    player_id: str,
+    title: str,
+    description: str,
+    badge_type: str,  # "attendance", "performance", "milestone", "tournament"
+    metadata: dict = {},
+    user_info = Depends(require_academy_user)
+):
+    """Award an achievement badge to a player"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Verify player
+        player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+        
+        # Create achievement
+        achievement_id = str(uuid.uuid4())
+        achievement = {
+            "id": achievement_id,
+            "player_id": player_id,
+            "academy_id": academy_id,
+            "title": title,
+            "description": description,
+            "badge_type": badge_type,
+            "metadata": metadata,
+            "earned_at": datetime.utcnow(),
+            "awarded_by": user_info["user_id"]
+        }
+        
+        await db.achievements.insert_one(achievement)
+        
+        # Notify player
+        await notification_store.notify(
+            academy_id, "player", player_id, f"Congratulations! You've earned: {title}",
+            type="achievement_earned",
+            title="New Achievement Earned! 🏆",
+            data={"achievement_id": achievement_id}
+        )
+        
+        return {"message": "Achievement awarded successfully", "achievement_id": achievement_id}
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error awarding achievement: {e}")
+        raise HTTPException(status_code=500, detail="Failed to award achievement")
+
+# Generate Certificate
+@router.post("/academy/players/{player_id}/certificate")
+async def generate_certificate(
+    player_id: str,
+    certificate_type: str,  # "completion", "achievement", "participation"
+    title: str,
+    description: str,
+    issue_date: str = None,
+    user_info = Depends(require_academy_user)
+):
+    """Generate a certificate for a player"""
+    try:
+        academy_id = user_info["academy_id"]
+        
+        # Verify player
+        player = await db.players.find_one({"id": player_id, "academy_id": academy_id})
+        if not player:
+            raise HTTPException(status_code=404, detail="Player not found")
+        
+        # Get academy info
+        academy = await get_academy(academy_id)
+        
+        issue_date_obj = datetime.fromisoformat(issue_date.replace('Z', '+00:00')) if issue_date else datetime.utcnow()
+        
+        # Create certificate record
+        certificate_id = str(uuid.uuid4())
+        certificate = {
+            "id": certificate_id,
+            "player_id": player_id,
+            "academy_id": academy_id,
+            "certificate_type": certificate_type,
+            "title": title,
+            "description": description,
+            "player_name": f"{player.get('first_name')} {player.get('last_name')}",
+            "academy_name": academy.get("name"),
+            "issue_date": issue_date_obj,
+            "certificate_number": f"CERT-{academy_id[:8]}-{certificate_id[:8]}",
+            "status": "issued",
+            "created_at": datetime.utcnow()
+        }
+        
+        await db.certificates.insert_one(certificate)
+        
+        # Notify player
+        await notification_store.notify(
+            academy_id, "player", player_id, f"A new certificate has been issued: {title}",
+            type="certificate_issued",
+            title="Certificate Issued 📜",
+            data={"certificate_id": certificate_id}
+        )
+        
+        return {
+            "message": "Certificate generated successfully",
+            "certificate_id": certificate_id,
+            "certificate_number": certificate["certificate_number"]
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error generating certificate: {e}")
+        raise HTTPException(status_code=500, detail="Failed to generate certificate")
@@ -0,0 +1,140 @@
+"""
+pytest-benchmark suite for the CPU-bound helpers on hot request paths.
+
+Inputs are synthetic but shaped like production data (attendance records
+with sport-specific ratings, player update payloads, upload headers) at
+1k-100k records. Not collected by the normal test run; invoke it directly:
+
+    # record a baseline
+    python -m pytest benchmarks/bench_helpers.py --benchmark-storage=benchmarks/.benchmarks \\
+        --benchmark-autosave
+    # compare later runs against the latest one, failing on a >20% mean regression
+    python -m pytest benchmarks/bench_helpers.py --benchmark-storage=benchmarks/.benchmarks \\
+        --benchmark-compare --benchmark-compare-fail=mean:20%
+
+Baselines live under benchmarks/.benchmarks/<machine>/; comparisons are only
+meaningful against a baseline recorded on the same machine.
+"""
+import os
+import random
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("pytest_benchmark")
+# player_update_ops still calls .dict(); the warning per call would swamp the timings
+pytestmark = pytest.mark.filterwarnings("ignore::DeprecationWarning")
+
+from pydantic import BaseModel  # noqa: E402
+from typing import Optional  # noqa: E402
+
+from app.constants import SPORT_PERFORMANCE_CATEGORIES, get_sport_performance_categories  # noqa: E402
+from utils.analytics import (  # noqa: E402
+    aggregate_academy_ratings, aggregate_sport_ratings, linear_trend, slope_of_series, trend_confidence
+)
+from utils.player_update_ops import build_player_update_ops  # noqa: E402
+from utils.validation import calculate_age_from_dob, has_image_signature  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000]
+SPORTS = ["Football", "Cricket", "Basketball", "Tennis", "Swimming", "Badminton"]
+
+
+def make_attendance(count, seed=1):
+    """Attendance records as stored: ~85% present with ratings, some sparse/None ratings"""
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        sport = rng.choice(SPORTS)
+        present = rng.random() < 0.85
+        ratings = {}
+        if present:
+            for category in SPORT_PERFORMANCE_CATEGORIES[sport]:
+                roll = rng.random()
+                ratings[category] = None if roll < 0.05 else rng.randint(1, 10)
+        records.append({"player_id": f"p{rng.randrange(count // 10 + 1)}", "sport": sport,
+                        "present": present, "performance_ratings": ratings})
+    return records
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"{n // 1000}k")
+def attendance(request):
+    return make_attendance(request.param)
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda n: f"{n // 1000}k")
+def series(request):
+    rng = random.Random(2)
+    return [rng.uniform(1, 10) for _ in range(request.param)]
+
+
+def test_aggregate_academy_ratings(benchmark, attendance):
+    result = benchmark(aggregate_academy_ratings, attendance, SPORT_PERFORMANCE_CATEGORIES["Football"])
+    assert result["rated_count"] > 0
+
+
+def test_aggregate_sport_ratings(benchmark, attendance):
+    result = benchmark(aggregate_sport_ratings, attendance, get_sport_performance_categories)
+    assert len(result) == len(SPORTS)
+
+
+def test_linear_trend(benchmark, series):
+    benchmark(linear_trend, series)
+
+
+def test_trend_confidence(benchmark, series):
+    benchmark(trend_confidence, series)
+
+
+def test_slope_of_series(benchmark, series):
+    benchmark(slope_of_series, series)
+
+
+class PlayerUpdate(BaseModel):
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    position: Optional[str] = None
+    coach_id: Optional[str] = None
+
+
+@pytest.mark.parametrize("count", SIZES[:2], ids=lambda n: f"{n // 1000}k")
+def test_build_player_update_ops(benchmark, count):
+    existing = {"id": "p1", "coach_id": "c1"}
+    payloads = [
+        PlayerUpdate(first_name=f"Player{i}", phone="9876543210", coach_id=None if i % 3 == 0 else f"c{i % 7}")
+        for i in range(count)
+    ]
+
+    def build_all():
+        for payload in payloads:
+            build_player_update_ops(existing, payload)
+
+    benchmark(build_all)
+
+
+@pytest.mark.parametrize("count", SIZES, ids=lambda n: f"{n // 1000}k")
+def test_has_image_signature(benchmark, count):
+    headers = [b"\xFF\xD8\xFF\xE0", b"\x89PNG\r\n\x1a\n", b"RIFF\x00\x00\x00\x00WEBPVP8 ", b"%PDF-1.7", b"GIF89a"]
+    uploads = [headers[i % len(headers)] + b"\x00" * 64 for i in range(count)]
+
+    def check_all():
+        return sum(1 for content in uploads if has_image_signature(content))
+
+    assert benchmark(check_all) == count - count // len(headers)
+
+
+@pytest.mark.parametrize("count", SIZES, ids=lambda n: f"{n // 1000}k")
+def test_calculate_age_from_dob(benchmark, count):
+    rng = random.Random(3)
+    dobs = [f"{rng.randint(1995, 2018)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" for _ in range(count)]
+    today = date(2026, 6, 1)
+
+    def ages():
+        for dob in dobs:
+            calculate_age_from_dob(dob, today)
+
+    benchmark(ages)
@@ -0,0 +1,99 @@
+"""
+Cost of MetricsMiddleware per request.
+
+Drives a small FastAPI app directly through ASGI (no network, no test client)
+with and without the middleware. The route returns a 50-row page through
+FastJSONResponse, like the list endpoints do. Target: under 2% overhead.
+
+    python benchmarks/metrics_overhead_benchmark.py --requests 5000 --repeat 15
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI  # noqa: E402
+
+from utils.metrics import MetricsMiddleware  # noqa: E402
+from utils.serialization import FastJSONResponse  # noqa: E402
+
+ROWS = [
+    {"id": f"player-{i}", "first_name": f"Player{i}", "sport": "Football", "created_at": datetime(2024, 1, 1)}
+    for i in range(50)
+]
+
+
+async def bare_endpoint(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+def build_app(with_metrics):
+    app = FastAPI()
+
+    @app.get("/api/academy/players/{player_id}")
+    async def players(player_id: str):
+        return FastJSONResponse(ROWS)
+
+    if with_metrics:
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app, requests):
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": "/api/academy/players/p1", "raw_path": b"/api/academy/players/p1",
+        "query_string": b"", "headers": [], "server": ("test", 80), "client": ("test", 1), "root_path": "",
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+
+
+def bench(apps, requests, repeat):
+    """Best time per app; rounds alternate between apps so machine noise hits both"""
+    best = {name: float("inf") for name in apps}
+    for _ in range(repeat):
+        for name, app in apps.items():
+            start = time.perf_counter()
+            asyncio.run(drive(app, requests))
+            best[name] = min(best[name], time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    results = bench({
+        "plain": build_app(False),
+        "metrics": build_app(True),
+        # The middleware around a bare ASGI endpoint isolates its own cost from FastAPI noise
+        "bare": bare_endpoint,
+        "bare+metrics": MetricsMiddleware(bare_endpoint),
+    }, args.requests, args.repeat)
+    for name, seconds in results.items():
+        print(f"{name:<13} {seconds * 1000:8.1f}ms total  {seconds / args.requests * 1e6:6.2f}µs/request")
+
+    cost = (results["bare+metrics"] - results["bare"]) / args.requests
+    plain = results["plain"] / args.requests
+    print(f"middleware cost: {cost * 1e6:.2f}µs/request")
+    print(f"overhead: {cost / plain * 100:.2f}% of an in-process request (measured end to end: "
+          f"{(results['metrics'] / results['plain'] - 1) * 100:+.2f}%)")
+
+
+if __name__ == "__main__":
+    main()
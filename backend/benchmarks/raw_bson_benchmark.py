@@ -0,0 +1,145 @@
+"""
+CPU time per request for the dict path vs the raw BSON pass-through.
+
+Offline (default) the BSON bytes are generated in-process, which isolates the
+decode -> shape -> encode work each request does:
+
+    python benchmarks/raw_bson_benchmark.py --rows 1000 10000
+
+With --mongo-url the documents are seeded into a scratch collection and both
+paths run end to end through Motor (wire compression per MONGO_COMPRESSORS):
+
+    python benchmarks/raw_bson_benchmark.py --mongo-url mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bson  # noqa: E402
+from bson.raw_bson import RawBSONDocument  # noqa: E402
+from pydantic import BaseModel  # noqa: E402
+from typing import List, Optional  # noqa: E402
+
+from utils.raw_bson import raw_find_page, raw_to_json_array  # noqa: E402
+from utils.serialization import dumps, rows_from_db  # noqa: E402
+from utils.streaming import projection_for  # noqa: E402
+
+
+class PlayerRow(BaseModel):
+    # Trimmed PlayerResponse so the script doesn't need the app's env to import
+    id: str
+    academy_id: str
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    sport: Optional[str] = None
+    position: Optional[str] = None
+    training_days: List[str] = []
+    status: str = "active"
+    created_at: datetime
+    updated_at: datetime
+
+
+def make_docs(rows):
+    base = datetime(2024, 1, 1)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "academy_id": "bench-academy",
+            "first_name": f"Player{i}",
+            "last_name": "Benchmark",
+            "email": f"player{i}@example.com",
+            "sport": "Football",
+            "position": "Midfielder",
+            "training_days": ["Monday", "Wednesday", "Friday"],
+            "status": "active",
+            "supabase_user_id": str(uuid.uuid4()),
+            "medical_notes": "n/a" * 20,
+            "created_at": base + timedelta(seconds=i),
+            "updated_at": base + timedelta(seconds=i),
+        }
+        for i in range(rows)
+    ]
+
+
+def cpu_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        fn()
+        best = min(best, time.process_time() - start)
+    return best * 1000
+
+
+def offline(rows, repeat):
+    encoded = [bson.encode(doc) for doc in make_docs(rows)]
+    raw = [RawBSONDocument(b) for b in encoded]
+
+    def dict_path():
+        # What Motor + the regular route do: decode every document, shape it, encode
+        docs = [bson.decode(b) for b in encoded]
+        return dumps(rows_from_db(docs, PlayerRow))
+
+    def raw_path():
+        return raw_to_json_array(raw)
+
+    return cpu_ms(dict_path, repeat), cpu_ms(raw_path, repeat)
+
+
+async def online(mongo_url, rows, repeat):
+    from utils.db import create_mongo_client
+
+    client = create_mongo_client(mongo_url)
+    collection = client["perf_benchmarks"][f"players_{uuid.uuid4().hex[:8]}"]
+    try:
+        await collection.insert_many(make_docs(rows))
+        projection = projection_for(PlayerRow)
+
+        async def dict_path():
+            docs = await collection.find({"academy_id": "bench-academy"}).sort("created_at", 1).to_list(None)
+            return dumps(rows_from_db(docs, PlayerRow))
+
+        async def raw_path():
+            docs, _ = await raw_find_page(collection, {"academy_id": "bench-academy"}, projection,
+                                          sort_field="created_at", direction=1)
+            return raw_to_json_array(docs)
+
+        results = []
+        for fn in (dict_path, raw_path):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.process_time()
+                await fn()
+                best = min(best, time.process_time() - start)
+            results.append(best * 1000)
+        return results
+    finally:
+        await collection.drop()
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--mongo-url", default=None)
+    args = parser.parse_args()
+
+    mode = "mongo" if args.mongo_url else "offline"
+    for rows in args.rows:
+        if args.mongo_url:
+            dict_ms, raw_ms = asyncio.run(online(args.mongo_url, rows, args.repeat))
+        else:
+            dict_ms, raw_ms = offline(rows, args.repeat)
+        print(f"[{mode}] {rows:>6} rows  dict path {dict_ms:8.1f}ms CPU  raw path {raw_ms:8.1f}ms CPU  "
+              f"({dict_ms / raw_ms:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
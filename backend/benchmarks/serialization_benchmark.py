@@ -0,0 +1,93 @@
+"""
+Per-row serialization cost for a 5000-player list response.
+
+Compares the old path (Player(**doc) per row, then FastAPI validating against
+List[PlayerResponse] and encoding with jsonable_encoder + json) with the fast
+path (rows_from_db + orjson via FastJSONResponse).
+
+    python benchmarks/serialization_benchmark.py --rows 5000 --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import uuid
+from datetime import datetime
+from typing import List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.models import Player, PlayerResponse  # noqa: E402
+from utils.serialization import FastJSONResponse, rows_from_db  # noqa: E402
+
+
+def make_docs(rows):
+    return [
+        {
+            "_id": uuid.uuid4().hex[:24],
+            "id": str(uuid.uuid4()),
+            "academy_id": "academy-1",
+            "coach_id": "coach-1",
+            "first_name": f"Player{i}",
+            "last_name": "Benchmark",
+            "email": f"player{i}@example.com",
+            "phone": "9999999999",
+            "age": 14,
+            "gender": "Male",
+            "sport": "Football",
+            "position": "Midfielder",
+            "registration_number": f"REG{i:05d}",
+            "training_days": ["Monday", "Wednesday", "Friday"],
+            "training_batch": "Morning",
+            "status": "active",
+            "has_login": True,
+            "default_password": "temp-pass",
+            "password_changed": False,
+            "supabase_user_id": str(uuid.uuid4()),
+            "created_at": datetime(2024, 1, 1, 10, 30),
+            "updated_at": datetime(2024, 2, 1, 8, 15),
+        }
+        for i in range(rows)
+    ]
+
+
+def old_path(docs, adapter):
+    players = [Player(**doc) for doc in docs]
+    validated = adapter.validate_python([p.model_dump() for p in players])
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(docs, adapter):
+    return FastJSONResponse(rows_from_db(docs, PlayerResponse)).body
+
+
+def bench(fn, docs, adapter, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(docs, adapter)
+        best = min(best, time.perf_counter() - start)
+    return best, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    docs = make_docs(args.rows)
+    adapter = TypeAdapter(List[PlayerResponse])
+    results = {name: bench(fn, docs, adapter, args.repeat) for name, fn in (("old", old_path), ("fast", fast_path))}
+
+    for name, (seconds, size) in results.items():
+        print(f"{name:<5} {seconds * 1000:8.1f}ms total  {seconds / args.rows * 1e6:6.2f}µs/row  body {size / 1e3:.0f}KB")
+    print(f"speedup: {results['old'][0] / results['fast'][0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
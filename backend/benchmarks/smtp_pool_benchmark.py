@@ -0,0 +1,106 @@
+"""
+Benchmark pooled SMTP sending against connect-per-message.
+
+Runs a local aiosmtpd server (pip install aiosmtpd) so no real mail is sent:
+
+    python benchmarks/smtp_pool_benchmark.py --messages 200 --pool-size 4
+
+Pass --host/--port to target an existing SMTP stand-in instead.
+"""
+import argparse
+import asyncio
+import os
+import smtplib
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import email_utils  # noqa: E402
+from email_utils import SMTPConnectionPool, render_fee_reminder_email, set_smtp_pool  # noqa: E402
+
+
+def start_stand_in(port):
+    try:
+        from aiosmtpd.controller import Controller
+        from aiosmtpd.handlers import Sink
+    except ImportError:
+        sys.exit("aiosmtpd is not installed: pip install aiosmtpd (or pass --host/--port)")
+    controller = Controller(Sink(), hostname="127.0.0.1", port=port)
+    controller.start()
+    return controller
+
+
+def make_recipients(count):
+    due = datetime.utcnow() + timedelta(days=2)
+    return [
+        {
+            "email": f"player{i}@example.com",
+            "player_name": f"Player {i}",
+            "academy_name": "Benchmark Academy",
+            "fee_amount": 2500.0,
+            "due_date": due,
+            "frequency": "monthly"
+        }
+        for i in range(count)
+    ]
+
+
+def bench_connect_per_message(host, port, recipients):
+    # What email_utils did before pooling: connect, send, quit for every email
+    start = time.perf_counter()
+    for recipient in recipients:
+        msg = render_fee_reminder_email(
+            to_email=recipient["email"],
+            player_name=recipient["player_name"],
+            academy_name=recipient["academy_name"],
+            fee_amount=recipient["fee_amount"],
+            due_date=recipient["due_date"]
+        )
+        with smtplib.SMTP(host, port, timeout=30) as server:
+            server.send_message(msg)
+    return time.perf_counter() - start
+
+
+def bench_pooled(host, port, recipients, pool_size):
+    set_smtp_pool(SMTPConnectionPool(host, port, size=pool_size, use_ssl=False))
+    start = time.perf_counter()
+    summary = asyncio.run(email_utils.send_bulk_fee_reminders(recipients))
+    elapsed = time.perf_counter() - start
+    set_smtp_pool(None)
+    if summary["failed"]:
+        print(f"warning: {summary['failed']} pooled sends failed")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--pool-size", type=int, default=4)
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=8025)
+    args = parser.parse_args()
+
+    controller = None
+    host = args.host
+    if host is None:
+        controller = start_stand_in(args.port)
+        host = "127.0.0.1"
+
+    try:
+        recipients = make_recipients(args.messages)
+        baseline = bench_connect_per_message(host, args.port, recipients)
+        pooled = bench_pooled(host, args.port, recipients, args.pool_size)
+    finally:
+        if controller is not None:
+            controller.stop()
+
+    print(f"messages:             {args.messages}")
+    print(f"connect per message:  {baseline:.3f}s ({args.messages / baseline:.0f} msg/s)")
+    print(f"pooled (size {args.pool_size}):      {pooled:.3f}s ({args.messages / pooled:.0f} msg/s)")
+    print(f"speedup:              {baseline / pooled:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Cold import and startup time of the API, measured in fresh interpreters.
+
+Stages (median of --repeat runs, each in a new process):
+- interpreter: `python -c pass`, the floor every worker pays
+- import: `import server` (framework, routers and middleware; no clients)
+- startup: running the lifespan (Mongo/Supabase clients, indexes); only
+  with --lifespan, as it needs a reachable MONGO_URL
+
+It also lists heavy optional modules that the import pulled in (they should
+be loaded on first use), and with --ref measures `import server` at an
+older git revision for a before/after comparison.
+
+    python benchmarks/startup_benchmark.py --repeat 7 --ref HEAD~1
+    MONGO_URL=mongodb://localhost:27017 python benchmarks/startup_benchmark.py --lifespan
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that should not be imported until a request needs them
+LAZY_MODULES = ("supabase", "email_utils", "zoho_mail_api", "fee_reminder_scheduler")
+
+IMPORT_PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import server
+elapsed = time.perf_counter() - started
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+""" % (LAZY_MODULES,)
+
+LIFESPAN_PROBE = """
+import asyncio, json, time
+import server
+
+async def main():
+    started = time.perf_counter()
+    async with server.app.router.lifespan_context(server.app):
+        elapsed = time.perf_counter() - started
+    return elapsed
+
+print(json.dumps({"seconds": asyncio.run(main())}))
+"""
+
+
+def run_probe(code: str, cwd: str) -> dict:
+    env = {**os.environ, "PYTHONDONTWRITEBYTECODE": "1"}
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "probe failed")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def time_interpreter(repeat: int) -> float:
+    walls = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "pass"], check=True)
+        walls.append(time.perf_counter() - started)
+    return statistics.median(walls)
+
+
+def time_import(repeat: int, cwd: str):
+    samples, loaded = [], set()
+    for _ in range(repeat):
+        result = run_probe(IMPORT_PROBE, cwd)
+        samples.append(result["seconds"])
+        loaded.update(result["loaded"])
+    return statistics.median(samples), min(samples), sorted(loaded)
+
+
+def export_revision(ref: str, target: str) -> str:
+    """Extract backend/ at `ref` into target and return its path"""
+    repo_root = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    ).stdout.strip()
+    prefix = os.path.relpath(BACKEND_DIR, repo_root)
+    archive = os.path.join(target, "rev.tar")
+    with open(archive, "wb") as f:
+        subprocess.run(["git", "archive", ref, prefix], cwd=repo_root, stdout=f, check=True)
+    with tarfile.open(archive) as tar:
+        tar.extractall(target)
+    return os.path.join(target, prefix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--lifespan", action="store_true", help="also time the lifespan (needs MONGO_URL)")
+    parser.add_argument("--ref", help="git revision to compare `import server` against")
+    args = parser.parse_args()
+
+    print(f"interpreter:  {time_interpreter(args.repeat) * 1000:8.1f} ms (process wall time)")
+    median, best, loaded = time_import(args.repeat, BACKEND_DIR)
+    print(f"import:       {median * 1000:8.1f} ms median, {best * 1000:.1f} ms best")
+    print(f"lazy modules loaded at import: {', '.join(loaded) or 'none'}")
+
+    if args.ref:
+        with tempfile.TemporaryDirectory() as tmp:
+            old_median, old_best, old_loaded = time_import(args.repeat, export_revision(args.ref, tmp))
+        print(f"import @{args.ref}: {old_median * 1000:8.1f} ms median, {old_best * 1000:.1f} ms best "
+              f"({(median / old_median - 1) * 100:+.0f}%)")
+        print(f"lazy modules loaded at import @{args.ref}: {', '.join(old_loaded) or 'none'}")
+
+    if args.lifespan:
+        samples = [run_probe(LIFESPAN_PROBE, BACKEND_DIR)["seconds"] for _ in range(args.repeat)]
+        print(f"startup:      {statistics.median(samples) * 1000:8.1f} ms median (lifespan, after import)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Compare time-to-first-byte and peak memory of a materialized list response
+against the streaming JSON array used by `?stream=1`.
+
+    python benchmarks/streaming_benchmark.py --rows 100000
+
+Uses an in-process fake cursor so only serialization and buffering are measured.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.serialization import dumps  # noqa: E402
+from utils.streaming import STREAM_BATCH_SIZE, iter_json_array  # noqa: E402
+
+
+class FakeCursor:
+    """Yields generated player-shaped documents in batches, like a Motor cursor"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self._batch = STREAM_BATCH_SIZE
+
+    def batch_size(self, size):
+        self._batch = size
+        return self
+
+    def _doc(self, i):
+        return {
+            "id": str(uuid.uuid4()),
+            "academy_id": "academy-1",
+            "first_name": f"Player{i}",
+            "last_name": "Benchmark",
+            "email": f"player{i}@example.com",
+            "sport": "Football",
+            "position": "Midfielder",
+            "training_days": ["Monday", "Wednesday", "Friday"],
+            "status": "active",
+            "created_at": datetime(2024, 1, 1),
+            "updated_at": datetime(2024, 1, 1),
+        }
+
+    async def to_list(self, length=None):
+        return [self._doc(i) for i in range(self.rows)]
+
+    def __aiter__(self):
+        async def gen():
+            for i in range(self.rows):
+                if i % self._batch == 0:
+                    await asyncio.sleep(0)
+                yield self._doc(i)
+        return gen()
+
+
+async def materialized(rows):
+    start = time.perf_counter()
+    docs = await FakeCursor(rows).to_list(None)
+    body = dumps(docs)
+    # Nothing can be sent before the whole body exists
+    return time.perf_counter() - start, time.perf_counter() - start, len(body)
+
+
+async def streamed(rows):
+    start = time.perf_counter()
+    first = None
+    size = 0
+    async for chunk in iter_json_array(FakeCursor(rows)):
+        # Count the first chunk carrying rows, not the opening bracket
+        if first is None and chunk != b"[":
+            first = time.perf_counter() - start
+        size += len(chunk)
+    return first, time.perf_counter() - start, size
+
+
+def measure(fn, rows):
+    tracemalloc.start()
+    ttfb, total, size = asyncio.run(fn(rows))
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return ttfb, total, size, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    args = parser.parse_args()
+
+    for name, fn in (("materialized", materialized), ("streamed", streamed)):
+        ttfb, total, size, peak = measure(fn, args.rows)
+        print(f"{name:<13} ttfb {ttfb * 1000:8.1f}ms  total {total:6.2f}s  "
+              f"body {size / 1e6:6.1f}MB  peak mem {peak / 1e6:7.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,12 @@ Private internal blog automation system with public read-only blogs page.
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from typing import TYPE_CHECKING, List, Optional, Dict, Any
 from datetime import datetime
 from motor.motor_asyncio import AsyncIOMotorClient
-from supabase import Client
+
+if TYPE_CHECKING:  # the SDK is imported by app.core only when Supabase is configured
+    from supabase import Client
 import os
 import uuid
 import logging
@@ -22,10 +24,10 @@ security = HTTPBearer(auto_error=False)
 
 # Global references - will be set by setup_blog_dependencies()
 _db: AsyncIOMotorClient = None
-_supabase: Client = None
-_supabase_admin: Client = None
+_supabase: "Client" = None
+_supabase_admin: "Client" = None
 
-def setup_blog_dependencies(db: AsyncIOMotorClient, supabase: Client, supabase_admin: Client = None):
+def setup_blog_dependencies(db: AsyncIOMotorClient, supabase: "Client", supabase_admin: "Client" = None):
     """Set up database and Supabase clients for blog router"""
     global _db, _supabase, _supabase_admin
     _db = db
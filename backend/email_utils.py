@@ -1,10 +1,20 @@
 import smtplib
 import os
+import re
+import asyncio
+import queue
+import threading
+import time
+from string import Template
+from email.message import Message
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from datetime import datetime
+from typing import Iterable, Optional
 import logging
 
+from utils.tracing import span
+
 logger = logging.getLogger(__name__)
 
 # Zoho SMTP Configuration
@@ -13,115 +23,232 @@ SMTP_PORT = int(os.environ.get('SMTP_PORT', 465))
 SMTP_USER = os.environ.get('SMTP_USER', 'donotreply@trackmyacademy.com')
 SMTP_PASSWORD = os.environ.get('SMTP_PASSWORD', 'Y5EDkVMjn7pE')
 
-def send_fee_reminder_email(
-    to_email: str,
-    player_name: str,
-    academy_name: str,
-    fee_amount: float,
-    due_date: datetime,
-    frequency: str = 'monthly'
-) -> bool:
-    """
-    Send fee reminder email using Zoho SMTP
 
-    Args:
-        to_email: Recipient email address
-        player_name: Name of the player
-        academy_name: Name of the academy
-        fee_amount: Amount due
-        due_date: Payment due date
-        frequency: Fee frequency (monthly, quarterly, etc.)
+# ============================================================================
+# SMTP CONNECTION POOL
+# ============================================================================
 
-    Returns:
-        bool: True if email sent successfully, False otherwise
+class _PooledConnection:
+    def __init__(self, server: smtplib.SMTP):
+        self.server = server
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.sent = 0
+
+
+class SMTPConnectionPool:
     """
-    try:
-        # Create message
-        msg = MIMEMultipart('alternative')
-        msg['Subject'] = f'Fee Payment Reminder - {academy_name}'
-        msg['From'] = f'Track My Academy <{SMTP_USER}>'
-        msg['To'] = to_email
+    Small pool of logged-in SMTP connections shared across threads.
 
-        # Format due date
-        due_date_str = due_date.strftime('%B %d, %Y')
-
-        # Calculate days until due
-        days_until_due = (due_date - datetime.utcnow()).days
-        urgency_text = ""
-        if days_until_due < 0:
-            urgency_text = f"⚠️ This payment is {abs(days_until_due)} days overdue."
-        elif days_until_due == 0:
-            urgency_text = "⚠️ This payment is due today!"
-        elif days_until_due <= 3:
-            urgency_text = f"⚠️ This payment is due in {days_until_due} day(s)."
+    Many messages go over one connection instead of connect + login per email.
+    Connections are recycled after `max_messages_per_connection` sends or when
+    idle longer than `idle_timeout` (Zoho drops idle sessions). A send that
+    fails because the connection dropped is retried once on a fresh connection.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        user: Optional[str] = None,
+        password: Optional[str] = None,
+        size: int = 3,
+        use_ssl: bool = True,
+        timeout: float = 30,
+        max_messages_per_connection: int = 100,
+        idle_timeout: float = 60
+    ):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.size = max(1, size)
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.max_messages_per_connection = max_messages_per_connection
+        self.idle_timeout = idle_timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    def _connect(self) -> _PooledConnection:
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        logger.info(f"Opening SMTP connection to {self.host}:{self.port}")
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        try:
+            if self.user and self.password:
+                server.login(self.user, self.password)
+        except Exception:
+            self._close(server)
+            raise
+        return _PooledConnection(server)
+
+    @staticmethod
+    def _close(server: smtplib.SMTP) -> None:
+        try:
+            server.quit()
+        except Exception:
+            try:
+                server.close()
+            except Exception:
+                pass
+
+    def _checkout(self) -> _PooledConnection:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return self._connect()
+            if time.monotonic() - conn.last_used > self.idle_timeout:
+                self._close(conn.server)
+                continue
+            return conn
+
+    def _checkin(self, conn: _PooledConnection) -> None:
+        conn.last_used = time.monotonic()
+        if conn.sent >= self.max_messages_per_connection:
+            self._close(conn.server)
         else:
-            urgency_text = f"This payment is due in {days_until_due} days."
+            self._idle.put(conn)
+
+    @staticmethod
+    def _is_connection_error(error: Exception) -> bool:
+        if isinstance(error, smtplib.SMTPServerDisconnected):
+            return True
+        if isinstance(error, smtplib.SMTPResponseException):
+            # 421: service closing transmission channel
+            return error.smtp_code == 421
+        return isinstance(error, OSError) and not isinstance(error, smtplib.SMTPException)
+
+    def send(self, msg: Message) -> None:
+        """Send one message, reconnecting once if the pooled connection went away."""
+        with self._slots, span("smtp.send", client=True, **{"peer.service": "smtp", "server.address": self.host}):
+            conn = self._checkout()
+            for attempt in range(2):
+                try:
+                    conn.server.send_message(msg)
+                    conn.sent += 1
+                    self._checkin(conn)
+                    return
+                except Exception as e:
+                    if attempt == 0 and self._is_connection_error(e):
+                        logger.warning(f"SMTP connection lost ({e}), reconnecting")
+                        self._close(conn.server)
+                        conn = self._connect()
+                        continue
+                    if self._is_connection_error(e):
+                        self._close(conn.server)
+                    else:
+                        # Message-level failure (e.g. refused recipient); connection is still usable
+                        self._checkin(conn)
+                    raise
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn.server)
+
+
+_pool: Optional[SMTPConnectionPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_smtp_pool() -> SMTPConnectionPool:
+    """Shared pool, created on first use so values from .env are picked up."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            port = int(os.environ.get('SMTP_PORT', SMTP_PORT))
+            _pool = SMTPConnectionPool(
+                host=os.environ.get('SMTP_HOST', SMTP_HOST),
+                port=port,
+                user=os.environ.get('SMTP_USER', SMTP_USER),
+                password=os.environ.get('SMTP_PASSWORD', SMTP_PASSWORD),
+                size=int(os.environ.get('SMTP_POOL_SIZE', 3)),
+                use_ssl=os.environ.get('SMTP_USE_SSL', 'true' if port == 465 else 'false').lower() == 'true'
+            )
+        return _pool
+
+
+def set_smtp_pool(pool: Optional[SMTPConnectionPool]) -> None:
+    """Replace the shared pool (e.g. point it at a local SMTP server for benchmarks)."""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close_all()
+        _pool = pool
+
+
+# ============================================================================
+# TEMPLATES (compiled once at import)
+# ============================================================================
 
-        # Create HTML email body
-        html_body = f"""
+FEE_REMINDER_HTML_TEMPLATE = Template("""
         <!DOCTYPE html>
         <html>
         <head>
             <style>
-                body {{
+                body {
                     font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
                     line-height: 1.6;
                     color: #333;
                     max-width: 600px;
                     margin: 0 auto;
                     padding: 20px;
-                }}
-                .header {{
+                }
+                .header {
                     background: linear-gradient(135deg, #0ea5e9 0%, #0284c7 100%);
                     color: white;
                     padding: 30px;
                     border-radius: 10px 10px 0 0;
                     text-align: center;
-                }}
-                .header h1 {{
+                }
+                .header h1 {
                     margin: 0;
                     font-size: 24px;
-                }}
-                .content {{
+                }
+                .content {
                     background: #ffffff;
                     padding: 30px;
                     border: 1px solid #e5e7eb;
                     border-top: none;
-                }}
-                .fee-details {{
+                }
+                .fee-details {
                     background: #f9fafb;
                     border-left: 4px solid #0ea5e9;
                     padding: 20px;
                     margin: 20px 0;
                     border-radius: 5px;
-                }}
-                .fee-details h2 {{
+                }
+                .fee-details h2 {
                     margin-top: 0;
                     color: #0ea5e9;
                     font-size: 18px;
-                }}
-                .amount {{
+                }
+                .amount {
                     font-size: 32px;
                     font-weight: bold;
                     color: #0ea5e9;
                     margin: 10px 0;
-                }}
-                .urgency {{
+                }
+                .urgency {
                     background: #fef3c7;
                     border-left: 4px solid #f59e0b;
                     padding: 15px;
                     margin: 20px 0;
                     border-radius: 5px;
-                }}
-                .footer {{
+                }
+                .footer {
                     background: #f9fafb;
                     padding: 20px;
                     text-align: center;
                     border-radius: 0 0 10px 10px;
                     font-size: 12px;
                     color: #6b7280;
-                }}
-                .button {{
+                }
+                .button {
                     display: inline-block;
                     background: #0ea5e9;
                     color: white;
@@ -129,7 +256,7 @@ def send_fee_reminder_email(
                     text-decoration: none;
                     border-radius: 5px;
                     margin: 20px 0;
-                }}
+                }
             </style>
         </head>
         <body>
@@ -138,19 +265,19 @@ def send_fee_reminder_email(
             </div>
 
             <div class="content">
-                <p>Dear {player_name},</p>
+                <p>Dear ${player_name},</p>
 
-                <p>This is a friendly reminder about your upcoming fee payment for <strong>{academy_name}</strong>.</p>
+                <p>This is a friendly reminder about your upcoming fee payment for <strong>${academy_name}</strong>.</p>
 
                 <div class="fee-details">
                     <h2>Payment Details</h2>
-                    <div class="amount">₹{fee_amount:,.2f}</div>
-                    <p><strong>Frequency:</strong> {frequency.capitalize()}</p>
-                    <p><strong>Due Date:</strong> {due_date_str}</p>
+                    <div class="amount">₹${fee_amount}</div>
+                    <p><strong>Frequency:</strong> ${frequency}</p>
+                    <p><strong>Due Date:</strong> ${due_date}</p>
                 </div>
 
                 <div class="urgency">
-                    {urgency_text}
+                    ${urgency_text}
                 </div>
 
                 <p>Please ensure your payment is completed by the due date to avoid any interruption in your training.</p>
@@ -160,32 +287,31 @@ def send_fee_reminder_email(
                 <p>For any questions or payment assistance, please contact your academy administration.</p>
 
                 <p>Best regards,<br>
-                <strong>{academy_name}</strong></p>
+                <strong>${academy_name}</strong></p>
             </div>
 
             <div class="footer">
                 <p>This is an automated message from Track My Academy.<br>
                 Please do not reply to this email.</p>
-                <p>&copy; {datetime.utcnow().year} Track My Academy. All rights reserved.</p>
+                <p>&copy; ${year} Track My Academy. All rights reserved.</p>
             </div>
         </body>
         </html>
-        """
+        """)
 
-        # Create plain text version
-        text_body = f"""
-        Fee Payment Reminder - {academy_name}
+FEE_REMINDER_TEXT_TEMPLATE = Template("""
+        Fee Payment Reminder - ${academy_name}
 
-        Dear {player_name},
+        Dear ${player_name},
 
         This is a friendly reminder about your upcoming fee payment.
 
         Payment Details:
-        Amount: ₹{fee_amount:,.2f}
-        Frequency: {frequency.capitalize()}
-        Due Date: {due_date_str}
+        Amount: ₹${fee_amount}
+        Frequency: ${frequency}
+        Due Date: ${due_date}
 
-        {urgency_text}
+        ${urgency_text}
 
         Please ensure your payment is completed by the due date to avoid any interruption in your training.
 
@@ -194,23 +320,96 @@ def send_fee_reminder_email(
         For any questions or payment assistance, please contact your academy administration.
 
         Best regards,
-        {academy_name}
+        ${academy_name}
 
         ---
         This is an automated message from Track My Academy.
         Please do not reply to this email.
-        """
+        """)
 
-        # Attach both versions
-        part1 = MIMEText(text_body, 'plain')
-        part2 = MIMEText(html_body, 'html')
-        msg.attach(part1)
-        msg.attach(part2)
 
-        # Connect to Zoho SMTP server and send email
-        with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT) as server:
-            server.login(SMTP_USER, SMTP_PASSWORD)
-            server.send_message(msg)
+def _urgency_text(due_date: datetime, now: datetime) -> str:
+    days_until_due = (due_date - now).days
+    if days_until_due < 0:
+        return f"⚠️ This payment is {abs(days_until_due)} days overdue."
+    elif days_until_due == 0:
+        return "⚠️ This payment is due today!"
+    elif days_until_due <= 3:
+        return f"⚠️ This payment is due in {days_until_due} day(s)."
+    return f"This payment is due in {days_until_due} days."
+
+
+def render_fee_reminder_email(
+    to_email: str,
+    player_name: str,
+    academy_name: str,
+    fee_amount: float,
+    due_date: datetime,
+    frequency: str = 'monthly',
+    now: Optional[datetime] = None
+) -> MIMEMultipart:
+    """
+    Build the fee reminder message from the precompiled templates.
+
+    Args:
+        now: Reference time for the due-date wording; pass one value for a whole batch
+    """
+    now = now or datetime.utcnow()
+    values = {
+        "player_name": player_name,
+        "academy_name": academy_name,
+        "fee_amount": f"{fee_amount:,.2f}",
+        "frequency": frequency.capitalize(),
+        "due_date": due_date.strftime('%B %d, %Y'),
+        "urgency_text": _urgency_text(due_date, now),
+        "year": now.year
+    }
+
+    msg = MIMEMultipart('alternative')
+    msg['Subject'] = f'Fee Payment Reminder - {academy_name}'
+    msg['From'] = f'Track My Academy <{SMTP_USER}>'
+    msg['To'] = to_email
+    msg.attach(MIMEText(FEE_REMINDER_TEXT_TEMPLATE.substitute(values), 'plain'))
+    msg.attach(MIMEText(FEE_REMINDER_HTML_TEMPLATE.substitute(values), 'html'))
+    return msg
+
+
+# ============================================================================
+# SENDING
+# ============================================================================
+
+def send_fee_reminder_email(
+    to_email: str,
+    player_name: str,
+    academy_name: str,
+    fee_amount: float,
+    due_date: datetime,
+    frequency: str = 'monthly'
+) -> bool:
+    """
+    Send fee reminder email using Zoho SMTP
+
+    Args:
+        to_email: Recipient email address
+        player_name: Name of the player
+        academy_name: Name of the academy
+        fee_amount: Amount due
+        due_date: Payment due date
+        frequency: Fee frequency (monthly, quarterly, etc.)
+
+    Returns:
+        bool: True if email sent successfully, False otherwise
+    """
+    try:
+        msg = render_fee_reminder_email(
+            to_email=to_email,
+            player_name=player_name,
+            academy_name=academy_name,
+            fee_amount=fee_amount,
+            due_date=due_date,
+            frequency=frequency
+        )
+        get_smtp_pool().send(msg)
 
         logger.info(f"Fee reminder email sent successfully to {to_email}")
         return True
@@ -220,43 +419,78 @@ def send_fee_reminder_email(
         return False
 
 
-def send_bulk_fee_reminders(recipients: list) -> dict:
+async def send_many(messages: Iterable[Message], concurrency: Optional[int] = None) -> dict:
     """
-    Send fee reminders to multiple recipients
+    Send prepared messages through the shared pool without blocking the event loop
+
+    Args:
+        messages: Messages with To/From/Subject headers set
+        concurrency: Messages in flight at once (defaults to the pool size)
+
+    Returns:
+        dict: Summary of sent/failed emails plus a per-message `results` list of bools
+    """
+    pool = get_smtp_pool()
+    messages = list(messages)
+    semaphore = asyncio.Semaphore(concurrency or pool.size)
+
+    async def _send(msg: Message) -> bool:
+        async with semaphore:
+            try:
+                await asyncio.to_thread(pool.send, msg)
+                return True
+            except Exception as e:
+                logger.error(f"Failed to send email to {msg['To']}: {e}")
+                return False
+
+    results = await asyncio.gather(*(_send(msg) for msg in messages))
+    sent = sum(1 for ok in results if ok)
+    return {
+        'sent': sent,
+        'failed': len(messages) - sent,
+        'total': len(messages),
+        'results': list(results)
+    }
+
+
+async def send_bulk_fee_reminders(recipients: list) -> dict:
+    """
+    Send fee reminders to multiple recipients over pooled connections
 
     Args:
         recipients: List of dicts with email details
 
     Returns:
-        dict: Summary of sent/failed emails
+        dict: Summary of sent/failed emails (`results` lines up with `recipients`)
     """
-    sent = 0
-    failed = 0
+    now = datetime.utcnow()
+    messages = []
+    render_failures = set()
 
-    for recipient in recipients:
+    for index, recipient in enumerate(recipients):
         try:
-            success = send_fee_reminder_email(
+            messages.append(render_fee_reminder_email(
                 to_email=recipient['email'],
                 player_name=recipient['player_name'],
                 academy_name=recipient['academy_name'],
                 fee_amount=recipient['fee_amount'],
                 due_date=recipient['due_date'],
-                frequency=recipient.get('frequency', 'monthly')
-            )
-
-            if success:
-                sent += 1
-            else:
-                failed += 1
-
+                frequency=recipient.get('frequency', 'monthly'),
+                now=now
+            ))
         except Exception as e:
             logger.error(f"Error processing reminder for {recipient.get('email')}: {e}")
-            failed += 1
+            render_failures.add(index)
+
+    summary = await send_many(messages)
+    sent_results = iter(summary['results'])
+    results = [False if i in render_failures else next(sent_results) for i in range(len(recipients))]
 
     return {
-        'sent': sent,
-        'failed': failed,
-        'total': len(recipients)
+        'sent': summary['sent'],
+        'failed': len(recipients) - summary['sent'],
+        'total': len(recipients),
+        'results': results
     }
 
 
@@ -301,7 +535,6 @@ def send_manual_email(
         msg['To'] = to_email
 
         # Create plain text version (strip HTML tags)
-        import re
         text_content = re.sub('<[^<]+?>', '', content)
 
         # Attach both versions
@@ -310,15 +543,10 @@ def send_manual_email(
         msg.attach(part1)
         msg.attach(part2)
 
-        # Connect to Zoho SMTP server and send email
+        # Send over a pooled Zoho SMTP connection (connects and logs in only when needed)
         try:
-            logger.info(f"Connecting to SMTP server {SMTP_HOST}:{SMTP_PORT}...")
-            with smtplib.SMTP_SSL(SMTP_HOST, SMTP_PORT, timeout=30) as server:
-                logger.info("Connected to SMTP server, attempting login...")
-                server.login(SMTP_USER, SMTP_PASSWORD)
-                logger.info("Login successful, sending message...")
-                server.send_message(msg)
-                logger.info(f"Message sent successfully to {to_email}")
+            get_smtp_pool().send(msg)
+            logger.info(f"Message sent successfully to {to_email}")
 
         except smtplib.SMTPAuthenticationError as auth_error:
             error_msg = f"SMTP Authentication failed. Please check SMTP username and password. Error: {str(auth_error)}"
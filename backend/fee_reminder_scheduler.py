@@ -1,16 +1,23 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-from motor.motor_asyncio import AsyncIOMotorClient
+from pathlib import Path
 import os
-from email_utils import send_fee_reminder_email
+from email_utils import send_bulk_fee_reminders
+from utils.db import create_mongo_client, get_db_name
+from utils.notifications import NotificationStore
+from utils.scheduler import JobScheduler
 
 logger = logging.getLogger(__name__)
 
-# MongoDB connection
-mongo_url = os.environ.get('MONGO_URL') or os.environ.get('MONGODB_URI') or "mongodb://localhost:27017"
-client = AsyncIOMotorClient(mongo_url)
-db = client.track_my_academy
+# Database handle, set by setup_scheduler_dependencies() (API lifespan) or run_scheduler()
+db = None
+
+
+def setup_scheduler_dependencies(database):
+    """Point the background jobs at the API's database."""
+    global db
+    db = database
 
 
 async def send_automatic_fee_reminders():
@@ -18,20 +25,23 @@ async def send_automatic_fee_reminders():
     Automated task to send fee reminders for academies with automatic reminder setting
     Runs daily and sends reminders to players with unpaid fees
     Respects 24-hour cooldown period
+
+    Returns:
+        int: Number of reminders sent
     """
     try:
         logger.info("Starting automatic fee reminder job...")
 
         # Get all academies with automatic reminder setting
-        academies_with_auto_reminders = await db.academy_settings.find({
-            "fee_reminder_type": "automatic"
-        }).to_list(None)
+        academies_with_auto_reminders = await db.academy_settings.find(
+            {"fee_reminder_type": "automatic"}, {"academy_id": 1}
+        ).to_list(None)
 
         academy_ids = [setting["academy_id"] for setting in academies_with_auto_reminders]
 
         if not academy_ids:
             logger.info("No academies with automatic reminders enabled")
-            return
+            return 0
 
         logger.info(f"Found {len(academy_ids)} academies with automatic reminders enabled")
 
@@ -50,38 +60,56 @@ async def send_automatic_fee_reminders():
 
         if not unpaid_fees:
             logger.info("No fees requiring reminders at this time")
-            return
+            return 0
 
         logger.info(f"Found {len(unpaid_fees)} fees requiring reminders")
 
-        # Process each fee
+        # Load players and academies in two queries instead of two per fee
+        player_ids = list({fee["player_id"] for fee in unpaid_fees})
+        fee_academy_ids = list({fee["academy_id"] for fee in unpaid_fees})
+        players = {
+            p["id"]: p async for p in db.players.find(
+                {"id": {"$in": player_ids}},
+                {"_id": 0, "id": 1, "email": 1, "first_name": 1, "last_name": 1}
+            )
+        }
+        academies = {
+            a["id"]: a async for a in db.academies.find(
+                {"id": {"$in": fee_academy_ids}}, {"_id": 0, "id": 1, "name": 1}
+            )
+        }
+
+        # Collect deliverable reminders, then send them as one pooled batch
+        batch = []
+        for fee in unpaid_fees:
+            player = players.get(fee["player_id"])
+            if not player or not player.get("email"):
+                logger.warning(f"Skipping fee for player {fee['player_id']} - no email found")
+                continue
+
+            academy = academies.get(fee["academy_id"])
+            if not academy:
+                logger.warning(f"Skipping fee for academy {fee['academy_id']} - academy not found")
+                continue
+
+            batch.append((fee, {
+                "email": player["email"],
+                "player_name": f"{player.get('first_name', '')} {player.get('last_name', '')}",
+                "academy_name": academy.get("name", "Your Academy"),
+                "fee_amount": fee["amount"],
+                "due_date": fee["due_date"],
+                "frequency": fee.get("frequency", "monthly")
+            }))
+
+        summary = await send_bulk_fee_reminders([recipient for _, recipient in batch])
+
         sent_count = 0
         failed_count = 0
+        store = NotificationStore(db)
+        notifications = []
 
-        for fee in unpaid_fees:
+        for (fee, recipient), email_sent in zip(batch, summary["results"]):
             try:
-                # Get player info
-                player = await db.players.find_one({"id": fee["player_id"]})
-                if not player or not player.get("email"):
-                    logger.warning(f"Skipping fee for player {fee['player_id']} - no email found")
-                    continue
-
-                # Get academy info
-                academy = await db.academies.find_one({"id": fee["academy_id"]})
-                if not academy:
-                    logger.warning(f"Skipping fee for academy {fee['academy_id']} - academy not found")
-                    continue
-
-                # Send email
-                email_sent = send_fee_reminder_email(
-                    to_email=player["email"],
-                    player_name=f"{player.get('first_name', '')} {player.get('last_name', '')}",
-                    academy_name=academy.get("name", "Your Academy"),
-                    fee_amount=fee["amount"],
-                    due_date=fee["due_date"],
-                    frequency=fee.get("frequency", "monthly")
-                )
-
                 if email_sent:
                     # Update last_reminder_sent timestamp
                     await db.student_fees.update_one(
@@ -89,55 +117,133 @@ async def send_automatic_fee_reminders():
                         {"$set": {"last_reminder_sent": datetime.utcnow()}}
                     )
 
-                    # Create in-app notification
-                    notification = {
-                        "id": str(__import__('uuid').uuid4()),
-                        "player_id": fee["player_id"],
-                        "academy_id": fee["academy_id"],
-                        "type": "fee_reminder",
-                        "title": "Fee Payment Reminder",
-                        "message": f"Reminder: Your {fee.get('frequency', 'monthly')} fee of ₹{fee['amount']} is due on {fee['due_date'].strftime('%d %b %Y')}. Please make the payment at the earliest.",
-                        "read": False,
-                        "created_at": datetime.utcnow()
-                    }
-                    await db.notifications.insert_one(notification)
+                    # In-app notification, stored with the rest of the batch below
+                    notifications.append(store.build(
+                        fee["academy_id"], "player", fee["player_id"],
+                        f"Reminder: Your {fee.get('frequency', 'monthly')} fee of ₹{fee['amount']} is due on {fee['due_date'].strftime('%d %b %Y')}. Please make the payment at the earliest.",
+                        type="fee_reminder",
+                        title="Fee Payment Reminder"
+                    ))
 
                     sent_count += 1
-                    logger.info(f"Sent reminder to {player['email']} for fee of ₹{fee['amount']}")
+                    logger.info(f"Sent reminder to {recipient['email']} for fee of ₹{fee['amount']}")
                 else:
                     failed_count += 1
-                    logger.error(f"Failed to send reminder to {player['email']}")
+                    logger.error(f"Failed to send reminder to {recipient['email']}")
 
             except Exception as e:
                 failed_count += 1
                 logger.error(f"Error processing fee reminder for player {fee.get('player_id')}: {e}")
 
+        # One insert for every player reminded
+        try:
+            await store.notify_many(notifications)
+        except Exception as e:
+            logger.error(f"Error creating fee reminder notifications: {e}")
+
         logger.info(f"Automatic fee reminder job completed - Sent: {sent_count}, Failed: {failed_count}")
+        return sent_count
 
     except Exception as e:
         logger.error(f"Error in automatic fee reminder job: {e}")
+        raise
 
 
-async def run_scheduler():
+async def rebuild_academy_stats():
     """
-    Main scheduler loop - runs the reminder task daily
+    Recompute per-academy player/coach counts into `academy_stats`.
+
+    Returns:
+        int: Number of academies updated
     """
-    while True:
-        try:
-            # Run the reminder task
-            await send_automatic_fee_reminders()
+    counts = {}
+    for collection, prefix in ((db.players, "players"), (db.coaches, "coaches")):
+        pipeline = [
+            {"$group": {
+                "_id": "$academy_id",
+                "total": {"$sum": 1},
+                "active": {"$sum": {"$cond": [{"$eq": ["$status", "active"]}, 1, 0]}}
+            }}
+        ]
+        async for row in collection.aggregate(pipeline):
+            if not row["_id"]:
+                continue
+            stats = counts.setdefault(row["_id"], {})
+            stats[f"total_{prefix}"] = row["total"]
+            stats[f"active_{prefix}"] = row["active"]
+
+    now = datetime.utcnow()
+    for academy_id, stats in counts.items():
+        await db.academy_stats.update_one(
+            {"academy_id": academy_id},
+            {"$set": {
+                "total_players": stats.get("total_players", 0),
+                "active_players": stats.get("active_players", 0),
+                "total_coaches": stats.get("total_coaches", 0),
+                "active_coaches": stats.get("active_coaches", 0),
+                "updated_at": now
+            }},
+            upsert=True
+        )
+    logger.info(f"Rebuilt stats for {len(counts)} academies")
+    return len(counts)
+
+
+async def cleanup_old_records():
+    """
+    Remove scheduler run records past their retention and recount unread
+    notifications (the TTL index expires notifications without touching
+    the counters).
 
-            # Wait for 24 hours before next run
-            logger.info("Waiting 24 hours until next reminder job...")
-            await asyncio.sleep(86400)  # 24 hours in seconds
+    Returns:
+        int: Number of documents deleted
+    """
+    now = datetime.utcnow()
+    job_run_days = int(os.environ.get("JOB_RUN_RETENTION_DAYS", "30"))
+
+    job_runs = await db.job_runs.delete_many({"started_at": {"$lt": now - timedelta(days=job_run_days)}})
+    fixed = await NotificationStore(db).reconcile_counters()
+
+    logger.info(f"Cleanup removed {job_runs.deleted_count} job runs and fixed {fixed} unread counters")
+    return job_runs.deleted_count
 
-        except Exception as e:
-            logger.error(f"Error in scheduler loop: {e}")
-            # Wait 1 hour before retry on error
-            await asyncio.sleep(3600)
+
+def build_scheduler(database, **kwargs) -> JobScheduler:
+    """
+    Create a JobScheduler with the backend's recurring jobs registered.
+    Schedules are cron expressions in UTC and can be overridden via env.
+    """
+    setup_scheduler_dependencies(database)
+    scheduler = JobScheduler(database, **kwargs)
+    # 03:30 UTC is 09:00 IST
+    scheduler.register("fee_reminders", os.environ.get("FEE_REMINDER_CRON", "30 3 * * *"),
+                       send_automatic_fee_reminders, lease_seconds=1800)
+    scheduler.register("academy_stats_rebuild", os.environ.get("STATS_REBUILD_CRON", "*/30 * * * *"),
+                       rebuild_academy_stats)
+    scheduler.register("cleanup", os.environ.get("CLEANUP_CRON", "0 21 * * *"),
+                       cleanup_old_records)
+    return scheduler
+
+
+async def run_scheduler():
+    """
+    Standalone scheduler process. Safe to run on several hosts at once:
+    leases in `scheduled_jobs` make sure each run happens only once.
+    """
+    client = create_mongo_client()
+    try:
+        scheduler = build_scheduler(client[get_db_name()])
+        await scheduler.run_forever()
+    finally:
+        client.close()
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    # Same .env as the API so both use the same database
+    load_dotenv(Path(__file__).parent / '.env')
+
     # Configure logging
     logging.basicConfig(
         level=logging.INFO,
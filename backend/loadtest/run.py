@@ -0,0 +1,205 @@
+"""
+Scripted load test over the main user journeys, with per-endpoint percentiles.
+
+Virtual users pick a journey (weighted) and a random seeded user for it:
+- coach_marks_attendance: coach dashboard, then marks today's attendance
+- player_opens_dashboard: the requests the player dashboard makes on load
+- admin_opens_analytics: academy stats, analytics and leaderboard
+
+Run it against loadtest/stub_server.py seeded by loadtest/seed.py:
+
+    python loadtest/run.py --base-url http://127.0.0.1:8001 --users 50 --duration 60 \\
+        --output reports/after.json --compare reports/before.json
+
+The report has count, errors, throughput and p50/p95/p99 latency per endpoint
+template; --compare prints the change against an earlier report.
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest_users.json")
+
+# Share of virtual-user iterations per journey
+JOURNEY_WEIGHTS = {
+    "player_opens_dashboard": 6,
+    "coach_marks_attendance": 3,
+    "admin_opens_analytics": 1,
+}
+
+PLAYER_DASHBOARD = [
+    "/api/player/profile",
+    "/api/player/stats",
+    "/api/player/attendance",
+    "/api/player/performance",
+    "/api/player/fee-notifications",
+    "/api/player/announcements",
+]
+
+ADMIN_ANALYTICS = [
+    "/api/academy/stats",
+    "/api/academy/analytics",
+    "/api/academy/analytics/dashboard",
+    "/api/academy/leaderboard",
+]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        self.latencies[endpoint].append(seconds * 1000)
+        if not ok:
+            self.errors[endpoint] += 1
+
+    def report(self, duration: float) -> Dict[str, Dict[str, float]]:
+        report = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            report[endpoint] = {
+                "count": len(values),
+                "errors": self.errors.get(endpoint, 0),
+                "rps": round(len(values) / duration, 2),
+                "p50_ms": round(percentile(values, 50), 1),
+                "p95_ms": round(percentile(values, 95), 1),
+                "p99_ms": round(percentile(values, 99), 1),
+                "max_ms": round(values[-1], 1),
+            }
+        return report
+
+
+async def timed(client: httpx.AsyncClient, recorder: Recorder, method: str, path: str, token: str,
+                endpoint: Optional[str] = None, **kwargs) -> Optional[httpx.Response]:
+    started = time.perf_counter()
+    try:
+        response = await client.request(method, path, headers={"Authorization": f"Bearer {token}"}, **kwargs)
+    except httpx.HTTPError:
+        recorder.record(endpoint or f"{method} {path}", time.perf_counter() - started, ok=False)
+        return None
+    recorder.record(endpoint or f"{method} {path}", time.perf_counter() - started, ok=response.status_code < 400)
+    return response
+
+
+async def player_opens_dashboard(client, recorder, rng, academy):
+    player = rng.choice(academy["players"])
+    # The dashboard fires these in parallel on load
+    await asyncio.gather(*(timed(client, recorder, "GET", path, player["token"]) for path in PLAYER_DASHBOARD))
+
+
+async def coach_marks_attendance(client, recorder, rng, academy):
+    coach = rng.choice([coach for coach in academy["coaches"] if coach["players"]])
+    await timed(client, recorder, "GET", "/api/coach/dashboard", coach["token"])
+    today = datetime.utcnow().strftime("%Y-%m-%d")
+    records = [
+        {"player_id": player_id, "date": today, "present": rng.random() < 0.85, "sport": coach["sport"], "performance_ratings": {}}
+        for player_id in coach["players"]
+    ]
+    await timed(client, recorder, "POST", "/api/coach/attendance", coach["token"],
+                json={"date": today, "attendance_records": records})
+
+
+async def admin_opens_analytics(client, recorder, rng, academy):
+    for path in ADMIN_ANALYTICS:
+        await timed(client, recorder, "GET", path, academy["owner_token"])
+
+
+JOURNEYS = {
+    "player_opens_dashboard": player_opens_dashboard,
+    "coach_marks_attendance": coach_marks_attendance,
+    "admin_opens_analytics": admin_opens_analytics,
+}
+
+
+async def virtual_user(client, recorder, rng, academies, deadline, think_time):
+    names = list(JOURNEY_WEIGHTS)
+    weights = [JOURNEY_WEIGHTS[name] for name in names]
+    while time.monotonic() < deadline:
+        journey = rng.choices(names, weights)[0]
+        await JOURNEYS[journey](client, recorder, rng, rng.choice(academies))
+        if think_time:
+            await asyncio.sleep(rng.uniform(0, think_time))
+
+
+async def run(args) -> Dict[str, Any]:
+    with open(args.manifest) as f:
+        academies = json.load(f)["academies"]
+    recorder = Recorder()
+    limits = httpx.Limits(max_connections=args.users, max_keepalive_connections=args.users)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        started = time.monotonic()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            virtual_user(client, recorder, random.Random(args.seed + i), academies, deadline, args.think_time)
+            for i in range(args.users)
+        ))
+        duration = time.monotonic() - started
+    return {
+        "base_url": args.base_url,
+        "users": args.users,
+        "duration_s": round(duration, 1),
+        "created_at": datetime.utcnow().isoformat(),
+        "endpoints": recorder.report(duration),
+    }
+
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    print(f"{'endpoint':<42}{'count':>7}{'err':>5}{'rps':>8}{'p50':>9}{'p95':>9}{'p99':>9}")
+    base = (baseline or {}).get("endpoints", {})
+    for endpoint, stats in report["endpoints"].items():
+        line = (f"{endpoint:<42}{stats['count']:>7}{stats['errors']:>5}{stats['rps']:>8.1f}"
+                f"{stats['p50_ms']:>9.1f}{stats['p95_ms']:>9.1f}{stats['p99_ms']:>9.1f}")
+        previous = base.get(endpoint)
+        if previous and previous["p95_ms"]:
+            line += f"   p95 {(stats['p95_ms'] / previous['p95_ms'] - 1) * 100:+.0f}% vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://127.0.0.1:8001")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    parser.add_argument("--users", type=int, default=20, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30, help="seconds")
+    parser.add_argument("--think-time", type=float, default=0.5, help="max pause between journeys (s)")
+    parser.add_argument("--timeout", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="earlier JSON report to compare p95s against")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+    if args.output:
+        os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    if any(stats["errors"] for stats in report["endpoints"].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,274 @@
+"""
+Seed a database with synthetic academies for load testing.
+
+Each academy gets an owner account, coaches, players (assigned to coaches,
+with logins), attendance history with sport-specific ratings, weekly
+performance metrics, a fee record per player and notifications. The users
+and their stub auth tokens are written to a manifest for loadtest/run.py.
+
+    python loadtest/seed.py --academies 20 --players 150 --coaches 8 --days 90 \\
+        --mongo-url mongodb://localhost:27017 --db-name tma_loadtest --drop
+
+Point the API at the same database (DB_NAME=tma_loadtest) and start it with
+loadtest/stub_server.py so the manifest tokens are accepted.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.constants import SPORT_PERFORMANCE_CATEGORIES, SPORT_POSITIONS, TRAINING_BATCHES, TRAINING_DAYS  # noqa: E402
+from utils.db import create_mongo_client  # noqa: E402
+from utils.indexes import ensure_indexes  # noqa: E402
+from utils.notifications import NotificationStore  # noqa: E402
+
+DEFAULT_MANIFEST = os.path.join(os.path.dirname(os.path.abspath(__file__)), "loadtest_users.json")
+
+FIRST_NAMES = ["Aarav", "Vivaan", "Aditya", "Diya", "Ananya", "Ishaan", "Kavya", "Rohan", "Saanvi", "Arjun",
+               "Meera", "Kabir", "Riya", "Vihaan", "Aisha", "Reyansh", "Tara", "Dev", "Nisha", "Yash"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Reddy", "Singh", "Nair", "Gupta", "Das", "Menon", "Kapoor"]
+CITIES = ["Bengaluru", "Chennai", "Mumbai", "Pune", "Hyderabad", "Kochi", "Delhi", "Kolkata"]
+SPORTS = [sport for sport in SPORT_POSITIONS if sport != "Other"]
+
+# Collections written by the generator, in insert order
+COLLECTIONS = ("academies", "coaches", "players", "player_attendance", "performance_metrics", "student_fees", "notifications")
+
+# Builds notification rows in the API's shape; seed() rebuilds the unread counters after inserting them
+NOTIFICATIONS = NotificationStore(None)
+
+
+def stub_token(supabase_user_id: str, email: str) -> str:
+    """Bearer token accepted by loadtest/stub_server.py in place of a Supabase JWT"""
+    return f"lt:{supabase_user_id}:{email}"
+
+
+def _person(rng: random.Random) -> Dict[str, str]:
+    return {"first_name": rng.choice(FIRST_NAMES), "last_name": rng.choice(LAST_NAMES)}
+
+
+def generate_academy(rng: random.Random, index: int, players: int, coaches: int, days: int, today: datetime) -> Dict[str, Any]:
+    """
+    Documents for one academy, keyed by collection, plus its manifest entry.
+    Shapes follow what the API's own create endpoints insert.
+    """
+    academy_id = str(uuid.uuid4())
+    created = today - timedelta(days=days + 30)
+    owner_uid = str(uuid.uuid4())
+    owner_email = f"owner{index}@loadtest.trackmyacademy.com"
+    academy_sports = rng.sample(SPORTS, k=min(3, len(SPORTS)))
+
+    docs: Dict[str, List[Dict[str, Any]]] = {name: [] for name in COLLECTIONS}
+    docs["academies"].append({
+        "id": academy_id,
+        "name": f"Loadtest Academy {index}",
+        "owner_name": "Load Test Owner",
+        "email": owner_email,
+        "phone": f"98{rng.randrange(10**8):08d}",
+        "location": rng.choice(CITIES),
+        "sports_type": ", ".join(academy_sports),
+        "logo_url": None,
+        "player_limit": players + 50,
+        "coach_limit": coaches + 5,
+        "status": "approved",
+        "created_at": created,
+        "updated_at": created,
+        "supabase_user_id": owner_uid,
+    })
+
+    coach_entries = []
+    for c in range(coaches):
+        coach_uid = str(uuid.uuid4())
+        email = f"coach{index}-{c}@loadtest.trackmyacademy.com"
+        coach = {
+            "id": str(uuid.uuid4()),
+            "academy_id": academy_id,
+            **_person(rng),
+            "email": email,
+            "phone": f"97{rng.randrange(10**8):08d}",
+            "sports": [academy_sports[c % len(academy_sports)]],
+            "specialization": rng.choice(["Technical", "Fitness", "Tactical"]),
+            "experience_years": rng.randint(1, 20),
+            "status": "active",
+            "has_login": True,
+            "default_password": None,
+            "password_changed": True,
+            "supabase_user_id": coach_uid,
+            "created_at": created + timedelta(days=c),
+            "updated_at": created + timedelta(days=c),
+        }
+        docs["coaches"].append(coach)
+        coach_entries.append({"coach_id": coach["id"], "sport": coach["sports"][0], "token": stub_token(coach_uid, email), "players": []})
+
+    player_entries = []
+    for p in range(players):
+        coach_entry = coach_entries[p % len(coach_entries)] if coach_entries else None
+        sport = coach_entry["sport"] if coach_entry else rng.choice(academy_sports)
+        player_uid = str(uuid.uuid4())
+        email = f"player{index}-{p}@loadtest.trackmyacademy.com"
+        joined = created + timedelta(days=rng.randint(0, 30))
+        player = {
+            "id": str(uuid.uuid4()),
+            "academy_id": academy_id,
+            "coach_id": coach_entry["coach_id"] if coach_entry else None,
+            **_person(rng),
+            "email": email,
+            "phone": f"96{rng.randrange(10**8):08d}",
+            "age": rng.randint(8, 22),
+            "gender": rng.choice(["Male", "Female"]),
+            "sport": sport,
+            "position": rng.choice(SPORT_POSITIONS[sport]),
+            "registration_number": f"LT{index:03d}{p:05d}",
+            "training_days": sorted(rng.sample(TRAINING_DAYS, k=3), key=TRAINING_DAYS.index),
+            "training_batch": rng.choice(TRAINING_BATCHES),
+            "status": "active",
+            "has_login": True,
+            "default_password": None,
+            "password_changed": True,
+            "supabase_user_id": player_uid,
+            "created_at": joined,
+            "updated_at": joined,
+        }
+        docs["players"].append(player)
+        if coach_entry:
+            coach_entry["players"].append(player["id"])
+        player_entries.append({"player_id": player["id"], "token": stub_token(player_uid, email)})
+
+        categories = SPORT_PERFORMANCE_CATEGORIES.get(sport, [])
+        skill = rng.uniform(4, 8)
+        marked_by = player["coach_id"] or owner_uid
+        for d in range(days, 0, -1):
+            day = today - timedelta(days=d)
+            if day.strftime("%A") not in player["training_days"]:
+                continue
+            present = rng.random() < 0.85
+            skill = min(10, max(1, skill + rng.uniform(-0.3, 0.4)))
+            docs["player_attendance"].append({
+                "id": str(uuid.uuid4()),
+                "player_id": player["id"],
+                "academy_id": academy_id,
+                "date": day.strftime("%Y-%m-%d"),
+                "present": present,
+                "sport": sport,
+                "performance_ratings": {
+                    category: max(1, min(10, round(skill + rng.uniform(-1.5, 1.5)))) for category in categories
+                } if present else {},
+                "notes": None,
+                "marked_by": marked_by,
+                "marked_by_role": "coach" if player["coach_id"] else "academy",
+                "created_at": day,
+                "updated_at": day,
+            })
+            if present and day.weekday() == 0:
+                ratings = {name: max(1, min(10, round(skill + rng.uniform(-2, 2)))) for name in ("speed", "agility", "movement", "pace", "stamina")}
+                docs["performance_metrics"].append({
+                    "id": str(uuid.uuid4()),
+                    "player_id": player["id"],
+                    "academy_id": academy_id,
+                    "date": day.strftime("%Y-%m-%d"),
+                    **ratings,
+                    "overall_rating": round(sum(ratings.values()) / len(ratings)),
+                    "notes": None,
+                    "created_at": day,
+                    "updated_at": day,
+                })
+
+        due = today + timedelta(days=rng.randint(-20, 20))
+        status = "paid" if due < today and rng.random() < 0.7 else rng.choice(["due", "overdue"]) if due < today else "due"
+        docs["student_fees"].append({
+            "id": str(uuid.uuid4()),
+            "player_id": player["id"],
+            "academy_id": academy_id,
+            "amount": float(rng.choice([1500, 2000, 2500, 3000])),
+            "frequency": "monthly",
+            "due_date": due,
+            "status": status,
+            "paid_date": due if status == "paid" else None,
+            "notes": None,
+            "created_at": created,
+            "updated_at": created,
+        })
+        if status != "paid":
+            notification = NOTIFICATIONS.build(
+                academy_id, "player", player["id"], f"Your monthly fee is due on {due.strftime('%d %b %Y')}",
+                type="fee_due", title="Fee Payment Due", now=due - timedelta(days=7),
+            )
+            notification["is_read"] = rng.random() < 0.5
+            docs["notifications"].append(notification)
+
+    for coach in docs["coaches"]:
+        for n in range(5):
+            notification = NOTIFICATIONS.build(
+                academy_id, "coach", coach["id"], f"New player assigned ({n + 1})", now=today - timedelta(days=n),
+            )
+            notification["is_read"] = n < 3
+            docs["notifications"].append(notification)
+
+    manifest = {
+        "academy_id": academy_id,
+        "owner_token": stub_token(owner_uid, owner_email),
+        "coaches": coach_entries,
+        "players": player_entries,
+    }
+    return {"docs": docs, "manifest": manifest}
+
+
+async def seed(args) -> List[Dict[str, Any]]:
+    client = create_mongo_client(args.mongo_url)
+    db = client[args.db_name]
+    try:
+        if args.drop:
+            for name in COLLECTIONS:
+                await db[name].drop()
+            await db.notification_counters.drop()
+        await ensure_indexes(db)
+
+        rng = random.Random(args.seed)
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        manifest, totals = [], {name: 0 for name in COLLECTIONS}
+        for index in range(args.academies):
+            academy = generate_academy(rng, index, args.players, args.coaches, args.days, today)
+            for name in COLLECTIONS:
+                batch = academy["docs"][name]
+                for start in range(0, len(batch), args.batch_size):
+                    await db[name].insert_many(batch[start:start + args.batch_size], ordered=False)
+                totals[name] += len(batch)
+            manifest.append(academy["manifest"])
+            print(f"academy {index + 1}/{args.academies} seeded")
+        await NotificationStore(db).reconcile_counters()
+        print("inserted: " + ", ".join(f"{name}={count}" for name, count in totals.items()))
+        return manifest
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--academies", type=int, default=10)
+    parser.add_argument("--players", type=int, default=100, help="players per academy")
+    parser.add_argument("--coaches", type=int, default=5, help="coaches per academy")
+    parser.add_argument("--days", type=int, default=90, help="days of attendance history")
+    parser.add_argument("--mongo-url", default=os.environ.get("MONGO_URL", "mongodb://localhost:27017"))
+    parser.add_argument("--db-name", default="tma_loadtest")
+    parser.add_argument("--drop", action="store_true", help="drop the seeded collections first")
+    parser.add_argument("--seed", type=int, default=42, help="random seed, for reproducible datasets")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    manifest = asyncio.run(seed(args))
+    with open(args.manifest, "w") as f:
+        json.dump({"db_name": args.db_name, "academies": manifest}, f)
+    print(f"manifest written to {args.manifest} ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Run the API for load tests with Supabase auth stubbed out.
+
+Bearer tokens of the form "lt:<supabase_user_id>:<email>" (written by
+loadtest/seed.py) are accepted as-is instead of being verified with Supabase,
+so load tests measure our code and Mongo, not Supabase rate limits. Never
+use this entry point outside a load-test environment.
+
+    DB_NAME=tma_loadtest python loadtest/stub_server.py --port 8001 --workers 1
+"""
+import argparse
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import uvicorn  # noqa: E402
+
+from app import dependencies  # noqa: E402
+from app.main import create_app  # noqa: E402
+
+
+def stub_verify_token(token: str):
+    """Stand-in for app.dependencies.verify_supabase_token"""
+    prefix, _, rest = token.partition(":")
+    user_id, _, email = rest.partition(":")
+    if prefix != "lt" or not user_id or not email:
+        raise Exception("Invalid load-test token")
+    return SimpleNamespace(user=SimpleNamespace(id=user_id, email=email, user_metadata={}))
+
+
+# Auth dependencies look verify_supabase_token up at call time, so patching the module is enough
+dependencies.verify_supabase_token = stub_verify_token
+app = create_app()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        # Workers import the app by name, which re-applies the stub in each process
+        uvicorn.run("loadtest.stub_server:app", host=args.host, port=args.port, workers=args.workers, log_level="warning")
+    else:
+        uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from app.dependencies import admission
+from utils.admission import AdmissionController, Overloaded
+
+
+def test_per_tenant_cap_and_round_robin_between_tenants():
+    async def run():
+        controller = AdmissionController("test", max_concurrent=2, per_tenant=2, queue_timeout=1)
+        order = []
+
+        async def request(tenant, name):
+            async with controller.slot(tenant):
+                order.append(name)
+                await asyncio.sleep(0.01)
+
+        # Academy A queues five requests before B's single one arrives
+        tasks = [asyncio.create_task(request("A", f"a{i}")) for i in range(5)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("B", "b0")))
+        await asyncio.gather(*tasks)
+        # B is served as soon as the first slot frees instead of after all of A
+        assert order.index("b0") <= 3
+        assert controller.active == 0 and not controller.queues and not controller.tenant_active
+
+    asyncio.run(run())
+
+
+def test_requests_are_shed_after_the_queue_deadline():
+    async def run():
+        controller = AdmissionController("test", max_concurrent=1, per_tenant=1, queue_timeout=0.05, retry_after=3)
+        await controller.acquire("A")
+        with pytest.raises(Overloaded) as shed:
+            await controller.acquire("B")
+        assert shed.value.retry_after == 3
+        controller.release("A")
+        # The shed waiter doesn't hold anything up
+        await asyncio.wait_for(controller.acquire("B"), 0.1)
+        controller.release("B")
+        assert controller.active == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_is_skipped():
+    async def run():
+        controller = AdmissionController("test", max_concurrent=1, per_tenant=1, queue_timeout=1)
+        await controller.acquire("A")
+        waiting = asyncio.create_task(controller.acquire("B"))
+        await asyncio.sleep(0)
+        waiting.cancel()  # client disconnected while queued
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        controller.release("A")
+        assert controller.active == 0 and not controller.queues
+
+    asyncio.run(run())
+
+
+def test_dependency_returns_503_with_retry_after_when_busy():
+    controller = AdmissionController("test", max_concurrent=1, per_tenant=1, queue_timeout=0.05)
+
+    async def academy_user():
+        return {"academy_id": "A"}
+
+    app = FastAPI()
+
+    @app.get("/report", dependencies=[Depends(admission(controller, academy_user))])
+    async def report():
+        return {"ok": True}
+
+    client = TestClient(app)
+    assert client.get("/report").status_code == 200
+    assert controller.active == 0
+
+    controller.active = 1  # another request holds the only slot
+    busy = client.get("/report")
+    assert busy.status_code == 503 and busy.headers["Retry-After"] == "2"
@@ -0,0 +1,63 @@
+import sys
+import os
+from datetime import date
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from utils.analytics import (
+    aggregate_academy_ratings, aggregate_sport_ratings, linear_trend, slope_of_series, trend_confidence
+)
+from utils.validation import calculate_age_from_dob, has_image_signature
+
+RECORDS = [
+    {"sport": "Tennis", "performance_ratings": {"Serve": 8, "Footwork": "6", "Mental": None}},
+    {"sport": "Tennis", "performance_ratings": {"Serve": 6, "Footwork": "n/a"}},
+    {"sport": None, "performance_ratings": {"Fitness": 4}},
+    {"sport": "Tennis", "performance_ratings": {}},
+    "not-a-record",
+]
+
+
+def test_academy_ratings_average_numeric_values_only():
+    result = aggregate_academy_ratings(RECORDS, ["Serve", "Footwork", "Mental"])
+    assert result["rated_count"] == 3
+    assert result["categories"] == [
+        {"name": "Serve", "average": 7.0, "count": 2},
+        {"name": "Footwork", "average": 6.0, "count": 1},
+        {"name": "Mental", "average": 0.0, "count": 0},
+    ]
+
+
+def test_sport_ratings_group_by_sport_with_other_fallback():
+    categories = {"Tennis": ["Serve", "Footwork"], "Other": ["Fitness"]}
+    result = aggregate_sport_ratings(RECORDS, categories.get)
+    assert [s["sport"] for s in result] == ["Other", "Tennis"]
+    other, tennis = result
+    assert other["categories"] == [{"name": "Fitness", "average": 4.0, "count": 1}]
+    assert tennis["sample_size"] == 3 and tennis["rated_count"] == 2
+    assert tennis["overall_average"] == 6.5
+
+
+def test_regression_helpers():
+    slope, intercept = linear_trend([1.0, 3.0, 5.0, 7.0])
+    assert (slope, intercept) == (2.0, 1.0)
+    assert slope_of_series([1.0, 3.0, 5.0, 7.0]) == 2.0
+    assert slope_of_series([5.0]) == 0.0
+    assert linear_trend([4.0]) == (0, 4.0)
+    assert trend_confidence([5.0, 5.0, 5.0]) == 100
+    assert trend_confidence([1.0, 10.0]) == 0
+    assert trend_confidence([7.0]) == 50
+
+
+def test_image_signatures():
+    assert has_image_signature(b"\xFF\xD8\xFF\xE0rest")
+    assert has_image_signature(b"RIFF\x10\x00\x00\x00WEBPVP8 ")
+    assert not has_image_signature(b"RIFF\x10\x00\x00\x00WAVEfmt ")
+    assert not has_image_signature(b"RIFF")
+    assert not has_image_signature(b"%PDF-1.7")
+
+
+def test_age_from_dob():
+    today = date(2026, 6, 1)
+    assert calculate_age_from_dob("2010-06-01", today) == 16
+    assert calculate_age_from_dob("2010-06-02", today) == 15
+    assert calculate_age_from_dob("01/06/2010", today) is None
+    assert calculate_age_from_dob(None, today) is None
@@ -0,0 +1,62 @@
+import subprocess
+import sys
+import os
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0]
+sys.path.append(BACKEND_DIR)
+from fastapi.testclient import TestClient
+from app import core
+from app.main import create_app
+
+
+def test_importing_the_api_defers_clients_and_optional_modules():
+    probe = (
+        "import sys, server\n"
+        "from app import core\n"
+        "lazy = ('supabase', 'email_utils', 'zoho_mail_api', 'fee_reminder_scheduler')\n"
+        "print([m for m in lazy if m in sys.modules], core._mongo_client is None)"
+    )
+    result = subprocess.run([sys.executable, "-c", probe], cwd=BACKEND_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().splitlines()[-1] == "[] True"
+
+
+def test_create_app_with_a_subset_of_routers():
+    app = create_app(routers=["app.routers.ops:router"])
+    paths = {route.path for route in app.routes}
+    assert "/metrics" in paths and "/api/admin/profiles" in paths
+    assert "/api/academy/players" not in paths
+    assert TestClient(app).get("/").json() == {"status": "ok"}
+
+
+def test_lazy_db_resolves_to_the_configured_database():
+    class FakeDatabase:
+        players = "players-collection"
+
+        def __getitem__(self, name):
+            return f"{name}-collection"
+
+    previous = core._db, core._analytics_db
+    core.use_database(FakeDatabase())
+    try:
+        assert core.db.players == "players-collection"
+        assert core.db["coaches"] == "coaches-collection"
+        assert core.analytics_db.players == "players-collection"
+    finally:
+        core.use_database(*previous)
+
+
+def test_analytics_client_has_its_own_pool_and_read_budget(monkeypatch):
+    from pymongo import ReadPreference
+    from utils.db import create_analytics_client, create_mongo_client
+
+    monkeypatch.setenv("ANALYTICS_MONGO_MAX_POOL", "3")
+    monkeypatch.setenv("ANALYTICS_MAX_TIME_MS", "2500")
+    analytics, main = create_analytics_client("mongodb://localhost:27017"), create_mongo_client("mongodb://localhost:27017")
+    try:
+        assert analytics.options.pool_options.max_pool_size == 3
+        assert analytics.read_preference == ReadPreference.SECONDARY_PREFERRED
+        assert analytics.options.timeout == 2.5
+        assert main.read_preference == ReadPreference.PRIMARY and main.options.timeout is None
+    finally:
+        analytics.close()
+        main.close()
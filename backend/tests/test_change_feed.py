@@ -0,0 +1,143 @@
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from mongomock_motor import AsyncMongoMockClient
+from pymongo.errors import OperationFailure
+from app.change_feed import _invalidator, build_change_feed
+from utils.change_feed import RESUME_TOKEN_KEY, ChangeEvent, ChangeFeed, DataVersions, data_versions
+from utils.ref_cache import ReferenceCache
+from utils.state import MemoryStateBackend
+
+
+class FakeStream:
+    def __init__(self, changes):
+        self.changes = changes
+        self.resume_token = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.changes:
+            await asyncio.Event().wait()  # idle until cancelled
+        change = self.changes.pop(0)
+        self.resume_token = change["_id"]
+        return change
+
+
+class StreamingDb:
+    def __init__(self, changes):
+        self.changes = changes
+        self.resume_after = []
+
+    def watch(self, pipeline, full_document=None, resume_after=None):
+        self.resume_after.append(resume_after)
+        return FakeStream(self.changes)
+
+
+class StandaloneDb:
+    def __init__(self, db):
+        self.db = db
+
+    def watch(self, *args, **kwargs):
+        raise OperationFailure("The $changeStream stage is only supported on replica sets", code=40573)
+
+    def __getitem__(self, name):
+        return self.db[name]
+
+
+def change(token, collection, operation, document=None):
+    return {"_id": {"_data": token}, "ns": {"db": "test", "coll": collection},
+            "operationType": operation, "fullDocument": document}
+
+
+def test_stream_events_invalidate_keys_and_save_resume_token():
+    async def run():
+        docs = {"c1": {"id": "c1", "first_name": "Old"}, "c2": {"id": "c2", "first_name": "Other"}}
+        loads = []
+
+        async def load(coach_id):
+            loads.append(coach_id)
+            return dict(docs[coach_id])
+
+        coaches = ReferenceCache("test_feed_coach", load)
+        versions = DataVersions()
+        state = MemoryStateBackend()
+        db = StreamingDb([change("t1", "coaches", "update", {"id": "c1", "academy_id": "a1"})])
+        feed = ChangeFeed(db, state=lambda: state, token_save_seconds=0)
+        feed.subscribe("coaches", _invalidator(coaches, "id"))
+        feed.subscribe("coaches", lambda event: versions.bump(event.collection, event.academy_id))
+
+        await coaches.get("c1"), await coaches.get("c2")
+        docs["c1"]["first_name"] = "New"  # written by another worker
+        feed.start()
+        await asyncio.sleep(0.01)
+        assert feed.mode == "stream"
+        assert (await coaches.get("c1"))["first_name"] == "New"
+        await coaches.get("c2")
+        assert loads == ["c1", "c2", "c1"]
+        assert versions.get("coaches", "a1") == 1 and versions.get("coaches") == 1
+        assert (await state.get(RESUME_TOKEN_KEY)) == {"token": {"_data": "t1"}}
+
+        # A restarted worker resumes after the stored token; a delete drops the whole entity
+        await feed.stop()
+        db.changes.append(change("t2", "coaches", "delete"))
+        feed.start()
+        await asyncio.sleep(0.01)
+        await feed.stop()
+        assert db.resume_after == [None, {"_data": "t1"}]
+        await coaches.get("c2")
+        assert loads[-1] == "c2"
+
+    asyncio.run(run())
+
+
+def test_falls_back_to_polling_updated_at_without_change_streams():
+    async def run():
+        db = StandaloneDb(AsyncMongoMockClient()["test"])
+        start = datetime.utcnow()
+        await db["players"].insert_many([
+            {"id": "p1", "academy_id": "a1", "created_at": start - timedelta(days=1),
+             "updated_at": start + timedelta(seconds=1)},
+            {"id": "p2", "academy_id": "a1", "created_at": start - timedelta(days=1)},
+            {"id": "p3", "academy_id": "a2", "created_at": start + timedelta(seconds=2)},
+        ])
+        seen = []
+        feed = ChangeFeed(db, poll_seconds=0.01, retry_seconds=0)
+        feed.subscribe("players", lambda event: seen.append((event.operation, event.document["id"])))
+
+        newest = await feed.poll_once("players", start)
+        assert sorted(seen) == [("poll", "p1"), ("poll", "p3")]
+        assert abs(newest - (start + timedelta(seconds=2))) < timedelta(milliseconds=1)
+        assert await feed.poll_once("players", newest) == newest and len(seen) == 2
+
+        feed.start()
+        await asyncio.sleep(0.01)
+        assert feed.mode == "poll"
+        await feed.stop()
+
+    asyncio.run(run())
+
+
+def test_app_wiring_counts_versions_for_every_watched_collection():
+    async def run():
+        feed = build_change_feed(None)
+        before = data_versions.get("player_attendance", "a1")
+        await feed.dispatch(ChangeEvent("player_attendance", "insert", {"id": "r1", "academy_id": "a1"}))
+        # Handlers failing don't stop the others
+        feed.subscribe("player_attendance", lambda event: 1 / 0)
+        await feed.dispatch(ChangeEvent("player_attendance", "update", {"id": "r1", "academy_id": "a1"}))
+        assert data_versions.get("player_attendance", "a1") == before + 2
+        assert set(feed.handlers) == {"academies", "academy_settings", "academy_fee_structure", "coaches",
+                                      "players", "player_attendance", "notifications", "announcements"}
+        assert {"recipient_type", "recipient_id", "title", "date"} <= feed.fields
+
+    asyncio.run(run())
@@ -0,0 +1,36 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from utils.scheduler import CronSchedule
+
+
+def test_daily_schedule_next_run():
+    schedule = CronSchedule("30 3 * * *")
+    assert schedule.next_after(datetime(2024, 5, 1, 2, 0)) == datetime(2024, 5, 1, 3, 30)
+    assert schedule.next_after(datetime(2024, 5, 1, 3, 30)) == datetime(2024, 5, 2, 3, 30)
+
+
+def test_step_and_weekday_fields():
+    every_15 = CronSchedule("*/15 * * * *")
+    assert every_15.next_after(datetime(2024, 5, 1, 10, 7, 42)) == datetime(2024, 5, 1, 10, 15)
+    # 2024-05-01 is a Wednesday; next Monday 09:00 is May 6
+    mondays = CronSchedule("0 9 * * 1")
+    assert mondays.next_after(datetime(2024, 5, 1)) == datetime(2024, 5, 6, 9, 0)
+    sundays = CronSchedule("0 0 * * 7")
+    assert sundays.next_after(datetime(2024, 5, 1)) == datetime(2024, 5, 5, 0, 0)
+
+
+def test_month_rollover_and_missed_run_count():
+    schedule = CronSchedule("0 0 1 * *")
+    assert schedule.next_after(datetime(2024, 12, 15)) == datetime(2025, 1, 1)
+    daily = CronSchedule("0 0 * * *")
+    assert daily.count_between(datetime(2024, 5, 1), datetime(2024, 5, 4, 12)) == 3
+
+
+def test_invalid_expressions_rejected():
+    with pytest.raises(ValueError):
+        CronSchedule("* * * *")
+    with pytest.raises(ValueError):
+        CronSchedule("61 * * * *")
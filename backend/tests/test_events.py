@@ -0,0 +1,145 @@
+import sys
+import os
+import asyncio
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+import pytest
+from fastapi.testclient import TestClient
+from app import core
+from app.dependencies import get_event_stream_user, get_event_user_info
+from app.events import bus, publish_announcement, publish_attendance, publish_notification, user_topics
+from app.main import create_app
+from app.routers.events import _frames
+from utils.admission import Overloaded
+from utils.events import HEARTBEAT_FRAME, RESET_FRAME, EventBus
+from utils.state import MemoryStateBackend
+
+COACH = {"role": "coach", "coach_id": "c1", "academy_id": "a1"}
+PLAYER = {"role": "player", "player_id": "p1", "academy_id": "a1"}
+ADMIN = {"role": "academy_user", "academy_id": "a1"}
+
+
+def drain(subscription):
+    events = []
+    while not subscription.queue.empty():
+        events.append(subscription.queue.get_nowait())
+    return events
+
+
+def test_topics_dedupe_and_resume():
+    async def run():
+        events = EventBus("test", buffer_size=3)
+        coach = events.subscribe({"coach:c1"})
+        player = events.subscribe({"player:p1"})
+        first = events.publish("notification", {"id": "n1"}, {"coach:c1"}, key="notifications:n1:v1")
+        assert events.publish("notification", {"id": "n1"}, {"coach:c1"}, key="notifications:n1:v1") is None
+        assert [e.id for e in drain(coach)] == [first.id] and drain(player) == []
+
+        later = [events.publish("notification", {"n": i}, {"coach:c1"}) for i in range(2)]
+        resumed = events.subscribe({"coach:c1"}, last_event_id=first.id)
+        assert drain(resumed) == later and not resumed.reset
+
+        # Fell out of the buffer, or issued by another worker: the client must refetch
+        events.publish("notification", {}, {"player:p1"})
+        events.publish("notification", {}, {"player:p1"})
+        assert events.subscribe({"coach:c1"}, last_event_id=first.id).reset
+        assert events.subscribe({"coach:c1"}, last_event_id="other-1").reset
+
+    asyncio.run(run())
+
+
+def test_slow_subscribers_reset_and_connections_are_capped():
+    async def run():
+        events = EventBus("test", max_connections=2, queue_size=2)
+        slow = events.subscribe({"academy:a1:coach"})
+        for i in range(3):
+            events.publish("announcement", {"i": i}, {"academy:a1:coach"})
+        assert slow.reset and slow.queue.qsize() == 0
+        events.subscribe({"x"})
+        with pytest.raises(Overloaded):
+            events.subscribe({"y"})
+        slow.close()
+        events.subscribe({"y"})
+        assert events.connections == 2
+
+    asyncio.run(run())
+
+
+def test_events_reach_their_audience_once_from_route_and_feed():
+    async def run():
+        subs = {name: bus.subscribe(user_topics(info)) for name, info in
+                (("coach", COACH), ("player", PLAYER), ("admin", ADMIN))}
+        try:
+            written = datetime(2026, 1, 5, 10, 30, 0, 123456)
+            notification = {"id": "n1", "recipient_type": "coach", "recipient_id": "c1", "academy_id": "a1",
+                            "message": "hi", "created_at": written}
+            publish_notification(notification)
+            # The change feed reads the same write back with Mongo's millisecond precision
+            publish_notification({**notification, "created_at": written.replace(microsecond=123000)})
+            publish_notification({"id": "n2", "recipient_type": "player", "recipient_id": "p1", "academy_id": "a1",
+                                  "created_at": written})
+            publish_announcement({"id": "an1", "academy_id": "a1", "title": "Closed", "target_audience": "players",
+                                  "created_at": written, "updated_at": written})
+            publish_attendance({"id": "r1", "academy_id": "a1", "player_id": "p1", "present": True,
+                                "created_at": written})
+            received = {name: [(e.type, e.data["id"]) for e in drain(sub)] for name, sub in subs.items()}
+        finally:
+            for sub in subs.values():
+                sub.close()
+        assert received == {
+            "coach": [("notification", "n1")],
+            "player": [("notification", "n2"), ("announcement", "an1")],
+            "admin": [("announcement", "an1"), ("attendance_marked", "r1")],
+        }
+
+    asyncio.run(run())
+
+
+def test_stream_frames_heartbeat_events_and_reset(monkeypatch):
+    monkeypatch.setattr("app.routers.events.HEARTBEAT_SECONDS", 0.01)
+
+    async def run():
+        events = EventBus("test", queue_size=1)
+        subscription = events.subscribe({"coach:c1"})
+        frames = _frames(subscription)
+        assert (await frames.__anext__()).startswith(b"retry:")
+        assert await frames.__anext__() == HEARTBEAT_FRAME
+        event = events.publish("notification", {"id": "n1"}, {"coach:c1"})
+        assert await frames.__anext__() == f'id: {event.id}\nevent: notification\ndata: {{"id":"n1"}}\n\n'.encode()
+        events.publish("notification", {"id": "n2"}, {"coach:c1"})
+        events.publish("notification", {"id": "n3"}, {"coach:c1"})  # queue of one overflows
+        assert await frames.__anext__() == RESET_FRAME
+        await frames.aclose()
+        assert events.connections == 0
+
+    asyncio.run(run())
+
+
+def test_stream_endpoint_requires_auth_and_sheds_past_the_connection_limit(monkeypatch):
+    app = create_app(routers=["app.routers.events:router"])
+    client = TestClient(app)
+    assert client.get("/api/events/stream").status_code == 401
+
+    app.dependency_overrides[get_event_stream_user] = lambda: COACH
+    monkeypatch.setattr(bus, "max_connections", 0)
+    response = client.get("/api/events/stream")
+    assert response.status_code == 503 and response.headers["retry-after"] == str(bus.retry_after)
+
+
+def test_stream_tickets_are_single_use(monkeypatch):
+    app = create_app(routers=["app.routers.events:router"])
+    client = TestClient(app)
+    assert client.post("/api/events/ticket").status_code == 401
+
+    app.dependency_overrides[get_event_user_info] = lambda: {**COACH, "user": object()}
+    # Past the connection limit an accepted ticket gets 503 instead of a never-ending stream
+    monkeypatch.setattr(bus, "max_connections", 0)
+    core.use_state_backend(MemoryStateBackend())
+    try:
+        ticket = client.post("/api/events/ticket").json()["ticket"]
+        assert client.get("/api/events/stream", params={"ticket": ticket}).status_code == 503
+        assert client.get("/api/events/stream", params={"ticket": ticket}).status_code == 401
+        assert client.get("/api/events/stream", params={"ticket": "made-up"}).status_code == 401
+        assert client.get("/api/events/stream", params={"access_token": "jwt"}).status_code == 401
+    finally:
+        core.use_state_backend(None)
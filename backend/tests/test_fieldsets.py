@@ -0,0 +1,32 @@
+import pytest
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from fastapi import HTTPException
+from utils.fieldsets import FieldSelection, parse_fields
+
+ALLOWED = ["id", "first_name", "last_name", "email", "created_at"]
+
+
+def test_no_selection_means_full_documents():
+    assert parse_fields(None, ALLOWED) is None
+    assert parse_fields("  ", ALLOWED) is None
+    assert FieldSelection(None).projection({"_id": 0}) == {"_id": 0}
+
+
+def test_selection_always_includes_id_and_builds_projection():
+    fields = parse_fields("first_name, last_name,first_name", ALLOWED)
+    assert fields == ["id", "first_name", "last_name"]
+    selection = FieldSelection(fields)
+    assert selection.projection(extra=("created_at",)) == {
+        "id": 1, "first_name": 1, "last_name": 1, "created_at": 1, "_id": 0
+    }
+    row = {"id": "p1", "first_name": "A", "last_name": "B", "created_at": "x", "email": "e"}
+    assert selection.trim(row) == {"id": "p1", "first_name": "A", "last_name": "B"}
+
+
+def test_fields_outside_whitelist_rejected():
+    with pytest.raises(HTTPException) as exc:
+        parse_fields("first_name,supabase_user_id", ALLOWED)
+    assert exc.value.status_code == 400
+    assert "supabase_user_id" in exc.value.detail
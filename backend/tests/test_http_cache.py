@@ -0,0 +1,77 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from utils.http_cache import ETagMiddleware, StaticPayload, add_compression_middleware, etag_matches
+
+PLANS = StaticPayload({"plans": {"starter": {"price": 2499.0}}})
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.get("/items")
+    async def items():
+        return [{"id": str(i), "name": "player" * 50} for i in range(20)]
+
+    @app.get("/plans")
+    async def plans(request: Request):
+        return PLANS.response(request)
+
+    @app.get("/stream")
+    async def stream():
+        async def gen():
+            yield b"["
+            yield b"]"
+        return StreamingResponse(gen(), media_type="application/json")
+
+    app.add_middleware(ETagMiddleware)
+    add_compression_middleware(app, minimum_size=500)
+    return app
+
+
+def test_etag_and_not_modified():
+    client = TestClient(build_app())
+    first = client.get("/items")
+    etag = first.headers["etag"]
+    assert etag.startswith('W/"')
+
+    second = client.get("/items", headers={"If-None-Match": etag})
+    assert second.status_code == 304
+    assert second.content == b""
+    assert second.headers["etag"] == etag
+
+
+def test_large_bodies_are_compressed():
+    response = TestClient(build_app()).get("/items", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert len(response.json()) == 20
+
+
+def test_brotli_when_accepted():
+    response = TestClient(build_app()).get("/items", headers={"Accept-Encoding": "br, gzip"})
+    assert response.headers["content-encoding"] == "br"
+    assert len(response.json()) == 20
+
+
+def test_static_payload_keeps_precomputed_etag():
+    client = TestClient(build_app())
+    response = client.get("/plans")
+    assert response.headers["etag"] == PLANS.etag
+    assert response.json() == {"plans": {"starter": {"price": 2499.0}}}
+    assert client.get("/plans", headers={"If-None-Match": PLANS.etag}).status_code == 304
+
+
+def test_streaming_responses_pass_through():
+    response = TestClient(build_app()).get("/stream")
+    assert response.content == b"[]"
+    assert "etag" not in response.headers
+
+
+def test_etag_matching_is_weak_and_handles_lists():
+    assert etag_matches('"abc", W/"def"', 'W/"def"')
+    assert etag_matches('"abc"', 'W/"abc"')
+    assert etag_matches("*", 'W/"abc"')
+    assert not etag_matches(None, 'W/"abc"')
@@ -0,0 +1,129 @@
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from mongomock_motor import AsyncMongoMockClient
+from utils.scheduler import JobScheduler
+
+
+class Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def make_schedulers(count, clock, func, cron="0 * * * *", lease_seconds=600):
+    db = AsyncMongoMockClient()["test"]
+    schedulers = [JobScheduler(db, instance_id=f"replica-{i}", clock=clock) for i in range(count)]
+    for scheduler in schedulers:
+        scheduler.register("report", cron, func, lease_seconds=lease_seconds)
+    return db, schedulers
+
+
+def test_racing_replicas_run_a_due_job_once():
+    clock = Clock(datetime(2026, 1, 1, 0, 5))
+    calls = []
+
+    async def job():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 3
+
+    async def run():
+        db, replicas = make_schedulers(2, clock, job)
+        assert await replicas[0].run_pending() == 0
+        clock.now = datetime(2026, 1, 1, 1, 0, 30)
+        ran = await asyncio.gather(*(replica.run_pending() for replica in replicas))
+        assert sorted(ran) == [0, 1] and len(calls) == 1
+        state = await db.scheduled_jobs.find_one({"_id": "report"})
+        # Timings come from the scheduler's clock, not the wall clock
+        assert state["next_run_at"] == datetime(2026, 1, 1, 2, 0)
+        assert state["last_run_at"] == clock.now and state["lease_until"] is None
+        [record] = await db.job_runs.find({}).to_list(None)
+        assert record["items"] == 3 and record["missed_runs"] == 0 and record["status"] == "success"
+
+    asyncio.run(run())
+
+
+def test_catch_up_after_downtime_runs_once():
+    clock = Clock(datetime(2026, 1, 1, 0, 5))
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    async def run():
+        db, [scheduler] = make_schedulers(1, clock, job)
+        await scheduler.run_pending()
+        # Down from before 01:00 until 05:30: the 01:00 run is taken, 02:00-05:00 are coalesced into it
+        clock.now = datetime(2026, 1, 1, 5, 30)
+        assert await scheduler.run_pending() == 1
+        assert await scheduler.run_pending() == 0
+        assert len(calls) == 1
+        [record] = await db.job_runs.find({}).to_list(None)
+        assert record["scheduled_for"] == datetime(2026, 1, 1, 1, 0) and record["missed_runs"] == 4
+        assert (await db.scheduled_jobs.find_one({"_id": "report"}))["next_run_at"] == datetime(2026, 1, 1, 6, 0)
+
+    asyncio.run(run())
+
+
+def test_expired_lease_is_taken_over():
+    clock = Clock(datetime(2026, 1, 1, 0, 5))
+    calls = []
+
+    async def job():
+        calls.append(1)
+
+    async def run():
+        db, [scheduler] = make_schedulers(1, clock, job)
+        await scheduler.run_pending()
+        clock.now = datetime(2026, 1, 1, 1, 1)
+        # A replica that died mid-run still holds the lease
+        await db.scheduled_jobs.update_one(
+            {"_id": "report"}, {"$set": {"lease_owner": "dead", "lease_until": clock.now + timedelta(minutes=5)}}
+        )
+        assert await scheduler.run_pending() == 0
+        clock.now += timedelta(minutes=6)
+        assert await scheduler.run_pending() == 1 and len(calls) == 1
+        assert (await db.scheduled_jobs.find_one({"_id": "report"}))["lease_owner"] == "replica-0"
+
+    asyncio.run(run())
+
+
+def test_lease_renewal_survives_errors_and_aborts_when_it_keeps_failing(monkeypatch):
+    monkeypatch.setattr(JobScheduler, "RENEW_MIN_INTERVAL", 0.01)
+    clock = Clock(datetime(2026, 1, 1, 0, 5))
+
+    async def job():
+        await asyncio.sleep(0.2)
+        return 1
+
+    async def run(failures):
+        db, [scheduler] = make_schedulers(1, clock, job, lease_seconds=0.09)
+        clock.now = datetime(2026, 1, 1, 0, 5)
+        await scheduler.run_pending()
+        update_one = scheduler.jobs.update_one
+        calls = {"renewals": 0}
+
+        async def flaky_update_one(query, update, **kwargs):
+            if "lease_until" in update.get("$set", {}) and len(update["$set"]) == 1:
+                calls["renewals"] += 1
+                if calls["renewals"] <= failures:
+                    raise ConnectionError("transient")
+            return await update_one(query, update, **kwargs)
+
+        scheduler.jobs.update_one = flaky_update_one
+        clock.now = datetime(2026, 1, 1, 1, 0)
+        await scheduler.run_pending()
+        [record] = await db.job_runs.find({}).to_list(None)
+        return record["status"], calls["renewals"]
+
+    # One failed renewal is retried and the job completes
+    status, renewals = asyncio.run(run(failures=1))
+    assert status == "success" and renewals > 2
+    # Renewals that keep failing abort the job before its lease runs out
+    status, _ = asyncio.run(run(failures=1000))
+    assert status == "aborted"
@@ -0,0 +1,81 @@
+import random
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from loadtest.run import Recorder, percentile
+from loadtest.seed import generate_academy
+from loadtest.stub_server import stub_verify_token
+
+TODAY = datetime(2026, 1, 15)
+
+
+def test_generated_academy_is_consistent():
+    academy = generate_academy(random.Random(1), 0, players=12, coaches=3, days=28, today=TODAY)
+    docs, manifest = academy["docs"], academy["manifest"]
+    academy_id = docs["academies"][0]["id"]
+
+    assert len(docs["players"]) == 12 and len(docs["coaches"]) == 3
+    assert manifest["academy_id"] == academy_id
+    for name, rows in docs.items():
+        if name == "academies":
+            continue
+        assert all(row["academy_id"] == academy_id for row in rows), name
+
+    players = {player["id"]: player for player in docs["players"]}
+    for coach in manifest["coaches"]:
+        assert coach["players"]
+        assert all(players[player_id]["coach_id"] == coach["coach_id"] for player_id in coach["players"])
+
+    for record in docs["player_attendance"]:
+        player = players[record["player_id"]]
+        assert datetime.strptime(record["date"], "%Y-%m-%d").strftime("%A") in player["training_days"]
+        assert record["date"] < TODAY.strftime("%Y-%m-%d")
+        assert bool(record["performance_ratings"]) == record["present"]
+    assert len(docs["student_fees"]) == 12
+
+    # Notifications use the store's shape, so the API can page and count them
+    recipients = {"player": players, "coach": {coach["id"] for coach in docs["coaches"]}}
+    for notification in docs["notifications"]:
+        assert notification["recipient_id"] in recipients[notification["recipient_type"]]
+        assert notification["expires_at"] > notification["created_at"]
+        assert isinstance(notification["is_read"], bool) and "read" not in notification
+
+
+def test_generation_is_reproducible_for_a_seed():
+    first = generate_academy(random.Random(7), 0, 5, 2, 14, TODAY)["docs"]["player_attendance"]
+    second = generate_academy(random.Random(7), 0, 5, 2, 14, TODAY)["docs"]["player_attendance"]
+    assert [(r["present"], r["date"]) for r in first] == [(r["present"], r["date"]) for r in second]
+
+
+def test_manifest_tokens_are_accepted_by_the_stub_auth():
+    manifest = generate_academy(random.Random(1), 3, 2, 1, 7, TODAY)["manifest"]
+    user = stub_verify_token(manifest["owner_token"]).user
+    assert user.email == "owner3@loadtest.trackmyacademy.com"
+    try:
+        stub_verify_token("eyJhbGciOi.real.jwt")
+    except Exception:
+        pass
+    else:
+        raise AssertionError("non load-test tokens must be rejected")
+
+
+def test_percentiles_use_nearest_rank():
+    values = sorted(float(v) for v in range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([3.0], 99) == 3
+    assert percentile([], 50) == 0
+
+
+def test_recorder_reports_per_endpoint():
+    recorder = Recorder()
+    for ms in range(1, 21):
+        recorder.record("GET /api/player/stats", ms / 1000, ok=True)
+    recorder.record("POST /api/coach/attendance", 0.5, ok=False)
+    report = recorder.report(duration=2)
+    assert report["GET /api/player/stats"]["count"] == 20
+    assert report["GET /api/player/stats"]["p95_ms"] == 19
+    assert report["GET /api/player/stats"]["rps"] == 10
+    assert report["POST /api/coach/attendance"]["errors"] == 1
@@ -0,0 +1,83 @@
+import asyncio
+import sys
+import os
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import Response
+from fastapi.testclient import TestClient
+from prometheus_client import REGISTRY
+from utils.metrics import EventLoopLagMonitor, MetricsMiddleware, observe_outbound, record_cache, render_metrics
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.get("/metrics-test/players/{player_id}")
+    async def get_player(player_id: str):
+        if player_id == "missing":
+            raise HTTPException(status_code=404, detail="Player not found")
+        return {"id": player_id}
+
+    @app.get("/metrics")
+    async def metrics():
+        body, content_type = render_metrics()
+        return Response(content=body, media_type=content_type)
+
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+def test_requests_labelled_by_route_template():
+    route = "/metrics-test/players/{player_id}"
+    before_ok = sample("http_request_duration_seconds_count", method="GET", route=route, status="200")
+    before_missing = sample("http_request_duration_seconds_count", method="GET", route=route, status="404")
+    client = TestClient(build_app())
+    client.get("/metrics-test/players/p1")
+    client.get("/metrics-test/players/p2")
+    client.get("/metrics-test/players/missing")
+    client.get("/no-such-path")
+
+    assert sample("http_request_duration_seconds_count", method="GET", route=route, status="200") == before_ok + 2
+    assert sample("http_request_duration_seconds_count", method="GET", route=route, status="404") == before_missing + 1
+    assert sample("http_request_duration_seconds_count", method="GET", route="unmatched", status="404") >= 1
+    assert sample("http_request_duration_seconds_bucket", method="GET", route=route, status="200", le="+Inf") >= 2
+
+    idle = sample("http_requests_in_progress")
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_bucket{le="0.005",method="GET",route="/metrics-test/players/{player_id}",status="200"}' in body
+    # The scrape itself is the one request in flight
+    assert f"http_requests_in_progress {idle + 1}" in body
+    assert sample("http_requests_in_progress") == idle
+
+
+def test_outbound_and_cache_metrics():
+    before = sample("outbound_request_duration_seconds_count", service="supabase", operation="test", outcome="error")
+    try:
+        with observe_outbound("supabase", "test"):
+            raise RuntimeError("down")
+    except RuntimeError:
+        pass
+    assert sample("outbound_request_duration_seconds_count", service="supabase", operation="test", outcome="error") == before + 1
+
+    record_cache("test_cache", True)
+    record_cache("test_cache", False)
+    assert sample("cache_requests_total", cache="test_cache", result="hit") >= 1
+    assert sample("cache_requests_total", cache="test_cache", result="miss") >= 1
+
+
+def test_event_loop_lag_monitor_reports_blocking():
+    async def run():
+        monitor = EventLoopLagMonitor(interval=0.01)
+        monitor.start()
+        await asyncio.sleep(0.02)
+        time.sleep(0.05)  # block the loop
+        await asyncio.sleep(0.03)
+        await monitor.stop()
+        return monitor.max_lag
+
+    assert asyncio.run(run()) >= 0.03
@@ -0,0 +1,97 @@
+import sys
+import os
+import asyncio
+from datetime import datetime, timedelta
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from fastapi.testclient import TestClient
+from mongomock_motor import AsyncMongoMockClient
+from app import core
+from app.dependencies import require_coach_user
+from app.main import create_app
+from utils.notifications import NotificationStore
+from utils.pagination import decode_cursor
+
+
+def test_fan_out_counters_and_keyset_pages():
+    async def run():
+        db = AsyncMongoMockClient()["test"]
+        published = []
+        store = NotificationStore(db, publish=published.append)
+        start = datetime(2026, 1, 1)
+        await store.notify_many([
+            store.build("a1", "player", f"p{i % 2}", f"Fee due {i}", type="fee_due", now=start + timedelta(minutes=i))
+            for i in range(5)
+        ])
+        assert len(published) == 5
+        assert await store.unread_count("player", "p0") == 3 and await store.unread_count("player", "p1") == 2
+
+        first, cursor = await store.page("player", "p0", limit=2)
+        rest, end = await store.page("player", "p0", limit=2, position=decode_cursor(cursor))
+        assert [n["message"] for n in first + rest] == ["Fee due 4", "Fee due 2", "Fee due 0"] and end is None
+
+        assert await store.mark_read("player", "p0", first[0]["id"])
+        assert await store.mark_read("player", "p0", first[0]["id"])  # already read: no double decrement
+        assert not await store.mark_read("player", "p1", first[0]["id"])  # someone else's
+        assert await store.unread_count("player", "p0") == 2
+        assert await store.mark_all_read("player", "p0") == 2
+        assert await store.unread_count("player", "p0") == 0
+
+    asyncio.run(run())
+
+
+def test_reconcile_after_expiry_and_legacy_migration():
+    async def run():
+        db = AsyncMongoMockClient()["test"]
+        store = NotificationStore(db)
+        created = await store.notify("a1", "coach", "c1", "Plan to review", data={"plan_id": "t1"})
+        # The TTL monitor deletes without touching counters
+        await db.notifications.delete_one({"id": created["id"]})
+        assert await store.unread_count("coach", "c1") == 1
+        assert await store.reconcile_counters() == 1
+        assert await store.unread_count("coach", "c1") == 0
+
+        now = datetime.utcnow()
+        await db.notifications.insert_many([
+            {"id": "l1", "coach_id": "c1", "academy_id": "a1", "message": "Player assigned", "is_read": False,
+             "created_at": now},
+            {"id": "l2", "player_id": "p1", "academy_id": "a1", "type": "achievement_earned", "title": "Well done",
+             "message": "Badge", "achievement_id": "b1", "read": True, "created_at": now},
+            {"id": "l3", "academy_id": "a1", "type": "training_plan_reviewed", "message": "Approved", "plan_id": "t1",
+             "read": False, "created_at": now - timedelta(days=200)},
+        ])
+        assert await store.migrate_legacy() == 3 and await store.migrate_legacy() == 0
+        docs = {d["id"]: d async for d in db.notifications.find({}, {"_id": 0})}
+        assert (docs["l1"]["recipient_type"], docs["l1"]["recipient_id"]) == ("coach", "c1")
+        assert docs["l1"]["type"] == "general"
+        assert docs["l2"]["is_read"] and docs["l2"]["data"] == {"achievement_id": "b1"} and "read" not in docs["l2"]
+        assert (docs["l3"]["recipient_type"], docs["l3"]["recipient_id"]) == ("academy", "a1")
+        # Retention counts from the migration, not from when an old notification was created
+        assert docs["l3"]["expires_at"] >= now.replace(microsecond=now.microsecond // 1000 * 1000) + timedelta(days=90)
+        recipients = (("coach", "c1"), ("player", "p1"), ("academy", "a1"))
+        assert [await store.unread_count(*recipient) for recipient in recipients] == [1, 0, 1]
+
+    asyncio.run(run())
+
+
+def test_coach_routes_use_the_store():
+    previous = core._db, core._analytics_db
+    core.use_database(AsyncMongoMockClient()["test"])
+    app = create_app(routers=["app.routers.coaches:router"])
+    app.dependency_overrides[require_coach_user] = lambda: {"role": "coach", "coach_id": "c1", "academy_id": "a1"}
+    client = TestClient(app)
+    try:
+        async def seed():
+            store = NotificationStore(core.db)
+            await store.notify_many([store.build("a1", "coach", "c1", f"Message {i}") for i in range(3)])
+        asyncio.run(seed())
+
+        body = client.get("/api/coach/notifications?limit=2").json()
+        assert body["unread_count"] == 3 and len(body["notifications"]) == 2 and body["next_cursor"]
+        assert {"id", "message", "is_read", "created_at"} <= set(body["notifications"][0])
+        notification_id = body["notifications"][0]["id"]
+        assert client.put(f"/api/coach/notifications/{notification_id}/read").status_code == 200
+        assert client.put("/api/coach/notifications/missing/read").status_code == 404
+        assert client.put("/api/coach/notifications/read-all").json()["updated_count"] == 2
+        assert client.get("/api/coach/notifications").json()["unread_count"] == 0
+    finally:
+        core.use_database(*previous)
@@ -0,0 +1,39 @@
+import pytest
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from utils.pagination import encode_cursor, decode_cursor, keyset_filter
+
+
+def test_cursor_round_trip_keeps_datetime():
+    created = datetime(2024, 5, 1, 10, 30, 15, 250000)
+    cursor = encode_cursor(created, "p-42")
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == (created, "p-42")
+
+
+def test_invalid_cursor_rejected():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+def test_keyset_filter_descending_includes_tie_break_and_nulls():
+    created = datetime(2024, 5, 1)
+    query = keyset_filter({"academy_id": "a1"}, "created_at", (created, "p-9"), -1)
+    assert query == {"$and": [
+        {"academy_id": "a1"},
+        {"$or": [
+            {"created_at": {"$lt": created}},
+            {"created_at": created, "id": {"$lt": "p-9"}},
+            {"created_at": None}
+        ]}
+    ]}
+
+
+def test_keyset_filter_ascending_after_null_key():
+    query = keyset_filter({}, "created_at", (None, "p-1"), 1)
+    assert query == {"$or": [
+        {"created_at": None, "id": {"$gt": "p-1"}},
+        {"created_at": {"$ne": None}}
+    ]}
@@ -0,0 +1,100 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from utils import profiling
+from utils.profiling import (
+    PROFILE_HEADER, ProfileStore, ProfilingMiddleware, render_profile, sign_profile_request,
+    tag_request, verify_profile_signature
+)
+
+
+def build_app(store, **options):
+    app = FastAPI()
+
+    @app.get("/analytics/{academy_id}")
+    async def analytics(academy_id: str):
+        tag_request(tenant=academy_id)
+        return {"total": sum(i * i for i in range(20000))}
+
+    app.add_middleware(ProfilingMiddleware, store=store, **options)
+    return app
+
+
+def test_signature_is_bound_to_method_and_path():
+    value = sign_profile_request("secret", "GET", "/api/analytics/a1")
+    assert verify_profile_signature("secret", value, "GET", "/api/analytics/a1")
+    assert not verify_profile_signature("secret", value, "GET", "/api/analytics/a2")
+    assert not verify_profile_signature("other", value, "GET", "/api/analytics/a1")
+    expired = sign_profile_request("secret", "GET", "/api/analytics/a1", ttl_seconds=-1)
+    assert not verify_profile_signature("secret", expired, "GET", "/api/analytics/a1")
+
+
+def test_signed_request_is_profiled_with_route_and_tenant():
+    store = ProfileStore()
+    client = TestClient(build_app(store, secret="secret", sample_rate=0))
+
+    client.get("/analytics/a1")
+    assert store.list() == []
+
+    signature = sign_profile_request("secret", "GET", "/analytics/a1")
+    assert client.get("/analytics/a1", headers={PROFILE_HEADER: signature}).status_code == 200
+    [entry] = store.list()
+    assert entry["route"] == "/analytics/{academy_id}"
+    assert entry["tenant"] == "a1"
+    assert entry["trigger"] == "signed"
+    content, _ = render_profile(store.get(entry["id"]), "text")
+    assert "analytics" in content
+
+
+def test_latency_threshold_keeps_only_slow_requests():
+    store = ProfileStore()
+    TestClient(build_app(store, secret="", sample_rate=1.0, latency_threshold_ms=60_000)).get("/analytics/a1")
+    assert store.list() == []
+    TestClient(build_app(store, secret="", sample_rate=1.0, latency_threshold_ms=0)).get("/analytics/a1")
+    assert [entry["trigger"] for entry in store.list()] == ["slow"]
+
+
+def test_latency_threshold_alone_only_profiles_sampled_candidates(monkeypatch):
+    middleware = ProfilingMiddleware(None, secret="", sample_rate=0, latency_threshold_ms=0)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    monkeypatch.setattr(profiling.random, "random", lambda: profiling.DEFAULT_THRESHOLD_SAMPLE_RATE)
+    assert middleware._trigger(scope) is None
+    monkeypatch.setattr(profiling.random, "random", lambda: 0.0)
+    assert middleware._trigger(scope) == "slow"
+
+
+def test_cprofile_fallback_skips_concurrent_requests(monkeypatch):
+    monkeypatch.setattr(profiling, "_Pyinstrument", None)
+    store = ProfileStore()
+
+    async def app(scope, receive, send):
+        await asyncio.sleep(0.01)
+
+    middleware = ProfilingMiddleware(app, store=store, secret="", sample_rate=1.0)
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+
+    async def run():
+        # Overlapping requests: none is profiled alone, so none is kept
+        await asyncio.gather(*(middleware(dict(scope), None, None) for _ in range(3)))
+        assert store.list() == []
+        await middleware(dict(scope), None, None)
+        assert len(store.list()) == 1
+
+    asyncio.run(run())
+
+
+def test_ring_buffer_is_bounded_and_cprofile_fallback(monkeypatch):
+    monkeypatch.setattr(profiling, "_Pyinstrument", None)
+    store = ProfileStore(max_entries=2)
+    client = TestClient(build_app(store, secret="", sample_rate=1.0))
+    for academy_id in ("a1", "a2", "a3"):
+        client.get(f"/analytics/{academy_id}")
+    entries = store.list()
+    assert [entry["tenant"] for entry in entries] == ["a3", "a2"]
+    assert entries[0]["profiler"] == "cprofile"
+    content, media_type = render_profile(store.get(entries[0]["id"]))
+    assert media_type == "text/plain"
+    assert "function calls" in content
@@ -0,0 +1,71 @@
+import asyncio
+import logging
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from utils.query_monitor import (
+    QueryMonitorListener, QueryMonitorMiddleware, RouteQueryTotals, current_query_stats, query_shape
+)
+
+listener = QueryMonitorListener()
+
+
+async def fake_query(request_id, command, duration_micros=2000):
+    # Motor runs PyMongo (and so the listener) in an executor with a copied context
+    def run():
+        listener.started(SimpleNamespace(request_id=request_id, command_name="find", command=command))
+        listener.succeeded(SimpleNamespace(request_id=request_id, duration_micros=duration_micros))
+    await asyncio.to_thread(run)
+
+
+def build_app(totals):
+    app = FastAPI()
+
+    @app.get("/players/{player_id}")
+    async def get_player(player_id: str):
+        await fake_query(1, {"find": "players", "filter": {"id": player_id}})
+        return {"id": player_id}
+
+    @app.get("/leaderboard")
+    async def leaderboard():
+        for i in range(12):
+            await fake_query(i, {"find": "player_performance", "filter": {"player_id": str(i)}})
+        return []
+
+    app.add_middleware(QueryMonitorMiddleware, query_budget=10, repeat_threshold=5, server_timing=True, totals=totals)
+    return app
+
+
+def test_queries_attributed_to_route_with_server_timing():
+    totals = RouteQueryTotals()
+    response = TestClient(build_app(totals)).get("/players/p1")
+    assert response.headers["server-timing"].startswith('db;dur=2.0;desc="1 queries"')
+    route = totals.snapshot()["GET /players/{player_id}"]
+    assert route["requests"] == 1
+    assert route["queries"] == 1
+    assert route["slowest_query"] == "find players {'id': '?'}"
+
+
+def test_budget_and_repeated_shape_warnings(caplog):
+    totals = RouteQueryTotals()
+    with caplog.at_level(logging.WARNING, logger="utils.query_monitor"):
+        TestClient(build_app(totals)).get("/leaderboard")
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("12 queries" in message and "budget of 10" in message for message in messages)
+    assert any("Possible N+1 in GET /leaderboard: 12x find player_performance" in message for message in messages)
+
+
+def test_commands_outside_requests_are_ignored():
+    assert current_query_stats() is None
+    listener.started(SimpleNamespace(request_id=1, command_name="find", command={"find": "players", "filter": {}}))
+
+
+def test_query_shape_ignores_literal_values():
+    a = query_shape("find", {"find": "players", "filter": {"academy_id": "a", "status": {"$in": ["x", "y"]}}})
+    b = query_shape("find", {"find": "players", "filter": {"academy_id": "b", "status": {"$in": ["z"]}}})
+    assert a == b
+    assert query_shape("aggregate", {"aggregate": "players", "pipeline": [{"$match": {}}, {"$group": {}}]}) == \
+        "aggregate players ['$match', '$group']"
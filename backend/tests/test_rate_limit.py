@@ -0,0 +1,143 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from types import SimpleNamespace
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+from app import core
+from app.dependencies import client_ip, rate_limit
+from utils.rate_limit import RateLimit
+from utils.state import MemoryStateBackend
+
+
+def test_memory_counters_stay_bounded():
+    async def run():
+        state = MemoryStateBackend(max_keys=100)
+        for i in range(1000):
+            await state.hit(f"ratelimit:demo:user{i}@example.com", 3, 3600)
+            await state.set(f"cache:{i}", {"i": i})
+        assert len(state._counters) == 100 and len(state._values) == 100
+        # The most recent identifiers are the ones kept
+        assert "ratelimit:demo:user999@example.com" in state._counters
+        assert await state.get("cache:0") is None and await state.get("cache:999") == {"i": 999}
+
+    asyncio.run(run())
+
+
+def test_memory_counter_rolls_over_windows(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr("utils.state.time.time", lambda: clock[0])
+
+    async def run():
+        state = MemoryStateBackend()
+        assert [(await state.hit("k", 2, 10))[0] for _ in range(3)] == [True, True, False]
+        # Halfway into the next window half of the previous 2 hits still count
+        clock[0] = 1015.0
+        assert [(await state.hit("k", 2, 10))[0] for _ in range(2)] == [True, False]
+        # Two windows later nothing carries over
+        clock[0] = 1030.0
+        assert [(await state.hit("k", 2, 10))[0] for _ in range(3)] == [True, True, False]
+
+    asyncio.run(run())
+
+
+def make_client(policy, user_dependency=None):
+    app = FastAPI()
+
+    @app.post("/send", dependencies=[Depends(rate_limit(policy, user_dependency))])
+    async def send():
+        return {"sent": True}
+
+    return TestClient(app)
+
+
+def test_ip_policy_returns_429_with_retry_after():
+    core.use_state_backend(MemoryStateBackend())
+    try:
+        client = make_client(RateLimit("test_ip", 2, 60))
+        statuses = [client.post("/send").status_code for _ in range(3)]
+        denied = client.post("/send")
+    finally:
+        core.use_state_backend(None)
+    assert statuses == [200, 200, 429]
+    assert denied.status_code == 429 and 1 <= int(denied.headers["Retry-After"]) <= 120
+
+
+def test_retry_after_is_when_the_sliding_window_next_allows(monkeypatch):
+    clock = [1200.0]
+    monkeypatch.setattr("utils.state.time.time", lambda: clock[0])
+    core.use_state_backend(MemoryStateBackend())
+    try:
+        client = make_client(RateLimit("test_retry", 2, 60))
+        assert [client.post("/send").status_code for _ in range(3)] == [200, 200, 429]
+        # Both hits still weigh half in the next window: allowed again 90s in, not at the boundary
+        clock[0] = 1200.0 + 60
+        denied = client.post("/send")
+        assert denied.status_code == 429 and denied.headers["Retry-After"] == "30"
+        clock[0] += 29
+        assert client.post("/send").status_code == 429
+        clock[0] += 1
+        assert client.post("/send").status_code == 200
+        # Later in a window the previous window's fading weight decides
+        assert client.post("/send").status_code == 429
+    finally:
+        core.use_state_backend(None)
+
+
+def test_retry_after_values():
+    from utils.state import _retry_after
+    # 10 reminders at the start of a 300s window: the 11th passes once they weigh 9, 30s into the next window
+    assert _retry_after(10, 0, 0.0, 10, 300) == 330
+    # 9 previous and 5 current against 10: needs the previous weight down to 4
+    assert _retry_after(5, 9, 0.2, 10, 300) == 107
+    # Never longer than two windows
+    assert _retry_after(10, 10, 0.5, 1, 300) <= 450
+
+
+def test_user_policy_counts_each_user_separately():
+    current = {"id": "u1"}
+
+    async def fake_user():
+        return {"user": SimpleNamespace(id=current["id"]), "academy_id": "a1"}
+
+    core.use_state_backend(MemoryStateBackend())
+    try:
+        client = make_client(RateLimit("test_user", 1, 60, scope="user"), fake_user)
+        first = [client.post("/send").status_code for _ in range(2)]
+        current["id"] = "u2"
+        second = client.post("/send").status_code
+    finally:
+        core.use_state_backend(None)
+    assert first == [200, 429] and second == 200
+
+
+def make_request(peer, forwarded=None):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": headers, "client": (peer, 4321)})
+
+
+def test_client_ip_only_trusts_forwarded_for_from_proxies(monkeypatch):
+    monkeypatch.delenv("TRUSTED_PROXIES", raising=False)
+    assert client_ip(make_request("10.0.0.5", "203.0.113.7")) == "10.0.0.5"
+
+    monkeypatch.setenv("TRUSTED_PROXIES", "10.0.0.0/8, 192.168.1.1")
+    # A spoofed left-most entry is skipped: the last untrusted hop is the client
+    assert client_ip(make_request("10.0.0.5", "1.2.3.4, 203.0.113.7, 192.168.1.1")) == "203.0.113.7"
+    # Not from a proxy: the header is ignored
+    assert client_ip(make_request("198.51.100.9", "203.0.113.7")) == "198.51.100.9"
+
+    monkeypatch.setenv("TRUSTED_PROXIES", "*")
+    assert client_ip(make_request("10.0.0.5", "1.2.3.4, 203.0.113.7")) == "203.0.113.7"
+
+
+def test_ip_policy_behind_proxy_limits_each_client(monkeypatch):
+    monkeypatch.setenv("TRUSTED_PROXIES", "*")
+    core.use_state_backend(MemoryStateBackend())
+    try:
+        client = make_client(RateLimit("test_proxy", 1, 60))
+        first = [client.post("/send", headers={"X-Forwarded-For": "203.0.113.7"}).status_code for _ in range(2)]
+        other = client.post("/send", headers={"X-Forwarded-For": "203.0.113.8"}).status_code
+    finally:
+        core.use_state_backend(None)
+    assert first == [200, 429] and other == 200
@@ -0,0 +1,32 @@
+import json
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+import bson
+from bson.raw_bson import RawBSONDocument
+from utils.raw_bson import raw_decode, raw_json_response, raw_to_json_array
+from utils.serialization import dumps
+
+
+def raw_docs(count):
+    return [
+        RawBSONDocument(bson.encode({"id": str(i), "name": f"P{i}", "created_at": datetime(2024, 1, 1, 0, i % 60)}))
+        for i in range(count)
+    ]
+
+
+def test_raw_array_matches_dict_encoding_across_batches():
+    docs = raw_docs(7)
+    expected = dumps([bson.decode(doc.raw) for doc in docs])
+    assert raw_to_json_array(docs, batch_size=3) == expected
+    assert raw_to_json_array([]) == b"[]"
+    assert raw_decode(docs, batch_size=3) == [bson.decode(doc.raw) for doc in docs]
+
+
+def test_raw_json_response_embeds_arrays_in_objects():
+    response = raw_json_response({"announcements": raw_docs(2), "limit": 100, "next_cursor": None})
+    body = json.loads(response.body)
+    assert [a["id"] for a in body["announcements"]] == ["0", "1"]
+    assert body["announcements"][0]["created_at"] == "2024-01-01T00:00:00"
+    assert body["limit"] == 100 and body["next_cursor"] is None
@@ -0,0 +1,75 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from prometheus_client import REGISTRY
+from utils.ref_cache import ReferenceCache
+from utils.state import MemoryStateBackend
+
+
+class FakeCollection:
+    def __init__(self, docs):
+        self.docs = docs
+        self.queries = 0
+
+    async def find_one(self, key):
+        self.queries += 1
+        await asyncio.sleep(0.001)
+        doc = self.docs.get(key)
+        return dict(doc) if doc else None
+
+
+def hits(entity, result):
+    return REGISTRY.get_sample_value("cache_requests_total", {"cache": f"ref:{entity}", "result": result}) or 0
+
+
+def test_read_through_with_ttl_and_cached_misses():
+    async def run():
+        academies = FakeCollection({"a1": {"id": "a1", "name": "Ace"}})
+        cache = ReferenceCache("test_academy", academies.find_one, ttl_seconds=0.05)
+        hits_before = hits("test_academy", "hit")
+
+        results = await asyncio.gather(*(cache.get("a1") for _ in range(10)))
+        assert all(r["name"] == "Ace" for r in results) and academies.queries == 1
+        assert await cache.get("missing") is None and await cache.get("missing") is None
+        assert academies.queries == 2
+        assert hits("test_academy", "hit") - hits_before == 1
+
+        await asyncio.sleep(0.06)
+        await cache.get("a1")
+        assert academies.queries == 3
+
+    asyncio.run(run())
+
+
+def test_invalidation_reaches_other_workers():
+    async def run():
+        coaches = FakeCollection({"c1": {"id": "c1", "first_name": "Old"}})
+        state = MemoryStateBackend()
+        worker_a = ReferenceCache("test_coach", coaches.find_one, state=lambda: state, sync_seconds=0)
+        worker_b = ReferenceCache("test_coach", coaches.find_one, state=lambda: state, sync_seconds=0)
+        assert (await worker_a.get("c1"))["first_name"] == "Old"
+        assert (await worker_b.get("c1"))["first_name"] == "Old"
+
+        # update_coach runs on worker A
+        coaches.docs["c1"]["first_name"] = "New"
+        await worker_a.invalidate("c1")
+
+        assert (await worker_a.get("c1"))["first_name"] == "New"
+        assert (await worker_b.get("c1"))["first_name"] == "New"
+
+    asyncio.run(run())
+
+
+def test_load_overlapping_an_invalidation_is_not_stored():
+    async def run():
+        settings = FakeCollection({"a1": {"fee_reminder_type": "manual"}})
+        cache = ReferenceCache("test_settings", settings.find_one)
+        loading = asyncio.create_task(cache.get("a1"))
+        await asyncio.sleep(0)
+        settings.docs["a1"]["fee_reminder_type"] = "automatic"
+        await cache.invalidate("a1")
+        await loading  # read before the write landed
+        assert (await cache.get("a1"))["fee_reminder_type"] == "automatic"
+
+    asyncio.run(run())
@@ -0,0 +1,29 @@
+import json
+import sys
+import os
+from datetime import datetime
+from typing import List
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from bson import ObjectId
+from pydantic import BaseModel, Field
+from utils.serialization import dumps, row_from_db
+
+
+class Row(BaseModel):
+    id: str
+    tags: List[str] = []
+    status: str = "active"
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+def test_dumps_encodes_bson_types_like_isoformat():
+    when = datetime(2024, 5, 1, 10, 30, 0, 123000)
+    body = json.loads(dumps({"_id": ObjectId("65f000000000000000000001"), "at": when}))
+    assert body == {"_id": "65f000000000000000000001", "at": when.isoformat()}
+
+
+def test_row_from_db_keeps_model_fields_and_fills_defaults():
+    row = row_from_db({"_id": ObjectId(), "id": "r1", "secret": "x"}, Row)
+    assert set(row) == {"id", "tags", "status", "created_at"}
+    assert row["tags"] == [] and row["status"] == "active"
+    assert isinstance(row["created_at"], datetime)
@@ -0,0 +1,93 @@
+import sys
+import os
+import asyncio
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+import pytest
+from app.dependencies import admitted
+from utils.admission import AdmissionController
+from utils.single_flight import SingleFlight, coalesce, flight_key
+
+
+def test_concurrent_duplicates_share_one_computation():
+    async def run():
+        flights = SingleFlight("test")
+        calls = []
+
+        async def compute():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return {"total": 42}
+
+        results = await asyncio.gather(*(flights.do("a1|dashboard", compute) for _ in range(20)))
+        assert len(calls) == 1 and all(r == {"total": 42} for r in results)
+        assert flights.in_flight() == 0
+        # Finished flights aren't cached
+        await flights.do("a1|dashboard", compute)
+        assert len(calls) == 2
+
+    asyncio.run(run())
+
+
+def test_errors_are_shared_or_retried():
+    async def run(share_errors):
+        flights = SingleFlight("test", share_errors=share_errors)
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            await asyncio.sleep(0.01)
+            if len(attempts) == 1:
+                raise RuntimeError("timeout")
+            return "ok"
+
+        results = await asyncio.gather(flights.do("k", flaky), flights.do("k", flaky), return_exceptions=True)
+        return [type(r).__name__ if isinstance(r, Exception) else r for r in results], len(attempts)
+
+    assert asyncio.run(run(True)) == (["RuntimeError", "RuntimeError"], 1)
+    assert asyncio.run(run(False)) == (["RuntimeError", "ok"], 2)
+
+
+def test_leader_cancellation_does_not_cancel_followers():
+    async def run():
+        flights = SingleFlight("test", copy_results=True)
+
+        async def compute():
+            await asyncio.sleep(0.02)
+            return {"rows": [1, 2]}
+
+        leader = asyncio.create_task(flights.do("k", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.do("k", compute))
+        await asyncio.sleep(0)
+        leader.cancel()
+        result = await follower
+        result["rows"].append(3)  # a private copy
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return result
+
+    assert asyncio.run(run()) == {"rows": [1, 2, 3]}
+
+
+def test_coalesced_handler_keys_on_tenant_and_params_and_takes_one_slot():
+    flights = SingleFlight("test")
+    controller = AdmissionController("test", max_concurrent=1, per_tenant=1, queue_timeout=0.05)
+    calls = []
+
+    @coalesce(flights, lambda args: flight_key(args["user_info"]["academy_id"], args, exclude=("user_info",)))
+    @admitted(controller)
+    async def leaderboard(sport: str = None, limit: int = 10, user_info=None):
+        calls.append((user_info["academy_id"], sport, limit))
+        await asyncio.sleep(0.02)
+        return calls[-1]
+
+    async def run():
+        a1, a2 = {"academy_id": "a1"}, {"academy_id": "a2"}
+        same = await asyncio.gather(*(leaderboard(sport="Tennis", user_info=a1) for _ in range(10)),
+                                    leaderboard(user_info=a1, sport="Tennis", limit=10))
+        assert len(set(same)) == 1 and len(calls) == 1
+        await asyncio.gather(leaderboard(sport="Tennis", user_info=a2), leaderboard(sport="Cricket", user_info=a1))
+        assert len(calls) == 3
+
+    asyncio.run(run())
+    assert flight_key("a1", {"limit": 10, "sport": "x"}) == flight_key("a1", {"sport": "x", "limit": 10})
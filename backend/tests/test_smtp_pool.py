@@ -0,0 +1,78 @@
+import asyncio
+import smtplib
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+import email_utils
+from email_utils import SMTPConnectionPool, render_fee_reminder_email
+
+
+class FakeSMTP:
+    instances = []
+
+    def __init__(self, host, port, timeout=None):
+        self.sent = []
+        self.logins = 0
+        self.fail_next = False
+        FakeSMTP.instances.append(self)
+
+    def login(self, user, password):
+        self.logins += 1
+
+    def send_message(self, msg):
+        if self.fail_next:
+            self.fail_next = False
+            raise smtplib.SMTPServerDisconnected("gone")
+        self.sent.append(msg["To"])
+
+    def quit(self):
+        pass
+
+
+def make_msg(to):
+    return render_fee_reminder_email(to, "Asha", "Ace Academy", 1500, datetime(2024, 5, 10), now=datetime(2024, 5, 1))
+
+
+def test_pool_reuses_one_login_for_many_messages(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP_SSL", FakeSMTP)
+    pool = SMTPConnectionPool("smtp.test", 465, "user", "pw", size=2)
+    for i in range(5):
+        pool.send(make_msg(f"p{i}@x.com"))
+    assert len(FakeSMTP.instances) == 1
+    assert FakeSMTP.instances[0].logins == 1
+    assert len(FakeSMTP.instances[0].sent) == 5
+
+
+def test_pool_reconnects_when_connection_drops(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP_SSL", FakeSMTP)
+    pool = SMTPConnectionPool("smtp.test", 465, "user", "pw", size=1)
+    pool.send(make_msg("a@x.com"))
+    FakeSMTP.instances[0].fail_next = True
+    pool.send(make_msg("b@x.com"))
+    assert len(FakeSMTP.instances) == 2
+    assert FakeSMTP.instances[1].sent == ["b@x.com"]
+
+
+def test_fee_reminder_template_renders_values():
+    msg = make_msg("p@x.com")
+    html = msg.get_payload()[1].get_payload(decode=True).decode()
+    assert "Asha" in html and "₹1,500.00" in html and "May 10, 2024" in html
+    assert "due in 9 days" in html and "$" not in html
+    assert msg["Subject"] == "Fee Payment Reminder - Ace Academy"
+
+
+def test_bulk_reminders_report_results_per_recipient(monkeypatch):
+    FakeSMTP.instances = []
+    monkeypatch.setattr(smtplib, "SMTP_SSL", FakeSMTP)
+    email_utils.set_smtp_pool(SMTPConnectionPool("smtp.test", 465, "user", "pw", size=2))
+    recipients = [
+        {"email": "a@x.com", "player_name": "A", "academy_name": "Ace", "fee_amount": 100, "due_date": datetime(2024, 5, 10)},
+        {"email": "b@x.com", "player_name": "B", "academy_name": "Ace", "due_date": datetime(2024, 5, 10)},
+    ]
+    summary = asyncio.run(email_utils.send_bulk_fee_reminders(recipients))
+    email_utils.set_smtp_pool(None)
+    assert summary["sent"] == 1 and summary["failed"] == 1
+    assert summary["results"] == [True, False]
@@ -0,0 +1,218 @@
+import sys
+import os
+import asyncio
+import multiprocessing
+import threading
+import uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+import pytest
+from utils.state import MemoryStateBackend, MongoStateBackend, RedisStateBackend, TokenStore
+
+TEST_MONGO_URL = os.environ.get("TEST_MONGO_URL", "mongodb://127.0.0.1:27017")
+
+WORKERS = 4
+HITS_PER_WORKER = 25
+LIMIT = 30
+
+
+def test_memory_backend_values_expire_and_merge():
+    async def run():
+        state = MemoryStateBackend()
+        await state.set("a", {"x": 1}, ttl_seconds=0.05)
+        await state.update("a", {"y": 2})
+        assert await state.get("a") == {"x": 1, "y": 2}
+        await asyncio.sleep(0.06)
+        assert await state.get("a") is None
+
+        calls = []
+
+        async def loader():
+            calls.append(1)
+            return {"total": 3}
+
+        assert await state.get_or_set("b", 60, loader) == {"total": 3}
+        assert await state.get_or_set("b", 60, loader) == {"total": 3}
+        assert len(calls) == 1
+
+    asyncio.run(run())
+
+
+def test_memory_backend_hit_and_lock():
+    async def run():
+        state = MemoryStateBackend()
+        results = [await state.hit("k", 3, 3600) for _ in range(5)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False, False]
+        owner = await state.acquire_lock("refresh", 30)
+        assert owner
+        assert not await state.acquire_lock("refresh", 30)
+        # Only the owner releases
+        await state.release_lock("refresh", "someone-else")
+        assert not await state.acquire_lock("refresh", 30)
+        await state.release_lock("refresh", owner)
+        assert await state.acquire_lock("refresh", 30)
+
+    asyncio.run(run())
+
+
+def test_redis_lock_is_released_only_by_its_owner():
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def run():
+        state = RedisStateBackend("", client=fakeredis.FakeAsyncRedis())
+        owner = await state.acquire_lock("refresh", 30)
+        assert owner and not await state.acquire_lock("refresh", 30)
+        await state.release_lock("refresh", "someone-else")
+        assert not await state.acquire_lock("refresh", 30)
+        await state.release_lock("refresh", owner)
+        assert await state.acquire_lock("refresh", 30)
+
+    asyncio.run(run())
+
+
+def test_token_store_shares_token_and_refresh_lock():
+    async def run():
+        state = MemoryStateBackend()
+        worker_a, worker_b = TokenStore(state), TokenStore(state)
+        owner = await worker_a.acquire_refresh_lock("zoho_mail", 30)
+        assert owner
+        assert not await worker_b.acquire_refresh_lock("zoho_mail", 30)
+        await worker_a.save("zoho_mail", {"access_token": "t1"})
+        assert (await worker_b.load("zoho_mail"))["access_token"] == "t1"
+        # Saving other fields (e.g. the account id) doesn't release the lock
+        await worker_b.save("zoho_mail", {"account_id": "acc"})
+        assert not await worker_b.acquire_refresh_lock("zoho_mail", 30)
+        await worker_a.release_refresh_lock("zoho_mail", owner)
+        assert await worker_b.acquire_refresh_lock("zoho_mail", 30)
+
+    asyncio.run(run())
+
+
+def test_check_rate_limit_uses_shared_state():
+    from app import core
+    from app.dependencies import check_rate_limit
+
+    core.use_state_backend(MemoryStateBackend())
+    try:
+        results = [asyncio.run(check_rate_limit("demo_request:a@b.c", max_requests=2)) for _ in range(3)]
+    finally:
+        core.use_state_backend(None)
+    assert [allowed for allowed, _ in results] == [True, True, False]
+    assert "Maximum 2 requests per 60 minutes" in results[2][1]
+
+
+def test_mongo_backend_hit_lock_and_expiry():
+    from mongomock_motor import AsyncMongoMockClient
+
+    async def run():
+        state = MongoStateBackend(AsyncMongoMockClient()["test"])
+        results = [await state.hit("k", 3, 3600) for _ in range(5)]
+        assert [allowed for allowed, _ in results] == [True, True, True, False, False]
+        # Denied hits are taken back off the counter
+        [counter] = await state.collection.find({"_id": {"$regex": "^k:"}}).to_list(None)
+        assert counter["count"] == 3
+
+        # The second acquire collides on _id (DuplicateKeyError) while the lock is held
+        owner = await state.acquire_lock("refresh", 30)
+        assert owner and not await state.acquire_lock("refresh", 30)
+        await state.release_lock("refresh", "someone-else")
+        assert not await state.acquire_lock("refresh", 30)
+        await state.release_lock("refresh", owner)
+        # An expired lock is taken over
+        assert await state.acquire_lock("refresh", 0.05)
+        await asyncio.sleep(0.06)
+        assert await state.acquire_lock("refresh", 30)
+
+        # Reads check expires_at themselves: the TTL monitor runs only once a minute
+        await state.set("a", {"x": 1}, ttl_seconds=0.05)
+        await state.update("a", {"y": 2})
+        assert await state.get("a") == {"x": 1, "y": 2}
+        await asyncio.sleep(0.06)
+        assert await state.get("a") is None
+
+    asyncio.run(run())
+
+
+def test_take_hands_a_value_to_one_caller():
+    from mongomock_motor import AsyncMongoMockClient
+    fakeredis = pytest.importorskip("fakeredis")
+
+    async def run(state):
+        await state.set("ticket", {"role": "coach"}, ttl_seconds=30)
+        taken = await asyncio.gather(*(state.take("ticket") for _ in range(3)))
+        assert sorted(taken, key=bool) == [None, None, {"role": "coach"}]
+        assert await state.get("ticket") is None
+        # Expired values aren't handed out
+        await state.set("stale", {"role": "coach"}, ttl_seconds=0.05)
+        await asyncio.sleep(0.06)
+        assert await state.take("stale") is None
+
+    for state in (MemoryStateBackend(), MongoStateBackend(AsyncMongoMockClient()["test"]),
+                  RedisStateBackend("", client=fakeredis.FakeAsyncRedis())):
+        asyncio.run(run(state))
+
+
+def _worker(url, queue, backend="redis", database=None):
+    async def run():
+        if backend == "mongo":
+            from motor.motor_asyncio import AsyncIOMotorClient
+            client = AsyncIOMotorClient(url)
+            state = MongoStateBackend(client[database])
+        else:
+            state = RedisStateBackend(url)
+        results = await asyncio.gather(*(state.hit("ratelimit:shared", LIMIT, 3600) for _ in range(HITS_PER_WORKER)))
+        await state.close()
+        if backend == "mongo":
+            client.close()
+        return sum(1 for allowed, _ in results if allowed)
+
+    queue.put(asyncio.run(run()))
+
+
+def _run_workers(url, backend="redis", database=None):
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(url, queue, backend, database)) for _ in range(WORKERS)]
+    for process in workers:
+        process.start()
+    allowed = [queue.get(timeout=60) for _ in workers]
+    for process in workers:
+        process.join(timeout=10)
+    return allowed
+
+
+def test_rate_limit_holds_across_worker_processes():
+    pytest.importorskip("redis")
+    fakeredis = pytest.importorskip("fakeredis")
+
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0), server_type="redis")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = "redis://127.0.0.1:%d/0" % server.server_address[1]
+    try:
+        allowed = _run_workers(url)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # 100 hits from 4 processes against a limit of 30: exactly 30 get through
+    assert sum(allowed) == LIMIT
+
+
+def test_mongo_rate_limit_holds_across_worker_processes():
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    client = MongoClient(TEST_MONGO_URL, serverSelectionTimeoutMS=500)
+    try:
+        client.admin.command("ping")
+    except PyMongoError:
+        client.close()
+        pytest.skip(f"no mongod at {TEST_MONGO_URL} (set TEST_MONGO_URL)")
+    database = f"test_state_{uuid.uuid4().hex[:8]}"
+    try:
+        allowed = _run_workers(TEST_MONGO_URL, "mongo", database)
+    finally:
+        client.drop_database(database)
+        client.close()
+
+    assert sum(allowed) == LIMIT
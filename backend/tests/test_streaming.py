@@ -0,0 +1,44 @@
+import asyncio
+import json
+import sys
+import os
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from utils.streaming import iter_json_array, iter_ndjson
+
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def batch_size(self, size):
+        return self
+
+    def __aiter__(self):
+        async def gen():
+            for doc in self.docs:
+                yield doc
+        return gen()
+
+
+async def collect(chunks):
+    return b"".join([chunk async for chunk in chunks])
+
+
+def test_json_array_stream_matches_plain_json():
+    docs = [{"id": str(i), "created_at": datetime(2024, 1, 1)} for i in range(250)]
+    body = asyncio.run(collect(iter_json_array(FakeCursor(docs))))
+    parsed = json.loads(body)
+    assert len(parsed) == 250
+    assert parsed[0] == {"id": "0", "created_at": "2024-01-01T00:00:00"}
+
+
+def test_empty_json_array_stream():
+    assert asyncio.run(collect(iter_json_array(FakeCursor([])))) == b"[]"
+
+
+def test_ndjson_stream_applies_transform():
+    docs = [{"id": str(i), "secret": "x"} for i in range(5)]
+    body = asyncio.run(collect(iter_ndjson(FakeCursor(docs), transform=lambda d: {"id": d["id"]})))
+    lines = body.decode().strip().split("\n")
+    assert [json.loads(line) for line in lines] == [{"id": str(i)} for i in range(5)]
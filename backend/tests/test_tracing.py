@@ -0,0 +1,71 @@
+import asyncio
+import sys
+import os
+from types import SimpleNamespace
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from utils.metrics import observe_outbound
+from utils.tracing import (
+    TracingCommandListener, configure_tracing, instrument_app, set_span_attributes, shutdown_tracing, span
+)
+
+listener = TracingCommandListener()
+
+
+def build_app():
+    app = FastAPI()
+
+    @app.post("/academy/players")
+    async def create_player():
+        set_span_attributes(**{"academy.id": "academy-1"})
+
+        def count_players():
+            event = SimpleNamespace(
+                request_id=1, connection_id=("localhost", 27017), database_name="tma",
+                command_name="count", command={"count": "players", "query": {"academy_id": "academy-1"}}
+            )
+            listener.started(event)
+            listener.succeeded(event)
+
+        await asyncio.to_thread(count_players)
+        with observe_outbound("supabase", "admin.create_user"):
+            pass
+        with span("notifications.insert"):
+            pass
+        return {"id": "p1"}
+
+    instrument_app(app)
+    return app
+
+
+def test_request_legs_are_child_spans_with_academy_and_route():
+    exporter = InMemorySpanExporter()
+    assert configure_tracing(exporter=exporter, batch=False)
+    try:
+        TestClient(build_app()).post("/academy/players")
+    finally:
+        shutdown_tracing()
+
+    spans = {s.name: s for s in exporter.get_finished_spans()}
+    server = spans["POST /academy/players"]
+    assert server.attributes["academy.id"] == "academy-1"
+
+    for name in ("mongo.count", "supabase.admin.create_user", "notifications.insert"):
+        child = spans[name]
+        assert child.parent.span_id == server.context.span_id
+        assert child.attributes["academy.id"] == "academy-1"
+        assert child.attributes["http.route"] == "/academy/players"
+
+    mongo = spans["mongo.count"]
+    assert mongo.attributes["db.mongodb.collection"] == "players"
+    assert mongo.attributes["db.statement"] == "count players {'academy_id': '?'}"
+
+
+def test_tracing_is_a_no_op_when_not_configured():
+    shutdown_tracing()
+    with span("anything") as current:
+        assert current is None
+    set_span_attributes(**{"academy.id": "academy-1"})
+    assert not configure_tracing()
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+import os
+import httpx
+sys.path.append(os.path.dirname(os.path.abspath(__file__)).rsplit(os.sep, 1)[0])
+from zoho_mail_api import ZohoMailClient, InMemoryTokenStore
+
+
+def make_client(handler, store=None):
+    return ZohoMailClient(
+        store or InMemoryTokenStore(),
+        client_id="id", client_secret="secret", refresh_token="refresh",
+        accounts_url="https://accounts.test", mail_api_url="https://mail.test/api",
+        transport=httpx.MockTransport(handler)
+    )
+
+
+def test_token_and_account_id_fetched_once():
+    calls = {"token": 0, "accounts": 0, "send": 0}
+
+    def handler(request):
+        if request.url.path == "/oauth/v2/token":
+            calls["token"] += 1
+            return httpx.Response(200, json={"access_token": "tok", "expires_in": 3600})
+        if request.url.path == "/api/accounts":
+            calls["accounts"] += 1
+            return httpx.Response(200, json={"data": [{"accountId": "acc1"}]})
+        calls["send"] += 1
+        assert request.url.path == "/api/accounts/acc1/messages"
+        return httpx.Response(200, json={})
+
+    async def run():
+        client = make_client(handler)
+        messages = [{"to_email": f"p{i}@x.com", "subject": "s", "html_content": "<p>hi</p>"} for i in range(10)]
+        result = await client.send_many(messages, concurrency=4)
+        await client.aclose()
+        return result
+
+    result = asyncio.run(run())
+    assert result["sent"] == 10 and result["failed"] == 0
+    assert calls == {"token": 1, "accounts": 1, "send": 10}
+
+
+def test_send_retries_once_on_401_with_fresh_token():
+    tokens = iter(["old", "new"])
+
+    def handler(request):
+        if request.url.path == "/oauth/v2/token":
+            return httpx.Response(200, json={"access_token": next(tokens), "expires_in": 3600})
+        if request.headers["Authorization"] == "Zoho-oauthtoken old":
+            return httpx.Response(401, json={"message": "expired"})
+        return httpx.Response(200, json={})
+
+    async def run():
+        client = ZohoMailClient(
+            InMemoryTokenStore(), account_id="acc1",
+            client_id="id", client_secret="secret", refresh_token="refresh",
+            accounts_url="https://accounts.test", mail_api_url="https://mail.test/api",
+            transport=httpx.MockTransport(handler)
+        )
+        ok = await client.send_mail("p@x.com", "s", "<p>hi</p>")
+        await client.aclose()
+        return ok
+
+    assert asyncio.run(run()) is True
+
+
+def test_workers_share_token_through_store():
+    calls = {"token": 0}
+
+    def handler(request):
+        if request.url.path == "/oauth/v2/token":
+            calls["token"] += 1
+            return httpx.Response(200, json={"access_token": "tok", "expires_in": 3600})
+        return httpx.Response(200, json={"data": [{"accountId": "acc1"}]})
+
+    async def run():
+        store = InMemoryTokenStore()
+        first, second = make_client(handler, store), make_client(handler, store)
+        tokens = await asyncio.gather(first.get_access_token(), second.get_access_token())
+        await first.aclose()
+        await second.aclose()
+        return tokens
+
+    assert asyncio.run(run()) == ["tok", "tok"]
+    assert calls["token"] == 1
+
+
+def test_waits_out_a_lock_left_by_a_dead_refresher(monkeypatch):
+    monkeypatch.setattr(ZohoMailClient, "REFRESH_LOCK_SECONDS", 1.5)
+    monkeypatch.setattr(ZohoMailClient, "REFRESH_POLL_SECONDS", 0.05)
+
+    def handler(request):
+        return httpx.Response(200, json={"access_token": "tok", "expires_in": 3600})
+
+    async def run():
+        store = InMemoryTokenStore()
+        # Another worker took the lock and died; saving other fields doesn't release it
+        owner = await store.acquire_refresh_lock(ZohoMailClient.TOKEN_KEY, 1.5)
+        await store.save(ZohoMailClient.TOKEN_KEY, {"account_id": "acc1"})
+        await store.release_refresh_lock(ZohoMailClient.TOKEN_KEY, "not-the-owner")
+        assert owner and not await store.acquire_refresh_lock(ZohoMailClient.TOKEN_KEY, 1.5)
+        client = make_client(handler, store)
+        token = await client.get_access_token()
+        await client.aclose()
+        # The refresher released its own lock
+        assert await store.acquire_refresh_lock(ZohoMailClient.TOKEN_KEY, 1.5)
+        return token
+
+    assert asyncio.run(run()) == "tok"
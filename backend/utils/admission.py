@@ -0,0 +1,125 @@
+"""
+Admission control for expensive routes.
+
+Routes that fan out into many Mongo queries (leaderboards, comparisons,
+dashboards) get a cost class: an AdmissionController that caps how many of
+them run at once in this worker, overall and per academy. Requests over
+either cap wait in a per-academy queue; freed slots go round-robin across
+academies, so one tenant refreshing a heavy page can't take every slot (and
+every pooled Mongo connection) from the others. A request that can't be
+admitted within the queue deadline is shed with Overloaded, which the route
+dependency turns into 503 + Retry-After instead of a slow timeout.
+
+Queueing time per cost class and tenant is exported as
+admission_queue_seconds (see utils/metrics.py).
+"""
+import asyncio
+import time
+from collections import OrderedDict, defaultdict, deque
+from typing import Deque, Dict
+
+from utils.metrics import ADMISSION_IN_FLIGHT, observe_admission
+
+
+class Overloaded(Exception):
+    """Raised when a request waited past the queue deadline"""
+
+    def __init__(self, cost_class: str, retry_after: int):
+        super().__init__(f"{cost_class} requests are over capacity")
+        self.cost_class = cost_class
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Concurrency caps with fair queuing for one cost class (per worker).
+
+        async with controller.slot(academy_id):
+            ...   # at most max_concurrent of these run, at most per_tenant per academy
+    """
+
+    def __init__(self, name: str, max_concurrent: int, per_tenant: int, queue_timeout: float,
+                 retry_after: int = 2):
+        self.name = name
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_tenant = max(1, per_tenant)
+        self.queue_timeout = queue_timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self.tenant_active: Dict[str, int] = defaultdict(int)
+        # Tenants with waiters, in round-robin order
+        self.queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+    def _can_run(self, tenant: str) -> bool:
+        return self.active < self.max_concurrent and self.tenant_active.get(tenant, 0) < self.per_tenant
+
+    def _admit(self, tenant: str) -> None:
+        self.active += 1
+        self.tenant_active[tenant] += 1
+        ADMISSION_IN_FLIGHT.labels(self.name).set(self.active)
+
+    def _dispatch(self) -> None:
+        """Hand free slots to queued requests, one tenant at a time in turn"""
+        progressed = True
+        while progressed and self.queues and self.active < self.max_concurrent:
+            progressed = False
+            for tenant in list(self.queues):
+                waiters = self.queues[tenant]
+                while waiters and waiters[0].done():
+                    waiters.popleft()  # timed out or cancelled
+                if not waiters:
+                    del self.queues[tenant]
+                    continue
+                if not self._can_run(tenant):
+                    continue
+                self._admit(tenant)
+                waiters.popleft().set_result(None)
+                # Served: go to the back of the line
+                self.queues.move_to_end(tenant)
+                progressed = True
+                if self.active >= self.max_concurrent:
+                    return
+
+    async def acquire(self, tenant: str) -> None:
+        started = time.perf_counter()
+        waiter = asyncio.get_running_loop().create_future()
+        self.queues.setdefault(tenant, deque()).append(waiter)
+        # Admits at once when there is room and nobody from this tenant is ahead
+        self._dispatch()
+        if waiter.done():
+            observe_admission(self.name, tenant, "admitted", 0.0)
+            return
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            observe_admission(self.name, tenant, "shed", time.perf_counter() - started)
+            raise Overloaded(self.name, self.retry_after)
+        except asyncio.CancelledError:
+            # Client went away; give back a slot granted in the meantime
+            if waiter.done() and not waiter.cancelled():
+                self.release(tenant)
+            raise
+        observe_admission(self.name, tenant, "admitted", time.perf_counter() - started)
+
+    def release(self, tenant: str) -> None:
+        self.active -= 1
+        self.tenant_active[tenant] -= 1
+        if not self.tenant_active[tenant]:
+            del self.tenant_active[tenant]  # keep the map to tenants with work in flight
+        ADMISSION_IN_FLIGHT.labels(self.name).set(self.active)
+        self._dispatch()
+
+    def slot(self, tenant: str):
+        return _Slot(self, tenant)
+
+
+class _Slot:
+    def __init__(self, controller: AdmissionController, tenant: str):
+        self.controller = controller
+        self.tenant = tenant
+
+    async def __aenter__(self):
+        await self.controller.acquire(self.tenant)
+
+    async def __aexit__(self, *exc):
+        self.controller.release(self.tenant)
@@ -0,0 +1,123 @@
+"""
+Pure computations behind the analytics endpoints.
+
+Kept free of database and request state so they can be unit tested and
+benchmarked on synthetic data (see benchmarks/bench_helpers.py).
+"""
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+
+def _category_averages(sums: Dict[str, float], counts: Dict[str, int], categories: List[str]) -> List[Dict[str, Any]]:
+    result = []
+    for cat in categories:
+        avg = (sums.get(cat, 0.0) / counts.get(cat, 1)) if counts.get(cat, 0) > 0 else 0.0
+        result.append({"name": cat, "average": round(avg, 2), "count": counts.get(cat, 0)})
+    return result
+
+
+def _accumulate(ratings: Any, sums: Dict[str, float], counts: Dict[str, int]) -> bool:
+    """Add one record's ratings to the running sums; True if it had any rating"""
+    if not isinstance(ratings, dict):
+        return False
+    rated = any(v is not None for v in ratings.values())
+    for category, value in ratings.items():
+        if value is None:
+            continue
+        try:
+            v = float(value)
+        except (TypeError, ValueError):
+            continue
+        sums[category] = sums.get(category, 0.0) + v
+        counts[category] = counts.get(category, 0) + 1
+    return rated
+
+
+def aggregate_academy_ratings(records: List[Dict[str, Any]], default_categories: List[str]) -> Dict[str, Any]:
+    """Average attendance performance_ratings per category across all records"""
+    sums: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+    rated_count = 0
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        if _accumulate(record.get("performance_ratings") or {}, sums, counts):
+            rated_count += 1
+    return {"categories": _category_averages(sums, counts, default_categories), "rated_count": rated_count}
+
+
+def aggregate_sport_ratings(records: List[Dict[str, Any]],
+                            categories_for: Callable[[str], List[str]]) -> List[Dict[str, Any]]:
+    """
+    Per-sport category averages. Records without a sport count as "Other";
+    categories_for(sport) gives the categories to report for each sport.
+    """
+    per_sport_sums: Dict[str, Dict[str, float]] = {}
+    per_sport_counts: Dict[str, Dict[str, int]] = {}
+    per_sport_record_counts: Dict[str, int] = {}
+    per_sport_rated_counts: Dict[str, int] = {}
+    for record in records:
+        if not isinstance(record, dict):
+            continue
+        sport_val = record.get("sport")
+        sport = sport_val if isinstance(sport_val, str) and sport_val else "Other"
+        if sport not in per_sport_sums:
+            per_sport_sums[sport] = {}
+            per_sport_counts[sport] = {}
+            per_sport_record_counts[sport] = 0
+            per_sport_rated_counts[sport] = 0
+        per_sport_record_counts[sport] += 1
+        if _accumulate(record.get("performance_ratings") or {}, per_sport_sums[sport], per_sport_counts[sport]):
+            per_sport_rated_counts[sport] += 1
+
+    result_sports: List[Dict[str, Any]] = []
+    for sport, sums in per_sport_sums.items():
+        categories = _category_averages(sums, per_sport_counts.get(sport, {}), categories_for(sport))
+        overall_avg = round(sum(c["average"] for c in categories) / len(categories), 2) if categories else 0.0
+        result_sports.append({
+            "sport": sport,
+            "categories": categories,
+            "overall_average": overall_avg,
+            "sample_size": per_sport_record_counts.get(sport, 0),
+            "rated_count": per_sport_rated_counts.get(sport, 0),
+        })
+    result_sports.sort(key=lambda s: s["sport"])
+    return result_sports
+
+
+def linear_trend(values: Sequence[float]) -> Tuple[float, float]:
+    """Least-squares (slope, intercept) of values against x = 0..n-1"""
+    n = len(values)
+    if n == 0:
+        return 0.0, 0.0
+    sum_x = n * (n - 1) / 2
+    sum_x2 = (n - 1) * n * (2 * n - 1) / 6
+    sum_y = sum(values)
+    sum_xy = sum(x * y for x, y in enumerate(values))
+    denom = n * sum_x2 - sum_x * sum_x
+    slope = (n * sum_xy - sum_x * sum_y) / denom if denom != 0 else 0
+    intercept = (sum_y - slope * sum_x) / n
+    return slope, intercept
+
+
+def trend_confidence(values: Sequence[float]) -> float:
+    """0-100 confidence in a trend; lower variance gives higher confidence"""
+    if len(values) <= 1:
+        return 50
+    mean = sum(values) / len(values)
+    variance = sum((y - mean) ** 2 for y in values) / len(values)
+    return max(0, min(100, 100 - (variance * 5)))
+
+
+def slope_of_series(series: Sequence[float]) -> float:
+    """Least-squares slope of series against x = 1..n (0.0 below two points)"""
+    n = len(series)
+    if n < 2:
+        return 0.0
+    sx = n * (n + 1) / 2
+    sx2 = n * (n + 1) * (2 * n + 1) / 6
+    sy = sum(series)
+    sxy = sum((i + 1) * v for i, v in enumerate(series))
+    denom = (n * sx2 - sx * sx)
+    if denom == 0:
+        return 0.0
+    return (n * sxy - sx * sy) / denom
@@ -0,0 +1,221 @@
+"""
+Per-worker change feed: turns writes to watched collections, made by any
+replica, into local invalidation events.
+
+ChangeFeed watches a MongoDB change stream (replica sets and Atlas) and
+calls the handlers subscribed to each collection with a ChangeEvent. The
+resume token is saved in the shared state backend every few seconds, so a
+restarted worker picks up where the feed left off instead of missing
+writes. On a standalone mongod, where change streams don't exist, it polls
+each collection for documents whose updated_at/created_at moved past the
+last one seen (deletes are not seen there; cache TTLs cover them).
+
+DataVersions keeps a counter per (collection, academy) that handlers bump,
+so anything derived from that data (cached analytics, ETags) can tell
+whether it is out of date. Live events (app/events.py) are published from
+the same feed, so clients of any worker see writes made on the others.
+"""
+import asyncio
+import inspect
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+RESUME_TOKEN_KEY = "changefeed:resume"
+
+# Fields every event carries; subscribers can ask for more
+EVENT_FIELDS = ("id", "academy_id", "updated_at", "created_at")
+
+
+@dataclass
+class ChangeEvent:
+    collection: str
+    operation: str  # insert, update, replace, delete (or "poll" from the fallback)
+    document: Optional[Dict[str, Any]]  # the subscribed fields of the document; None for deletes
+
+    @property
+    def academy_id(self) -> Optional[str]:
+        return (self.document or {}).get("academy_id")
+
+
+Handler = Callable[[ChangeEvent], Any]
+
+
+class DataVersions:
+    """Monotonic per-worker counters of changes seen per collection and academy"""
+
+    def __init__(self):
+        self._versions: Dict[Tuple[str, Optional[str]], int] = defaultdict(int)
+
+    def bump(self, collection: str, academy_id: Optional[str] = None) -> None:
+        self._versions[(collection, academy_id)] += 1
+        if academy_id is not None:
+            self._versions[(collection, None)] += 1
+
+    def get(self, collection: str, academy_id: Optional[str] = None) -> int:
+        """Changes seen for the academy, or for the whole collection when academy_id is None"""
+        return self._versions.get((collection, academy_id), 0)
+
+
+data_versions = DataVersions()
+
+
+def _is_unsupported(error: Exception) -> bool:
+    """True when the server (or driver double) can't run change streams, e.g. a standalone mongod"""
+    from pymongo.errors import OperationFailure
+    if isinstance(error, NotImplementedError):
+        return True
+    # 40573: "The $changeStream stage is only supported on replica sets"
+    return isinstance(error, OperationFailure) and (error.code == 40573 or "replica set" in str(error).lower())
+
+
+def _history_lost(error: Exception) -> bool:
+    from pymongo.errors import OperationFailure
+    # 286: ChangeStreamHistoryLost; 280: ChangeStreamFatalError (token no longer valid)
+    return isinstance(error, OperationFailure) and getattr(error, "code", None) in (286, 280)
+
+
+class ChangeFeed:
+    """
+    Background watcher dispatching changes of `collections` to handlers.
+
+        feed = ChangeFeed(db, state=get_state)
+        feed.subscribe("coaches", on_coach_change)
+        feed.start()
+        ...
+        await feed.stop()
+    """
+
+    def __init__(self, db, state: Optional[Callable[[], Any]] = None, poll_seconds: float = 5.0,
+                 token_save_seconds: float = 5.0, retry_seconds: float = 5.0):
+        self.db = db
+        self.state = state
+        self.poll_seconds = poll_seconds
+        self.token_save_seconds = token_save_seconds
+        self.retry_seconds = retry_seconds
+        self.handlers: Dict[str, List[Handler]] = defaultdict(list)
+        self.fields = set(EVENT_FIELDS)
+        self.mode: Optional[str] = None  # "stream" or "poll" once running
+        self._task: Optional[asyncio.Task] = None
+
+    def subscribe(self, collection: str, handler: Handler, fields: Iterable[str] = ()) -> None:
+        """Call `handler` for changes to `collection`, with `fields` of the document besides EVENT_FIELDS"""
+        self.handlers[collection].append(handler)
+        self.fields.update(fields)
+
+    async def dispatch(self, event: ChangeEvent) -> None:
+        for handler in self.handlers.get(event.collection, ()):
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Change feed handler for {event.collection} failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None and self.handlers:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.mode = "stream"
+                await self._watch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if _is_unsupported(e):
+                    logger.info(f"Change streams unavailable ({e}); polling updated_at every {self.poll_seconds}s")
+                    self.mode = "poll"
+                    await self._poll_forever()
+                    return
+                if _history_lost(e):
+                    logger.warning("Stored change stream resume token expired; resuming from now")
+                    await self._save_token(None)
+                else:
+                    logger.warning(f"Change stream interrupted, retrying in {self.retry_seconds}s: {e}")
+                    await asyncio.sleep(self.retry_seconds)
+
+    # ---------------- change streams ----------------
+
+    async def _load_token(self):
+        if self.state is None:
+            return None
+        try:
+            doc = await self.state().get(RESUME_TOKEN_KEY)
+        except Exception as e:
+            logger.warning(f"Could not load change stream resume token: {e}")
+            return None
+        return doc.get("token") if doc else None
+
+    async def _save_token(self, token) -> None:
+        if self.state is None:
+            return
+        try:
+            if token is None:
+                await self.state().delete(RESUME_TOKEN_KEY)
+            else:
+                await self.state().set(RESUME_TOKEN_KEY, {"token": token})
+        except Exception as e:
+            logger.warning(f"Could not save change stream resume token: {e}")
+
+    async def _watch(self) -> None:
+        pipeline = [
+            {"$match": {"ns.coll": {"$in": list(self.handlers)},
+                        "operationType": {"$in": ["insert", "update", "replace", "delete"]}}},
+            {"$project": {"ns": 1, "operationType": 1, "documentKey": 1,
+                          **{f"fullDocument.{field}": 1 for field in sorted(self.fields)}}},
+        ]
+        loop = asyncio.get_running_loop()
+        last_saved = loop.time()
+        token = await self._load_token()
+        async with self.db.watch(pipeline, full_document="updateLookup", resume_after=token) as stream:
+            logger.info(f"Watching {', '.join(self.handlers)} for cache invalidation")
+            async for change in stream:
+                document = change.get("fullDocument")
+                operation = change["operationType"]
+                await self.dispatch(ChangeEvent(change["ns"]["coll"], operation,
+                                                None if operation == "delete" else (document or {})))
+                if loop.time() - last_saved >= self.token_save_seconds:
+                    await self._save_token(stream.resume_token)
+                    last_saved = loop.time()
+
+    # ---------------- polling fallback ----------------
+
+    async def _poll_forever(self) -> None:
+        # Start slightly in the past to absorb clock skew between app and database hosts
+        since = {collection: datetime.utcnow() - timedelta(seconds=self.poll_seconds) for collection in self.handlers}
+        while True:
+            await asyncio.sleep(self.poll_seconds)
+            for collection in list(self.handlers):
+                try:
+                    since[collection] = await self.poll_once(collection, since[collection])
+                except Exception as e:
+                    logger.warning(f"Polling {collection} for changes failed: {e}")
+
+    async def poll_once(self, collection: str, since: datetime) -> datetime:
+        """Dispatch documents changed after `since`; returns the newest change time seen"""
+        query = {"$or": [{"updated_at": {"$gt": since}}, {"created_at": {"$gt": since}}]}
+        projection = {"_id": 0, **{field: 1 for field in self.fields}}
+        newest = since
+        async for document in self.db[collection].find(query, projection):
+            await self.dispatch(ChangeEvent(collection, "poll", document))
+            for field in ("updated_at", "created_at"):
+                value = document.get(field)
+                if isinstance(value, datetime) and value > newest:
+                    newest = value
+        return newest
+
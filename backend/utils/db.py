@@ -0,0 +1,83 @@
+import os
+import importlib.util
+from motor.motor_asyncio import AsyncIOMotorClient
+
+# Wire compressors and the module each one needs (zlib ships with Python)
+_COMPRESSOR_MODULES = {"zstd": "zstandard", "snappy": "snappy", "zlib": "zlib"}
+
+
+def get_mongo_url():
+    """Mongo connection string shared by the API, scheduler and scripts."""
+    return os.environ.get('MONGO_URL') or os.environ.get('MONGODB_URI') or "mongodb://localhost:27017"
+
+
+def get_db_name():
+    """Database name shared by the API, scheduler and scripts."""
+    return os.environ.get('DB_NAME', 'attendance_tracker')
+
+
+def get_compressors():
+    """
+    Wire compressors to offer the server, in preference order, from
+    MONGO_COMPRESSORS (default "zstd,snappy,zlib"; empty disables). Ones whose
+    Python module isn't installed are skipped instead of making PyMongo warn.
+    """
+    requested = os.environ.get("MONGO_COMPRESSORS", "zstd,snappy,zlib")
+    available = []
+    for name in (c.strip() for c in requested.split(",")):
+        module = _COMPRESSOR_MODULES.get(name)
+        if module and importlib.util.find_spec(module) is not None:
+            available.append(name)
+    return ",".join(available)
+
+
+def create_mongo_client(mongo_url=None, **overrides):
+    """
+    Create an AsyncIOMotorClient with the API's pool and timeout settings.
+
+    Args:
+        mongo_url: Defaults to get_mongo_url()
+        overrides: Extra keyword arguments passed to AsyncIOMotorClient
+    """
+    mongo_url = mongo_url or get_mongo_url()
+    options = dict(
+        maxPoolSize=int(os.getenv("MONGO_MAX_POOL", "10")),
+        minPoolSize=0,
+        serverSelectionTimeoutMS=5000,
+        connectTimeoutMS=5000,
+        retryWrites=True,
+        tls=True if mongo_url.startswith("mongodb+srv://") else False,
+    )
+    compressors = get_compressors()
+    if compressors:
+        options["compressors"] = compressors
+    options.update(overrides)
+    return AsyncIOMotorClient(mongo_url, **options)
+
+
+def analytics_pool_enabled():
+    """False when ANALYTICS_MONGO_MAX_POOL is 0: analytics then share the main client."""
+    return int(os.getenv("ANALYTICS_MONGO_MAX_POOL", "5")) > 0
+
+
+def create_analytics_client(mongo_url=None, **overrides):
+    """
+    Create the client for analytics, leaderboard and report reads.
+
+    It has its own pool (ANALYTICS_MONGO_MAX_POOL, default 5) so long scans
+    can't take the connections writes need, reads from secondaries when there
+    are any (ANALYTICS_READ_PREFERENCE, default secondaryPreferred), and gives
+    every operation a time budget (ANALYTICS_MAX_TIME_MS, default 15000) that
+    PyMongo sends to the server as maxTimeMS.
+
+    Args:
+        mongo_url: Defaults to ANALYTICS_MONGO_URL, then get_mongo_url()
+        overrides: Extra keyword arguments passed to AsyncIOMotorClient
+    """
+    options = dict(
+        maxPoolSize=int(os.getenv("ANALYTICS_MONGO_MAX_POOL", "5")),
+        readPreference=os.getenv("ANALYTICS_READ_PREFERENCE", "secondaryPreferred"),
+        timeoutMS=int(os.getenv("ANALYTICS_MAX_TIME_MS", "15000")),
+    )
+    options.update(overrides)
+    return create_mongo_client(mongo_url or os.environ.get("ANALYTICS_MONGO_URL"), **options)
@@ -0,0 +1,152 @@
+"""
+In-process pub/sub for live events (notifications, announcements,
+attendance) pushed to browsers over server-sent events.
+
+Events are published with a set of topics ("coach:<id>",
+"academy:<id>:player", ...) and reach every subscriber holding one of
+them. Each worker numbers its events "<epoch>-<seq>" and keeps the last
+`buffer_size` of them, so a client reconnecting with Last-Event-ID gets
+what it missed. When that isn't possible (the id comes from another
+worker or a restarted one, or fell out of the buffer) the subscriber is
+told to reset, i.e. refetch over the REST endpoints.
+
+The same write can reach a worker twice: directly from the route that
+made it and again from the change feed. Publishing with a `key`
+(document id and version) drops the second copy.
+"""
+import asyncio
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from typing import Any, Deque, Dict, FrozenSet, Iterable, List, Optional, Set
+
+from utils.admission import Overloaded
+from utils.metrics import EVENT_STREAM_CONNECTIONS, EVENTS_PUBLISHED
+from utils.serialization import dumps
+
+
+@dataclass(frozen=True)
+class Event:
+    id: str
+    type: str
+    data: Dict[str, Any]
+    topics: FrozenSet[str]
+    seq: int
+
+
+# Tells the client events were lost: refetch over REST, then keep listening
+RESET_FRAME = b"event: reset\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": ping\n\n"
+
+
+def format_sse(event: Event) -> bytes:
+    """One server-sent events frame"""
+    return f"id: {event.id}\nevent: {event.type}\ndata: {dumps(event.data).decode()}\n\n".encode()
+
+
+class Subscription:
+    def __init__(self, bus: "EventBus", topics: Iterable[str], queue_size: int):
+        self.bus = bus
+        self.topics: Set[str] = set(topics)
+        self.queue: "asyncio.Queue[Event]" = asyncio.Queue(maxsize=queue_size)
+        # Set when events were lost (unknown resume point, or the client fell behind)
+        self.reset = False
+
+    def offer(self, event: Event) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # A stalled client must not hold memory or slow publishers down
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.reset = True
+
+    async def next(self, timeout: float) -> Optional[Event]:
+        """The next event, or None after `timeout` seconds without one"""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.bus.unsubscribe(self)
+
+
+class EventBus:
+    """
+    Topic-filtered broadcast to this worker's open connections.
+
+        sub = bus.subscribe({"coach:c1"}, last_event_id=request.headers.get("last-event-id"))
+        ...
+        bus.publish("notification", {...}, {"coach:c1"}, key="notifications:n1")
+    """
+
+    def __init__(self, name: str, max_connections: int = 500, buffer_size: int = 1000, queue_size: int = 256,
+                 dedupe_size: int = 10_000, retry_after: int = 5):
+        self.name = name
+        self.max_connections = max_connections
+        self.queue_size = queue_size
+        self.dedupe_size = dedupe_size
+        self.retry_after = retry_after
+        self.epoch = uuid.uuid4().hex[:12]
+        self._seq = 0
+        self._buffer: Deque[Event] = deque(maxlen=buffer_size)
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._subscribers: Set[Subscription] = set()
+        self._connections = EVENT_STREAM_CONNECTIONS.labels(name)
+
+    @property
+    def connections(self) -> int:
+        return len(self._subscribers)
+
+    def publish(self, type: str, data: Dict[str, Any], topics: Iterable[str],
+                key: Optional[str] = None) -> Optional[Event]:
+        """Deliver to matching subscribers; returns None for a duplicate `key`"""
+        if key is not None:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                return None
+            self._seen[key] = None
+            if len(self._seen) > self.dedupe_size:
+                self._seen.popitem(last=False)
+        self._seq += 1
+        event = Event(f"{self.epoch}-{self._seq}", type, data, frozenset(topics), self._seq)
+        self._buffer.append(event)
+        EVENTS_PUBLISHED.labels(self.name, type).inc()
+        for subscriber in self._subscribers:
+            if not subscriber.topics.isdisjoint(event.topics):
+                subscriber.offer(event)
+        return event
+
+    def _missed(self, last_event_id: str, topics: Set[str]) -> Optional[List[Event]]:
+        """Buffered events after `last_event_id`, or None if they can't all be replayed"""
+        epoch, _, seq = last_event_id.rpartition("-")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if seq > self._seq:
+            return None
+        oldest = self._buffer[0].seq if self._buffer else self._seq + 1
+        if seq < oldest - 1:
+            return None
+        return [event for event in self._buffer if event.seq > seq and not topics.isdisjoint(event.topics)]
+
+    def subscribe(self, topics: Iterable[str], last_event_id: Optional[str] = None) -> Subscription:
+        """Open a subscription, raising Overloaded when the worker is at max_connections"""
+        if len(self._subscribers) >= self.max_connections:
+            raise Overloaded(f"{self.name} stream", self.retry_after)
+        subscription = Subscription(self, topics, self.queue_size)
+        if last_event_id:
+            missed = self._missed(last_event_id, subscription.topics)
+            if missed is None:
+                subscription.reset = True
+            else:
+                for event in missed:
+                    subscription.offer(event)
+        self._subscribers.add(subscription)
+        self._connections.set(len(self._subscribers))
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+        self._connections.set(len(self._subscribers))
@@ -0,0 +1,80 @@
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException, Query
+
+
+def parse_fields(fields: Optional[str], allowed: Sequence[str], always: Sequence[str] = ("id",)) -> Optional[List[str]]:
+    """
+    Parse a `fields=a,b,c` value against an endpoint's whitelist.
+
+    Returns None when no selection was made (full documents). Fields in
+    `always` are included in every selection so clients can still key rows.
+
+    Raises:
+        HTTPException: 400 for fields outside the whitelist
+    """
+    if fields is None or not fields.strip():
+        return None
+
+    requested = [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = [name for name in requested if name not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown field(s): {', '.join(unknown)}. Allowed: {', '.join(allowed)}"
+        )
+
+    selected = [name for name in always if name in allowed]
+    for name in requested:
+        if name not in selected:
+            selected.append(name)
+    return selected
+
+
+class FieldSelection:
+    """Result of a `fields=` parameter: Mongo projection plus response trimming"""
+
+    def __init__(self, fields: Optional[List[str]]):
+        self.fields = fields
+
+    @property
+    def selected(self) -> bool:
+        return self.fields is not None
+
+    def projection(self, default: Optional[Dict[str, Any]] = None, extra: Iterable[str] = ()) -> Optional[Dict[str, Any]]:
+        """
+        Projection for the selected fields, or `default` when nothing was selected.
+        `extra` adds fields the endpoint needs internally (sort keys, joins);
+        they are removed again by trim().
+        """
+        if not self.selected:
+            return default
+        projection = {name: 1 for name in self.fields}
+        for name in extra:
+            projection[name] = 1
+        projection["_id"] = 0
+        return projection
+
+    def trim(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.selected:
+            return row
+        return {name: row[name] for name in self.fields if name in row}
+
+    def trim_rows(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if not self.selected:
+            return list(rows)
+        return [self.trim(row) for row in rows]
+
+
+def sparse_fields(allowed: Iterable[str], always: Sequence[str] = ("id",)):
+    """
+    Build a FastAPI dependency for a `fields=` query parameter limited to
+    `allowed` (the endpoint's whitelist, usually its response model fields).
+    """
+    allowed = list(allowed)
+    description = f"Comma-separated subset of: {', '.join(allowed)}"
+
+    def dependency(fields: Optional[str] = Query(None, description=description)) -> FieldSelection:
+        return FieldSelection(parse_fields(fields, allowed, always))
+
+    return dependency
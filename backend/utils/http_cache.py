@@ -0,0 +1,170 @@
+"""
+Conditional GET and compression for the API.
+
+ETagMiddleware hashes complete (non-streaming) GET bodies and answers a
+matching If-None-Match with 304, so repeat loads only cost headers.
+StaticPayload pre-serializes constant responses once, with their ETag.
+"""
+import hashlib
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.middleware.gzip import GZipMiddleware
+
+from utils.metrics import record_cache
+from utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Bodies smaller than this are sent uncompressed
+DEFAULT_COMPRESSION_MINIMUM_SIZE = 1000
+
+# Constant payloads only change on deploy; clients revalidate after this
+STATIC_CACHE_CONTROL = "public, max-age=300"
+
+
+def compute_etag(body: bytes) -> str:
+    """
+    Weak ETag for a response body. Weak because compression may re-encode the
+    bytes on the way out; the representation is still the same.
+    """
+    return f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against `etag`"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def _not_modified_headers(raw_headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    # A 304 keeps the validators and caching headers but has no body
+    dropped = {b"content-length", b"content-type", b"content-encoding"}
+    return [(key, value) for key, value in raw_headers if key.lower() not in dropped]
+
+
+class ETagMiddleware:
+    """
+    ASGI middleware adding ETags to successful GET responses.
+
+    Only responses sent in one body message are hashed; streaming responses
+    pass through untouched so memory stays bounded. Responses that already
+    carry an ETag (e.g. StaticPayload) keep it but still get the 304 check.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if_none_match = Headers(scope=scope).get("if-none-match")
+        start_message: Optional[Dict[str, Any]] = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                if message["status"] != 200 or "cache-control" in headers and "no-store" in headers["cache-control"]:
+                    passthrough = True
+                    await send(message)
+                    return
+                # Hold the headers until the body shows whether it is complete
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            if message.get("more_body", False):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            etag = headers.get("etag")
+            if etag is None:
+                etag = compute_etag(body)
+                headers["ETag"] = etag
+
+            if if_none_match:
+                record_cache("http_etag", etag_matches(if_none_match, etag))
+            if etag_matches(if_none_match, etag):
+                await send({
+                    "type": "http.response.start",
+                    "status": 304,
+                    "headers": _not_modified_headers(start_message["headers"]),
+                })
+                await send({"type": "http.response.body", "body": b""})
+                return
+
+            await send(start_message)
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+
+class StaticPayload:
+    """
+    A constant JSON body serialized once, with its ETag computed up front.
+    Routes return payload.response(request) instead of rebuilding the data.
+    """
+
+    def __init__(self, content: Any, cache_control: str = STATIC_CACHE_CONTROL):
+        self.body = dumps(content)
+        self.etag = compute_etag(self.body)
+        self.cache_control = cache_control
+
+    def response(self, request: Request) -> Response:
+        headers = {"ETag": self.etag, "Cache-Control": self.cache_control}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match:
+            record_cache("http_etag", etag_matches(if_none_match, self.etag))
+        if etag_matches(if_none_match, self.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=self.body, media_type="application/json", headers=headers)
+
+
+def get_compression_minimum_size() -> int:
+    return int(os.environ.get("COMPRESSION_MINIMUM_SIZE", DEFAULT_COMPRESSION_MINIMUM_SIZE))
+
+
+def add_compression_middleware(app, minimum_size: Optional[int] = None) -> str:
+    """
+    Install Brotli (with gzip fallback) when brotli-asgi is available, plain
+    gzip otherwise. Returns the name of the encoder that was installed.
+    """
+    if minimum_size is None:
+        minimum_size = get_compression_minimum_size()
+    try:
+        from brotli_asgi import BrotliMiddleware
+    except ImportError:
+        app.add_middleware(GZipMiddleware, minimum_size=minimum_size)
+        logger.info("brotli-asgi not installed, using gzip compression")
+        return "gzip"
+    app.add_middleware(BrotliMiddleware, minimum_size=minimum_size, gzip_fallback=True)
+    return "br"
@@ -0,0 +1,52 @@
+import logging
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import ConnectionFailure
+
+logger = logging.getLogger(__name__)
+
+# (collection, keys[, options]) tuples. Keyset-paginated lists need an index on
+# (filter fields..., sort field, id) so each page is a bounded range scan.
+INDEXES = [
+    ("players", [("academy_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("players", [("coach_id", ASCENDING), ("academy_id", ASCENDING), ("status", ASCENDING),
+                 ("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("coaches", [("academy_id", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("academies", [("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("academy_subscriptions", [("created_at", ASCENDING), ("id", ASCENDING)]),
+    ("payment_transactions", [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("demo_requests", [("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("announcements", [("academy_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+    ("notifications", [("recipient_type", ASCENDING), ("recipient_id", ASCENDING), ("created_at", DESCENDING),
+                       ("id", DESCENDING)]),
+    # Notifications carry their own expiry (utils/notifications.py)
+    ("notifications", [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+    ("player_attendance", [("academy_id", ASCENDING), ("date", ASCENDING), ("id", ASCENDING)]),
+    ("training_plans", [("academy_id", ASCENDING), ("created_at", DESCENDING), ("id", DESCENDING)]),
+    # Change feed polling fallback (utils/change_feed.py) on standalone mongod
+    ("players", [("updated_at", ASCENDING)]),
+    ("players", [("created_at", ASCENDING)]),
+    ("player_attendance", [("updated_at", ASCENDING)]),
+    ("player_attendance", [("created_at", ASCENDING)]),
+    ("notifications", [("created_at", ASCENDING)]),
+    # Scheduler run history (cleanup job deletes by age)
+    ("job_runs", [("job", ASCENDING), ("started_at", DESCENDING)]),
+    ("job_runs", [("started_at", ASCENDING)]),
+    # Shared state (utils/state.py): Mongo drops entries once expires_at passes
+    ("app_state", [("expires_at", ASCENDING)], {"expireAfterSeconds": 0}),
+]
+
+
+async def ensure_indexes(db):
+    """
+    Create the indexes the API relies on. Safe to call on every startup:
+    create_index is a no-op when the index already exists.
+    """
+    for collection_name, keys, *options in INDEXES:
+        try:
+            await db[collection_name].create_index(keys, background=True, **(options[0] if options else {}))
+        except ConnectionFailure as e:
+            # Don't retry every index against an unreachable server
+            logger.warning(f"Skipping index creation, MongoDB unreachable: {e}")
+            return
+        except Exception as e:
+            logger.warning(f"Could not create index {keys} on {collection_name}: {e}")
@@ -0,0 +1,351 @@
+"""
+Prometheus metrics for the API, exposed by GET /metrics.
+
+Covers HTTP latency/status per route template, in-flight requests,
+event-loop lag, the Mongo connection pool, per-route DB query totals,
+outbound Supabase/Zoho calls, cache hit/miss counts, request coalescing,
+admission queueing for expensive routes and background job durations.
+Everything lives in the default prometheus_client registry.
+"""
+import asyncio
+import logging
+import re
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import CounterMetricFamily, HistogramMetricFamily, REGISTRY
+from pymongo import monitoring
+
+from utils.query_monitor import route_query_totals
+from utils.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from cached reads to slow reports
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HTTP_IN_PROGRESS = Gauge("http_requests_in_progress", "HTTP requests currently being served")
+
+EVENT_LOOP_LAG = Gauge("event_loop_lag_seconds", "Delay of the last event-loop lag probe past its scheduled time")
+EVENT_LOOP_LAG_MAX = Gauge("event_loop_lag_max_seconds", "Largest event-loop lag seen since startup")
+
+# `pool` tells the main (OLTP) client from the analytics one
+MONGO_POOL_CONNECTIONS = Gauge("mongo_pool_connections", "Open connections in the Mongo pool", ["pool", "address"])
+MONGO_POOL_IN_USE = Gauge("mongo_pool_connections_in_use", "Mongo connections checked out", ["pool", "address"])
+MONGO_POOL_CHECKOUT_FAILURES = Counter(
+    "mongo_pool_checkout_failures_total", "Failed Mongo connection checkouts", ["pool", "reason"]
+)
+MONGO_POOL_CLEARED = Counter("mongo_pool_cleared_total", "Times a Mongo pool was cleared", ["pool", "address"])
+
+OUTBOUND_DURATION = Histogram(
+    "outbound_request_duration_seconds", "Latency of calls to external services",
+    ["service", "operation", "outcome"], buckets=LATENCY_BUCKETS
+)
+
+CACHE_REQUESTS = Counter("cache_requests_total", "Cache lookups by cache and result (hit/miss)", ["cache", "result"])
+
+# follower = a duplicate request that awaited an in-flight computation (one saved)
+SINGLE_FLIGHT_REQUESTS = Counter(
+    "single_flight_requests_total", "Coalesced reads by group and role (leader/follower)", ["group", "role"]
+)
+
+ADMISSION_QUEUE_SECONDS = Histogram(
+    "admission_queue_seconds", "Time expensive requests waited for a slot, by cost class, academy and outcome",
+    ["cost_class", "tenant", "outcome"], buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+ADMISSION_IN_FLIGHT = Gauge("admission_in_flight", "Requests holding a slot, by cost class", ["cost_class"])
+
+EVENT_STREAM_CONNECTIONS = Gauge("event_stream_connections", "Open live event connections, by stream", ["stream"])
+EVENTS_PUBLISHED = Counter(
+    "events_published_total", "Live events published, by stream and type (duplicates not counted)", ["stream", "type"]
+)
+
+JOB_DURATION = Histogram(
+    "job_duration_seconds", "Background job run time", ["job", "status"],
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 60.0, 300.0, 900.0)
+)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """Current metrics in the Prometheus text format, with its content type"""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# ---------------- HTTP ----------------
+
+class _Durations:
+    """Bucket counts and sum of one label set"""
+
+    __slots__ = ("buckets", "sum")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self.sum += seconds
+
+
+class RequestDurationCollector:
+    """
+    http_request_duration_seconds, exported as a Prometheus histogram.
+
+    Counts are plain per-bucket ints: they are only written from the event
+    loop, so they need none of the locking Histogram.observe does per bucket
+    (most of the middleware's cost). Buckets are made cumulative at scrape
+    time. Status is a label rather than a separate counter: the _count series
+    already gives responses per route and status code.
+
+    Series are nested route -> method -> status, so a lookup needs no key
+    tuple built and hashed per request. In-flight requests are the ones
+    started but not yet observed, so the middleware counts each request once
+    rather than incrementing and decrementing a gauge.
+    """
+
+    def __init__(self):
+        self._children: Dict[str, Dict[str, Dict[int, _Durations]]] = {}
+        self.started = 0
+
+    def labels(self, method: str, route: str, status: int) -> _Durations:
+        by_status = self._children.setdefault(route, {}).setdefault(method, {})
+        child = by_status.get(status)
+        if child is None:
+            child = by_status[status] = _Durations()
+        return child
+
+    def in_flight(self) -> int:
+        observed = sum(
+            sum(child.buckets)
+            for by_method in list(self._children.values())
+            for by_status in list(by_method.values())
+            for child in list(by_status.values())
+        )
+        return self.started - observed
+
+    def collect(self):
+        family = HistogramMetricFamily(
+            "http_request_duration_seconds", "HTTP request latency by route template and status",
+            labels=["method", "route", "status"]
+        )
+        series = [
+            (method, route, status, child)
+            for route, by_method in list(self._children.items())
+            for method, by_status in list(by_method.items())
+            for status, child in list(by_status.items())
+        ]
+        for method, route, status, child in series:
+            total, buckets = 0, []
+            for bound, count in zip((*LATENCY_BUCKETS, float("inf")), list(child.buckets)):
+                total += count
+                buckets.append(("+Inf" if bound == float("inf") else str(bound), total))
+            family.add_metric([method, route, str(status)], buckets, child.sum)
+        yield family
+
+
+HTTP_REQUEST_DURATION = RequestDurationCollector()
+REGISTRY.register(HTTP_REQUEST_DURATION)
+HTTP_IN_PROGRESS.set_function(HTTP_REQUEST_DURATION.in_flight)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency, status and in-flight count per route.
+
+    Routes are labelled by their template ("/api/players/{player_id}"), never
+    the raw path, so label cardinality stays bounded; unmatched paths share
+    one label.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._durations = HTTP_REQUEST_DURATION
+        self._children = HTTP_REQUEST_DURATION._children
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 0 until the response starts, so later messages skip the type check
+        status = 0
+
+        # A plain function handing back send()'s awaitable saves a coroutine per message
+        def send_wrapper(message):
+            nonlocal status
+            if not status and message["type"] == "http.response.start":
+                status = message["status"]
+            return send(message)
+
+        # Only touched from the event loop, so a plain int is enough (see RequestDurationCollector)
+        self._durations.started += 1
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            seconds = perf_counter() - started
+            # Set (to a FastAPI APIRoute) only once a route matched
+            route = scope.get("route")
+            route = route.path if route is not None else "unmatched"
+            # RequestDurationCollector.labels() and _Durations.observe() inlined: this runs on every request
+            try:
+                child = self._children[route][scope["method"]][status or 500]
+            except KeyError:
+                child = self._durations.labels(scope["method"], route, status or 500)
+            child.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            child.sum += seconds
+
+
+# ---------------- event loop ----------------
+
+class EventLoopLagMonitor:
+    """Background task measuring how late a periodic sleep wakes up"""
+
+    def __init__(self, interval: float = 0.5):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _probe(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            EVENT_LOOP_LAG.set(lag)
+            if lag > self.max_lag:
+                self.max_lag = lag
+                EVENT_LOOP_LAG_MAX.set(lag)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._probe())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# ---------------- Mongo ----------------
+
+class MongoPoolMetricsListener(monitoring.ConnectionPoolListener):
+    """PyMongo pool listener keeping connection gauges per client and server address"""
+
+    def __init__(self, pool: str = "main"):
+        self.pool = pool
+
+    def _labels(self, event) -> Tuple[str, str]:
+        host, port = event.address
+        return self.pool, f"{host}:{port}"
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        MONGO_POOL_CLEARED.labels(*self._labels(event)).inc()
+
+    def pool_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels(*self._labels(event)).set(0)
+        MONGO_POOL_IN_USE.labels(*self._labels(event)).set(0)
+
+    def connection_created(self, event):
+        MONGO_POOL_CONNECTIONS.labels(*self._labels(event)).inc()
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        MONGO_POOL_CONNECTIONS.labels(*self._labels(event)).dec()
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        MONGO_POOL_CHECKOUT_FAILURES.labels(self.pool, str(event.reason)).inc()
+
+    def connection_checked_out(self, event):
+        MONGO_POOL_IN_USE.labels(*self._labels(event)).inc()
+
+    def connection_checked_in(self, event):
+        MONGO_POOL_IN_USE.labels(*self._labels(event)).dec()
+
+
+class RouteQueryCollector:
+    """Exports the per-route totals kept by utils.query_monitor"""
+
+    def collect(self):
+        queries = CounterMetricFamily("db_queries", "Mongo commands issued per route", labels=["route"])
+        db_time = CounterMetricFamily("db_time_seconds", "Time spent in Mongo commands per route", labels=["route"])
+        for route, totals in route_query_totals.snapshot().items():
+            queries.add_metric([route], totals["queries"])
+            db_time.add_metric([route], totals["db_ms"] / 1000)
+        yield queries
+        yield db_time
+
+
+REGISTRY.register(RouteQueryCollector())
+
+
+# ---------------- outbound calls, caches, jobs ----------------
+
+@contextmanager
+def observe_outbound(service: str, operation: str):
+    """
+    Time a call to an external service and trace it as a client span:
+    `with observe_outbound("supabase", "get_user"): ...`
+    """
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        with span(f"{service}.{operation}", client=True, **{"peer.service": service}):
+            yield
+        outcome = "success"
+    finally:
+        OUTBOUND_DURATION.labels(service, operation, outcome).observe(time.perf_counter() - started)
+
+
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def httpx_metrics_hooks(service: str) -> Dict[str, list]:
+    """
+    event_hooks for an httpx.AsyncClient recording OUTBOUND_DURATION per
+    request; numeric path segments are collapsed so labels stay bounded.
+    """
+
+    async def on_request(request):
+        request.extensions["metrics_started"] = time.perf_counter()
+
+    async def on_response(response):
+        started = response.request.extensions.get("metrics_started")
+        if started is None:
+            return
+        operation = f"{response.request.method} {_ID_SEGMENT.sub('/{id}', response.request.url.path)}"
+        outcome = "success" if response.status_code < 400 else "error"
+        OUTBOUND_DURATION.labels(service, operation, outcome).observe(time.perf_counter() - started)
+
+    return {"request": [on_request], "response": [on_response]}
+
+
+def record_cache(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+def observe_admission(cost_class: str, tenant: str, outcome: str, seconds: float):
+    ADMISSION_QUEUE_SECONDS.labels(cost_class, tenant, outcome).observe(seconds)
+
+
+def observe_job(job: str, status: str, seconds: float):
+    JOB_DURATION.labels(job, status).observe(seconds)
@@ -0,0 +1,210 @@
+"""
+In-app notifications: one document shape for every recipient, unread
+counters and expiry.
+
+Stored documents (app.models.Notification):
+
+    id, academy_id,
+    recipient_type   "coach", "player" or "academy" (the academy's admins)
+    recipient_id     the coach, player or academy id
+    type, title, message,
+    data             ids of related documents (plan_id, achievement_id, ...)
+    is_read, created_at,
+    expires_at       a TTL index deletes the notification then
+
+Unread counts are kept per recipient in `notification_counters`
+({_id: "<recipient_type>:<recipient_id>", unread}) and updated with $inc on
+every create and read, so the badge is one primary-key lookup instead of a
+count over the recipient's notifications. Expiry and crashes between the
+two writes can make a counter drift; reconcile_counters() recounts them
+(run daily by the cleanup job).
+"""
+import logging
+import os
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from utils.pagination import fetch_page
+
+logger = logging.getLogger(__name__)
+
+RETENTION_DAYS = int(os.environ.get("NOTIFICATION_RETENTION_DAYS", "90"))
+
+RECIPIENT_TYPES = ("coach", "player", "academy")
+
+# Legacy fields folded into `data` by migrate_legacy()
+LEGACY_REFERENCES = ("plan_id", "achievement_id", "certificate_id")
+MIGRATION_BATCH = 1000
+
+
+def recipient_key(recipient_type: str, recipient_id: str) -> str:
+    return f"{recipient_type}:{recipient_id}"
+
+
+class NotificationStore:
+    """
+    Notifications of one database.
+
+        store = NotificationStore(db)
+        await store.notify("a1", "coach", coach_id, "A new player has been assigned to you.", type="player_assigned")
+        rows, next_cursor = await store.page("coach", coach_id, limit=20)
+        unread = await store.unread_count("coach", coach_id)
+
+    `publish` is called with each new notification once it is stored (live
+    events).
+    """
+
+    def __init__(self, db, publish: Optional[Callable[[Dict[str, Any]], None]] = None,
+                 retention_days: int = RETENTION_DAYS):
+        self.db = db
+        self.publish = publish
+        self.retention_days = retention_days
+
+    def build(self, academy_id: str, recipient_type: str, recipient_id: str, message: str, *,
+              type: str = "general", title: Optional[str] = None, data: Optional[Dict[str, Any]] = None,
+              now: Optional[datetime] = None) -> Dict[str, Any]:
+        if recipient_type not in RECIPIENT_TYPES:
+            raise ValueError(f"Unknown notification recipient type {recipient_type!r}")
+        now = now or datetime.utcnow()
+        return {
+            "id": str(uuid.uuid4()),
+            "academy_id": academy_id,
+            "recipient_type": recipient_type,
+            "recipient_id": recipient_id,
+            "type": type,
+            "title": title,
+            "message": message,
+            "data": data or {},
+            "is_read": False,
+            "created_at": now,
+            "expires_at": now + timedelta(days=self.retention_days),
+        }
+
+    async def notify(self, academy_id: str, recipient_type: str, recipient_id: str, message: str,
+                     **kwargs) -> Dict[str, Any]:
+        """Create one notification (keyword arguments as for build())"""
+        notification = self.build(academy_id, recipient_type, recipient_id, message, **kwargs)
+        await self.notify_many([notification])
+        return notification
+
+    async def notify_many(self, notifications: List[Dict[str, Any]]) -> None:
+        """Store notifications made with build(): one insert and one counter write for the whole batch"""
+        if not notifications:
+            return
+        await self.db.notifications.insert_many(notifications, ordered=False)
+        unread = Counter(recipient_key(n["recipient_type"], n["recipient_id"]) for n in notifications)
+        await self._add_unread(unread.items())
+        if self.publish is not None:
+            for notification in notifications:
+                self.publish(notification)
+
+    async def _add_unread(self, changes: Iterable[Tuple[str, int]]) -> None:
+        updates = [UpdateOne({"_id": key}, {"$inc": {"unread": delta}}, upsert=True) for key, delta in changes if delta]
+        if updates:
+            await self.db.notification_counters.bulk_write(updates, ordered=False)
+
+    @staticmethod
+    def _recipient(recipient_type: str, recipient_id: str) -> Dict[str, Any]:
+        return {"recipient_type": recipient_type, "recipient_id": recipient_id}
+
+    async def page(self, recipient_type: str, recipient_id: str, *, types: Optional[Iterable[str]] = None,
+                   limit: Optional[int] = 50, position=None,
+                   projection: Optional[Dict[str, Any]] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """Newest first, keyset-paginated (see utils/pagination.py)"""
+        query = self._recipient(recipient_type, recipient_id)
+        if types is not None:
+            query["type"] = {"$in": list(types)}
+        return await fetch_page(self.db.notifications, query, sort_field="created_at", direction=-1,
+                                limit=limit, position=position, projection=projection)
+
+    async def unread_count(self, recipient_type: str, recipient_id: str) -> int:
+        counter = await self.db.notification_counters.find_one({"_id": recipient_key(recipient_type, recipient_id)})
+        return max(0, counter["unread"]) if counter else 0
+
+    async def mark_read(self, recipient_type: str, recipient_id: str, notification_id: str) -> bool:
+        """False when the recipient has no such notification"""
+        result = await self.db.notifications.update_one(
+            {"id": notification_id, **self._recipient(recipient_type, recipient_id)},
+            {"$set": {"is_read": True}}
+        )
+        if result.modified_count:
+            await self._add_unread([(recipient_key(recipient_type, recipient_id), -1)])
+        return result.matched_count > 0
+
+    async def mark_all_read(self, recipient_type: str, recipient_id: str) -> int:
+        result = await self.db.notifications.update_many(
+            {**self._recipient(recipient_type, recipient_id), "is_read": False},
+            {"$set": {"is_read": True}}
+        )
+        await self._add_unread([(recipient_key(recipient_type, recipient_id), -result.modified_count)])
+        return result.modified_count
+
+    async def reconcile_counters(self) -> int:
+        """Recount unread notifications per recipient; returns how many counters were wrong"""
+        actual = {
+            recipient_key(row["_id"]["type"], row["_id"]["id"]): row["unread"]
+            async for row in self.db.notifications.aggregate([
+                {"$match": {"is_read": False, "recipient_type": {"$in": list(RECIPIENT_TYPES)}}},
+                {"$group": {"_id": {"type": "$recipient_type", "id": "$recipient_id"}, "unread": {"$sum": 1}}},
+            ])
+        }
+        fixes = []
+        async for counter in self.db.notification_counters.find({}):
+            expected = actual.pop(counter["_id"], 0)
+            if counter.get("unread") != expected:
+                fixes.append(UpdateOne({"_id": counter["_id"]}, {"$set": {"unread": expected}}))
+        fixes += [UpdateOne({"_id": key}, {"$set": {"unread": unread}}, upsert=True) for key, unread in actual.items()]
+        if fixes:
+            await self.db.notification_counters.bulk_write(fixes, ordered=False)
+            logger.info(f"Reconciled {len(fixes)} notification unread counters")
+        return len(fixes)
+
+    async def migrate_legacy(self) -> int:
+        """
+        Rewrite notifications stored before this schema (coach_id/player_id
+        recipients, `read` or `is_read`, no expiry) and rebuild the counters.
+        Safe to run repeatedly. Retention runs from the migration (or the
+        creation date if later), so the TTL index doesn't delete older
+        legacy notifications, unread ones included, the moment it applies.
+        """
+        updates, migrated = [], 0
+        now = datetime.utcnow()
+        async for doc in self.db.notifications.find({"recipient_type": {"$exists": False}}):
+            if doc.get("coach_id"):
+                recipient = ("coach", doc["coach_id"])
+            elif doc.get("player_id"):
+                recipient = ("player", doc["player_id"])
+            else:
+                recipient = ("academy", doc.get("academy_id"))
+            created_at = doc.get("created_at") or now
+            updates.append(UpdateOne({"_id": doc["_id"]}, {
+                "$set": {
+                    **self._recipient(*recipient),
+                    "type": doc.get("type") or "general",
+                    "title": doc.get("title"),
+                    "data": {field: doc[field] for field in LEGACY_REFERENCES if doc.get(field)},
+                    "is_read": bool(doc.get("is_read") or doc.get("read")),
+                    "created_at": created_at,
+                    "expires_at": max(created_at, now) + timedelta(days=self.retention_days),
+                },
+                "$unset": {field: "" for field in ("coach_id", "player_id", "read", *LEGACY_REFERENCES)},
+            }))
+            if len(updates) == MIGRATION_BATCH:
+                migrated += await self._write(updates)
+        migrated += await self._write(updates)
+        if migrated:
+            logger.info(f"Migrated {migrated} notifications to the unified schema")
+            await self.reconcile_counters()
+        return migrated
+
+    async def _write(self, updates: List[UpdateOne]) -> int:
+        if not updates:
+            return 0
+        await self.db.notifications.bulk_write(updates, ordered=False)
+        count = len(updates)
+        updates.clear()
+        return count
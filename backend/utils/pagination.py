@@ -0,0 +1,142 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+# Page sizes for cursor pagination
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """Envelope returned by list endpoints when a cursor is requested"""
+    items: List[T]
+    limit: int
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(sort_value: Any, doc_id: str) -> str:
+    """Opaque cursor for the (sort_key, id) position of the last row on a page"""
+    if isinstance(sort_value, datetime):
+        sort_value = {"$date": sort_value.isoformat()}
+    raw = json.dumps({"k": sort_value, "i": doc_id}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Any, str]:
+    """Inverse of encode_cursor. Raises ValueError for malformed cursors."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        sort_value, doc_id = data["k"], data["i"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if isinstance(sort_value, dict) and "$date" in sort_value:
+        sort_value = datetime.fromisoformat(sort_value["$date"])
+    if not isinstance(doc_id, str):
+        raise ValueError("Invalid cursor")
+    return sort_value, doc_id
+
+
+def keyset_filter(query: Dict[str, Any], sort_field: str, position: Tuple[Any, str], direction: int) -> Dict[str, Any]:
+    """
+    Add the "rows after `position`" condition to `query`.
+
+    Ties on the sort key are broken by `id`. Mongo compares values of one BSON
+    type only, so rows with a null/missing sort key are handled explicitly:
+    they sort first ascending and last descending.
+    """
+    value, last_id = position
+    op = "$gt" if direction > 0 else "$lt"
+    if value is None:
+        after = [{sort_field: None, "id": {op: last_id}}]
+        if direction > 0:
+            after.append({sort_field: {"$ne": None}})
+    else:
+        after = [{sort_field: {op: value}}, {sort_field: value, "id": {op: last_id}}]
+        if direction < 0:
+            after.append({sort_field: None})
+    condition = {"$or": after}
+    return {"$and": [query, condition]} if query else condition
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    *,
+    sort_field: str = "created_at",
+    direction: int = -1,
+    limit: Optional[int] = DEFAULT_PAGE_SIZE,
+    position: Optional[Tuple[Any, str]] = None,
+    projection: Optional[Dict[str, Any]] = None,
+    skip: int = 0
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one page ordered by (sort_field, id) starting after `position`.
+
+    The query is a bounded index range scan, so deep pages cost the same as
+    the first one. Fetches limit + 1 rows to know whether another page exists.
+
+    Returns:
+        (documents, next_cursor) - next_cursor is None on the last page
+    """
+    if position is not None:
+        query = keyset_filter(query, sort_field, position, direction)
+
+    cursor = collection.find(query, projection).sort([(sort_field, direction), ("id", direction)])
+    if skip:
+        cursor = cursor.skip(skip)
+    if limit is None:
+        return await cursor.to_list(length=None), None
+
+    docs = await cursor.limit(limit + 1).to_list(length=limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    last = docs[-1]
+    return docs, encode_cursor(last.get(sort_field), last.get("id"))
+
+
+class PageParams:
+    """
+    `limit` / `cursor` query parameters shared by list endpoints.
+
+    Passing `cursor` (empty for the first page) opts in to the
+    {"items", "limit", "next_cursor"} envelope; without it list endpoints keep
+    returning a plain array for existing clients.
+    """
+
+    def __init__(
+        self,
+        limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+        cursor: Optional[str] = Query(None)
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.position = None
+        if cursor:
+            try:
+                self.position = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    @property
+    def requested(self) -> bool:
+        return self.cursor is not None
+
+    def page_limit(self, default: Optional[int] = DEFAULT_PAGE_SIZE) -> Optional[int]:
+        """Limit to apply: explicit `limit`, else the envelope default, else `default`"""
+        if self.limit is not None:
+            return self.limit
+        return DEFAULT_PAGE_SIZE if self.requested else default
+
+    def respond(self, items: List[Any], next_cursor: Optional[str]):
+        """Plain list for legacy callers, Page envelope when a cursor was requested"""
+        if not self.requested:
+            return items
+        return {"items": items, "limit": self.page_limit(), "next_cursor": next_cursor}
@@ -0,0 +1,252 @@
+"""
+Opt-in request profiling.
+
+ProfilingMiddleware captures a wall-clock profile of a request when one of
+these triggers applies:
+- it carries a valid X-Profile-Signature header (HMAC of expiry, method and
+  path with PROFILE_SECRET, minted by a super admin)
+- it is picked by PROFILE_SAMPLE_RATE
+- PROFILE_LATENCY_THRESHOLD_MS is set. Sampled requests are then profiled,
+  but only those slower than the threshold are kept. Without a sample rate
+  the candidates are drawn at DEFAULT_THRESHOLD_SAMPLE_RATE, so the
+  threshold never puts a profiler on every request.
+
+Profiles go to an in-memory ring buffer per worker, tagged with the route and
+the tenant (academy) of the request. pyinstrument (a requirement) follows the
+request across awaits. Without it cProfile is used, which sees the whole
+thread: it only starts when no other request is in flight, and the profile is
+dropped if another request arrived while it ran.
+"""
+import cProfile
+import hashlib
+import hmac
+import io
+import logging
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from starlette.datastructures import Headers
+
+try:
+    from pyinstrument import Profiler as _Pyinstrument
+except ImportError:  # optional dependency
+    _Pyinstrument = None
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "X-Profile-Signature"
+DEFAULT_BUFFER_SIZE = 50
+DEFAULT_THRESHOLD_SAMPLE_RATE = 0.01
+
+# Tags attached to the current request's profile (set by auth dependencies)
+_request_tags: ContextVar[Optional[Dict[str, Any]]] = ContextVar("profile_request_tags", default=None)
+
+
+def tag_request(**tags):
+    """Attach tags (e.g. tenant=academy_id) to the profile of the current request, if any"""
+    current = _request_tags.get()
+    if current is not None:
+        current.update(tags)
+
+
+# ---------------- signed trigger ----------------
+
+def _signature(secret: str, expires: int, method: str, path: str) -> str:
+    message = f"{expires}:{method.upper()}:{path}".encode()
+    return hmac.new(secret.encode(), message, hashlib.sha256).hexdigest()
+
+
+def sign_profile_request(secret: str, method: str, path: str, ttl_seconds: int = 600) -> str:
+    """Value for the X-Profile-Signature header, valid for `ttl_seconds`"""
+    expires = int(time.time()) + ttl_seconds
+    return f"{expires}.{_signature(secret, expires, method, path)}"
+
+
+def verify_profile_signature(secret: Optional[str], value: Optional[str], method: str, path: str) -> bool:
+    if not secret or not value or "." not in value:
+        return False
+    expires, _, signature = value.partition(".")
+    try:
+        expires = int(expires)
+    except ValueError:
+        return False
+    if expires < time.time():
+        return False
+    return hmac.compare_digest(signature, _signature(secret, expires, method, path))
+
+
+# ---------------- storage ----------------
+
+class ProfileStore:
+    """Bounded ring buffer of captured profiles; the oldest are dropped first"""
+
+    def __init__(self, max_entries: int = DEFAULT_BUFFER_SIZE):
+        self._entries = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def add(self, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries.append(entry)
+
+    def list(self) -> List[Dict[str, Any]]:
+        """Metadata of stored profiles, newest first"""
+        with self._lock:
+            entries = list(self._entries)
+        return [{key: value for key, value in entry.items() if key != "profile"} for entry in reversed(entries)]
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for entry in self._entries:
+                if entry["id"] == profile_id:
+                    return entry
+        return None
+
+
+profile_store = ProfileStore(int(os.environ.get("PROFILE_BUFFER_SIZE", DEFAULT_BUFFER_SIZE)))
+
+
+def render_profile(entry: Dict[str, Any], output_format: str = "html") -> Tuple[str, str]:
+    """
+    Render a stored profile as (content, media type). pyinstrument profiles
+    render as HTML or text, cProfile ones only as text.
+    """
+    profile = entry["profile"]
+    if entry["profiler"] == "pyinstrument":
+        if output_format == "html":
+            return profile.output_html(), "text/html"
+        return profile.output_text(unicode=True, show_all=False), "text/plain"
+    return profile, "text/plain"
+
+
+# ---------------- profilers ----------------
+
+class _CProfileRunner:
+    # cProfile hooks the whole thread, so only one request is profiled at a time
+    _busy = threading.Lock()
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.acquired = self._busy.acquire(blocking=False)
+
+    def start(self) -> bool:
+        if not self.acquired:
+            return False
+        self.profile.enable()
+        return True
+
+    def stop(self) -> str:
+        self.profile.disable()
+        self._busy.release()
+        output = io.StringIO()
+        pstats.Stats(self.profile, stream=output).sort_stats("cumulative").print_stats(60)
+        return output.getvalue()
+
+
+class _PyinstrumentRunner:
+    def __init__(self):
+        self.profiler = _Pyinstrument(async_mode="enabled")
+
+    def start(self) -> bool:
+        self.profiler.start()
+        return True
+
+    def stop(self):
+        self.profiler.stop()
+        return self.profiler
+
+
+def _new_runner():
+    return _PyinstrumentRunner() if _Pyinstrument is not None else _CProfileRunner()
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware capturing profiles of triggered requests into a ProfileStore.
+    Does nothing per request unless at least one trigger is configured.
+    """
+
+    def __init__(self, app, store: ProfileStore = profile_store, secret: Optional[str] = None,
+                 sample_rate: Optional[float] = None, latency_threshold_ms: Optional[float] = None):
+        self.app = app
+        self.store = store
+        self.secret = secret if secret is not None else os.environ.get("PROFILE_SECRET")
+        self.sample_rate = sample_rate if sample_rate is not None else float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+        if latency_threshold_ms is None and os.environ.get("PROFILE_LATENCY_THRESHOLD_MS"):
+            latency_threshold_ms = float(os.environ["PROFILE_LATENCY_THRESHOLD_MS"])
+        self.latency_threshold_ms = latency_threshold_ms
+        self.enabled = bool(self.secret or self.sample_rate > 0 or self.latency_threshold_ms is not None)
+
+        self._in_flight = 0
+        self._arrivals = 0
+
+    def _trigger(self, scope) -> Optional[str]:
+        if self.secret:
+            value = Headers(scope=scope).get(PROFILE_HEADER)
+            if value is not None and verify_profile_signature(self.secret, value, scope["method"], scope["path"]):
+                return "signed"
+        if self.latency_threshold_ms is not None:
+            rate = self.sample_rate or DEFAULT_THRESHOLD_SAMPLE_RATE
+            return "slow" if random.random() < rate else None
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        self._in_flight += 1
+        self._arrivals += 1
+        try:
+            await self._profile(scope, receive, send)
+        finally:
+            self._in_flight -= 1
+
+    async def _profile(self, scope, receive, send):
+        trigger = self._trigger(scope)
+        # cProfile would also record whatever other requests run meanwhile
+        exclusive = _Pyinstrument is None
+        if exclusive and self._in_flight > 1:
+            trigger = None
+        runner = _new_runner() if trigger else None
+        if runner is None or not runner.start():
+            await self.app(scope, receive, send)
+            return
+
+        tags: Dict[str, Any] = {}
+        token = _request_tags.set(tags)
+        started = time.perf_counter()
+        arrivals = self._arrivals
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            profile = runner.stop()
+            _request_tags.reset(token)
+            duration_ms = (time.perf_counter() - started) * 1000
+            overlapped = exclusive and self._arrivals != arrivals
+            if overlapped:
+                logger.debug(f"Dropped cProfile profile of {scope['path']}: other requests ran meanwhile")
+            elif trigger != "slow" or duration_ms >= self.latency_threshold_ms:
+                route = getattr(scope.get("route"), "path", None) or scope["path"]
+                self.store.add({
+                    "id": str(uuid.uuid4()),
+                    "method": scope["method"],
+                    "route": route,
+                    "path": scope["path"],
+                    "tenant": tags.get("tenant"),
+                    "trigger": trigger,
+                    "duration_ms": round(duration_ms, 1),
+                    "profiler": "pyinstrument" if isinstance(runner, _PyinstrumentRunner) else "cprofile",
+                    "created_at": datetime.utcnow(),
+                    "profile": profile,
+                })
+                logger.info(f"Captured {trigger} profile of {scope['method']} {route} ({duration_ms:.0f}ms)")
@@ -0,0 +1,214 @@
+"""
+Per-request Mongo query instrumentation.
+
+QueryMonitorListener is a PyMongo command listener; it attributes every
+command to the request being served through a context variable (Motor copies
+the context into its executor threads). QueryMonitorMiddleware opens that
+context per request, keeps per-route totals, warns about routes that exceed
+the query budget or repeat one query shape (N+1 patterns), and reports the
+totals in a Server-Timing header outside production.
+"""
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_BUDGET = 50
+DEFAULT_REPEAT_THRESHOLD = 10
+
+# Commands that say nothing about the route's data access
+_IGNORED_COMMANDS = {"endSessions", "hello", "isMaster", "ismaster", "ping", "saslStart", "saslContinue"}
+
+
+def _shape(value: Any, depth: int = 0) -> Any:
+    """Replace literal values with "?" so queries differing only in values compare equal"""
+    if depth > 4:
+        return "?"
+    if isinstance(value, dict):
+        return {key: _shape(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_shape(value[0], depth + 1)] if value else []
+    return "?"
+
+
+def query_shape(command_name: str, command: Dict[str, Any]) -> str:
+    """Stable description of a command: name, collection and filter/pipeline structure"""
+    collection = command.get(command_name)
+    if command_name == "aggregate":
+        detail = [next(iter(stage), "?") for stage in command.get("pipeline", [])]
+    elif command_name in ("update", "delete"):
+        statements = command.get("updates") or command.get("deletes") or [{}]
+        detail = _shape(statements[0].get("q", {}))
+    elif command_name == "findAndModify":
+        detail = _shape(command.get("query", {}))
+    else:
+        detail = _shape(command.get("filter", command.get("query", {})))
+    return f"{command_name} {collection} {detail}"
+
+
+class RequestQueryStats:
+    """Commands issued while serving one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_shape: Optional[str] = None
+        self.shapes: Counter = Counter()
+        self._pending: Dict[int, str] = {}
+        self._lock = threading.Lock()
+
+    def started(self, request_id: int, shape: str):
+        with self._lock:
+            self._pending[request_id] = shape
+
+    def finished(self, request_id: int, duration_micros: int):
+        with self._lock:
+            shape = self._pending.pop(request_id, None)
+            if shape is None:
+                return
+            elapsed_ms = duration_micros / 1000
+            self.count += 1
+            self.total_ms += elapsed_ms
+            self.shapes[shape] += 1
+            if elapsed_ms >= self.slowest_ms:
+                self.slowest_ms = elapsed_ms
+                self.slowest_shape = shape
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("request_query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    return _current_stats.get()
+
+
+class QueryMonitorListener(monitoring.CommandListener):
+    """Records command timings into the current request's RequestQueryStats"""
+
+    def started(self, event):
+        stats = _current_stats.get()
+        if stats is None or event.command_name in _IGNORED_COMMANDS:
+            return
+        stats.started(event.request_id, query_shape(event.command_name, event.command))
+
+    def succeeded(self, event):
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.finished(event.request_id, event.duration_micros)
+
+    def failed(self, event):
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.finished(event.request_id, event.duration_micros)
+
+
+class RouteQueryTotals:
+    """Aggregated query statistics per route since startup"""
+
+    def __init__(self):
+        self.routes: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, stats: RequestQueryStats):
+        with self._lock:
+            totals = self.routes.setdefault(route, {
+                "requests": 0,
+                "queries": 0,
+                "db_ms": 0.0,
+                "max_queries": 0,
+                "slowest_ms": 0.0,
+                "slowest_query": None,
+            })
+            totals["requests"] += 1
+            totals["queries"] += stats.count
+            totals["db_ms"] += stats.total_ms
+            totals["max_queries"] = max(totals["max_queries"], stats.count)
+            if stats.slowest_ms > totals["slowest_ms"]:
+                totals["slowest_ms"] = stats.slowest_ms
+                totals["slowest_query"] = stats.slowest_shape
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {route: dict(totals) for route, totals in self.routes.items()}
+
+
+route_query_totals = RouteQueryTotals()
+
+
+def server_timing_enabled() -> bool:
+    return os.environ.get("ENVIRONMENT", "development").lower() != "production"
+
+
+def _route_name(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path", None) or scope.get("path", "")
+    return f"{scope.get('method', '')} {path}"
+
+
+class QueryMonitorMiddleware:
+    """
+    ASGI middleware opening a RequestQueryStats for each HTTP request.
+
+    Args:
+        query_budget: Warn when a request issues more commands than this
+            (env QUERY_BUDGET)
+        repeat_threshold: Warn when one query shape runs this many times in
+            a request (env QUERY_REPEAT_THRESHOLD)
+        server_timing: Send a Server-Timing header; defaults to on unless
+            ENVIRONMENT=production
+    """
+
+    def __init__(self, app, query_budget: Optional[int] = None, repeat_threshold: Optional[int] = None,
+                 server_timing: Optional[bool] = None, totals: RouteQueryTotals = route_query_totals):
+        self.app = app
+        self.query_budget = query_budget if query_budget is not None else int(os.environ.get("QUERY_BUDGET", DEFAULT_QUERY_BUDGET))
+        self.repeat_threshold = repeat_threshold if repeat_threshold is not None else int(os.environ.get("QUERY_REPEAT_THRESHOLD", DEFAULT_REPEAT_THRESHOLD))
+        self.server_timing = server_timing_enabled() if server_timing is None else server_timing
+        self.totals = totals
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = _current_stats.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                headers = MutableHeaders(raw=message["headers"])
+                app_ms = (time.perf_counter() - started) * 1000
+                headers.append(
+                    "Server-Timing",
+                    f'db;dur={stats.total_ms:.1f};desc="{stats.count} queries", app;dur={app_ms:.1f}'
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current_stats.reset(token)
+            self._report(_route_name(scope), stats)
+
+    def _report(self, route: str, stats: RequestQueryStats):
+        if stats.count == 0:
+            return
+        self.totals.record(route, stats)
+        if stats.count > self.query_budget:
+            logger.warning(
+                f"{route} issued {stats.count} queries ({stats.total_ms:.1f} ms), "
+                f"over the budget of {self.query_budget}"
+            )
+        shape, repeats = stats.shapes.most_common(1)[0]
+        if repeats >= self.repeat_threshold:
+            logger.warning(f"Possible N+1 in {route}: {repeats}x {shape}")
@@ -0,0 +1,44 @@
+"""
+Named rate-limit policies counted in the shared state backend.
+
+Each check is one O(1) counter update (see StateBackend.hit), keyed by
+policy and identifier, so a policy holds across workers and replicas and
+idle identifiers expire on their own. Routes apply policies through the
+`rate_limit` dependency in app/dependencies.py:
+
+    REMINDER_LIMIT = RateLimit("manual_reminder", 10, 300, scope="user")
+
+    @router.post(..., dependencies=[Depends(rate_limit(REMINDER_LIMIT, require_academy_user))])
+"""
+from typing import Optional, Tuple
+
+SCOPES = ("ip", "user", "academy")
+
+
+class RateLimit:
+    """`max_requests` per `window_seconds` for each client IP, user or academy"""
+
+    def __init__(self, name: str, max_requests: int, window_seconds: float, scope: str = "ip",
+                 message: Optional[str] = None):
+        if scope not in SCOPES:
+            raise ValueError(f"Unknown rate limit scope {scope!r} (expected one of {', '.join(SCOPES)})")
+        self.name = name
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.scope = scope
+        self.message = message or "Rate limit exceeded. Please wait before trying again."
+
+    def key(self, identifier: str) -> str:
+        return f"ratelimit:{self.name}:{identifier}"
+
+    async def hit(self, state, identifier: str) -> Tuple[bool, int]:
+        """Count one request; returns (allowed, retry_after_seconds)"""
+        return await state.hit(self.key(identifier), self.max_requests, self.window_seconds)
+
+
+def identity(user_info: dict, scope: str) -> str:
+    """Identifier for a user- or academy-scoped policy from an auth dependency's user_info"""
+    if scope == "academy":
+        return str(user_info.get("academy_id") or "none")
+    user = user_info.get("user")
+    return str(getattr(user, "id", None) or user_info.get("user_id") or "anonymous")
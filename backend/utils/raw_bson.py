@@ -0,0 +1,114 @@
+"""
+Raw BSON pass-through for read-mostly list endpoints.
+
+Documents are read as RawBSONDocument (undecoded bytes) with a projection that
+already matches the response shape. The driver skips decoding them on
+receipt. Each batch is then decoded to dicts in one bson.decode_all call (in
+C) and handed straight to orjson. Dicts are still built, once, but no
+per-document Python cleaning or model building happens in between.
+
+Enabled with RAW_BSON_FASTPATH=true. The fast path does not fill model
+defaults for fields missing from a document; it returns what is stored,
+limited by the projection.
+"""
+import os
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import bson
+from bson.codec_options import CodecOptions
+from bson.raw_bson import RawBSONDocument
+from fastapi.responses import Response
+
+from utils.pagination import encode_cursor, keyset_filter
+from utils.serialization import dumps
+
+RAW_CODEC_OPTIONS = CodecOptions(document_class=RawBSONDocument)
+
+# Documents decoded per decode_all call
+RAW_BATCH_SIZE = 500
+
+
+def raw_fastpath_enabled() -> bool:
+    return os.environ.get("RAW_BSON_FASTPATH", "false").lower() == "true"
+
+
+def raw_collection(collection):
+    """Same collection, but reads return RawBSONDocument instead of dicts"""
+    return collection.with_options(codec_options=RAW_CODEC_OPTIONS)
+
+
+def _batches(raw_docs: Sequence[RawBSONDocument], batch_size: int):
+    for start in range(0, len(raw_docs), batch_size):
+        yield bson.decode_all(b"".join(doc.raw for doc in raw_docs[start:start + batch_size]))
+
+
+def raw_decode(raw_docs: Sequence[RawBSONDocument], batch_size: int = RAW_BATCH_SIZE) -> List[Dict[str, Any]]:
+    """Raw documents as dicts, a whole batch per decode_all call"""
+    return [doc for batch in _batches(raw_docs, batch_size) for doc in batch]
+
+
+def raw_to_json_array(raw_docs: Sequence[RawBSONDocument], batch_size: int = RAW_BATCH_SIZE) -> bytes:
+    """Encode raw documents as one JSON array, decoding a whole batch per call"""
+    parts: List[bytes] = []
+    for batch in _batches(raw_docs, batch_size):
+        encoded = dumps(batch)
+        # Strip the brackets so batches can be joined into one array
+        if len(encoded) > 2:
+            parts.append(encoded[1:-1])
+    return b"[" + b",".join(parts) + b"]"
+
+
+async def raw_find_page(
+    collection,
+    query: Dict[str, Any],
+    projection: Dict[str, Any],
+    *,
+    sort_field: str = "created_at",
+    direction: int = -1,
+    limit: Optional[int] = None,
+    position: Optional[Tuple[Any, str]] = None
+) -> Tuple[List[RawBSONDocument], Optional[str]]:
+    """Raw-document counterpart of utils.pagination.fetch_page"""
+    if position is not None:
+        query = keyset_filter(query, sort_field, position, direction)
+
+    cursor = raw_collection(collection).find(query, projection).sort([(sort_field, direction), ("id", direction)])
+    if limit is None:
+        return await cursor.to_list(length=None), None
+
+    docs = await cursor.limit(limit + 1).to_list(length=limit + 1)
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    # Only the last document is inflated, to build the cursor
+    last = docs[-1]
+    return docs, encode_cursor(last.get(sort_field), last.get("id"))
+
+
+async def raw_aggregate(collection, pipeline: Iterable[Dict[str, Any]]) -> List[RawBSONDocument]:
+    return await raw_collection(collection).aggregate(list(pipeline)).to_list(length=None)
+
+
+def _encode(value: Any) -> bytes:
+    if isinstance(value, list) and value and isinstance(value[0], RawBSONDocument):
+        return raw_to_json_array(value)
+    return dumps(value)
+
+
+def raw_json_response(content: Any) -> Response:
+    """
+    JSON response where lists of RawBSONDocument are encoded batch-wise.
+    `content` is either such a list or a flat dict whose values may be.
+    """
+    if isinstance(content, dict):
+        body = b"{" + b",".join(dumps(key) + b":" + _encode(value) for key, value in content.items()) + b"}"
+    else:
+        body = _encode(content)
+    return Response(content=body, media_type="application/json")
+
+
+def raw_page_response(page, raw_docs: List[RawBSONDocument], next_cursor: Optional[str]) -> Response:
+    """Raw counterpart of PageParams.respond()"""
+    if page.requested:
+        return raw_json_response({"items": raw_docs, "limit": page.page_limit(), "next_cursor": next_cursor})
+    return raw_json_response(raw_docs)
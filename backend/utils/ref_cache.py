@@ -0,0 +1,134 @@
+"""
+Read-through cache for rarely-changing reference documents (academies,
+academy settings and fee structures, coaches).
+
+Each entity type gets a ReferenceCache: documents are kept in process for
+`ttl_seconds` and loaded on a miss, with concurrent misses for the same key
+sharing one query (utils/single_flight.py). Routes that change a document
+call `await cache.invalidate(key)` after the write:
+
+- this worker drops the key at once;
+- the entity's marker in the shared state backend changes, and every other
+  worker clears its copy of that entity the next time it reads it after
+  `sync_seconds` (default 2). Edits are rare, so clearing the whole entity
+  is cheaper than tracking keys across workers.
+
+With a change feed running (app/change_feed.py) every worker also drops the
+exact key as soon as the write reaches it, including writes that bypass
+these routes.
+
+Cached documents are shared between requests: treat them as read-only and
+copy before changing them. Lookups are counted per entity in
+cache_requests_total{cache="ref:<entity>"}.
+"""
+import logging
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Generic, Optional, Tuple, TypeVar
+
+from utils.metrics import record_cache
+from utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class ReferenceCache(Generic[T]):
+    """
+    In-process read-through cache for one entity type.
+
+        academies = ReferenceCache("academy", lambda academy_id: db.academies.find_one({"id": academy_id}))
+        academy = await academies.get(academy_id)
+        ...
+        await academies.invalidate(academy_id)
+
+    `state` returns the shared state backend used for cross-worker
+    invalidation; without one invalidation is local to this process.
+    """
+
+    def __init__(self, entity: str, loader: Callable[[str], Awaitable[Optional[T]]], ttl_seconds: float = 300,
+                 max_entries: int = 10_000, state: Optional[Callable[[], Any]] = None, sync_seconds: float = 2.0):
+        self.entity = entity
+        self.loader = loader
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.state = state
+        self.sync_seconds = sync_seconds
+        # key -> (document or None, expires at)
+        self._entries: "OrderedDict[str, Tuple[Optional[T], float]]" = OrderedDict()
+        self._flights = SingleFlight(f"ref:{entity}")
+        self._marker: Any = _MISSING
+        self._synced_at = 0.0
+        # Bumped on every invalidation so a load that overlapped it isn't stored
+        self._generation = 0
+
+    @property
+    def _marker_key(self) -> str:
+        return f"refcache:{self.entity}"
+
+    async def _sync(self) -> None:
+        """Drop everything if another worker invalidated this entity since the last check"""
+        if self.state is None or time.monotonic() - self._synced_at < self.sync_seconds:
+            return
+        self._synced_at = time.monotonic()
+        try:
+            marker = await self.state().get(self._marker_key)
+        except Exception as e:
+            # Serve from this worker's entries; their TTL still bounds staleness
+            logger.warning(f"Could not check {self.entity} cache invalidations: {e}")
+            return
+        if self._marker is not _MISSING and marker != self._marker:
+            self._entries.clear()
+            self._generation += 1
+        self._marker = marker
+
+    async def get(self, key: str) -> Optional[T]:
+        await self._sync()
+        entry = self._entries.get(key)
+        if entry is not None and entry[1] > time.monotonic():
+            self._entries.move_to_end(key)
+            record_cache(f"ref:{self.entity}", True)
+            return entry[0]
+        record_cache(f"ref:{self.entity}", False)
+        return await self._flights.do(key, lambda: self._load(key))
+
+    async def _load(self, key: str) -> Optional[T]:
+        generation = self._generation
+        value = await self.loader(key)
+        if generation != self._generation:
+            return value
+        # Misses are cached too: a request for an unknown id shouldn't query every time
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return value
+
+    def invalidate_local(self, key: Optional[str] = None) -> None:
+        """Forget `key` (or every key) in this worker only, e.g. on a change feed event"""
+        self._generation += 1
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def invalidate(self, key: Optional[str] = None) -> None:
+        """Forget `key` (or every key) here and tell the other workers"""
+        self.invalidate_local(key)
+        if self.state is not None:
+            marker = {"changed_at": time.time(), "nonce": uuid.uuid4().hex}
+            try:
+                await self.state().set(self._marker_key, marker)
+                self._marker = marker
+            except Exception as e:
+                logger.error(f"Could not publish {self.entity} cache invalidation, other workers serve it "
+                             f"for up to {self.ttl_seconds}s: {e}")
+
+    def clear(self) -> None:
+        """Drop this worker's entries (tests)"""
+        self._entries.clear()
+
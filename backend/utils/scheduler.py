@@ -0,0 +1,344 @@
+"""
+Lease-based job scheduler backed by MongoDB.
+
+Every replica may run a JobScheduler. Each job has one document in the
+`scheduled_jobs` collection holding its next due time and a lease. A replica
+must take the lease before it runs a job, so each occurrence runs exactly once
+across the cluster. Because the next due time is stored in Mongo, a restart
+does not reset the schedule. Runs missed while nothing was up are coalesced
+into one catch-up run. Each run is recorded in `job_runs`.
+"""
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, Optional, Set
+
+from utils.metrics import observe_job
+
+logger = logging.getLogger(__name__)
+
+
+# ============================================================================
+# CRON EXPRESSIONS
+# ============================================================================
+
+_FIELD_RANGES = [
+    ("minute", 0, 59),
+    ("hour", 0, 23),
+    ("day", 1, 31),
+    ("month", 1, 12),
+    ("weekday", 0, 6),
+]
+
+
+def _parse_field(expr: str, low: int, high: int, name: str) -> Set[int]:
+    values: Set[int] = set()
+    for part in expr.split(","):
+        step = 1
+        if "/" in part:
+            part, step_text = part.split("/", 1)
+            step = int(step_text)
+            if step <= 0:
+                raise ValueError(f"Invalid step in cron {name} field: {expr}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_text, end_text = part.split("-", 1)
+            start, end = int(start_text), int(end_text)
+        else:
+            start = int(part)
+            # "5/15" means every 15 starting at 5
+            end = high if step > 1 else start
+        if name == "weekday" and end == 7:
+            # Allow 7 for Sunday like most cron implementations
+            if start == 7:
+                start = 0
+                end = 0
+            else:
+                values.add(0)
+                end = 6
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron {name} field out of range: {expr}")
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """
+    Standard 5-field cron expression: minute hour day-of-month month day-of-week.
+
+    Supports *, lists (1,15), ranges (1-5) and steps (*/10, 0-30/5).
+    Day-of-week uses 0 (or 7) for Sunday. When both day fields are
+    restricted a day matches if either matches, as in classic cron.
+    Times are naive UTC, like the rest of the backend.
+    """
+
+    def __init__(self, expression: str):
+        fields = expression.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression must have 5 fields: {expression!r}")
+        self.expression = expression
+        parsed = [_parse_field(f, low, high, name) for f, (name, low, high) in zip(fields, _FIELD_RANGES)]
+        self.minutes, self.hours, self.days, self.months, self.weekdays = parsed
+        self._day_restricted = fields[2] != "*"
+        self._weekday_restricted = fields[4] != "*"
+
+    def _day_matches(self, dt: datetime) -> bool:
+        day_ok = dt.day in self.days
+        weekday_ok = (dt.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, after: datetime) -> datetime:
+        """Return the first matching minute strictly after `after`."""
+        dt = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = dt + timedelta(days=366 * 5)
+        while dt < limit:
+            if dt.month not in self.months:
+                dt = (dt.replace(day=1, hour=0, minute=0) + timedelta(days=32)).replace(day=1)
+                continue
+            if not self._day_matches(dt):
+                dt = dt.replace(hour=0, minute=0) + timedelta(days=1)
+                continue
+            if dt.hour not in self.hours:
+                dt = dt.replace(minute=0) + timedelta(hours=1)
+                continue
+            if dt.minute not in self.minutes:
+                dt += timedelta(minutes=1)
+                continue
+            return dt
+        raise ValueError(f"Cron expression never matches: {self.expression!r}")
+
+    def count_between(self, start: datetime, end: datetime, cap: int = 1000) -> int:
+        """Number of occurrences in (start, end], capped to keep it cheap."""
+        count = 0
+        current = start
+        while count < cap:
+            current = self.next_after(current)
+            if current > end:
+                break
+            count += 1
+        return count
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+# A job returns the number of items it processed (or None)
+JobFunc = Callable[[], Awaitable[Optional[int]]]
+
+
+@dataclass
+class ScheduledJob:
+    name: str
+    schedule: CronSchedule
+    func: JobFunc
+    lease_seconds: int = 600
+
+
+class JobScheduler:
+    """
+    Runs registered jobs on their cron schedules, one replica per occurrence.
+
+    Usage:
+        scheduler = JobScheduler(db)
+        scheduler.register("fee_reminders", "30 3 * * *", send_automatic_fee_reminders)
+        scheduler.start()          # background task inside an event loop
+        ...
+        await scheduler.stop()
+    """
+
+    # Shortest time between lease renewals
+    RENEW_MIN_INTERVAL = 1.0
+
+    def __init__(
+        self,
+        db,
+        instance_id: Optional[str] = None,
+        poll_interval: float = 30.0,
+        jobs_collection: str = "scheduled_jobs",
+        runs_collection: str = "job_runs",
+        clock: Callable[[], datetime] = datetime.utcnow
+    ):
+        self.db = db
+        self.jobs = db[jobs_collection]
+        self.runs = db[runs_collection]
+        self.instance_id = instance_id or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.poll_interval = poll_interval
+        # Source of every timestamp the scheduler stores or compares (tests pass a fake one)
+        self.clock = clock
+        self._jobs: Dict[str, ScheduledJob] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = asyncio.Event()
+
+    def register(self, name: str, cron: str, func: JobFunc, lease_seconds: int = 600) -> None:
+        self._jobs[name] = ScheduledJob(name, CronSchedule(cron), func, lease_seconds)
+
+    # ---------------- lifecycle ----------------
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self.run_forever())
+        return self._task
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, timeout=10)
+            except asyncio.TimeoutError:
+                self._task.cancel()
+            self._task = None
+
+    async def run_forever(self) -> None:
+        logger.info(f"Job scheduler {self.instance_id} started with jobs: {', '.join(self._jobs)}")
+        while not self._stopping.is_set():
+            try:
+                await self.run_pending()
+            except Exception as e:
+                logger.error(f"Error in job scheduler loop: {e}")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+        logger.info(f"Job scheduler {self.instance_id} stopped")
+
+    # ---------------- scheduling ----------------
+
+    async def run_pending(self) -> int:
+        """Run every job that is due and whose lease this replica wins. Returns jobs run."""
+        ran = 0
+        for job in list(self._jobs.values()):
+            now_ts = self.clock()
+            state = await self._ensure_state(job, now_ts)
+            if state["next_run_at"] > now_ts:
+                continue
+            if not await self._acquire_lease(job, state, now_ts):
+                continue
+            await self._run(job, state["next_run_at"], now_ts)
+            ran += 1
+        return ran
+
+    async def _ensure_state(self, job: ScheduledJob, now: datetime) -> dict:
+        await self.jobs.update_one(
+            {"_id": job.name},
+            {"$setOnInsert": {"next_run_at": job.schedule.next_after(now), "created_at": now}},
+            upsert=True
+        )
+        state = await self.jobs.find_one({"_id": job.name})
+        if state.get("cron") != job.schedule.expression:
+            # Schedule changed in code: recompute from now rather than firing the old slot
+            next_run_at = job.schedule.next_after(now)
+            await self.jobs.update_one(
+                {"_id": job.name},
+                {"$set": {"cron": job.schedule.expression, "next_run_at": next_run_at}}
+            )
+            state["next_run_at"] = next_run_at
+        return state
+
+    async def _acquire_lease(self, job: ScheduledJob, state: dict, now: datetime) -> bool:
+        result = await self.jobs.update_one(
+            {
+                "_id": job.name,
+                "next_run_at": state["next_run_at"],
+                "$or": [
+                    {"lease_until": {"$exists": False}},
+                    {"lease_until": None},
+                    {"lease_until": {"$lt": now}}
+                ]
+            },
+            {"$set": {
+                "lease_owner": self.instance_id,
+                "lease_until": now + timedelta(seconds=job.lease_seconds)
+            }}
+        )
+        return result.modified_count == 1
+
+    async def _renew_lease(self, job: ScheduledJob, job_task: asyncio.Future) -> bool:
+        """
+        Keep the lease alive while a long job runs so nobody else starts it.
+        A failed renewal is retried on the next tick; once the lease may have
+        lapsed (or another replica holds it) the job is cancelled rather than
+        left running alongside a second copy. Returns True if it aborted the job.
+        """
+        interval = max(self.RENEW_MIN_INTERVAL, job.lease_seconds / 3)
+        renewed = time.monotonic()
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                result = await self.jobs.update_one(
+                    {"_id": job.name, "lease_owner": self.instance_id},
+                    {"$set": {"lease_until": self.clock() + timedelta(seconds=job.lease_seconds)}}
+                )
+            except Exception as e:
+                logger.warning(f"Could not renew lease of job {job.name}: {e}")
+            else:
+                if result.matched_count == 0:
+                    logger.error(f"Job {job.name} lost its lease to another replica; aborting it")
+                    job_task.cancel()
+                    return True
+                renewed = time.monotonic()
+            # Another renewal attempt would come after the lease ran out
+            if time.monotonic() - renewed + interval >= job.lease_seconds:
+                logger.error(f"Could not renew lease of job {job.name} for {job.lease_seconds}s; aborting it")
+                job_task.cancel()
+                return True
+
+    async def _run(self, job: ScheduledJob, scheduled_for: datetime, now: datetime) -> None:
+        missed = job.schedule.count_between(scheduled_for, now)
+        if missed:
+            logger.warning(f"Job {job.name} missed {missed} run(s) since {scheduled_for}; running once to catch up")
+
+        started_at = self.clock()
+        started = time.perf_counter()
+        status, error, items = "success", None, None
+        job_task = asyncio.ensure_future(job.func())
+        renewer = asyncio.create_task(self._renew_lease(job, job_task))
+        try:
+            items = await job_task
+        except asyncio.CancelledError:
+            if not (renewer.done() and renewer.result()):
+                raise
+            status, error = "aborted", "lease could not be renewed"
+        except Exception as e:
+            status, error = "failed", str(e)
+            logger.error(f"Job {job.name} failed: {e}")
+        finally:
+            renewer.cancel()
+        finished_at = self.clock()
+        seconds = time.perf_counter() - started
+        duration_ms = round(seconds * 1000, 1)
+        observe_job(job.name, status, seconds)
+
+        # Coalesce: the next run is the first slot after now, not after the missed one
+        await self.jobs.update_one(
+            {"_id": job.name, "lease_owner": self.instance_id},
+            {"$set": {
+                "next_run_at": job.schedule.next_after(max(now, finished_at)),
+                "last_run_at": started_at,
+                "last_status": status,
+                "lease_until": None
+            }}
+        )
+        await self.runs.insert_one({
+            "id": str(uuid.uuid4()),
+            "job": job.name,
+            "instance": self.instance_id,
+            "scheduled_for": scheduled_for,
+            "started_at": started_at,
+            "finished_at": finished_at,
+            "duration_ms": duration_ms,
+            "items": items,
+            "missed_runs": missed,
+            "status": status,
+            "error": error
+        })
+        logger.info(f"Job {job.name} {status} in {duration_ms}ms (items: {items})")
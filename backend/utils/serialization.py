@@ -0,0 +1,76 @@
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import orjson
+from bson import ObjectId
+from bson.decimal128 import Decimal128
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic_core import PydanticUndefined
+
+# orjson handles datetime/date/UUID natively; numpy values show up in analytics endpoints
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def bson_default(value: Any):
+    """Encode the BSON and Pydantic types orjson doesn't know about"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, Decimal128):
+        return float(value.to_decimal())
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=bson_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson and the shared BSON-aware encoder.
+
+    Returning one of these from a route skips FastAPI's response_model
+    validation and jsonable_encoder pass, so only use it for data we trust
+    (rows read from our own database, shaped with rows_from_db).
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# model -> [(field name, default, default_factory)]
+_FIELD_CACHE: Dict[type, List[Tuple[str, Any, Optional[Callable]]]] = {}
+
+
+def _fields_for(model) -> List[Tuple[str, Any, Optional[Callable]]]:
+    fields = _FIELD_CACHE.get(model)
+    if fields is None:
+        fields = []
+        for name, info in model.model_fields.items():
+            default = None if info.default is PydanticUndefined else info.default
+            fields.append((name, default, info.default_factory))
+        _FIELD_CACHE[model] = fields
+    return fields
+
+
+def row_from_db(doc: Dict[str, Any], model) -> Dict[str, Any]:
+    """
+    Shape one trusted DB document like `model` without validating it: keeps
+    only the model's fields and fills missing ones with their defaults.
+    """
+    row = {}
+    for name, default, factory in _fields_for(model):
+        if name in doc:
+            row[name] = doc[name]
+        elif factory is not None:
+            row[name] = factory()
+        else:
+            row[name] = default
+    return row
+
+
+def rows_from_db(docs: Iterable[Dict[str, Any]], model) -> List[Dict[str, Any]]:
+    return [row_from_db(doc, model) for doc in docs]
@@ -0,0 +1,101 @@
+"""
+Request coalescing ("single flight") for expensive reads.
+
+When identical requests arrive while one is already being computed, the
+later ones await the in-flight computation instead of starting their own:
+
+    flights = SingleFlight("analytics")
+    result = await flights.do(key, lambda: compute(...))
+
+or, on a route handler (below @router.get):
+
+    @coalesce(flights, lambda args: flight_key(args["user_info"]["academy_id"], args, exclude=("user_info",)))
+
+Only concurrent calls are merged; nothing is cached once the computation
+finishes. The computation runs in its own task, so a caller that goes away
+doesn't cancel it for the others. single_flight_requests_total counts
+leaders (computations run) and followers (computations saved).
+"""
+import asyncio
+import copy
+import functools
+import inspect
+from typing import Any, Awaitable, Callable, Dict, Iterable, TypeVar
+
+from utils.metrics import SINGLE_FLIGHT_REQUESTS
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Merges concurrent calls that share a key.
+
+    share_errors: followers get the leader's exception (True), or run the
+        computation themselves after a failure (False), e.g. when errors
+        can be transient or depend on the caller.
+    copy_results: give each follower a deep copy, for callers that mutate
+        what they get back.
+    """
+
+    def __init__(self, name: str, share_errors: bool = True, copy_results: bool = False):
+        self.name = name
+        self.share_errors = share_errors
+        self.copy_results = copy_results
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            SINGLE_FLIGHT_REQUESTS.labels(self.name, "leader").inc()
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+            return await asyncio.shield(task)
+
+        SINGLE_FLIGHT_REQUESTS.labels(self.name, "follower").inc()
+        try:
+            result = await asyncio.shield(task)
+        except Exception:
+            if self.share_errors:
+                raise
+            return await fn()
+        return copy.deepcopy(result) if self.copy_results else result
+
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Retrieved here too so a failure nobody awaited isn't logged as unhandled
+            task.exception()
+
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+
+def flight_key(tenant: Any, params: Dict[str, Any], exclude: Iterable[str] = ()) -> str:
+    """Key from the tenant and request parameters, independent of parameter order"""
+    skipped = set(exclude)
+    normalized = "&".join(f"{name}={params[name]!r}" for name in sorted(params) if name not in skipped)
+    return f"{tenant}|{normalized}"
+
+
+def coalesce(flight: SingleFlight, key: Callable[[Dict[str, Any]], str]):
+    """
+    Decorator merging concurrent calls of an async function whose bound
+    arguments give the same key(arguments). The function name is part of
+    the key, so one SingleFlight can serve several routes.
+    """
+    def decorator(fn):
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            flight_id = f"{fn.__name__}:{key(dict(bound.arguments))}"
+            return await flight.do(flight_id, lambda: fn(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
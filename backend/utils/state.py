@@ -0,0 +1,455 @@
+"""
+Shared state for anything several workers must agree on: rate limits, OAuth
+token caches and cached results.
+
+Backends (pick with STATE_BACKEND, see state_backend_from_env):
+- memory: process-local dicts. Single worker and tests only; with N workers
+  every limit is effectively multiplied by N.
+- mongo (default): one collection ("app_state") with a TTL index.
+- redis: any Redis-compatible server (Redis, Valkey, KeyDB) at REDIS_URL;
+  needs the optional `redis` package.
+
+All backends expose the same async API:
+    await state.get(key) / set(key, value, ttl_seconds) / update(key, fields) / delete(key)
+    await state.take(key)   # get and delete in one step (single-use values)
+    await state.hit(key, limit, window_seconds)   # rate limiting
+    owner = await state.acquire_lock(key, ttl_seconds) / release_lock(key, owner)
+    await state.get_or_set(key, ttl_seconds, loader)   # result caching
+
+Rate limits use a sliding window counter: the current fixed window's count
+plus the previous window's, weighted by how much of it still overlaps the
+sliding window. It is exact while all hits fall in one window and never
+lets more than `limit` through per window, whichever backend counts.
+"""
+import json
+import logging
+import math
+import os
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+STATE_COLLECTION = "app_state"
+
+
+def _window(window_seconds: float, now: Optional[float] = None) -> Tuple[int, float]:
+    """(index of the current fixed window, fraction of it already elapsed)"""
+    now = time.time() if now is None else now
+    index = int(now // window_seconds)
+    return index, (now - index * window_seconds) / window_seconds
+
+
+def _over_limit(current: int, previous: int, elapsed: float, limit: int) -> bool:
+    return previous * (1 - elapsed) + current > limit
+
+
+def _retry_after(current: int, previous: int, elapsed: float, limit: int, window_seconds: float) -> int:
+    """
+    Seconds until a request denied with these counts would pass _over_limit:
+    later in this window once the previous window's weight has faded enough,
+    otherwise in the next one, where this window's hits become the weighted
+    previous count. Never more than the two windows after which nothing counts.
+    """
+    if previous and current + 1 <= limit:
+        wait = 1 - (limit - current - 1) / previous - elapsed
+    else:
+        wait = 1 - elapsed + (max(0.0, 1 - (limit - 1) / current) if current else 0.0)
+    return max(1, math.ceil(min(wait, 2 - elapsed) * window_seconds))
+
+
+def _lock_owner() -> str:
+    return uuid.uuid4().hex
+
+
+class StateBackend:
+    """Interface shared by the backends (see module docstring)"""
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    async def set(self, key: str, value: Dict[str, Any], ttl_seconds: Optional[float] = None) -> None:
+        raise NotImplementedError
+
+    async def update(self, key: str, fields: Dict[str, Any]) -> None:
+        """Merge fields into the value at key (creating it), keeping its expiry"""
+        raise NotImplementedError
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError
+
+    async def take(self, key: str) -> Optional[Dict[str, Any]]:
+        """Delete key and return its value; of several concurrent callers only one gets it"""
+        raise NotImplementedError
+
+    async def hit(self, key: str, limit: int, window_seconds: float) -> Tuple[bool, int]:
+        """Count one request against key; returns (allowed, seconds until a retry would be allowed, 0 if allowed)"""
+        raise NotImplementedError
+
+    async def acquire_lock(self, key: str, ttl_seconds: float) -> Optional[str]:
+        """An owner token if the lock was free (or expired), None while someone else holds it"""
+        raise NotImplementedError
+
+    async def release_lock(self, key: str, owner: str) -> None:
+        """Release the lock if `owner` still holds it; after expiry it may belong to someone else"""
+        raise NotImplementedError
+
+    async def get_or_set(self, key: str, ttl_seconds: float,
+                         loader: Callable[[], Awaitable[Dict[str, Any]]]) -> Dict[str, Any]:
+        """Cached value for key, computing and storing it with loader() on a miss"""
+        value = await self.get(key)
+        if value is None:
+            value = await loader()
+            await self.set(key, value, ttl_seconds)
+        return value
+
+    async def close(self) -> None:
+        pass
+
+
+class MemoryStateBackend(StateBackend):
+    """
+    Process-local state. Correct for one worker only.
+
+    Values and counters are kept in LRU order and capped at max_keys each;
+    idle entries are swept from the cold end as new ones arrive, so every
+    operation is O(1) amortised and memory stays bounded however many
+    distinct identifiers (emails, IPs) show up.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._values: "OrderedDict[str, Tuple[Dict[str, Any], Optional[float]]]" = OrderedDict()
+        # key -> [window index, current count, previous window count, expires at]
+        self._counters: "OrderedDict[str, list]" = OrderedDict()
+        # key -> (expires at, owner)
+        self._locks: Dict[str, Tuple[float, str]] = {}
+
+    @staticmethod
+    def _evict(entries: OrderedDict, expires_at: Callable[[Any], Optional[float]], max_keys: int) -> None:
+        now = time.time()
+        while entries:
+            oldest = next(iter(entries.values()))
+            expiry = expires_at(oldest)
+            if len(entries) > max_keys or (expiry is not None and expiry <= now):
+                entries.popitem(last=False)
+            else:
+                break
+
+    def _live(self, key: str):
+        entry = self._values.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.time():
+            del self._values[key]
+            return None
+        if entry:
+            self._values.move_to_end(key)
+        return entry
+
+    def _store(self, key: str, value: Dict[str, Any], expires: Optional[float]) -> None:
+        self._values[key] = (value, expires)
+        self._values.move_to_end(key)
+        self._evict(self._values, lambda entry: entry[1], self.max_keys)
+
+    async def get(self, key):
+        entry = self._live(key)
+        return dict(entry[0]) if entry else None
+
+    async def set(self, key, value, ttl_seconds=None):
+        self._store(key, dict(value), time.time() + ttl_seconds if ttl_seconds else None)
+
+    async def update(self, key, fields):
+        entry = self._live(key)
+        value, expires = entry if entry else ({}, None)
+        self._store(key, {**value, **fields}, expires)
+
+    async def delete(self, key):
+        self._values.pop(key, None)
+
+    async def take(self, key):
+        entry = self._live(key)
+        if not entry:
+            return None
+        del self._values[key]
+        return entry[0]
+
+    async def hit(self, key, limit, window_seconds):
+        index, elapsed = _window(window_seconds)
+        counter = self._counters.pop(key, None)
+        if counter is None or counter[0] < index - 1:
+            counter = [index, 0, 0, 0.0]
+        elif counter[0] == index - 1:
+            # Roll over: the current window becomes the previous one
+            counter = [index, 0, counter[1], 0.0]
+        # Idle past the end of the next window, the counter no longer matters
+        counter[3] = (index + 2) * window_seconds
+        self._counters[key] = counter
+        self._evict(self._counters, lambda entry: entry[3], self.max_keys)
+
+        current = counter[1] + 1
+        if _over_limit(current, counter[2], elapsed, limit):
+            return False, _retry_after(counter[1], counter[2], elapsed, limit, window_seconds)
+        counter[1] = current
+        return True, 0
+
+    async def acquire_lock(self, key, ttl_seconds):
+        now = time.time()
+        if key in self._locks and self._locks[key][0] > now:
+            return None
+        owner = _lock_owner()
+        self._locks[key] = (now + ttl_seconds, owner)
+        return owner
+
+    async def release_lock(self, key, owner):
+        if key in self._locks and self._locks[key][1] == owner:
+            del self._locks[key]
+
+
+class MongoStateBackend(StateBackend):
+    """
+    State in one Mongo collection: {_id: key, value, expires_at}. The TTL
+    index (utils/indexes.py) removes expired documents; reads also check
+    expires_at because the TTL monitor only runs once a minute.
+    """
+
+    def __init__(self, db, collection_name: str = STATE_COLLECTION):
+        self.collection = db[collection_name]
+
+    @staticmethod
+    def _expiry(ttl_seconds: Optional[float]) -> Optional[datetime]:
+        return datetime.utcfromtimestamp(time.time() + ttl_seconds) if ttl_seconds else None
+
+    async def get(self, key):
+        doc = await self.collection.find_one({"_id": key})
+        if not doc:
+            return None
+        expires_at = doc.get("expires_at")
+        if expires_at and expires_at <= datetime.utcnow():
+            return None
+        return doc.get("value") or {}
+
+    async def set(self, key, value, ttl_seconds=None):
+        await self.collection.replace_one(
+            {"_id": key}, {"_id": key, "value": value, "expires_at": self._expiry(ttl_seconds)}, upsert=True
+        )
+
+    async def update(self, key, fields):
+        await self.collection.update_one(
+            {"_id": key},
+            {"$set": {f"value.{name}": value for name, value in fields.items()}},
+            upsert=True
+        )
+
+    async def delete(self, key):
+        await self.collection.delete_one({"_id": key})
+
+    async def take(self, key):
+        doc = await self.collection.find_one_and_delete({"_id": key})
+        if not doc:
+            return None
+        expires_at = doc.get("expires_at")
+        if expires_at and expires_at <= datetime.utcnow():
+            return None
+        return doc.get("value") or {}
+
+    async def _increment(self, key: str, amount: int, expires_at: datetime) -> int:
+        from pymongo import ReturnDocument
+        from pymongo.errors import DuplicateKeyError
+
+        for _ in range(2):
+            try:
+                doc = await self.collection.find_one_and_update(
+                    {"_id": key},
+                    {"$inc": {"count": amount}, "$setOnInsert": {"expires_at": expires_at}},
+                    upsert=True, return_document=ReturnDocument.AFTER
+                )
+                return doc["count"]
+            except DuplicateKeyError:
+                # Two workers upserted the same new window at once; the retry hits the existing doc
+                continue
+        raise RuntimeError(f"Could not increment counter {key}")
+
+    async def hit(self, key, limit, window_seconds):
+        index, elapsed = _window(window_seconds)
+        # Keep each window long enough to serve as the previous one
+        expires_at = datetime.utcfromtimestamp((index + 2) * window_seconds)
+        current = await self._increment(f"{key}:{index}", 1, expires_at)
+        previous_doc = await self.collection.find_one({"_id": f"{key}:{index - 1}"})
+        previous = previous_doc.get("count", 0) if previous_doc else 0
+        if _over_limit(current, previous, elapsed, limit):
+            await self._increment(f"{key}:{index}", -1, expires_at)
+            return False, _retry_after(current - 1, previous, elapsed, limit, window_seconds)
+        return True, 0
+
+    async def acquire_lock(self, key, ttl_seconds):
+        from pymongo.errors import DuplicateKeyError
+
+        now = datetime.utcnow()
+        owner = _lock_owner()
+        try:
+            # Matches only when nobody holds the lock; if the document exists but is
+            # locked the upsert collides on _id and we know another worker holds it.
+            await self.collection.find_one_and_update(
+                {"_id": f"lock:{key}", "$or": [{"expires_at": {"$exists": False}}, {"expires_at": {"$lt": now}}]},
+                {"$set": {"expires_at": self._expiry(ttl_seconds), "owner": owner}},
+                upsert=True
+            )
+            return owner
+        except DuplicateKeyError:
+            return None
+
+    async def release_lock(self, key, owner):
+        await self.collection.delete_one({"_id": f"lock:{key}", "owner": owner})
+
+
+def _encode(value: Any) -> str:
+    return json.dumps(value, default=lambda v: {"$dt": v.isoformat()} if isinstance(v, datetime) else str(v))
+
+
+def _decode(raw) -> Any:
+    return json.loads(raw, object_hook=lambda d: datetime.fromisoformat(d["$dt"]) if d.keys() == {"$dt"} else d)
+
+
+class RedisStateBackend(StateBackend):
+    """
+    State in a Redis-compatible server. Values are hashes (one JSON-encoded
+    field per key, so update() is an atomic HSET); counters use INCR and
+    locks SET NX, all with key expiry.
+    """
+
+    def __init__(self, url: str, prefix: str = "tma:", client=None):
+        if client is None:
+            try:
+                import redis.asyncio as redis_asyncio
+            except ImportError:
+                raise RuntimeError("STATE_BACKEND=redis needs the `redis` package (pip install redis)")
+            client = redis_asyncio.from_url(url)
+        self.redis = client
+        self.prefix = prefix
+
+    def _key(self, key: str) -> str:
+        return self.prefix + key
+
+    @staticmethod
+    def _value(fields) -> Optional[Dict[str, Any]]:
+        if not fields:
+            return None
+        value = {name.decode() if isinstance(name, bytes) else name: _decode(raw) for name, raw in fields.items()}
+        value.pop("__empty__", None)
+        return value
+
+    async def get(self, key):
+        return self._value(await self.redis.hgetall(self._key(key)))
+
+    async def set(self, key, value, ttl_seconds=None):
+        name = self._key(key)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(name)
+            if value:
+                pipe.hset(name, mapping={field: _encode(v) for field, v in value.items()})
+            else:
+                # Keep empty values distinguishable from missing keys
+                pipe.hset(name, mapping={"__empty__": _encode(True)})
+            if ttl_seconds:
+                pipe.pexpire(name, int(ttl_seconds * 1000))
+            await pipe.execute()
+
+    async def update(self, key, fields):
+        if fields:
+            await self.redis.hset(self._key(key), mapping={field: _encode(v) for field, v in fields.items()})
+
+    async def delete(self, key):
+        await self.redis.delete(self._key(key))
+
+    async def take(self, key):
+        # GETDEL only handles strings; MULTI runs the read and delete of the hash as one step
+        name = self._key(key)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hgetall(name)
+            pipe.delete(name)
+            fields, _ = await pipe.execute()
+        return self._value(fields)
+
+    async def hit(self, key, limit, window_seconds):
+        index, elapsed = _window(window_seconds)
+        current_key, previous_key = self._key(f"{key}:{index}"), self._key(f"{key}:{index - 1}")
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.incr(current_key)
+            pipe.pexpire(current_key, int(window_seconds * 2000))
+            pipe.get(previous_key)
+            current, _, previous = await pipe.execute()
+        previous = int(previous or 0)
+        if _over_limit(current, previous, elapsed, limit):
+            await self.redis.decr(current_key)
+            return False, _retry_after(current - 1, previous, elapsed, limit, window_seconds)
+        return True, 0
+
+    async def acquire_lock(self, key, ttl_seconds):
+        owner = _lock_owner()
+        acquired = await self.redis.set(self._key(f"lock:{key}"), owner, nx=True, px=int(ttl_seconds * 1000))
+        return owner if acquired else None
+
+    async def release_lock(self, key, owner):
+        from redis.exceptions import WatchError
+
+        lock_key = self._key(f"lock:{key}")
+        async with self.redis.pipeline(transaction=True) as pipe:
+            try:
+                # Delete only if still ours; WATCH aborts the delete if it changes meanwhile
+                await pipe.watch(lock_key)
+                if await pipe.get(lock_key) != owner.encode():
+                    return
+                pipe.multi()
+                pipe.delete(lock_key)
+                await pipe.execute()
+            except WatchError:
+                pass
+
+    async def close(self):
+        await self.redis.aclose()
+
+
+class TokenStore:
+    """
+    OAuth token cache over a state backend: every worker reads the same
+    token, and a short lock makes sure only one of them refreshes it. The
+    refresher saves the new token, then releases the lock with the owner
+    token acquire_refresh_lock returned.
+    """
+
+    def __init__(self, backend: StateBackend, prefix: str = "oauth:"):
+        self.backend = backend
+        self.prefix = prefix
+
+    async def load(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self.backend.get(self.prefix + key)
+
+    async def save(self, key: str, fields: Dict[str, Any]) -> None:
+        await self.backend.update(self.prefix + key, fields)
+
+    async def acquire_refresh_lock(self, key: str, ttl_seconds: int) -> Optional[str]:
+        return await self.backend.acquire_lock(self.prefix + key, ttl_seconds)
+
+    async def release_refresh_lock(self, key: str, owner: str) -> None:
+        await self.backend.release_lock(self.prefix + key, owner)
+
+
+def state_backend_from_env(db=None) -> StateBackend:
+    """
+    Backend selected by STATE_BACKEND (memory, mongo or redis; default mongo,
+    falling back to memory without a db). Redis reads REDIS_URL.
+    """
+    kind = os.environ.get("STATE_BACKEND", "mongo").lower()
+    if kind == "redis":
+        return RedisStateBackend(os.environ.get("REDIS_URL", "redis://localhost:6379/0"))
+    if kind == "mongo" and db is not None:
+        return MongoStateBackend(db)
+    if kind not in ("memory", "mongo"):
+        raise ValueError(f"Unknown STATE_BACKEND {kind!r} (expected memory, mongo or redis)")
+    workers = int(os.environ.get("WEB_CONCURRENCY", "1") or 1)
+    if workers > 1:
+        logger.warning(f"In-memory state with WEB_CONCURRENCY={workers}: rate limits and token caches are per worker")
+    return MemoryStateBackend()
+
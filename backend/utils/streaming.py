@@ -0,0 +1,93 @@
+import logging
+from typing import AsyncIterator, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from utils.serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Documents fetched per round trip and rows written per chunk
+STREAM_BATCH_SIZE = 500
+STREAM_FLUSH_ROWS = 100
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def projection_for(model) -> Dict[str, int]:
+    """
+    Mongo projection limited to a response model's fields. Streaming bypasses
+    response_model, so this is what keeps extra/internal fields out of the body.
+    """
+    projection = {name: 1 for name in model.model_fields}
+    projection["_id"] = 0
+    return projection
+
+
+async def _iter_rows(cursor, transform: Optional[Callable], batch_size: int) -> AsyncIterator[bytes]:
+    cursor = cursor.batch_size(batch_size)
+    async for doc in cursor:
+        if transform is not None:
+            doc = transform(doc)
+            if doc is None:
+                continue
+        yield dumps(doc)
+
+
+async def iter_ndjson(cursor, transform: Optional[Callable] = None, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """One JSON document per line, flushed every STREAM_FLUSH_ROWS rows"""
+    chunk = []
+    try:
+        async for row in _iter_rows(cursor, transform, batch_size):
+            chunk.append(row)
+            if len(chunk) >= STREAM_FLUSH_ROWS:
+                yield b"\n".join(chunk) + b"\n"
+                chunk = []
+        if chunk:
+            yield b"\n".join(chunk) + b"\n"
+    except Exception as e:
+        # Headers are already sent; the client sees a truncated stream
+        logger.error(f"Error while streaming NDJSON response: {e}")
+        raise
+
+
+async def iter_json_array(cursor, transform: Optional[Callable] = None, batch_size: int = STREAM_BATCH_SIZE) -> AsyncIterator[bytes]:
+    """A single JSON array written incrementally (same body as a regular list response)"""
+    yield b"["
+    chunk = []
+    first = True
+    try:
+        async for row in _iter_rows(cursor, transform, batch_size):
+            chunk.append(row)
+            if len(chunk) >= STREAM_FLUSH_ROWS:
+                yield (b"" if first else b",") + b",".join(chunk)
+                first = False
+                chunk = []
+        if chunk:
+            yield (b"" if first else b",") + b",".join(chunk)
+    except Exception as e:
+        logger.error(f"Error while streaming JSON array response: {e}")
+        raise
+    yield b"]"
+
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def stream_cursor(
+    cursor,
+    request: Request,
+    transform: Optional[Callable] = None,
+    batch_size: int = STREAM_BATCH_SIZE
+) -> StreamingResponse:
+    """
+    Stream a Motor cursor without materializing it.
+
+    Sends NDJSON when the client accepts application/x-ndjson and a JSON array
+    otherwise. Memory stays bounded by one batch regardless of result size.
+    """
+    if wants_ndjson(request):
+        return StreamingResponse(iter_ndjson(cursor, transform, batch_size), media_type=NDJSON_MEDIA_TYPE)
+    return StreamingResponse(iter_json_array(cursor, transform, batch_size), media_type="application/json")
@@ -0,0 +1,188 @@
+"""
+OpenTelemetry tracing for the API and the services it calls.
+
+Tracing is off unless TRACING_ENABLED=true, OTEL_EXPORTER_OTLP_ENDPOINT or
+TRACE_FILE is set, and everything here is a no-op while it is off (or when
+the OpenTelemetry packages are not installed). Spans are exported:
+- over OTLP/HTTP when OTEL_EXPORTER_OTLP_ENDPOINT is set
+- as JSON lines to TRACE_FILE, for offline use
+- to an exporter passed to configure_tracing (tests)
+
+Child spans inherit the academy.id and http.route attributes of the span
+they are started under, so every Mongo/Supabase/Zoho/SMTP leg of a request
+can be filtered by tenant and route.
+"""
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+from pymongo import monitoring
+
+from utils.query_monitor import query_shape
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter, SimpleSpanProcessor
+    from opentelemetry.trace import SpanKind, Status, StatusCode
+except ImportError:  # optional at runtime; tracing stays disabled
+    trace = None
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "track-my-academy-api"
+
+# Attributes copied from a parent span onto the spans started under it
+INHERITED_ATTRIBUTES = ("academy.id", "http.route")
+
+_provider = None
+_tracer = None
+
+
+def tracing_requested() -> bool:
+    return (
+        os.environ.get("TRACING_ENABLED", "false").lower() == "true"
+        or bool(os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"))
+        or bool(os.environ.get("TRACE_FILE"))
+    )
+
+
+def _default_exporter():
+    if os.environ.get("OTEL_EXPORTER_OTLP_ENDPOINT"):
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        # Reads the endpoint and headers from the standard OTEL_EXPORTER_OTLP_* variables
+        return OTLPSpanExporter()
+    trace_file = os.environ.get("TRACE_FILE")
+    if trace_file:
+        return ConsoleSpanExporter(
+            out=open(trace_file, "a"),
+            formatter=lambda span: span.to_json(indent=None) + "\n"
+        )
+    return ConsoleSpanExporter()
+
+
+def configure_tracing(service_name: str = SERVICE_NAME, exporter=None, batch: bool = True) -> bool:
+    """
+    Set up the tracer provider. Returns False (and leaves tracing off) when
+    tracing isn't requested or OpenTelemetry isn't installed.
+
+    Args:
+        exporter: Span exporter to use instead of the env-selected one
+        batch: Export in a background batch (False exports each span on end)
+    """
+    global _provider, _tracer
+    if trace is None:
+        if exporter is not None or tracing_requested():
+            logger.warning("Tracing requested but OpenTelemetry is not installed")
+        return False
+    if exporter is None and not tracing_requested():
+        return False
+
+    provider = TracerProvider(resource=Resource.create({
+        "service.name": os.environ.get("OTEL_SERVICE_NAME", service_name)
+    }))
+    exporter = exporter or _default_exporter()
+    provider.add_span_processor(BatchSpanProcessor(exporter) if batch else SimpleSpanProcessor(exporter))
+    _provider = provider
+    _tracer = provider.get_tracer("track-my-academy")
+    return True
+
+
+def instrument_app(app) -> None:
+    """Server spans for every request, named after the route template"""
+    if _provider is None:
+        return
+    try:
+        from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
+    except ImportError:
+        logger.warning("opentelemetry-instrumentation-fastapi not installed; no request spans")
+        return
+    FastAPIInstrumentor.instrument_app(app, tracer_provider=_provider, excluded_urls="metrics")
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans"""
+    global _provider, _tracer
+    if _provider is not None:
+        _provider.shutdown()
+    _provider = None
+    _tracer = None
+
+
+def _inherited() -> Dict[str, Any]:
+    parent_attributes = getattr(trace.get_current_span(), "attributes", None) or {}
+    return {key: parent_attributes[key] for key in INHERITED_ATTRIBUTES if key in parent_attributes}
+
+
+@contextmanager
+def span(name: str, client: bool = False, **attributes):
+    """
+    Child span around a block: `with span("zoho.send_mail", **{"mail.to": to}):`.
+    Exceptions are recorded on the span and re-raised.
+    """
+    if _tracer is None:
+        yield None
+        return
+    attributes = {**_inherited(), **{key: value for key, value in attributes.items() if value is not None}}
+    kind = SpanKind.CLIENT if client else SpanKind.INTERNAL
+    with _tracer.start_as_current_span(name, kind=kind, attributes=attributes) as current:
+        yield current
+
+
+def set_span_attributes(**attributes) -> None:
+    """Set attributes on the current span (e.g. academy.id once auth resolved it)"""
+    if _tracer is None:
+        return
+    current = trace.get_current_span()
+    for key, value in attributes.items():
+        if value is not None:
+            current.set_attribute(key, value)
+
+
+class TracingCommandListener(monitoring.CommandListener):
+    """
+    PyMongo command listener emitting one client span per Mongo command.
+
+    Motor runs PyMongo in executor threads with a copy of the caller's
+    context, so spans get the request span as their parent. db.statement is
+    the query shape (literal values removed), never the raw filter.
+    """
+
+    def __init__(self):
+        self._spans: Dict[tuple, Any] = {}
+        self._lock = threading.Lock()
+
+    def started(self, event):
+        if _tracer is None:
+            return
+        collection = event.command.get(event.command_name)
+        attributes = {
+            **_inherited(),
+            "db.system": "mongodb",
+            "db.name": event.database_name,
+            "db.operation": event.command_name,
+            "db.statement": query_shape(event.command_name, event.command),
+        }
+        if isinstance(collection, str):
+            attributes["db.mongodb.collection"] = collection
+        current = _tracer.start_span(f"mongo.{event.command_name}", kind=SpanKind.CLIENT, attributes=attributes)
+        with self._lock:
+            self._spans[(event.request_id, event.connection_id)] = current
+
+    def _finish(self, event) -> Optional[Any]:
+        with self._lock:
+            return self._spans.pop((event.request_id, event.connection_id), None)
+
+    def succeeded(self, event):
+        current = self._finish(event)
+        if current is not None:
+            current.end()
+
+    def failed(self, event):
+        current = self._finish(event)
+        if current is not None:
+            current.set_status(Status(StatusCode.ERROR, str(event.failure.get("errmsg", ""))))
+            current.end()
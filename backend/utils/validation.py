@@ -0,0 +1,36 @@
+"""
+Input checks used by the upload and player endpoints.
+"""
+from datetime import date, datetime
+from typing import Optional
+
+# Image file signatures (magic numbers)
+IMAGE_SIGNATURES = (
+    b'\xFF\xD8\xFF',  # JPEG
+    b'\x89PNG\r\n\x1a\n',  # PNG
+    b'GIF87a',  # GIF87a
+    b'GIF89a',  # GIF89a
+    b'BM',  # BMP
+)
+
+
+def has_image_signature(file_content: bytes) -> bool:
+    """
+    True when the content starts with a known image signature. Checks the
+    actual bytes rather than the declared content type, so renamed or
+    spoofed uploads are rejected.
+    """
+    if file_content.startswith(IMAGE_SIGNATURES):
+        return True
+    # WebP: RIFF container with WEBP at offset 8
+    return file_content.startswith(b'RIFF') and file_content[8:12] == b'WEBP'
+
+
+def calculate_age_from_dob(date_of_birth: str, today: Optional[date] = None) -> Optional[int]:
+    """Calculate age from date of birth string (YYYY-MM-DD format)"""
+    try:
+        birth_date = datetime.strptime(date_of_birth, "%Y-%m-%d").date()
+    except (ValueError, TypeError):
+        return None
+    today = today or date.today()
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
@@ -5,18 +5,25 @@ This module handles OAuth 2.0 authentication and email sending via Zoho Mail API
 Uses Zoho India endpoints (.in) for all operations.
 
 Requirements:
-- requests library for HTTP operations
+- requests library for HTTP operations (sync helpers)
+- httpx library for the pooled async client (ZohoMailClient)
 - Environment variables for credentials (see below)
 
 Author: Track My Academy Backend Team
 """
 
 import os
+import asyncio
 import requests
+import httpx
 import json
 import logging
+import uuid
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterable, List
+
+from utils.metrics import httpx_metrics_hooks, record_cache
+from utils.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -24,9 +31,9 @@ logger = logging.getLogger(__name__)
 # ZOHO API CONFIGURATION (India Endpoints)
 # ============================================================================
 
-# Zoho India OAuth endpoints
-ZOHO_ACCOUNTS_URL = "https://accounts.zoho.in"
-ZOHO_MAIL_API_URL = "https://mail.zoho.in/api"
+# Zoho India OAuth endpoints (overridable so tests can point at a local mock server)
+ZOHO_ACCOUNTS_URL = os.environ.get('ZOHO_ACCOUNTS_URL', "https://accounts.zoho.in")
+ZOHO_MAIL_API_URL = os.environ.get('ZOHO_MAIL_API_URL', "https://mail.zoho.in/api")
 
 # OAuth endpoints
 TOKEN_URL = f"{ZOHO_ACCOUNTS_URL}/oauth/v2/token"
@@ -55,13 +62,16 @@ ZOHO_ACCOUNT_ID = os.environ.get('ZOHO_ACCOUNT_ID', '')
 # IN-MEMORY TOKEN CACHE
 # ============================================================================
 
-# Cache to store access token and expiry time
-# In production, consider using Redis or database for multi-instance deployments
+# Cache to store access token and expiry time for the sync helpers below.
+# The async ZohoMailClient uses a shared TokenStore instead (see further down).
 _token_cache = {
     "access_token": None,
     "expires_at": None
 }
 
+# One keep-alive session for the sync helpers instead of a new connection per call
+_session = requests.Session()
+
 
 # ============================================================================
 # OAUTH 2.0 TOKEN MANAGEMENT
@@ -124,7 +134,7 @@ def refresh_access_token() -> str:
         }
 
         # Make token refresh request
-        response = requests.post(
+        response = _session.post(
             TOKEN_URL,
             data=payload,
             headers={'Content-Type': 'application/x-www-form-urlencoded'},
@@ -187,6 +197,8 @@ def get_account_id() -> str:
     if ZOHO_ACCOUNT_ID:
         logger.info(f"Using configured Zoho account ID: {ZOHO_ACCOUNT_ID}")
         return ZOHO_ACCOUNT_ID
+    if _token_cache.get("account_id"):
+        return _token_cache["account_id"]
 
     # Fetch account ID from API
     logger.info("Fetching Zoho account ID from API...")
@@ -199,7 +211,7 @@ def get_account_id() -> str:
             'Content-Type': 'application/json'
         }
 
-        response = requests.get(
+        response = _session.get(
             GET_ACCOUNTS_ENDPOINT,
             headers=headers,
             timeout=30
@@ -216,6 +228,7 @@ def get_account_id() -> str:
             # Usually first account is primary
             account_id = accounts_data['data'][0]['accountId']
             logger.info(f"✅ Fetched Zoho account ID: {account_id}")
+            _token_cache["account_id"] = account_id
             return account_id
         else:
             logger.error(f"No accounts found in response: {accounts_data}")
@@ -298,7 +311,7 @@ def send_mail_via_zoho_api(
         logger.info(f"Sending email to {to_email} via Zoho Mail API...")
         logger.debug(f"Send URL: {send_url}")
 
-        response = requests.post(
+        response = _session.post(
             send_url,
             headers=headers,
             json=email_data,
@@ -342,6 +355,150 @@ def send_mail_via_zoho_api(
 # HIGH-LEVEL WRAPPER FOR AUTOMATED EMAILS
 # ============================================================================
 
+def build_fee_reminder_email(
+    player_name: str,
+    academy_name: str,
+    fee_amount: float,
+    due_date: datetime,
+    frequency: str = 'monthly'
+) -> tuple[str, str]:
+    """
+    Build the subject and HTML body for an automated fee reminder.
+
+    Shared by the sync send_automated_fee_reminder() and ZohoMailClient.
+
+    Returns:
+        tuple: (subject, html_content)
+    """
+    # Format due date
+    due_date_str = due_date.strftime('%B %d, %Y')
+
+    # Calculate days until due
+    days_until_due = (due_date - datetime.utcnow()).days
+
+    if days_until_due < 0:
+        urgency_text = f"⚠️ This payment is {abs(days_until_due)} days overdue."
+        urgency_class = "background: #fee2e2; border-left: 4px solid #dc2626;"
+    elif days_until_due == 0:
+        urgency_text = "⚠️ This payment is due today!"
+        urgency_class = "background: #fef3c7; border-left: 4px solid #f59e0b;"
+    elif days_until_due <= 3:
+        urgency_text = f"⚠️ This payment is due in {days_until_due} day(s)."
+        urgency_class = "background: #fef3c7; border-left: 4px solid #f59e0b;"
+    else:
+        urgency_text = f"This payment is due in {days_until_due} days."
+        urgency_class = "background: #dbeafe; border-left: 4px solid #3b82f6;"
+
+    # Professional HTML email template
+    html_content = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <style>
+            body {{
+                font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+                line-height: 1.6;
+                color: #333;
+                max-width: 600px;
+                margin: 0 auto;
+                padding: 20px;
+            }}
+            .header {{
+                background: linear-gradient(135deg, #0ea5e9 0%, #0284c7 100%);
+                color: white;
+                padding: 30px;
+                border-radius: 10px 10px 0 0;
+                text-align: center;
+            }}
+            .header h1 {{
+                margin: 0;
+                font-size: 24px;
+            }}
+            .content {{
+                background: #ffffff;
+                padding: 30px;
+                border: 1px solid #e5e7eb;
+                border-top: none;
+            }}
+            .fee-details {{
+                background: #f9fafb;
+                border-left: 4px solid #0ea5e9;
+                padding: 20px;
+                margin: 20px 0;
+                border-radius: 5px;
+            }}
+            .fee-details h2 {{
+                margin-top: 0;
+                color: #0ea5e9;
+                font-size: 18px;
+            }}
+            .amount {{
+                font-size: 32px;
+                font-weight: bold;
+                color: #0ea5e9;
+                margin: 10px 0;
+            }}
+            .urgency {{
+                {urgency_class}
+                padding: 15px;
+                margin: 20px 0;
+                border-radius: 5px;
+            }}
+            .footer {{
+                background: #f9fafb;
+                padding: 20px;
+                text-align: center;
+                border-radius: 0 0 10px 10px;
+                font-size: 12px;
+                color: #6b7280;
+            }}
+        </style>
+    </head>
+    <body>
+        <div class="header">
+            <h1>Fee Payment Reminder</h1>
+        </div>
+
+        <div class="content">
+            <p>Dear {player_name},</p>
+
+            <p>This is an automated reminder about your fee payment for <strong>{academy_name}</strong>.</p>
+
+            <div class="fee-details">
+                <h2>Payment Details</h2>
+                <div class="amount">₹{fee_amount:,.2f}</div>
+                <p><strong>Frequency:</strong> {frequency.capitalize()}</p>
+                <p><strong>Due Date:</strong> {due_date_str}</p>
+            </div>
+
+            <div class="urgency">
+                {urgency_text}
+            </div>
+
+            <p>Please ensure your payment is completed by the due date to avoid any interruption in your training.</p>
+
+            <p>If you have already made the payment, please disregard this reminder.</p>
+
+            <p>For any questions or payment assistance, please contact your academy administration.</p>
+
+            <p>Best regards,<br>
+            <strong>{academy_name}</strong></p>
+        </div>
+
+        <div class="footer">
+            <p>This is an automated message from Track My Academy.<br>
+            Please do not reply to this email.</p>
+            <p>&copy; {datetime.utcnow().year} Track My Academy. All rights reserved.</p>
+        </div>
+    </body>
+    </html>
+    """
+
+    subject = f"Fee Payment Reminder - {academy_name}"
+    return subject, html_content
+
+
 def send_automated_fee_reminder(
     to_email: str,
     player_name: str,
@@ -371,144 +528,457 @@ def send_automated_fee_reminder(
         Exception: If sending fails
     """
     try:
-        # Format due date
-        due_date_str = due_date.strftime('%B %d, %Y')
-
-        # Calculate days until due
-        days_until_due = (due_date - datetime.utcnow()).days
-
-        if days_until_due < 0:
-            urgency_text = f"⚠️ This payment is {abs(days_until_due)} days overdue."
-            urgency_class = "background: #fee2e2; border-left: 4px solid #dc2626;"
-        elif days_until_due == 0:
-            urgency_text = "⚠️ This payment is due today!"
-            urgency_class = "background: #fef3c7; border-left: 4px solid #f59e0b;"
-        elif days_until_due <= 3:
-            urgency_text = f"⚠️ This payment is due in {days_until_due} day(s)."
-            urgency_class = "background: #fef3c7; border-left: 4px solid #f59e0b;"
-        else:
-            urgency_text = f"This payment is due in {days_until_due} days."
-            urgency_class = "background: #dbeafe; border-left: 4px solid #3b82f6;"
-
-        # Professional HTML email template
-        html_content = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <meta charset="UTF-8">
-            <style>
-                body {{
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-                    line-height: 1.6;
-                    color: #333;
-                    max-width: 600px;
-                    margin: 0 auto;
-                    padding: 20px;
-                }}
-                .header {{
-                    background: linear-gradient(135deg, #0ea5e9 0%, #0284c7 100%);
-                    color: white;
-                    padding: 30px;
-                    border-radius: 10px 10px 0 0;
-                    text-align: center;
-                }}
-                .header h1 {{
-                    margin: 0;
-                    font-size: 24px;
-                }}
-                .content {{
-                    background: #ffffff;
-                    padding: 30px;
-                    border: 1px solid #e5e7eb;
-                    border-top: none;
-                }}
-                .fee-details {{
-                    background: #f9fafb;
-                    border-left: 4px solid #0ea5e9;
-                    padding: 20px;
-                    margin: 20px 0;
-                    border-radius: 5px;
-                }}
-                .fee-details h2 {{
-                    margin-top: 0;
-                    color: #0ea5e9;
-                    font-size: 18px;
-                }}
-                .amount {{
-                    font-size: 32px;
-                    font-weight: bold;
-                    color: #0ea5e9;
-                    margin: 10px 0;
-                }}
-                .urgency {{
-                    {urgency_class}
-                    padding: 15px;
-                    margin: 20px 0;
-                    border-radius: 5px;
-                }}
-                .footer {{
-                    background: #f9fafb;
-                    padding: 20px;
-                    text-align: center;
-                    border-radius: 0 0 10px 10px;
-                    font-size: 12px;
-                    color: #6b7280;
-                }}
-            </style>
-        </head>
-        <body>
-            <div class="header">
-                <h1>Fee Payment Reminder</h1>
-            </div>
+        subject, html_content = build_fee_reminder_email(
+            player_name=player_name,
+            academy_name=academy_name,
+            fee_amount=fee_amount,
+            due_date=due_date,
+            frequency=frequency
+        )
+
+        # Send via Zoho Mail API
+        return send_mail_via_zoho_api(
+            to_email=to_email,
+            subject=subject,
+            html_content=html_content,
+            from_address="donotreply@trackmyacademy.com"
+        )
+
+    except Exception as e:
+        logger.error(f"Failed to send automated fee reminder: {e}")
+        raise
 
-            <div class="content">
-                <p>Dear {player_name},</p>
 
-                <p>This is an automated reminder about your fee payment for <strong>{academy_name}</strong>.</p>
+# ============================================================================
+# SHARED TOKEN STORE (multi-worker)
+# ============================================================================
 
-                <div class="fee-details">
-                    <h2>Payment Details</h2>
-                    <div class="amount">₹{fee_amount:,.2f}</div>
-                    <p><strong>Frequency:</strong> {frequency.capitalize()}</p>
-                    <p><strong>Due Date:</strong> {due_date_str}</p>
-                </div>
+class InMemoryTokenStore:
+    """
+    Process-local token store.
 
-                <div class="urgency">
-                    {urgency_text}
-                </div>
+    Fine for a single worker and for tests. Use MongoTokenStore when several
+    uvicorn workers or the scheduler need to share one access token.
+    """
 
-                <p>Please ensure your payment is completed by the due date to avoid any interruption in your training.</p>
+    def __init__(self):
+        self._docs: Dict[str, Dict[str, Any]] = {}
 
-                <p>If you have already made the payment, please disregard this reminder.</p>
+    async def load(self, key: str) -> Optional[Dict[str, Any]]:
+        doc = self._docs.get(key)
+        return dict(doc) if doc else None
 
-                <p>For any questions or payment assistance, please contact your academy administration.</p>
+    async def save(self, key: str, fields: Dict[str, Any]) -> None:
+        self._docs.setdefault(key, {}).update(fields)
 
-                <p>Best regards,<br>
-                <strong>{academy_name}</strong></p>
-            </div>
+    async def acquire_refresh_lock(self, key: str, ttl_seconds: int) -> Optional[str]:
+        now = datetime.utcnow()
+        doc = self._docs.setdefault(key, {})
+        lock_until = doc.get("refresh_lock_until")
+        if lock_until and lock_until > now:
+            return None
+        owner = uuid.uuid4().hex
+        doc.update(refresh_lock_until=now + timedelta(seconds=ttl_seconds), refresh_lock_owner=owner)
+        return owner
 
-            <div class="footer">
-                <p>This is an automated message from Track My Academy.<br>
-                Please do not reply to this email.</p>
-                <p>&copy; {datetime.utcnow().year} Track My Academy. All rights reserved.</p>
-            </div>
-        </body>
-        </html>
+    async def release_refresh_lock(self, key: str, owner: str) -> None:
+        doc = self._docs.get(key, {})
+        if doc.get("refresh_lock_owner") == owner:
+            doc.pop("refresh_lock_until", None)
+            doc.pop("refresh_lock_owner", None)
+
+
+class MongoTokenStore:
+    """
+    Token store backed by a Mongo collection, shared by every worker and the
+    scheduler. A short refresh lock makes sure only one process calls the
+    Zoho token endpoint when the cached token expires.
+    """
+
+    def __init__(self, db, collection_name: str = "oauth_tokens"):
+        self.collection = db[collection_name]
+
+    async def load(self, key: str) -> Optional[Dict[str, Any]]:
+        return await self.collection.find_one({"_id": key})
+
+    async def save(self, key: str, fields: Dict[str, Any]) -> None:
+        await self.collection.update_one(
+            {"_id": key},
+            {"$set": {**fields, "updated_at": datetime.utcnow()}},
+            upsert=True
+        )
+
+    async def acquire_refresh_lock(self, key: str, ttl_seconds: int) -> Optional[str]:
+        from pymongo.errors import DuplicateKeyError
+
+        now = datetime.utcnow()
+        owner = uuid.uuid4().hex
+        try:
+            # Matches only when nobody holds the lock; if the document exists but is
+            # locked the upsert collides on _id and we know another worker is refreshing.
+            await self.collection.find_one_and_update(
+                {
+                    "_id": key,
+                    "$or": [
+                        {"refresh_lock_until": {"$exists": False}},
+                        {"refresh_lock_until": {"$lt": now}}
+                    ]
+                },
+                {"$set": {"refresh_lock_until": now + timedelta(seconds=ttl_seconds), "refresh_lock_owner": owner}},
+                upsert=True
+            )
+            return owner
+        except DuplicateKeyError:
+            return None
+
+    async def release_refresh_lock(self, key: str, owner: str) -> None:
+        await self.collection.update_one(
+            {"_id": key, "refresh_lock_owner": owner},
+            {"$unset": {"refresh_lock_until": "", "refresh_lock_owner": ""}}
+        )
+
+
+# ============================================================================
+# ASYNC ZOHO MAIL CLIENT (pooled HTTP session)
+# ============================================================================
+
+class ZohoMailClient:
+    """
+    Async Zoho Mail API client built on one pooled httpx.AsyncClient.
+
+    - Access tokens live in a TokenStore so all workers reuse the same token
+    - The account ID is fetched once and cached (in process and in the store)
+    - send_many() sends a batch with bounded concurrency
+
+    Pass `transport` (e.g. httpx.MockTransport) or point ZOHO_ACCOUNTS_URL /
+    ZOHO_MAIL_API_URL at a local mock server to test without Zoho.
+    """
+
+    TOKEN_KEY = "zoho_mail"
+    REFRESH_LOCK_SECONDS = 30
+    REFRESH_POLL_SECONDS = 0.25
+    # Refresh 5 minutes before Zoho's expiry, same margin as the sync helper
+    EXPIRY_MARGIN_SECONDS = 300
+
+    def __init__(
+        self,
+        token_store=None,
+        *,
+        client_id: Optional[str] = None,
+        client_secret: Optional[str] = None,
+        refresh_token: Optional[str] = None,
+        account_id: Optional[str] = None,
+        accounts_url: Optional[str] = None,
+        mail_api_url: Optional[str] = None,
+        max_connections: int = 10,
+        timeout: float = 30.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None
+    ):
+        # Read env at construction time so values from .env (loaded after import) are seen
+        self.client_id = client_id or os.environ.get('ZOHO_CLIENT_ID', ZOHO_CLIENT_ID)
+        self.client_secret = client_secret or os.environ.get('ZOHO_CLIENT_SECRET', ZOHO_CLIENT_SECRET)
+        self.refresh_token = refresh_token or os.environ.get('ZOHO_REFRESH_TOKEN', ZOHO_REFRESH_TOKEN)
+        self._account_id = account_id or os.environ.get('ZOHO_ACCOUNT_ID', ZOHO_ACCOUNT_ID) or None
+        accounts_url = accounts_url or os.environ.get('ZOHO_ACCOUNTS_URL', ZOHO_ACCOUNTS_URL)
+        mail_api_url = mail_api_url or os.environ.get('ZOHO_MAIL_API_URL', ZOHO_MAIL_API_URL)
+        self.token_url = f"{accounts_url}/oauth/v2/token"
+        self.accounts_endpoint = f"{mail_api_url}/accounts"
+        self.send_endpoint = f"{mail_api_url}/accounts/{{accountId}}/messages"
+
+        self.token_store = token_store or InMemoryTokenStore()
+        self._token: Optional[Dict[str, Any]] = None
+        self._refresh_lock = asyncio.Lock()
+        self._http = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ),
+            transport=transport,
+            event_hooks=httpx_metrics_hooks("zoho")
+        )
+
+    async def aclose(self) -> None:
+        await self._http.aclose()
+
+    # ---------------- token management ----------------
+
+    @staticmethod
+    def _usable(doc: Optional[Dict[str, Any]], stale_token: Optional[str] = None) -> bool:
+        if not doc or not doc.get("access_token") or not doc.get("expires_at"):
+            return False
+        if stale_token and doc["access_token"] == stale_token:
+            return False
+        return datetime.utcnow() < doc["expires_at"]
+
+    async def get_access_token(self, stale_token: Optional[str] = None) -> str:
         """
+        Return a valid access token, refreshing it at most once across workers.
 
-        subject = f"Fee Payment Reminder - {academy_name}"
+        Args:
+            stale_token: A token Zoho just rejected; it won't be returned again.
+        """
+        if self._usable(self._token, stale_token):
+            record_cache("zoho_token", True)
+            return self._token["access_token"]
+        record_cache("zoho_token", False)
+
+        async with self._refresh_lock:
+            # Another coroutine or worker may have refreshed while we waited
+            doc = await self.token_store.load(self.TOKEN_KEY)
+            if self._usable(doc, stale_token):
+                self._token = doc
+                return doc["access_token"]
+
+            # Wait out the lock's TTL: a refresher that died leaves it held until then
+            for _ in range(int(self.REFRESH_LOCK_SECONDS / self.REFRESH_POLL_SECONDS) + 4):
+                owner = await self.token_store.acquire_refresh_lock(self.TOKEN_KEY, self.REFRESH_LOCK_SECONDS)
+                if owner:
+                    try:
+                        doc = await self._request_new_token()
+                        await self.token_store.save(self.TOKEN_KEY, doc)
+                    finally:
+                        await self.token_store.release_refresh_lock(self.TOKEN_KEY, owner)
+                    self._token = doc
+                    return doc["access_token"]
+
+                # Someone else is refreshing; wait for them to publish the new token
+                await asyncio.sleep(self.REFRESH_POLL_SECONDS)
+                doc = await self.token_store.load(self.TOKEN_KEY)
+                if self._usable(doc, stale_token):
+                    self._token = doc
+                    return doc["access_token"]
+
+            raise Exception("Timed out waiting for Zoho token refresh by another worker")
+
+    async def _request_new_token(self) -> Dict[str, Any]:
+        if not self.client_id or not self.client_secret or not self.refresh_token:
+            raise Exception(
+                "Zoho OAuth credentials not configured. Please set:\n"
+                "ZOHO_CLIENT_ID, ZOHO_CLIENT_SECRET, ZOHO_REFRESH_TOKEN"
+            )
 
-        # Send via Zoho Mail API
-        return send_mail_via_zoho_api(
-            to_email=to_email,
-            subject=subject,
-            html_content=html_content,
-            from_address="donotreply@trackmyacademy.com"
+        logger.info("Requesting new access token from Zoho...")
+        try:
+            with span("zoho.refresh_token", client=True, **{"peer.service": "zoho"}):
+                response = await self._http.post(
+                    self.token_url,
+                    data={
+                        "refresh_token": self.refresh_token,
+                        "client_id": self.client_id,
+                        "client_secret": self.client_secret,
+                        "grant_type": "refresh_token"
+                    }
+                )
+        except httpx.HTTPError as req_error:
+            raise Exception(f"Network error during token refresh: {str(req_error)}")
+
+        if response.status_code != 200:
+            logger.error(f"Token refresh failed: {response.text}")
+            raise Exception(f"Zoho token refresh failed: {response.text}")
+
+        token_data = response.json()
+        if 'access_token' not in token_data:
+            logger.error(f"No access_token in response: {token_data}")
+            raise Exception("Invalid token response from Zoho")
+
+        expires_in = token_data.get('expires_in', 3600)
+        logger.info(f"✅ Access token refreshed successfully. Expires in {expires_in}s")
+        return {
+            "access_token": token_data['access_token'],
+            "expires_at": datetime.utcnow() + timedelta(seconds=expires_in - self.EXPIRY_MARGIN_SECONDS)
+        }
+
+    # ---------------- account id ----------------
+
+    async def get_account_id(self) -> str:
+        """Get the Zoho Mail account ID, fetching it from the API only once."""
+        if self._account_id:
+            return self._account_id
+
+        doc = await self.token_store.load(self.TOKEN_KEY)
+        if doc and doc.get("account_id"):
+            self._account_id = doc["account_id"]
+            return self._account_id
+
+        access_token = await self.get_access_token()
+        with span("zoho.get_account_id", client=True, **{"peer.service": "zoho"}):
+            response = await self._http.get(
+                self.accounts_endpoint,
+                headers={'Authorization': f'Zoho-oauthtoken {access_token}'}
+            )
+        if response.status_code != 200:
+            raise Exception(f"Cannot fetch Zoho account ID: {response.text}")
+
+        accounts_data = response.json()
+        if not accounts_data.get('data'):
+            raise Exception("No Zoho Mail accounts found")
+
+        self._account_id = accounts_data['data'][0]['accountId']
+        await self.token_store.save(self.TOKEN_KEY, {"account_id": self._account_id})
+        logger.info(f"✅ Fetched Zoho account ID: {self._account_id}")
+        return self._account_id
+
+    # ---------------- sending ----------------
+
+    async def send_mail(
+        self,
+        to_email: str,
+        subject: str,
+        html_content: str,
+        from_address: str = "donotreply@trackmyacademy.com"
+    ) -> bool:
+        """
+        Send one email. Retries once with a fresh token if Zoho answers 401.
+
+        Raises:
+            ValueError: On invalid input
+            Exception: If Zoho rejects the message
+        """
+        if not to_email or '@' not in to_email:
+            raise ValueError(f"Invalid recipient email: {to_email}")
+        if not subject or not subject.strip():
+            raise ValueError("Email subject is required")
+        if not html_content or not html_content.strip():
+            raise ValueError("Email content is required")
+
+        account_id = await self.get_account_id()
+        send_url = self.send_endpoint.format(accountId=account_id)
+        email_data = {
+            "fromAddress": from_address,
+            "toAddress": to_email,
+            "subject": subject,
+            "content": html_content,
+            "mailFormat": "html"
+        }
+
+        access_token = await self.get_access_token()
+        for attempt in range(2):
+            try:
+                with span("zoho.send_mail", client=True, **{"peer.service": "zoho", "zoho.attempt": attempt + 1}) as current:
+                    response = await self._http.post(
+                        send_url,
+                        headers={'Authorization': f'Zoho-oauthtoken {access_token}'},
+                        json=email_data
+                    )
+                    if current is not None:
+                        current.set_attribute("http.status_code", response.status_code)
+            except httpx.HTTPError as req_error:
+                raise Exception(f"Network error sending email: {str(req_error)}")
+
+            if response.status_code in [200, 201]:
+                logger.info(f"✅ Email sent successfully to {to_email} via Zoho Mail API")
+                return True
+            if response.status_code == 401 and attempt == 0:
+                logger.warning("Zoho rejected access token, refreshing and retrying once")
+                access_token = await self.get_access_token(stale_token=access_token)
+                continue
+            break
+
+        try:
+            error_msg = response.json().get('message', response.text)
+        except ValueError:
+            error_msg = response.text
+        logger.error(f"Zoho Mail API error: {error_msg}")
+        raise Exception(f"Zoho Mail API failed: {error_msg}")
+
+    async def send_many(self, messages: Iterable[Dict[str, Any]], concurrency: int = 5) -> Dict[str, Any]:
+        """
+        Send a batch of emails with at most `concurrency` requests in flight.
+
+        Args:
+            messages: Dicts with to_email, subject, html_content (and optional from_address)
+
+        Returns:
+            dict: {"sent", "failed", "total", "errors": [{"to_email", "error"}]}
+        """
+        messages = list(messages)
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        errors: List[Dict[str, str]] = []
+
+        async def _send_one(message: Dict[str, Any]) -> bool:
+            async with semaphore:
+                try:
+                    return await self.send_mail(**message)
+                except Exception as e:
+                    errors.append({"to_email": message.get("to_email"), "error": str(e)})
+                    return False
+
+        results = await asyncio.gather(*(_send_one(m) for m in messages))
+        sent = sum(1 for ok in results if ok)
+        return {"sent": sent, "failed": len(messages) - sent, "total": len(messages), "errors": errors}
+
+    async def send_fee_reminder(
+        self,
+        to_email: str,
+        player_name: str,
+        academy_name: str,
+        fee_amount: float,
+        due_date: datetime,
+        frequency: str = 'monthly'
+    ) -> bool:
+        """Async counterpart of send_automated_fee_reminder()."""
+        subject, html_content = build_fee_reminder_email(
+            player_name=player_name,
+            academy_name=academy_name,
+            fee_amount=fee_amount,
+            due_date=due_date,
+            frequency=frequency
         )
+        return await self.send_mail(to_email=to_email, subject=subject, html_content=html_content)
 
-    except Exception as e:
-        logger.error(f"Failed to send automated fee reminder: {e}")
-        raise
+    async def send_fee_reminders(self, recipients: Iterable[Dict[str, Any]], concurrency: int = 5) -> Dict[str, Any]:
+        """
+        Batch fee reminders. Recipients use the same shape as
+        email_utils.send_bulk_fee_reminders (email, player_name, academy_name,
+        fee_amount, due_date, frequency).
+        """
+        messages = []
+        for recipient in recipients:
+            subject, html_content = build_fee_reminder_email(
+                player_name=recipient['player_name'],
+                academy_name=recipient['academy_name'],
+                fee_amount=recipient['fee_amount'],
+                due_date=recipient['due_date'],
+                frequency=recipient.get('frequency', 'monthly')
+            )
+            messages.append({"to_email": recipient['email'], "subject": subject, "html_content": html_content})
+        return await self.send_many(messages, concurrency=concurrency)
+
+
+# Process-wide client, configured once from the app lifespan or the scheduler
+_client: Optional[ZohoMailClient] = None
+
+
+def setup_zoho_client(db=None, state=None, **kwargs) -> ZohoMailClient:
+    """
+    Create the shared ZohoMailClient. With a state backend (utils/state.py) or
+    a db, tokens are shared so every worker and the scheduler reuse the same
+    access token.
+    """
+    global _client
+    if state is not None:
+        from utils.state import TokenStore
+        token_store = TokenStore(state)
+    else:
+        token_store = MongoTokenStore(db) if db is not None else InMemoryTokenStore()
+    _client = ZohoMailClient(token_store, **kwargs)
+    return _client
+
+
+def get_zoho_client() -> ZohoMailClient:
+    """Return the shared client, creating a process-local one if not set up."""
+    global _client
+    if _client is None:
+        _client = ZohoMailClient()
+    return _client
+
+
+async def close_zoho_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
 
 
 # ============================================================================